@@ -7,14 +7,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from api.routes import chat, workbench
+from api.routes import admin, chat, workbench
+from app.services.mcp_client import close_mcp_pool, warm_mcp_pool
 from core.config import log_config
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     log_config()
+    warm_mcp_pool()
     yield
+    close_mcp_pool()
 
 
 app = FastAPI(
@@ -40,6 +43,7 @@ app.add_middleware(
 )
 
 app.include_router(chat.router)
+app.include_router(admin.router)
 app.include_router(workbench.router)
 
 try:
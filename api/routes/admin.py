@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from api.schemas.admin import CacheVersionResponse
+from api.services.copilot import GRAPH_BUILD_VERSION
+from core import config
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    token = config.ADMIN_API_TOKEN
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin API disabled (ADMIN_API_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _cache_version() -> CacheVersionResponse:
+    from core.data_snapshot import snapshot_components, snapshot_version
+    from core.semantic_cache import get_semantic_cache
+
+    components = snapshot_components(GRAPH_BUILD_VERSION)
+    stats = get_semantic_cache().stats()
+    return CacheVersionResponse(
+        version=snapshot_version(components),
+        components=components,
+        epoch=stats["epoch"],
+        stats=stats,
+    )
+
+
+@router.get("/cache", response_model=CacheVersionResponse)
+def cache_version() -> CacheVersionResponse:
+    return _cache_version()
+
+
+@router.post("/cache/bump", response_model=CacheVersionResponse)
+def bump_cache_version() -> CacheVersionResponse:
+    """Invalidate every cached Copilot answer, e.g. after an out-of-band data fix."""
+    from core.semantic_cache import get_semantic_cache
+
+    get_semantic_cache().bump_epoch()
+    return _cache_version()
@@ -45,6 +45,7 @@ def _to_chat_response(result: dict) -> ChatResponse:
         supplier_id=result.get("supplier_id"),
         trace_id=result.get("trace_id"),
         cache_hit=bool(result.get("cache_hit")),
+        coalesced=bool(result.get("coalesced")),
         paused=bool(result.get("paused")),
         interrupt=result.get("interrupt"),
         approval_decision=result.get("approval_decision"),
@@ -13,6 +13,7 @@ from api.schemas.workbench import (
     SupplierListResponse,
     SupplierSummary,
 )
+from tools.kpi_rollup import supplier_kpi_trend
 
 router = APIRouter(prefix="/api/workbench", tags=["workbench"])
 
@@ -46,7 +47,8 @@ def get_supplier(supplier_id: str) -> SupplierDetail:
     row = mock_data.get_supplier(supplier_id)
     if not row:
         raise HTTPException(status_code=404, detail="Supplier not found")
-    trend = mock_data.KPI_TREND.get(supplier_id, {})
+    # Monthly rollup from the KPI warehouse; the static demo trend only when it is unavailable.
+    trend = supplier_kpi_trend(supplier_id) or mock_data.KPI_TREND.get(supplier_id, {})
     return SupplierDetail(**row, kpi_trend=trend)
 
 
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class CacheVersionResponse(BaseModel):
+    version: str
+    components: dict[str, str]
+    epoch: int
+    stats: dict[str, Any] = Field(default_factory=dict)
@@ -56,6 +56,7 @@ class ChatResponse(BaseModel):
     supplier_id: str | None = None
     trace_id: str | None = None
     cache_hit: bool = False
+    coalesced: bool = False
     paused: bool = False
     interrupt: dict[str, Any] | None = None
     approval_decision: str | None = None
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import copy
 import os
 import time
 import uuid
 from functools import lru_cache
 from typing import Any, Literal
 
+from core.singleflight import SingleFlight
+
 GRAPH_BUILD_VERSION = "ratti-lifecycle-v6-hitl-approval"
 
+# Concurrent cache-eligible runs of the same question share one graph invocation.
+_COPILOT_FLIGHTS = SingleFlight()
+
 
 def _project_root() -> str:
     return os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -182,6 +188,53 @@ ForcedIntent = Literal[
 ]
 
 
+def cache_snapshot_version() -> str:
+    """Data-snapshot version cached answers are stamped with (DB, indexes, graph build)."""
+    from core.data_snapshot import snapshot_version
+
+    return snapshot_version(graph_version=GRAPH_BUILD_VERSION)
+
+
+def _cacheable(payload: dict[str, Any]) -> bool:
+    return not payload["clarification_required"] and not payload.get("paused")
+
+
+def _coalesced_payload(
+    leader: dict[str, Any],
+    question: str,
+    response_language: str,
+    *,
+    thread_id: str,
+    started: float,
+) -> dict[str, Any]:
+    """Copy a leader's answer for a follower, under the follower's own thread and trace."""
+    from observability.recorder import finish_trace, record_step, start_trace
+
+    payload = copy.deepcopy(leader)
+    waited_ms = round((time.perf_counter() - started) * 1000, 2)
+    trace_id = start_trace(question, response_language)
+    record_step(
+        "copilot_singleflight",
+        tool_latency_ms=waited_ms,
+        detail={"leader_trace_id": leader.get("trace_id"), "leader_thread_id": leader.get("thread_id")},
+    )
+    route_info = payload.get("route_info") or {}
+    finish_trace(
+        trace_id,
+        final_answer=payload.get("answer"),
+        confidence=route_info.get("confidence"),
+        intent=payload.get("intent"),
+        total_latency_ms=waited_ms,
+        ambiguity_type=route_info.get("ambiguity_type"),
+        review_status=payload.get("review_status"),
+        human_approval_required=route_info.get("human_approval_required"),
+    )
+    payload["thread_id"] = thread_id
+    payload["trace_id"] = trace_id
+    payload["coalesced"] = True
+    return payload
+
+
 def run_copilot(
     question: str,
     response_language: str,
@@ -192,8 +245,7 @@ def run_copilot(
     forced_intent: ForcedIntent | None = None,
 ) -> dict[str, Any]:
     from core.prompt_injection import scan_user_input
-    from core.semantic_cache import get_semantic_cache
-    from observability.recorder import finish_trace, start_trace
+    from core.semantic_cache import get_semantic_cache, normalize_question
 
     thread_id = thread_id or str(uuid.uuid4())
     cache = get_semantic_cache()
@@ -205,13 +257,54 @@ def run_copilot(
         and forced_intent is None
         and not supplier_id
     )
-    if use_cache:
-        cached = cache.get(question, response_language)
-        if cached is not None:
-            cached = dict(cached)
-            cached["thread_id"] = thread_id
-            cached["cache_hit"] = True
-            return cached
+    if not use_cache:
+        return _invoke_graph(
+            question,
+            response_language,
+            thread_id=thread_id,
+            task_type=task_type,
+            supplier_id=supplier_id,
+            forced_intent=forced_intent,
+        )
+
+    version = cache_snapshot_version()
+    cached = cache.get(question, response_language, version=version)
+    if cached is not None:
+        cached = dict(cached)
+        cached["thread_id"] = thread_id
+        cached["cache_hit"] = True
+        return cached
+
+    started = time.perf_counter()
+    payload, shared = _COPILOT_FLIGHTS.do(
+        (response_language, normalize_question(question)),
+        lambda: _invoke_graph(
+            question, response_language, thread_id=thread_id, task_type=task_type, cache=cache, cache_version=version
+        ),
+    )
+    if not shared:
+        return payload
+    if _cacheable(payload):
+        return _coalesced_payload(payload, question, response_language, thread_id=thread_id, started=started)
+    # A clarification / approval pause belongs to the leader's thread; run our own.
+    return _invoke_graph(
+        question, response_language, thread_id=thread_id, task_type=task_type, cache=cache, cache_version=version
+    )
+
+
+def _invoke_graph(
+    question: str,
+    response_language: str,
+    *,
+    thread_id: str,
+    task_type: Literal["chat", "supplier_assessment"] | None = None,
+    supplier_id: str | None = None,
+    forced_intent: ForcedIntent | None = None,
+    cache: Any = None,
+    cache_version: str | None = None,
+) -> dict[str, Any]:
+    """Run the graph once; ``cache`` (when given) receives cache-eligible payloads."""
+    from observability.recorder import finish_trace, start_trace
 
     active_graph = get_graph(graph_cache_key())
     trace_id = start_trace(question, response_language)
@@ -278,8 +371,8 @@ def run_copilot(
     )
 
     payload = _payload_from_result(result, thread_id=thread_id, trace_id=trace_id)
-    if use_cache and not payload["clarification_required"] and not payload.get("paused"):
-        cache.put(question, response_language, payload)
+    if cache is not None and _cacheable(payload):
+        cache.put(question, response_language, payload, version=cache_version)
     return payload
 
 
@@ -5,8 +5,14 @@ Spawns ``mcp_server.server`` over stdio, then uses the standard MCP session API:
   list_tools() → discover tool catalog (descriptions feed routing)
   call_tool()  → execute query_policy / query_kpi
 
-LangGraph nodes call the sync helpers below; a background event loop keeps one
-stdio session warm so Pinecone/SQLite init is not repeated every turn.
+LangGraph nodes call the sync helpers below (async callers use ``acall_tool`` /
+``alist_tools``). A background event loop keeps a pool of ``MCP_POOL_SIZE`` stdio
+server subprocesses warm, so Pinecone/SQLite init is not repeated every turn and
+parallel graph branches (hybrid policy ∥ KPI, assessment gather) do not queue
+behind one session. A supervisor pings the sessions, swaps a failed one for a
+pre-started standby and restarts it in the background; the app starts the pool
+at startup (``warm_mcp_pool``). ``MCP_TRANSPORT=inprocess`` calls the tool implementations
+directly instead (``app.services.mcp_inprocess``), with the same contract.
 """
 
 from __future__ import annotations
@@ -16,12 +22,25 @@ import json
 import os
 import sys
 import threading
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from core.config import (
+    MCP_CALL_TIMEOUT_SECONDS,
+    MCP_FAILOVER_WAIT_SECONDS,
+    MCP_HEALTH_INTERVAL_SECONDS,
+    MCP_PING_TIMEOUT_SECONDS,
+    MCP_POOL_SIZE,
+    MCP_STANDBY_SIZE,
+    MCP_START_TIMEOUT_SECONDS,
+    MCP_TRANSPORT,
+)
+from tools.sql_results import from_columnar
+
 
 class McpToolError(RuntimeError):
     """Raised when an MCP tool returns isError=true (standard protocol error)."""
@@ -67,7 +86,7 @@ def _parse_tool_payload(raw: Any) -> Any:
     if not text:
         return None
     try:
-        return json.loads(text)
+        return from_columnar(json.loads(text))
     except json.JSONDecodeError:
         return text
 
@@ -81,92 +100,461 @@ def _content_to_text(result: Any) -> str:
     return "\n".join(parts).strip()
 
 
-class _PersistentMcpSession:
-    """One stdio MCP subprocess + ClientSession, owned by a dedicated asyncio loop."""
+@asynccontextmanager
+async def _stdio_connect() -> AsyncIterator[ClientSession]:
+    """Spawn ``mcp_server.server`` and yield an initialized ClientSession over its stdio."""
+    async with stdio_client(_server_params()) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
 
-    def __init__(self) -> None:
-        self._loop = asyncio.new_event_loop()
-        self._thread = threading.Thread(target=self._run_loop, name="mcp-client-loop", daemon=True)
-        self._ready = threading.Event()
-        self._error: BaseException | None = None
+
+class _SessionFailure(RuntimeError):
+    """Transport-level failure of one pooled session (timeout, closed pipe, dead subprocess)."""
+
+
+class _PooledSession:
+    """One MCP server subprocess + ClientSession, served by a task on the pool's event loop.
+
+    The task enters and exits the stdio / session context managers itself (anyio
+    cancel scopes must close in the task that opened them) and parks until ``stop``.
+    One request runs at a time per subprocess: the server's sync tools block its loop.
+    """
+
+    def __init__(self, slot: int, connect: Callable[[], Any], call_timeout: float) -> None:
+        self.slot = slot
+        self.healthy = False
+        self.inflight = 0
+        self.calls = 0
+        self.failures = 0
+        self.last_error: str | None = None
+        self._connect = connect
+        self._call_timeout = call_timeout
         self._session: ClientSession | None = None
-        self._stack = None  # AsyncExitStack-like via nested context managers
-        self._cm_stdio = None
-        self._cm_session = None
         self._lock = asyncio.Lock()
-        self._thread.start()
-        if not self._ready.wait(timeout=120):
-            raise TimeoutError("MCP stdio server failed to start within 120s.")
-        if self._error is not None:
-            raise RuntimeError(f"MCP stdio server failed to start: {self._error}") from self._error
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
 
-    def _run_loop(self) -> None:
-        asyncio.set_event_loop(self._loop)
+    async def start(self, timeout: float) -> None:
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._serve(ready), name=f"mcp-session-{self.slot}")
         try:
-            self._loop.run_until_complete(self._connect())
-            self._ready.set()
-            self._loop.run_forever()
-        except BaseException as exc:  # noqa: BLE001 — surface startup failures
-            self._error = exc
-            self._ready.set()
-
-    async def _connect(self) -> None:
-        params = _server_params()
-        self._cm_stdio = stdio_client(params)
-        read, write = await self._cm_stdio.__aenter__()
-        self._cm_session = ClientSession(read, write)
-        self._session = await self._cm_session.__aenter__()
-        await self._session.initialize()
-
-    def run(self, coro):
-        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
-        return fut.result(timeout=180)
+            await asyncio.wait_for(asyncio.shield(ready), timeout)
+        except asyncio.TimeoutError:
+            await self.stop()
+            raise TimeoutError(f"MCP stdio server failed to start within {timeout:g}s.") from None
 
-    async def list_tools(self) -> list[McpToolInfo]:
-        assert self._session is not None
+    async def _serve(self, ready: asyncio.Future) -> None:
+        try:
+            async with self._connect() as session:
+                self._session = session
+                self.healthy = True
+                ready.set_result(None)
+                await self._stop.wait()
+        except BaseException as exc:  # noqa: BLE001 — startup failures go to start(), later ones mark the slot
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+            if isinstance(exc, (asyncio.CancelledError, KeyboardInterrupt, SystemExit)):
+                raise
+        finally:
+            self.healthy = False
+            self._session = None
+
+    async def stop(self) -> None:
+        self.healthy = False
+        self._stop.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, 5)
+            except (asyncio.TimeoutError, asyncio.CancelledError, Exception):  # noqa: BLE001 — best-effort shutdown
+                pass
+
+    async def request(self, op: Callable[[ClientSession], Awaitable[Any]]) -> Any:
+        self.inflight += 1
+        try:
+            async with self._lock:
+                if not self.healthy or self._session is None:
+                    raise _SessionFailure(f"MCP session {self.slot} is not connected")
+                try:
+                    result = await asyncio.wait_for(op(self._session), self._call_timeout)
+                except asyncio.TimeoutError as exc:
+                    raise self._fail(f"no response within {self._call_timeout:g}s") from exc
+                except Exception as exc:  # noqa: BLE001 — protocol errors are tool results, not exceptions
+                    raise self._fail(f"{type(exc).__name__}: {exc}") from exc
+            self.calls += 1
+            return result
+        finally:
+            self.inflight -= 1
+
+    async def ping(self, timeout: float) -> bool:
+        """Health check for an idle session; a busy one is proven (or failed) by its own call."""
+        if not self.healthy or self._session is None:
+            return False
+        if self.inflight or self._lock.locked():
+            return True
         async with self._lock:
-            listed = await self._session.list_tools()
-        tools: list[McpToolInfo] = []
-        for tool in listed.tools:
-            tools.append(
-                McpToolInfo(
-                    name=tool.name,
-                    description=tool.description or "",
-                    input_schema=dict(tool.inputSchema or {}),
+            try:
+                await asyncio.wait_for(self._session.send_ping(), timeout)
+            except asyncio.TimeoutError:
+                self._fail(f"no ping response within {timeout:g}s")
+                return False
+            except Exception as exc:  # noqa: BLE001 — closed pipe / dead subprocess
+                self._fail(f"ping failed: {type(exc).__name__}: {exc}")
+                return False
+        return True
+
+    def _fail(self, reason: str) -> _SessionFailure:
+        self.healthy = False
+        self.failures += 1
+        self.last_error = reason
+        return _SessionFailure(f"MCP session {self.slot} failed: {reason}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "slot": self.slot,
+            "healthy": self.healthy,
+            "inflight": self.inflight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class McpSessionPool:
+    """``MCP_POOL_SIZE`` MCP server subprocesses on one background asyncio loop, under a supervisor.
+
+    Each call goes to the healthy session with the fewest in-flight requests (ties:
+    fewest calls so far). A session that times out, loses its transport or misses a
+    health ping is swapped for one of ``MCP_STANDBY_SIZE`` pre-started standbys
+    (falling back to a background restart), and a call that hit it is retried once;
+    tool errors (``isError``) are ordinary results and never retried. With no healthy
+    session a call waits at most ``failover_wait`` seconds, then fails.
+    Sync callers use ``run(coro)``; async callers ``await arun(coro)``.
+
+    ``wait=False`` returns at once and starts every subprocess in the background
+    (``get_mcp_pool``), so no request waits for a cold start.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        *,
+        connect: Callable[[], Any] | None = None,
+        start_timeout: float | None = None,
+        call_timeout: float | None = None,
+        standby: int | None = None,
+        health_interval: float | None = None,
+        ping_timeout: float | None = None,
+        failover_wait: float | None = None,
+        wait: bool = True,
+    ) -> None:
+        self.size = max(1, int(MCP_POOL_SIZE if size is None else size))
+        self.standby = max(0, int(MCP_STANDBY_SIZE if standby is None else standby))
+        self.start_timeout = float(MCP_START_TIMEOUT_SECONDS if start_timeout is None else start_timeout)
+        self.call_timeout = float(MCP_CALL_TIMEOUT_SECONDS if call_timeout is None else call_timeout)
+        self.health_interval = float(MCP_HEALTH_INTERVAL_SECONDS if health_interval is None else health_interval)
+        self.ping_timeout = float(MCP_PING_TIMEOUT_SECONDS if ping_timeout is None else ping_timeout)
+        self.failover_wait = float(MCP_FAILOVER_WAIT_SECONDS if failover_wait is None else failover_wait)
+        self._connect = connect or _stdio_connect
+        self._sessions: list[_PooledSession] = []
+        self._standbys: list[_PooledSession] = []
+        self._restarts: dict[int, asyncio.Task] = {}
+        self._spares: set[asyncio.Task] = set()
+        self._retiring: set[asyncio.Task] = set()
+        self._supervisor: asyncio.Task | None = None
+        self.failovers = 0
+        self.restarts = 0
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mcp-client-loop", daemon=True)
+        self._thread.start()
+        try:
+            self.run(self._start_all(wait), timeout=self.start_timeout + 10)
+        except BaseException:
+            self.close()
+            raise
+
+    # ---------- lifecycle (on the pool loop) ----------
+
+    def _new_session(self, slot: int) -> _PooledSession:
+        return _PooledSession(slot, self._connect, self.call_timeout)
+
+    async def _start_all(self, wait: bool) -> None:
+        self._sessions = [self._new_session(slot) for slot in range(self.size)]
+        if wait:
+            results = await asyncio.gather(
+                *(s.start(self.start_timeout) for s in self._sessions), return_exceptions=True
+            )
+            errors = [r for r in results if isinstance(r, BaseException)]
+            if len(errors) == len(results):
+                raise RuntimeError(f"MCP stdio server failed to start: {errors[0]}") from errors[0]
+            for session, result in zip(self._sessions, results):
+                if isinstance(result, BaseException):
+                    session.last_error = str(result)
+                    print(f"[mcp_client] session {session.slot} failed to start: {result}", file=sys.stderr)
+                    self._schedule_restart(session)
+        else:
+            for session in self._sessions:
+                self._schedule_restart(session)
+        self._fill_standby()
+        self._supervisor = asyncio.create_task(self._supervise(), name="mcp-supervisor")
+
+    def _schedule_restart(self, session: _PooledSession) -> asyncio.Task:
+        task = self._restarts.get(session.slot)
+        if task is None or task.done():
+            task = asyncio.create_task(self._restart(session), name=f"mcp-restart-{session.slot}")
+            self._restarts[session.slot] = task
+        return task
+
+    async def _restart(self, old: _PooledSession) -> None:
+        await old.stop()
+        fresh = self._new_session(old.slot)
+        fresh.failures, fresh.last_error = old.failures, old.last_error
+        try:
+            await fresh.start(self.start_timeout)
+        except Exception as exc:  # noqa: BLE001 — slot stays unhealthy; the supervisor retries it
+            fresh.last_error = str(exc)
+            print(f"[mcp_client] session {old.slot} restart failed: {exc}", file=sys.stderr)
+        else:
+            if old.started:  # the first start of a wait=False pool is not a recovery
+                self.restarts += 1
+        if self._sessions[old.slot] is old:
+            self._sessions[old.slot] = fresh
+        elif fresh.healthy and len(self._standbys) < self.standby:
+            self._standbys.append(fresh)  # a standby took the slot meanwhile
+        else:
+            await fresh.stop()
+
+    def _fill_standby(self) -> None:
+        """Start spares in the background until ``standby`` are ready or starting."""
+        self._standbys = [s for s in self._standbys if s.healthy]
+        for _ in range(self.standby - len(self._standbys) - len(self._spares)):
+            task = asyncio.create_task(self._start_spare(), name="mcp-standby")
+            self._spares.add(task)
+            task.add_done_callback(self._spares.discard)
+
+    async def _start_spare(self) -> None:
+        spare = self._new_session(-1)
+        try:
+            await spare.start(self.start_timeout)
+        except Exception as exc:  # noqa: BLE001 — the next supervisor pass tries again
+            print(f"[mcp_client] standby failed to start: {exc}", file=sys.stderr)
+            return
+        self._standbys.append(spare)
+
+    def _failover(self, session: _PooledSession) -> None:
+        """Replace a failed slot: swap in a ready standby now, else restart it in the background."""
+        if self._sessions[session.slot] is not session:
+            return
+        spare = next((s for s in self._standbys if s.healthy), None)
+        if spare is None:
+            self._schedule_restart(session)
+            return
+        self._standbys.remove(spare)
+        spare.slot = session.slot
+        spare.failures, spare.last_error = session.failures, session.last_error
+        self._sessions[session.slot] = spare
+        self.failovers += 1
+        print(f"[mcp_client] session {session.slot} replaced by standby", file=sys.stderr)
+        retired = asyncio.create_task(session.stop(), name=f"mcp-retire-{session.slot}")
+        self._retiring.add(retired)
+        retired.add_done_callback(self._retiring.discard)
+        self._fill_standby()
+
+    async def _supervise(self) -> None:
+        """Ping idle sessions and standbys, replace failed slots, keep the standbys topped up."""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                await asyncio.gather(
+                    *(s.ping(self.ping_timeout) for s in [*self._sessions, *self._standbys])
                 )
+                for session in list(self._sessions):
+                    restarting = self._restarts.get(session.slot)
+                    if not session.healthy and (restarting is None or restarting.done() or self._standbys):
+                        self._failover(session)
+                self._fill_standby()
+            except Exception as exc:  # noqa: BLE001 — the supervisor must outlive any one pass
+                print(f"[mcp_client] supervisor pass failed: {exc}", file=sys.stderr)
+
+    # ---------- dispatch (on the pool loop) ----------
+
+    async def _pick(self) -> _PooledSession:
+        deadline = asyncio.get_running_loop().time() + self.failover_wait
+        while True:
+            healthy = [s for s in self._sessions if s.healthy]
+            if healthy:
+                return min(healthy, key=lambda s: (s.inflight, s.calls))
+            for session in self._sessions:
+                self._failover(session)
+            if asyncio.get_running_loop().time() >= deadline:
+                raise RuntimeError(
+                    f"No healthy MCP session within {self.failover_wait:g}s; MCP server subprocesses are restarting."
+                )
+            await asyncio.sleep(0.01)
+
+    async def _dispatch(self, op: Callable[[ClientSession], Awaitable[Any]]) -> Any:
+        failure: _SessionFailure | None = None
+        for _ in range(2):
+            session = await self._pick()
+            try:
+                return await session.request(op)
+            except _SessionFailure as exc:
+                print(f"[mcp_client] {exc}; failing over", file=sys.stderr)
+                self._failover(session)
+                failure = exc
+        raise RuntimeError(str(failure)) from failure
+
+    async def list_tools(self) -> list[McpToolInfo]:
+        listed = await self._dispatch(lambda session: session.list_tools())
+        return [
+            McpToolInfo(
+                name=tool.name,
+                description=tool.description or "",
+                input_schema=dict(tool.inputSchema or {}),
             )
-        return tools
+            for tool in listed.tools
+        ]
 
     async def call_tool(self, name: str, arguments: dict[str, Any] | None = None) -> Any:
-        assert self._session is not None
-        async with self._lock:
-            result = await self._session.call_tool(name, arguments=arguments or {})
+        result = await self._dispatch(lambda session: session.call_tool(name, arguments=arguments or {}))
         text = _content_to_text(result)
         if getattr(result, "isError", False):
             raise McpToolError(name, text or "unknown tool error")
         return _parse_tool_payload(text)
 
+    # ---------- caller side ----------
+
+    def run(self, coro: Awaitable[Any], timeout: float | None = None) -> Any:
+        """Run ``coro`` on the pool loop and block the calling thread for its result."""
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return fut.result(timeout=timeout if timeout is not None else self._wait_budget())
+
+    async def arun(self, coro: Awaitable[Any]) -> Any:
+        """Await ``coro`` on the pool loop from another event loop (FastAPI handlers, async graphs)."""
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return await asyncio.wait_for(asyncio.wrap_future(fut), self._wait_budget())
+
+    def _wait_budget(self) -> float:
+        # two attempts, each after at most one bounded wait for a healthy session
+        return 2 * (self.call_timeout + self.failover_wait) + 5
+
+    def stats(self) -> list[dict[str, Any]]:
+        return [s.stats() for s in list(self._sessions)]
+
+    def supervisor_stats(self) -> dict[str, Any]:
+        return {
+            "standby_ready": sum(1 for s in list(self._standbys) if s.healthy),
+            "standby_target": self.standby,
+            "failovers": self.failovers,
+            "restarts": self.restarts,
+        }
+
+    def close(self) -> None:
+        """Stop every subprocess and the loop thread."""
+        if self._loop.is_closed():
+            return
+
+        async def _stop_all() -> None:
+            for task in [self._supervisor, *self._restarts.values(), *self._spares]:
+                if task is not None:
+                    task.cancel()
+            sessions = [*self._sessions, *self._standbys]
+            await asyncio.gather(
+                *(s.stop() for s in sessions), *list(self._retiring), return_exceptions=True
+            )
+
+        if self._loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(_stop_all(), self._loop).result(timeout=10)
+            except Exception:  # noqa: BLE001 — best-effort shutdown
+                pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+
+_POOL: McpSessionPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_mcp_pool() -> McpSessionPool:
+    """The shared pool; created without waiting, its subprocesses start in the background."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = McpSessionPool(wait=False)
+        return _POOL
+
 
-_SESSION: _PersistentMcpSession | None = None
-_SESSION_LOCK = threading.Lock()
+def warm_mcp_pool() -> None:
+    """Spawn the pool's subprocesses at app startup so the first request finds them running."""
+    if not _inprocess():
+        get_mcp_pool()
 
 
-def get_mcp_session() -> _PersistentMcpSession:
-    global _SESSION
-    with _SESSION_LOCK:
-        if _SESSION is None:
-            _SESSION = _PersistentMcpSession()
-        return _SESSION
+def close_mcp_pool() -> None:
+    """Close and drop the shared pool (app shutdown)."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+# Backward-compatible name: the pool exposes the old session's run / list_tools / call_tool.
+get_mcp_session = get_mcp_pool
+
+
+def _inprocess() -> bool:
+    return MCP_TRANSPORT == "inprocess"
 
 
 def list_tools() -> list[McpToolInfo]:
     """MCP list_tools() — Copilot discovers capabilities + descriptions."""
-    return get_mcp_session().run(get_mcp_session().list_tools())
+    if _inprocess():
+        from app.services import mcp_inprocess
+
+        return mcp_inprocess.list_tools()
+    pool = get_mcp_pool()
+    return pool.run(pool.list_tools())
 
 
 def call_tool(name: str, arguments: dict[str, Any] | None = None) -> Any:
     """MCP call_tool() — execute a registered server tool."""
-    return get_mcp_session().run(get_mcp_session().call_tool(name, arguments))
+    if _inprocess():
+        from app.services import mcp_inprocess
+
+        return mcp_inprocess.call_tool(name, arguments)
+    pool = get_mcp_pool()
+    return pool.run(pool.call_tool(name, arguments))
+
+
+async def alist_tools() -> list[McpToolInfo]:
+    """Async ``list_tools`` for callers on their own event loop; same pool as the sync helpers."""
+    if _inprocess():
+        return await asyncio.to_thread(list_tools)
+    pool = get_mcp_pool()
+    return await pool.arun(pool.list_tools())
+
+
+async def acall_tool(name: str, arguments: dict[str, Any] | None = None) -> Any:
+    """Async ``call_tool``; same pool, dispatch and error mapping as the sync helper."""
+    if _inprocess():
+        return await asyncio.to_thread(call_tool, name, arguments)
+    pool = get_mcp_pool()
+    return await pool.arun(pool.call_tool(name, arguments))
+
+
+def mcp_pool_stats() -> list[dict[str, Any]]:
+    """Per-session health and load of the running pool (empty before first use)."""
+    with _POOL_LOCK:
+        pool = _POOL
+    return pool.stats() if pool is not None else []
 
 
 def format_tools_for_router(tools: list[McpToolInfo] | None = None) -> str:
@@ -184,7 +572,5 @@ def format_tools_for_router(tools: list[McpToolInfo] | None = None) -> str:
 
 
 def reset_mcp_session_for_tests() -> None:
-    """Test helper — drop the cached session (does not kill the subprocess cleanly)."""
-    global _SESSION
-    with _SESSION_LOCK:
-        _SESSION = None
+    """Test helper — close and drop the cached pool."""
+    close_mcp_pool()
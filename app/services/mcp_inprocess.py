@@ -0,0 +1,78 @@
+"""In-process MCP transport (``MCP_TRANSPORT=inprocess``).
+
+When the Copilot and the tools share a host, ``call_tool`` can skip the stdio
+JSON-RPC round trip and the server subprocess. It calls
+``mcp_server.tools.TOOL_IMPLS`` directly. The contract matches the stdio server:
+
+  arguments   validated against the tool signature with pydantic, as FastMCP
+              does (coercion, required fields; unknown keys are ignored)
+  errors      ``ToolValidationError``, other failures and bad arguments raise
+              ``McpToolError`` with the text the server would send
+              (``Error executing tool <name>: ...``); unknown tools give
+              ``Unknown tool: <name>``
+  payload     the ``*_impl`` dict, which equals what the stdio client decodes
+              (``tests/test_mcp_inprocess.py`` checks that)
+  trace       no steps are recorded inside the tool (``suspended_trace``):
+              the stdio server subprocess cannot write into the caller's trace
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+import typing
+from typing import Any, Callable
+
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+
+from app.services.mcp_client import McpToolError, McpToolInfo
+from mcp_server.tools import TOOL_DESCRIPTIONS, TOOL_IMPLS, ToolValidationError
+from observability.recorder import suspended_trace
+
+_MODELS: dict[Callable[..., Any], type[BaseModel]] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def _arguments_model(name: str, impl: Callable[..., Any]) -> type[BaseModel]:
+    with _MODELS_LOCK:
+        model = _MODELS.get(impl)
+        if model is None:
+            hints = typing.get_type_hints(impl)
+            fields: dict[str, Any] = {}
+            for param in inspect.signature(impl).parameters.values():
+                default = ... if param.default is inspect.Parameter.empty else param.default
+                fields[param.name] = (hints.get(param.name, Any), default)
+            model = create_model(
+                f"{name}Arguments", __config__=ConfigDict(extra="ignore", arbitrary_types_allowed=True), **fields
+            )
+            _MODELS[impl] = model
+        return model
+
+
+def list_tools() -> list[McpToolInfo]:
+    return [
+        McpToolInfo(
+            name=name,
+            description=TOOL_DESCRIPTIONS.get(name, ""),
+            input_schema=_arguments_model(name, impl).model_json_schema(),
+        )
+        for name, impl in TOOL_IMPLS.items()
+    ]
+
+
+def call_tool(name: str, arguments: dict[str, Any] | None = None) -> Any:
+    impl = TOOL_IMPLS.get(name)
+    if impl is None:
+        raise McpToolError(name, f"Unknown tool: {name}")
+    try:
+        validated = _arguments_model(name, impl).model_validate(arguments or {})
+    except ValidationError as exc:
+        raise McpToolError(name, f"Error executing tool {name}: {exc}") from exc
+    kwargs = {field: getattr(validated, field) for field in type(validated).model_fields}
+    with suspended_trace():
+        try:
+            return impl(**kwargs)
+        except ToolValidationError as exc:
+            raise McpToolError(name, f"Error executing tool {name}: {exc}") from exc
+        except Exception as exc:
+            raise McpToolError(name, f"Error executing tool {name}: {name} failed: {exc}") from exc
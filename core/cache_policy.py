@@ -0,0 +1,158 @@
+"""Eviction / admission policies for bounded in-process caches.
+
+Every operation is O(1) (LFU victim selection is O(distinct hit counts) after
+the least-frequent bucket empties):
+
+  lru       evict the least recently used entry; always admit
+  lfu       evict the entry with the fewest hits (LRU among ties); always admit
+  tinylfu   LRU victim, but a new key only replaces it if a count-min sketch of
+            recent lookups says the newcomer is asked at least as often
+
+Policies only track keys; the owning cache keeps the values and calls the hooks
+under its own lock.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+POLICIES = ("lru", "lfu", "tinylfu")
+
+
+class LRUPolicy:
+    name = "lru"
+
+    def __init__(self) -> None:
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def record_access(self, key: str) -> None:
+        """Called for every lookup, hit or miss."""
+
+    def on_insert(self, key: str) -> None:
+        self._order[key] = None
+
+    def on_hit(self, key: str) -> None:
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def on_remove(self, key: str) -> None:
+        self._order.pop(key, None)
+
+    def victim(self) -> str | None:
+        return next(iter(self._order), None)
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        return True
+
+
+class LFUPolicy:
+    """Frequency buckets (``hits + 1`` → keys in LRU order)."""
+
+    name = "lfu"
+
+    def __init__(self) -> None:
+        self._freq: dict[str, int] = {}
+        self._buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_freq = 0
+
+    def record_access(self, key: str) -> None:
+        pass
+
+    def _bucket_add(self, key: str, freq: int) -> None:
+        self._freq[key] = freq
+        self._buckets.setdefault(freq, OrderedDict())[key] = None
+
+    def _bucket_remove(self, key: str) -> int:
+        freq = self._freq.pop(key)
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if freq == self._min_freq:
+                self._min_freq = min(self._buckets, default=0)
+        return freq
+
+    def on_insert(self, key: str) -> None:
+        if key in self._freq:
+            self._bucket_remove(key)
+        self._bucket_add(key, 1)
+        self._min_freq = 1
+
+    def on_hit(self, key: str) -> None:
+        if key not in self._freq:
+            return
+        freq = self._bucket_remove(key)
+        self._bucket_add(key, freq + 1)
+        if not self._min_freq or freq + 1 < self._min_freq:
+            self._min_freq = freq + 1
+
+    def on_remove(self, key: str) -> None:
+        if key in self._freq:
+            self._bucket_remove(key)
+
+    def victim(self) -> str | None:
+        bucket = self._buckets.get(self._min_freq)
+        return next(iter(bucket), None) if bucket else None
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        return True
+
+
+class CountMinSketch:
+    """4-row count-min sketch with 4-bit-style saturating counters and periodic halving."""
+
+    def __init__(self, capacity: int) -> None:
+        width = 64
+        while width < 8 * max(1, capacity):
+            width *= 2
+        self._mask = width - 1
+        self._table = np.zeros((4, width), dtype=np.uint8)
+        self._sample = 10 * max(1, capacity)
+        self._additions = 0
+
+    def _slots(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        return [int.from_bytes(digest[i : i + 4], "little") & self._mask for i in range(0, 16, 4)]
+
+    def increment(self, key: str) -> None:
+        for row, col in enumerate(self._slots(key)):
+            if self._table[row, col] < 15:
+                self._table[row, col] += 1
+        self._additions += 1
+        if self._additions >= self._sample:
+            # Aging keeps the sketch tracking recent popularity.
+            self._table >>= 1
+            self._additions //= 2
+
+    def estimate(self, key: str) -> int:
+        return int(min(self._table[row, col] for row, col in enumerate(self._slots(key))))
+
+
+class TinyLFUPolicy(LRUPolicy):
+    name = "tinylfu"
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__()
+        self.sketch = CountMinSketch(capacity)
+
+    def record_access(self, key: str) -> None:
+        self.sketch.increment(key)
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        # Ties admit, so one-off questions still rotate LRU-style while
+        # repeatedly asked entries are protected from them.
+        return self.sketch.estimate(candidate) >= self.sketch.estimate(victim)
+
+
+def make_policy(name: str, capacity: int) -> LRUPolicy | LFUPolicy | TinyLFUPolicy:
+    name = (name or "lru").strip().lower()
+    if name == "lfu":
+        return LFUPolicy()
+    if name == "tinylfu":
+        return TinyLFUPolicy(capacity)
+    if name != "lru":
+        raise ValueError(f"Unknown cache policy {name!r}; expected one of {', '.join(POLICIES)}")
+    return LRUPolicy()
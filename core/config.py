@@ -14,6 +14,21 @@ RERANKER_FALLBACK = os.getenv("RERANKER_FALLBACK", "openai")
 RERANKER_MODEL = os.getenv("RERANKER_MODEL", "BAAI/bge-reranker-base")
 RERANK_POOL = int(os.getenv("RERANK_POOL", "20"))
 ENABLE_HYDE = os.getenv("ENABLE_HYDE", "false").lower() == "true"
+# How often shared retrieval indexes re-stat their files to pick up a rebuild.
+INDEX_RELOAD_CHECK_SECONDS = float(os.getenv("INDEX_RELOAD_CHECK_SECONDS", "1.0"))
+# Worker threads shared by all retrievers for concurrent recall routes (<=1 runs them inline).
+RETRIEVAL_MAX_WORKERS = int(os.getenv("RETRIEVAL_MAX_WORKERS", "8"))
+# Cross-request cache of LLM query expansions (keywords / HyDE); 0 entries disables it.
+QUERY_EXPANSION_CACHE_SIZE = int(os.getenv("QUERY_EXPANSION_CACHE_SIZE", "512"))
+QUERY_EXPANSION_CACHE_TTL_SECONDS = float(os.getenv("QUERY_EXPANSION_CACHE_TTL_SECONDS", "3600"))
+
+# ---------- Vector store ----------
+# "pinecone" (managed) or "local" (memory-mapped index built by ingestion/build_vectorstore.py).
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", os.path.join("data", "vector_index"))
+# Corpora at or above this size get an IVF index; smaller ones are scanned exactly.
+VECTOR_IVF_MIN_DOCS = int(os.getenv("VECTOR_IVF_MIN_DOCS", "50000"))
+VECTOR_IVF_NPROBE = int(os.getenv("VECTOR_IVF_NPROBE", "16"))
 
 # ---------- Pinecone ----------
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
@@ -33,11 +48,78 @@ SQLITE_DB_PATH = os.getenv(
     os.path.join(_BASE_DIR, "data", "ratti_copilot_demo.db"),
 )
 
+# Read-only connection pool for tools.sql_tools (one connection per thread).
+# SQL_DB_IMMUTABLE skips SQLite's change detection; SQL_DB_IN_MEMORY serves a RAM copy of the DB.
+SQL_DB_IMMUTABLE = os.getenv("SQL_DB_IMMUTABLE", "false").lower() in {"1", "true", "yes"}
+SQL_DB_IN_MEMORY = os.getenv("SQL_DB_IN_MEMORY", "false").lower() in {"1", "true", "yes"}
+SQL_MMAP_BYTES = int(os.getenv("SQL_MMAP_BYTES", str(256 * 1024 * 1024)))
+SQL_CACHE_KB = int(os.getenv("SQL_CACHE_KB", "16384"))
+
+# Execution backend for guarded read-only SQL (tools.sql_backends): "sqlite" or "duckdb" (optional package).
+# DuckDB reads the same tables via its sqlite extension ("attach") or a Parquet export ("parquet").
+SQL_BACKEND = os.getenv("SQL_BACKEND", "sqlite").strip().lower()
+SQL_DUCKDB_SOURCE = os.getenv("SQL_DUCKDB_SOURCE", "attach").strip().lower()
+SQL_DUCKDB_PARQUET_DIR = os.getenv("SQL_DUCKDB_PARQUET_DIR", os.path.join(_BASE_DIR, "data", "duckdb_parquet"))
+SQL_DUCKDB_THREADS = int(os.getenv("SQL_DUCKDB_THREADS", "0"))
+
+# KPI templates read the monthly rollup (tools.kpi_rollup) while it is current with the event tables.
+KPI_USE_ROLLUP = os.getenv("KPI_USE_ROLLUP", "true").lower() in {"1", "true", "yes"}
+
+# Read-only query results cached per (template/SQL, params, DB fingerprint) by tools.result_cache; 0 disables.
+KPI_RESULT_CACHE_SIZE = int(os.getenv("KPI_RESULT_CACHE_SIZE", "512"))
+KPI_RESULT_CACHE_MAX_BYTES = int(os.getenv("KPI_RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Validated statements kept by tools.sql_guard (LLM-written SQL is never served from it).
+SQL_GUARD_CACHE_SIZE = int(os.getenv("SQL_GUARD_CACHE_SIZE", "1024"))
+
+# Cost control for LLM-written SQL (tools.sql_cost); 0 disables a limit.
+# Plan check: reject before execution when EXPLAIN QUERY PLAN shows a full scan of a table
+# above SQL_PLAN_MAX_SCAN_ROWS rows, or nested loops estimated above SQL_PLAN_MAX_NESTED_ROWS rows.
+SQL_PLAN_MAX_SCAN_ROWS = int(os.getenv("SQL_PLAN_MAX_SCAN_ROWS", "250000"))
+SQL_PLAN_MAX_NESTED_ROWS = int(os.getenv("SQL_PLAN_MAX_NESTED_ROWS", "1000000"))
+# Execution budget, enforced with sqlite3's progress handler (checked every SQL_PROGRESS_INTERVAL VM steps).
+SQL_QUERY_TIMEOUT_MS = int(os.getenv("SQL_QUERY_TIMEOUT_MS", "2000"))
+SQL_QUERY_MAX_VM_STEPS = int(os.getenv("SQL_QUERY_MAX_VM_STEPS", "50000000"))
+SQL_PROGRESS_INTERVAL = int(os.getenv("SQL_PROGRESS_INTERVAL", "10000"))
+
+# Bounded result sets (tools.sql_results) for query_kpi and risk scenarios: rows are fetched in
+# SQL_FETCH_BATCH batches and kept until SQL_RESULT_MAX_ROWS rows or ~SQL_RESULT_MAX_BYTES JSON bytes
+# (0 = no cap); after that up to SQL_RESULT_COUNT_CAP more rows are only counted for meta.total_rows_estimate.
+SQL_FETCH_BATCH = int(os.getenv("SQL_FETCH_BATCH", "256"))
+SQL_RESULT_MAX_ROWS = int(os.getenv("SQL_RESULT_MAX_ROWS", "500"))
+SQL_RESULT_MAX_BYTES = int(os.getenv("SQL_RESULT_MAX_BYTES", str(256 * 1024)))
+SQL_RESULT_COUNT_CAP = int(os.getenv("SQL_RESULT_COUNT_CAP", "100000"))
+
+# MCP client (app.services.mcp_client): pool of stdio server subprocesses, least-busy dispatch.
+# MCP_TRANSPORT=inprocess calls mcp_server.tools directly (same host; same errors and payloads).
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio").strip().lower()
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))
+MCP_START_TIMEOUT_SECONDS = float(os.getenv("MCP_START_TIMEOUT_SECONDS", "120"))
+MCP_CALL_TIMEOUT_SECONDS = float(os.getenv("MCP_CALL_TIMEOUT_SECONDS", "180"))
+# Supervision: idle sessions are pinged every MCP_HEALTH_INTERVAL_SECONDS; a failed one is swapped for one of
+# MCP_STANDBY_SIZE pre-started standbys and restarted in the background. With no healthy session a call
+# waits at most MCP_FAILOVER_WAIT_SECONDS, then fails.
+MCP_STANDBY_SIZE = int(os.getenv("MCP_STANDBY_SIZE", "1"))
+MCP_HEALTH_INTERVAL_SECONDS = float(os.getenv("MCP_HEALTH_INTERVAL_SECONDS", "2"))
+MCP_PING_TIMEOUT_SECONDS = float(os.getenv("MCP_PING_TIMEOUT_SECONDS", "1"))
+MCP_FAILOVER_WAIT_SECONDS = float(os.getenv("MCP_FAILOVER_WAIT_SECONDS", "2"))
+
 SKILLHUB_DB_PATH = os.getenv(
     "SKILLHUB_DB_PATH",
     os.path.join(_BASE_DIR, "data", "skillhub.db"),
 )
 
+# Admin API (/api/admin/*): callers send X-Admin-Token; unset keeps the endpoints disabled.
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+
+# Embedding cache: (model, text hash) → vector. Empty EMBEDDING_CACHE_PATH = memory tier only.
+EMBEDDING_CACHE_PATH = os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    os.path.join(_BASE_DIR, "data", "embedding_cache.sqlite"),
+)
+EMBEDDING_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "4096"))
+EMBEDDING_BATCH_WINDOW_MS = float(os.getenv("EMBEDDING_BATCH_WINDOW_MS", "2"))
+
 CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
 CHECKPOINT_SQLITE_PATH = os.getenv(
     "CHECKPOINT_SQLITE_PATH",
@@ -80,6 +162,7 @@ def log_config(*, stream=None) -> None:
     print(f" - RERANKER_MODEL = {RERANKER_MODEL}", file=_log)
     print(f" - RERANK_POOL = {RERANK_POOL}", file=_log)
     print(f" - ENABLE_HYDE = {ENABLE_HYDE}", file=_log)
+    print(f" - VECTOR_BACKEND = {VECTOR_BACKEND}", file=_log)
     print(f" - PINECONE_INDEX_NAME = {PINECONE_INDEX_NAME}", file=_log)
     print(f" - OPENAI_API_KEY set = {has_openai()}", file=_log)
     print(f" - PINECONE_API_KEY set = {bool(PINECONE_API_KEY)}", file=_log)
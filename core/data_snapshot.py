@@ -0,0 +1,137 @@
+"""Version stamp of the data a Copilot answer was computed from.
+
+Cached answers (``core.semantic_cache``) are stamped with ``snapshot_version``
+and dropped once it changes. The components are:
+
+  db       ``PRAGMA user_version`` + the file change counter, page count and
+           WAL header of ``SQLITE_DB_PATH`` (never a content hash)
+  bm25     build_id of the BM25 index (rewritten on every ingestion run,
+           including Pinecone re-ingests)
+  vectors  build_id of the local vector index (``VECTOR_BACKEND=local``)
+  graph    the caller's prompt/graph version (``GRAPH_BUILD_VERSION``)
+
+Each component is re-derived only when its file stamp (inode, mtime, size)
+changes, so computing the version per request costs a few ``stat`` calls.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable
+
+from core.config import SQLITE_DB_PATH, VECTOR_BACKEND, VECTOR_INDEX_PATH
+
+_lock = threading.Lock()
+_memo: dict[tuple[str, str], tuple[Any, str]] = {}
+
+
+def _stamp(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _memoized(kind: str, path: str, stamp: Any, compute: Callable[[], str]) -> str:
+    key = (kind, os.path.normpath(path))
+    with _lock:
+        cached = _memo.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    value = compute()
+    with _lock:
+        _memo[key] = (stamp, value)
+    return value
+
+
+def _db_header(path: str) -> tuple[int, int, int] | None:
+    """(file change counter, page count, user_version) from the 100-byte SQLite header."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(100)
+    except OSError:
+        return None
+    if len(header) < 100 or not header.startswith(b"SQLite format 3\x00"):
+        return None
+    return (
+        int.from_bytes(header[24:28], "big"),
+        int.from_bytes(header[28:32], "big"),
+        int.from_bytes(header[60:64], "big", signed=True),
+    )
+
+
+def _wal_header(path: str) -> bytes:
+    """Checkpoint sequence + salts of the WAL header; they change whenever the WAL is reset."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(32)[12:24]
+    except OSError:
+        return b""
+
+
+def db_fingerprint(path: str = SQLITE_DB_PATH) -> str:
+    """``uv<user_version>-<hash[:12]>`` of the database's change signals, ``missing`` if absent.
+
+    Hashes the header's file change counter and page count, the file identity and the
+    WAL header and stamp instead of the file contents, so the cost does not grow with
+    the database.
+    """
+    main, wal = _stamp(path), _stamp(path + "-wal")
+    if main is None:
+        return "missing"
+
+    def compute() -> str:
+        header = _db_header(path)
+        signals = [main[0], main[2], header, wal, _wal_header(path + "-wal").hex()]
+        digest = hashlib.sha256(json.dumps(signals).encode("utf-8"))
+        user_version = header[2] if header else "?"
+        return f"uv{user_version}-{digest.hexdigest()[:12]}"
+
+    return _memoized("db", path, (main, wal), compute)
+
+
+def _meta_build_id(kind: str, meta_path: str, fallback: Any) -> str:
+    stamp = _stamp(meta_path)
+    if stamp is None:
+        return f"none:{fallback}" if fallback is not None else "none"
+
+    def compute() -> str:
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                return str(json.load(f).get("build_id") or stamp)
+        except (OSError, ValueError):
+            return str(stamp)
+
+    return _memoized(kind, meta_path, stamp, compute)
+
+
+def bm25_build_id() -> str:
+    from rag.bm25_index import BM25_INDEX_PATH, LEGACY_BM25_PICKLE_PATH
+
+    legacy = _stamp(LEGACY_BM25_PICKLE_PATH)
+    return _meta_build_id("bm25", os.path.join(BM25_INDEX_PATH, "meta.json"), legacy)
+
+
+def vector_build_id() -> str:
+    if VECTOR_BACKEND != "local":
+        return VECTOR_BACKEND
+    return _meta_build_id("vectors", os.path.join(VECTOR_INDEX_PATH, "meta.json"), None)
+
+
+def snapshot_components(graph_version: str = "") -> dict[str, str]:
+    return {
+        "db": db_fingerprint(),
+        "bm25": bm25_build_id(),
+        "vectors": vector_build_id(),
+        "graph": graph_version,
+    }
+
+
+def snapshot_version(components: dict[str, str] | None = None, *, graph_version: str = "") -> str:
+    components = components if components is not None else snapshot_components(graph_version)
+    blob = json.dumps(components, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()[:16]
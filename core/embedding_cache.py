@@ -0,0 +1,230 @@
+"""Content-addressed embedding cache shared by retrieval, the semantic cache and the reranker.
+
+Vectors are keyed by ``(model, sha256(text))`` and looked up in two tiers:
+
+  memory   bounded LRU of float32 arrays (``EMBEDDING_CACHE_MEMORY_ENTRIES``)
+  sqlite   persistent WAL table at ``EMBEDDING_CACHE_PATH`` ("" disables it)
+
+Misses from concurrent callers are coalesced: the first caller waits
+``EMBEDDING_BATCH_WINDOW_MS`` and then sends every pending text in one
+``embed_documents`` call. A text already in flight is never requested twice.
+
+Query and document embeddings share keys. That is exact for OpenAI embedding
+models, where ``embed_query(t) == embed_documents([t])[0]``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from core.config import (
+    EMBEDDING_BATCH_WINDOW_MS,
+    EMBEDDING_CACHE_MEMORY_ENTRIES,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_MODEL,
+)
+
+_MAX_BATCH = 512
+
+
+def text_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class _SqliteTier:
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL,"
+            " vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, items: dict[str, np.ndarray]) -> None:
+        now = time.time()
+        rows = [(key, model, len(vec), vec.tobytes(), now) for key, vec in items.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain ``Embeddings`` wrapper: memory LRU → SQLite → batched upstream call."""
+
+    def __init__(
+        self,
+        embeddings: Any,
+        model: str,
+        *,
+        memory_entries: int = EMBEDDING_CACHE_MEMORY_ENTRIES,
+        db_path: str | None = EMBEDDING_CACHE_PATH,
+        batch_window_ms: float = EMBEDDING_BATCH_WINDOW_MS,
+    ) -> None:
+        self.embeddings = embeddings
+        self.model = model
+        self.memory_entries = memory_entries
+        self.batch_window_ms = batch_window_ms
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._disk: _SqliteTier | None = None
+        if db_path:
+            try:
+                self._disk = _SqliteTier(db_path)
+            except sqlite3.Error as exc:
+                print(f"[embedding_cache] persistent tier disabled ({db_path}): {exc}", file=sys.stderr)
+        self._inflight: dict[str, Future] = {}
+        self._pending: list[tuple[str, str]] = []
+        self._flush_scheduled = False
+        self._counts = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "upstream_calls": 0, "upstream_texts": 0}
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [vec.tolist() for vec in self.embed_arrays(texts)]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_arrays([text])[0].tolist()
+
+    def embed_arrays(self, texts: list[str]) -> list[np.ndarray]:
+        keys = [text_key(self.model, text) for text in texts]
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vec
+            self._counts["memory_hits"] += len(found)
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        if missing and self._disk is not None:
+            try:
+                from_disk = self._disk.get_many(missing)
+            except sqlite3.Error:
+                from_disk = {}
+            if from_disk:
+                with self._lock:
+                    self._counts["disk_hits"] += len(from_disk)
+                    for key, vec in from_disk.items():
+                        self._remember_unlocked(key, vec)
+                found.update(from_disk)
+                missing = [k for k in missing if k not in from_disk]
+        if missing:
+            by_key = dict(zip(keys, texts))
+            found.update(self._fetch({key: by_key[key] for key in missing}))
+        return [found[key] for key in keys]
+
+    def _fetch(self, wanted: dict[str, str]) -> dict[str, np.ndarray]:
+        futures: dict[str, Future] = {}
+        leader = False
+        with self._lock:
+            for key, text in wanted.items():
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    self._pending.append((key, text))
+                    self._counts["misses"] += 1
+                futures[key] = future
+            if self._pending and not self._flush_scheduled:
+                self._flush_scheduled = True
+                leader = True
+        if leader:
+            if self.batch_window_ms > 0:
+                time.sleep(self.batch_window_ms / 1000)
+            self._flush()
+        return {key: future.result() for key, future in futures.items()}
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._flush_scheduled = False
+        for start in range(0, len(batch), _MAX_BATCH):
+            chunk = batch[start : start + _MAX_BATCH]
+            try:
+                vectors = self.embeddings.embed_documents([text for _, text in chunk])
+                if len(vectors) != len(chunk):
+                    # pairing is unknown once counts differ: fail the whole chunk rather than guess
+                    raise RuntimeError(f"embedding upstream returned {len(vectors)} vectors for {len(chunk)} texts")
+                arrays = {key: np.asarray(vec, dtype=np.float32) for (key, _), vec in zip(chunk, vectors)}
+                for vec in arrays.values():
+                    vec.setflags(write=False)  # shared between callers
+            except BaseException as exc:
+                with self._lock:
+                    for key, _ in chunk:
+                        self._inflight.pop(key).set_exception(exc)
+                continue
+            if self._disk is not None:
+                try:
+                    self._disk.put_many(self.model, arrays)
+                except sqlite3.Error as exc:
+                    print(f"[embedding_cache] failed to persist {len(arrays)} vectors: {exc}", file=sys.stderr)
+            with self._lock:
+                self._counts["upstream_calls"] += 1
+                self._counts["upstream_texts"] += len(chunk)
+                for key, vec in arrays.items():
+                    self._remember_unlocked(key, vec)
+                    self._inflight.pop(key).set_result(vec)
+
+    def _remember_unlocked(self, key: str, vec: np.ndarray) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            out = {"model": self.model, "memory_size": len(self._memory), **self._counts}
+        out["disk_size"] = self._disk.count() if self._disk is not None else None
+        return out
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._memory.clear()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_service() -> CachedEmbeddings:
+    """Process-wide cached ``EMBEDDING_MODEL`` embeddings. Requires OPENAI_API_KEY."""
+    from langchain_openai import OpenAIEmbeddings
+
+    from core.config import require_openai
+
+    return CachedEmbeddings(
+        OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=require_openai()),
+        EMBEDDING_MODEL,
+    )
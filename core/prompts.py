@@ -260,6 +260,9 @@ Fix the SQL while keeping the original intent. Common fixes:
 - Add a GROUP BY when aggregating per supplier.
 - Replace `COUNT()` with `COUNT(*)` or `COUNT(column)`.
 - Use `NULLIF(COUNT(*), 0)` to guard against division by zero.
+- If the error starts with "Query cost check", the query was too expensive: filter event tables on
+  the indexed columns the message names, replace cross joins / correlated subqueries with a join on
+  supplier_id plus GROUP BY, or aggregate monthly figures from kpi_monthly_rollup.
 
 Database schema (do not invent tables/columns):
 suppliers(supplier_id, supplier_name_anonymized, country, category_level_2, kraljic_quadrant, risk_level, annual_spend_eur)
@@ -268,6 +271,8 @@ quality_events(supplier_id, defect_rate, severity)
 vendor_rating(supplier_id, period, final_vendor_rating_score, rating_class)
 documents(supplier_id, document_type, expiry_date, document_status)
 esg_assessments(supplier_id, final_esg_score, missing_or_expired_documents)
+kpi_monthly_rollup(supplier_id, month 'YYYY-MM', delivery_count, on_time_sum, on_time_n, delay_days_sum,
+                   delay_days_n, quality_event_count, defect_rate_sum, defect_rate_n, spend_eur)
 
 Return ONLY the corrected SELECT query, no markdown, no backticks, no explanation.
 """
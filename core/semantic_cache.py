@@ -2,16 +2,46 @@
 
 Uses OpenAI embeddings when available; falls back to normalized exact-match.
 Enable with ENABLE_SEMANTIC_CACHE=true (default on for API path).
+
+Embeddings live in one normalized float32 matrix per response_language, so a
+semantic lookup is a single matrix-vector product plus argmax (or an IVF probe
+above SEMANTIC_CACHE_ANN_MIN_ENTRIES, trained on a background thread while
+lookups keep scanning). The lock is held only to take a snapshot of the matrix
+and to confirm the winning entry, not for the math.
+
+Entries expire through a created_at heap and overflow is resolved by
+SEMANTIC_CACHE_POLICY (lru | lfu | tinylfu, see core.cache_policy), both O(1)
+per operation instead of rescanning the entry list.
+
+This process-local tier is the L1. With SEMANTIC_CACHE_BACKEND=sqlite|redis
+(core.semantic_cache_backends) every put is also written to a shared L2, L1
+misses fall through to it, and entries written by other workers are pulled
+into L1 at most every SEMANTIC_CACHE_SYNC_SECONDS.
+
+Callers pass a data-snapshot ``version`` (core.data_snapshot) to get/put. Each
+entry is stamped with it plus the cache epoch (``bump_epoch``, shared through
+L2); entries whose stamp no longer matches are dropped on the next lookup, so
+TTLs can stay long without serving answers from replaced data.
 """
 
 from __future__ import annotations
 
 import hashlib
+import heapq
+import itertools
+import math
 import os
+import sys
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from core.cache_policy import POLICIES, make_policy
+from core.semantic_cache_backends import CacheBackend, make_backend, pack_entry, unpack_entry
+from core.vector_math import assign_to_centroids, normalize_rows, spherical_kmeans
 
 
 def _enabled() -> bool:
@@ -39,6 +69,32 @@ def _max_entries() -> int:
         return 256
 
 
+def _policy_name() -> str:
+    name = os.getenv("SEMANTIC_CACHE_POLICY", "lru").strip().lower()
+    return name if name in POLICIES else "lru"
+
+
+def _sync_seconds() -> float:
+    try:
+        return float(os.getenv("SEMANTIC_CACHE_SYNC_SECONDS", "2"))
+    except ValueError:
+        return 2.0
+
+
+def _ann_min_entries() -> int:
+    try:
+        return int(os.getenv("SEMANTIC_CACHE_ANN_MIN_ENTRIES", "4096"))
+    except ValueError:
+        return 4096
+
+
+def _ann_nprobe() -> int:
+    try:
+        return int(os.getenv("SEMANTIC_CACHE_ANN_NPROBE", "8"))
+    except ValueError:
+        return 8
+
+
 def normalize_question(text: str) -> str:
     return " ".join((text or "").strip().lower().split())
 
@@ -48,15 +104,106 @@ def _exact_key(question: str, response_language: str) -> str:
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def _cosine(a: list[float], b: list[float]) -> float:
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    na = sum(x * x for x in a) ** 0.5
-    nb = sum(y * y for y in b) ** 0.5
-    if na == 0 or nb == 0:
-        return 0.0
-    return dot / (na * nb)
+class _MatrixSnapshot(NamedTuple):
+    rows: np.ndarray
+    keys: list[str | None]
+    lists: np.ndarray
+    centroids: np.ndarray | None
+
+
+class _EmbeddingMatrix:
+    """Normalized embeddings of one response_language.
+
+    Rows are appended into a growable buffer. Removed rows are zeroed (cosine 0
+    never reaches the threshold) and compacted away once half are dead. Appends
+    write past every published snapshot's row count, and growth/compaction
+    allocate new buffers, so a snapshot stays valid without holding the lock.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self._rows = np.zeros((16, dim), dtype=np.float32)
+        self._lists = np.full(16, -1, dtype=np.int32)
+        self._keys: list[str | None] = []
+        self._slots: dict[str, int] = {}
+        self._centroids: np.ndarray | None = None
+        self._ann_size = 0
+        self.generation = 0
+        self.ann_building = False
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        self.remove(key)
+        row = len(self._keys)
+        if row == len(self._rows):
+            self._rows = np.concatenate([self._rows, np.zeros_like(self._rows)])
+            self._lists = np.concatenate([self._lists, np.full(len(self._lists), -1, dtype=np.int32)])
+        self._rows[row] = vector
+        if self._centroids is not None:
+            self._lists[row] = int(np.argmax(self._centroids @ vector))
+        self._keys.append(key)
+        self._slots[key] = row
+
+    def remove(self, key: str) -> None:
+        row = self._slots.pop(key, None)
+        if row is None:
+            return
+        self._rows[row] = 0.0
+        self._keys[row] = None
+        if len(self._keys) > 64 and len(self._slots) * 2 < len(self._keys):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [row for row, key in enumerate(self._keys) if key is not None]
+        capacity = max(16, 2 * len(live))
+        rows = np.zeros((capacity, self.dim), dtype=np.float32)
+        rows[: len(live)] = self._rows[live]
+        lists = np.full(capacity, -1, dtype=np.int32)
+        lists[: len(live)] = self._lists[live]
+        self._rows, self._lists = rows, lists
+        self._keys = [self._keys[row] for row in live]
+        self._slots = {key: i for i, key in enumerate(self._keys)}
+        self.generation += 1
+
+    def snapshot(self) -> _MatrixSnapshot:
+        n = len(self._keys)
+        return _MatrixSnapshot(self._rows[:n], self._keys, self._lists[:n], self._centroids)
+
+    def needs_ann(self, min_entries: int) -> bool:
+        live = len(self._slots)
+        if min_entries <= 0 or live < min_entries or self.ann_building:
+            return False
+        return self._centroids is None or live >= 2 * self._ann_size
+
+    def install_ann(self, centroids: np.ndarray, lists: np.ndarray, generation: int) -> bool:
+        """Swap in a coarse quantizer trained on rows ``[:len(lists)]`` of ``generation``."""
+        if generation != self.generation:
+            return False
+        n = len(lists)
+        self._lists[:n] = lists
+        tail = np.arange(n, len(self._keys))
+        if len(tail):
+            self._lists[tail] = assign_to_centroids(self._rows[tail], centroids)
+        self._centroids = centroids
+        self._ann_size = len(self._slots)
+        return True
+
+
+def _best_row(snap: _MatrixSnapshot, query: np.ndarray, nprobe: int) -> tuple[int, float]:
+    rows = snap.rows
+    if snap.centroids is not None and nprobe < len(snap.centroids):
+        probe = np.argpartition(-(snap.centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.flatnonzero(np.isin(snap.lists, probe) | (snap.lists < 0))
+        if len(candidates):
+            scores = rows[candidates] @ query
+            best = int(np.argmax(scores))
+            return int(candidates[best]), float(scores[best])
+        return -1, 0.0
+    scores = rows @ query
+    best = int(np.argmax(scores))
+    return best, float(scores[best])
 
 
 @dataclass
@@ -64,33 +211,168 @@ class CacheEntry:
     exact_key: str
     question: str
     response_language: str
-    embedding: list[float] | None
+    embedding: np.ndarray | None
     payload: dict[str, Any]
     created_at: float = field(default_factory=time.time)
     hits: int = 0
+    version: str = ""
 
 
 class SemanticCache:
-    def __init__(self) -> None:
+    def __init__(self, policy: str | None = None, backend: CacheBackend | None = None) -> None:
         self._lock = threading.Lock()
-        self._entries: list[CacheEntry] = []
-        self._by_exact: dict[str, CacheEntry] = {}
+        self._backend = backend
+        self._sync_lock = threading.Lock()
+        self._synced_until: float | None = None
+        self._next_sync = 0.0
+        self._epoch = 0
+        self._next_epoch_check = 0.0
+        self._current_stamp: str | None = None
+        self._policy_name = policy or _policy_name()
+        self._policy = make_policy(self._policy_name, _max_entries())
+        self._entries: dict[str, CacheEntry] = {}
+        self._expiry: list[tuple[float, int, CacheEntry]] = []
+        self._seq = itertools.count()
+        self._matrices: dict[str, _EmbeddingMatrix] = {}
+        self._ann_builders: list[threading.Thread] = []
+        self._counters = dict.fromkeys(
+            (
+                "exact_hits",
+                "semantic_hits",
+                "misses",
+                "admissions",
+                "admission_rejections",
+                "evictions_expired",
+                "evictions_size",
+                "evictions_stale",
+                "backend_hits",
+                "backend_loads",
+                "backend_errors",
+            ),
+            0,
+        )
         self._embedder = None
         self._embedder_failed = False
 
     def clear(self) -> None:
+        """Drop every L1 entry and, when configured, the shared L2 entries too."""
+        if self._backend is not None:
+            try:
+                self._backend.clear()
+            except Exception as exc:
+                self._backend_error("clear", exc)
         with self._lock:
             self._entries.clear()
-            self._by_exact.clear()
+            self._expiry.clear()
+            self._matrices.clear()
+            self._policy = make_policy(self._policy_name, _max_entries())
 
     def stats(self) -> dict[str, Any]:
         with self._lock:
-            return {
+            out = {
                 "enabled": _enabled(),
                 "size": len(self._entries),
                 "threshold": _threshold(),
                 "ttl_seconds": _ttl_seconds(),
+                "max_entries": _max_entries(),
+                "policy": self._policy.name,
+                "epoch": self._epoch,
+                "version": self._current_stamp,
+                **self._counters,
+                "indexed": {lang: len(m) for lang, m in self._matrices.items()},
+                "ann_languages": sorted(lang for lang, m in self._matrices.items() if m._centroids is not None),
+                "backend": self._backend.name if self._backend is not None else "memory",
             }
+        if self._backend is not None:
+            try:
+                out["backend_size"] = self._backend.count()
+            except Exception:
+                out["backend_size"] = None
+        return out
+
+    def _stamp(self, version: str | None) -> str:
+        """Entry stamp: caller's data-snapshot version plus the (shared) cache epoch."""
+        if self._backend is not None and time.monotonic() >= self._next_epoch_check:
+            self._next_epoch_check = time.monotonic() + _sync_seconds()
+            try:
+                self._epoch = self._backend.epoch()
+            except Exception as exc:
+                self._backend_error("epoch", exc)
+        return f"{version or ''}#{self._epoch}"
+
+    def bump_epoch(self) -> int:
+        """Invalidate every cached answer (all workers, when L2 is shared). Returns the new epoch."""
+        if self._backend is not None:
+            epoch = self._backend.bump_epoch()
+        else:
+            epoch = self._epoch + 1
+        with self._lock:
+            self._epoch = epoch
+            self._next_epoch_check = time.monotonic() + _sync_seconds()
+        return epoch
+
+    def _purge_stale_unlocked(self, stamp: str) -> None:
+        if stamp == self._current_stamp:
+            return
+        for entry in [e for e in self._entries.values() if e.version != stamp]:
+            self._drop_unlocked(entry)
+            self._counters["evictions_stale"] += 1
+        self._current_stamp = stamp
+
+    def _backend_error(self, op: str, exc: Exception) -> None:
+        with self._lock:
+            self._counters["backend_errors"] += 1
+        print(f"[semantic_cache] {self._backend.name} {op} failed: {exc}", file=sys.stderr)
+
+    def _ingest_blob(self, blob: bytes, stamp: str) -> CacheEntry | None:
+        """Decode an L2 entry into L1; ``None`` if expired, stale, corrupt or not newer than L1's copy."""
+        try:
+            fields = unpack_entry(blob)
+        except Exception:
+            return None
+        if fields["created_at"] < time.time() - _ttl_seconds() or fields["version"] != stamp:
+            return None
+        if fields["embedding"] is not None:
+            fields["embedding"] = normalize_rows(fields["embedding"])
+        entry = CacheEntry(**fields)
+        with self._lock:
+            old = self._entries.get(entry.exact_key)
+            if old is not None:
+                if old.created_at >= entry.created_at and old.version == entry.version:
+                    return old
+                self._drop_unlocked(old)
+            elif not self._make_room_unlocked(entry.exact_key):
+                return None
+            self._counters["backend_loads"] += 1
+            self._insert_unlocked(entry)
+        return entry
+
+    def _sync_from_backend(self, stamp: str, *, force: bool = False) -> None:
+        """Pull entries peers wrote since the last sync (first call warms L1 from L2)."""
+        if self._backend is None or not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if not force and now < self._next_sync:
+                return
+            self._next_sync = now + _sync_seconds()
+            wall = time.time()
+            since = wall - _ttl_seconds() if self._synced_until is None else self._synced_until
+            # Overlap the window: a peer's created_at is stamped before its write lands.
+            blobs = self._backend.since(since - 5.0, max(1, _max_entries()))
+            self._synced_until = wall
+        except Exception as exc:
+            self._backend_error("sync", exc)
+            return
+        finally:
+            self._sync_lock.release()
+        languages = set()
+        for blob in blobs:
+            entry = self._ingest_blob(blob, stamp)
+            if entry is not None:
+                languages.add(entry.response_language)
+        for lang in languages:
+            self._maybe_build_ann(lang)
 
     def _get_embedder(self):
         if self._embedder_failed:
@@ -98,82 +380,224 @@ class SemanticCache:
         if self._embedder is not None:
             return self._embedder
         try:
-            from langchain_openai import OpenAIEmbeddings
-            from core.config import EMBEDDING_MODEL
+            from core.embedding_cache import get_embedding_service
 
-            self._embedder = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+            self._embedder = get_embedding_service()
             return self._embedder
         except Exception:
             self._embedder_failed = True
             return None
 
-    def _embed(self, text: str) -> list[float] | None:
+    def _embed(self, text: str) -> np.ndarray | None:
+        """Unit-norm float32 embedding (``None`` without an embedder or on failure)."""
         embedder = self._get_embedder()
         if embedder is None:
             return None
         try:
-            return list(embedder.embed_query(text))
+            vector = normalize_rows(np.asarray(embedder.embed_query(text), dtype=np.float32))
         except Exception:
             return None
+        return vector if vector.ndim == 1 and vector.any() else None
+
+    def _index_unlocked(self, entry: CacheEntry) -> None:
+        if entry.embedding is None:
+            return
+        matrix = self._matrices.get(entry.response_language)
+        if matrix is None or matrix.dim != len(entry.embedding):
+            # First entry for this language, or the embedding model changed.
+            matrix = self._matrices[entry.response_language] = _EmbeddingMatrix(len(entry.embedding))
+            for other in self._entries.values():
+                if (
+                    other is not entry
+                    and other.response_language == entry.response_language
+                    and other.embedding is not None
+                    and len(other.embedding) == matrix.dim
+                ):
+                    matrix.add(other.exact_key, other.embedding)
+        matrix.add(entry.exact_key, entry.embedding)
+
+    def _unindex_unlocked(self, entry: CacheEntry) -> None:
+        matrix = self._matrices.get(entry.response_language)
+        if matrix is not None:
+            matrix.remove(entry.exact_key)
+
+    def _maybe_build_ann(self, response_language: str) -> None:
+        """Start training the IVF quantizer for one language on a background thread.
+
+        Lookups keep the brute-force scan until ``_train_ann`` swaps the index in,
+        so the request that crosses the threshold does not pay for k-means.
+        """
+        min_entries = _ann_min_entries()
+        with self._lock:
+            matrix = self._matrices.get(response_language)
+            if matrix is None or not matrix.needs_ann(min_entries):
+                return
+            matrix.ann_building = True
+            snap = matrix.snapshot()
+            generation = matrix.generation
+            builder = threading.Thread(
+                target=self._train_ann,
+                args=(matrix, snap, generation),
+                name=f"semantic-cache-ann-{response_language}",
+                daemon=True,
+            )
+            self._ann_builders = [t for t in self._ann_builders if t.is_alive()] + [builder]
+        builder.start()
+
+    def _train_ann(self, matrix: _EmbeddingMatrix, snap: _MatrixSnapshot, generation: int) -> None:
+        try:
+            live = snap.rows[[i for i, key in enumerate(snap.keys[: len(snap.rows)]) if key is not None]]
+            n_lists = max(1, min(len(live), int(round(2 * math.sqrt(len(live))))))
+            centroids = spherical_kmeans(live, n_lists)
+            lists = assign_to_centroids(snap.rows, centroids).astype(np.int32)
+        except Exception as exc:
+            print(f"[semantic_cache] ANN build failed, keeping brute force: {exc}", file=sys.stderr)
+            with self._lock:
+                matrix.ann_building = False
+            return
+        with self._lock:
+            matrix.ann_building = False
+            matrix.install_ann(centroids, lists, generation)
+
+    def wait_for_ann(self, timeout: float | None = None) -> None:
+        """Block until in-flight ANN builds finish (tests, benchmarks)."""
+        with self._lock:
+            builders = list(self._ann_builders)
+        for builder in builders:
+            builder.join(timeout)
+
+    def _drop_unlocked(self, entry: CacheEntry) -> None:
+        del self._entries[entry.exact_key]
+        self._policy.on_remove(entry.exact_key)
+        self._unindex_unlocked(entry)
 
     def _evict_expired_unlocked(self) -> None:
-        ttl = _ttl_seconds()
-        now = time.time()
-        keep: list[CacheEntry] = []
-        for entry in self._entries:
-            if now - entry.created_at <= ttl:
-                keep.append(entry)
-            else:
-                self._by_exact.pop(entry.exact_key, None)
-        self._entries = keep
-        while len(self._entries) > _max_entries():
-            oldest = min(self._entries, key=lambda e: e.created_at)
-            self._entries.remove(oldest)
-            self._by_exact.pop(oldest.exact_key, None)
-
-    def get(self, question: str, response_language: str) -> dict[str, Any] | None:
+        cutoff = time.time() - _ttl_seconds()
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, _, entry = heapq.heappop(self._expiry)
+            if self._entries.get(entry.exact_key) is entry:
+                self._drop_unlocked(entry)
+                self._counters["evictions_expired"] += 1
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            # Replaced entries leave stale heap records behind; rebuild occasionally.
+            self._expiry = [item for item in self._expiry if self._entries.get(item[2].exact_key) is item[2]]
+            heapq.heapify(self._expiry)
+
+    def _make_room_unlocked(self, key: str) -> bool:
+        """Evict until ``key`` fits; ``False`` if the admission policy rejects it."""
+        limit = _max_entries()
+        if limit <= 0:
+            return False
+        while len(self._entries) >= limit:
+            victim_key = self._policy.victim()
+            if victim_key is None:
+                break
+            if not self._policy.admit(key, victim_key):
+                self._counters["admission_rejections"] += 1
+                return False
+            self._drop_unlocked(self._entries[victim_key])
+            self._counters["evictions_size"] += 1
+        return True
+
+    def _insert_unlocked(self, entry: CacheEntry) -> None:
+        self._entries[entry.exact_key] = entry
+        self._policy.on_insert(entry.exact_key)
+        heapq.heappush(self._expiry, (entry.created_at, next(self._seq), entry))
+        self._index_unlocked(entry)
+
+    def get(self, question: str, response_language: str, *, version: str | None = None) -> dict[str, Any] | None:
         if not _enabled():
             return None
         key = _exact_key(question, response_language)
+        stamp = self._stamp(version)
         with self._lock:
             self._evict_expired_unlocked()
-            exact = self._by_exact.get(key)
+            self._purge_stale_unlocked(stamp)
+            self._policy.record_access(key)
+            exact = self._entries.get(key)
+            if exact is not None and exact.version != stamp:
+                # Put under a superseded snapshot after the purge.
+                self._drop_unlocked(exact)
+                self._counters["evictions_stale"] += 1
+                exact = None
             if exact is not None:
                 exact.hits += 1
+                self._policy.on_hit(key)
+                self._counters["exact_hits"] += 1
                 payload = dict(exact.payload)
                 payload["cache_hit"] = True
                 payload["cache_mode"] = "exact"
                 return payload
 
-            query_emb = None
+        if self._backend is not None:
+            self._sync_from_backend(stamp)
+            hit = self._backend_exact(key, stamp)
+            if hit is not None:
+                return hit
+
         # Embed outside lock (network)
         query_emb = self._embed(normalize_question(question))
-        if query_emb is None:
+        best = self._semantic_match(query_emb, response_language, stamp) if query_emb is not None else None
+        if best is None:
+            with self._lock:
+                self._counters["misses"] += 1
             return None
-
-        threshold = _threshold()
-        best: CacheEntry | None = None
-        best_score = 0.0
+        best, score = best
         with self._lock:
-            for entry in self._entries:
-                if entry.response_language != response_language:
-                    continue
-                if not entry.embedding:
-                    continue
-                score = _cosine(query_emb, entry.embedding)
-                if score > best_score:
-                    best_score = score
-                    best = entry
-            if best is not None and best_score >= threshold:
-                best.hits += 1
-                payload = dict(best.payload)
-                payload["cache_hit"] = True
-                payload["cache_mode"] = "semantic"
-                payload["cache_similarity"] = round(best_score, 4)
-                return payload
-        return None
-
-    def put(self, question: str, response_language: str, payload: dict[str, Any]) -> None:
+            best.hits += 1
+            self._policy.on_hit(best.exact_key)
+            self._counters["semantic_hits"] += 1
+            payload = dict(best.payload)
+        payload["cache_hit"] = True
+        payload["cache_mode"] = "semantic"
+        payload["cache_similarity"] = round(score, 4)
+        return payload
+
+    def _backend_exact(self, key: str, stamp: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.version != stamp:
+            try:
+                blob = self._backend.get(key)
+            except Exception as exc:
+                self._backend_error("get", exc)
+                return None
+            entry = self._ingest_blob(blob, stamp) if blob is not None else None
+            if entry is None:
+                return None
+        with self._lock:
+            entry.hits += 1
+            self._policy.on_hit(key)
+            self._counters["backend_hits"] += 1
+            payload = dict(entry.payload)
+        payload["cache_hit"] = True
+        payload["cache_mode"] = "exact"
+        return payload
+
+    def _semantic_match(
+        self, query_emb: np.ndarray, response_language: str, stamp: str
+    ) -> tuple[CacheEntry, float] | None:
+        with self._lock:
+            matrix = self._matrices.get(response_language)
+            if matrix is None or matrix.dim != len(query_emb) or not len(matrix):
+                return None
+            snap = matrix.snapshot()
+        row, score = _best_row(snap, query_emb, _ann_nprobe())
+        if row < 0 or score < _threshold():
+            return None
+        with self._lock:
+            best = self._entries.get(snap.keys[row] or "")
+            if best is None or time.time() - best.created_at > _ttl_seconds():
+                return None
+            if best.version != stamp:
+                self._drop_unlocked(best)
+                self._counters["evictions_stale"] += 1
+                return None
+        return best, score
+
+    def put(
+        self, question: str, response_language: str, payload: dict[str, Any], *, version: str | None = None
+    ) -> None:
         if not _enabled():
             return
         # Do not cache clarification / refusal-only paths that are empty of value
@@ -192,18 +616,52 @@ class SemanticCache:
             response_language=response_language,
             embedding=emb,
             payload=stored,
+            version=self._stamp(version),
         )
         with self._lock:
             self._evict_expired_unlocked()
-            old = self._by_exact.get(key)
-            if old is not None and old in self._entries:
-                self._entries.remove(old)
-            self._by_exact[key] = entry
-            self._entries.append(entry)
-
-
-_CACHE = SemanticCache()
+            old = self._entries.get(key)
+            if old is not None:
+                self._drop_unlocked(old)
+                admitted = True
+            else:
+                admitted = self._make_room_unlocked(key)
+                if admitted:
+                    self._counters["admissions"] += 1
+            if admitted:
+                self._insert_unlocked(entry)
+        if self._backend is not None:
+            # L1 admission is local; the shared tier keeps every answer for peers.
+            try:
+                self._backend.put(
+                    key,
+                    entry.created_at,
+                    pack_entry(
+                        exact_key=key,
+                        question=question,
+                        response_language=response_language,
+                        created_at=entry.created_at,
+                        payload=stored,
+                        embedding=emb,
+                        version=entry.version,
+                    ),
+                    _ttl_seconds(),
+                )
+            except Exception as exc:
+                self._backend_error("put", exc)
+        if admitted:
+            self._maybe_build_ann(response_language)
+
+
+_CACHE: SemanticCache | None = None
+_CACHE_LOCK = threading.Lock()
 
 
 def get_semantic_cache() -> SemanticCache:
+    """Process-wide cache, backed by the SEMANTIC_CACHE_BACKEND L2 when configured."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = SemanticCache(backend=make_backend())
     return _CACHE
@@ -0,0 +1,253 @@
+"""Shared storage tiers (L2) behind the process-local semantic cache.
+
+``SEMANTIC_CACHE_BACKEND`` selects where entries outlive the process:
+
+  memory   no L2 (default): each worker keeps its own cache until restart
+  sqlite   WAL database at ``SEMANTIC_CACHE_SQLITE_PATH``, shared by every
+           process on one host
+  redis    any Redis-protocol server at ``SEMANTIC_CACHE_REDIS_URL`` (the
+           optional ``redis`` extra), shared across hosts
+
+Backends store opaque blobs keyed by the cache's exact key, plus a created_at
+index so workers can pull entries written by their peers, and a shared
+invalidation epoch (bumped by the admin API). ``pack_entry`` is the compact
+encoding: zlib-compressed JSON metadata and payload, followed by the
+unit-norm embedding as float16.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Protocol
+
+import numpy as np
+
+_BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+_DEFAULT_SQLITE = os.path.join(_BASE_DIR, "data", "semantic_cache.sqlite")
+_MAGIC = b"SC1"
+_PURGE_EVERY = 256
+
+
+def semantic_cache_backend() -> str:
+    return (os.getenv("SEMANTIC_CACHE_BACKEND") or "memory").strip().lower()
+
+
+def semantic_cache_sqlite_path() -> str:
+    return os.getenv("SEMANTIC_CACHE_SQLITE_PATH") or _DEFAULT_SQLITE
+
+
+def semantic_cache_redis_url() -> str:
+    return os.getenv("SEMANTIC_CACHE_REDIS_URL") or "redis://localhost:6379/0"
+
+
+def pack_entry(
+    *,
+    exact_key: str,
+    question: str,
+    response_language: str,
+    created_at: float,
+    payload: dict[str, Any],
+    embedding: np.ndarray | None,
+    version: str = "",
+) -> bytes:
+    meta = {
+        "key": exact_key,
+        "version": version,
+        "question": question,
+        "lang": response_language,
+        "created_at": created_at,
+        "dim": 0 if embedding is None else len(embedding),
+        "payload": payload,
+    }
+    body = zlib.compress(json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8"))
+    vector = b"" if embedding is None else np.asarray(embedding, dtype=np.float16).tobytes()
+    return _MAGIC + struct.pack("<I", len(body)) + body + vector
+
+
+def unpack_entry(blob: bytes) -> dict[str, Any]:
+    if blob[:3] != _MAGIC:
+        raise ValueError("not a semantic cache entry")
+    (size,) = struct.unpack_from("<I", blob, 3)
+    meta = json.loads(zlib.decompress(blob[7 : 7 + size]))
+    embedding = None
+    if meta["dim"]:
+        embedding = np.frombuffer(blob, dtype=np.float16, offset=7 + size, count=meta["dim"]).astype(np.float32)
+    return {
+        "exact_key": meta["key"],
+        "question": meta["question"],
+        "response_language": meta["lang"],
+        "created_at": float(meta["created_at"]),
+        "payload": meta["payload"],
+        "embedding": embedding,
+        "version": meta.get("version", ""),
+    }
+
+
+class CacheBackend(Protocol):
+    name: str
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def put(self, key: str, created_at: float, blob: bytes, ttl_seconds: float) -> None: ...
+
+    def since(self, created_after: float, limit: int) -> list[bytes]:
+        """Newest ``limit`` entries created after ``created_after``, oldest first."""
+        ...
+
+    def clear(self) -> None: ...
+
+    def count(self) -> int: ...
+
+    def epoch(self) -> int: ...
+
+    def bump_epoch(self) -> int: ...
+
+
+class SqliteCacheBackend:
+    name = "sqlite"
+
+    def __init__(self, path: str, *, max_rows: int = 100_000) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache ("
+            " key TEXT PRIMARY KEY, created_at REAL NOT NULL, entry BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_semantic_cache_created ON semantic_cache(created_at)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_cache_meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute("SELECT entry FROM semantic_cache WHERE key = ?", (key,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def put(self, key: str, created_at: float, blob: bytes, ttl_seconds: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO semantic_cache (key, created_at, entry) VALUES (?, ?, ?)",
+                (key, created_at, blob),
+            )
+            self._puts += 1
+            if self._puts % _PURGE_EVERY == 0:
+                self._conn.execute("DELETE FROM semantic_cache WHERE created_at < ?", (time.time() - ttl_seconds,))
+                self._conn.execute(
+                    "DELETE FROM semantic_cache WHERE key IN ("
+                    " SELECT key FROM semantic_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+
+    def since(self, created_after: float, limit: int) -> list[bytes]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entry FROM semantic_cache WHERE created_at > ? ORDER BY created_at DESC LIMIT ?",
+                (created_after, limit),
+            ).fetchall()
+        return [bytes(r[0]) for r in reversed(rows)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM semantic_cache")
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM semantic_cache").fetchone()[0])
+
+    def epoch(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM semantic_cache_meta WHERE name = 'epoch'").fetchone()
+        return int(row[0]) if row else 0
+
+    def bump_epoch(self) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO semantic_cache_meta (name, value) VALUES ('epoch', 1)"
+                " ON CONFLICT(name) DO UPDATE SET value = value + 1"
+            )
+            return int(self._conn.execute("SELECT value FROM semantic_cache_meta WHERE name = 'epoch'").fetchone()[0])
+
+
+class RedisCacheBackend:
+    """Entries as ``<prefix>:e:<key>`` strings with EX=TTL, indexed by a created_at sorted set."""
+
+    name = "redis"
+
+    def __init__(self, client: Any = None, *, url: str | None = None, prefix: str = "ratti:semcache") -> None:
+        if client is None:
+            import redis  # optional dependency
+
+            client = redis.Redis.from_url(url or semantic_cache_redis_url())
+        self.client = client
+        self.prefix = prefix
+        self._index = f"{prefix}:idx"
+        self._epoch = f"{prefix}:epoch"
+        self._puts = 0
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:e:{key}"
+
+    def get(self, key: str) -> bytes | None:
+        return self.client.get(self._entry_key(key))
+
+    def put(self, key: str, created_at: float, blob: bytes, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        self.client.set(self._entry_key(key), blob, ex=max(1, math.ceil(ttl_seconds)))
+        self.client.zadd(self._index, {key: created_at})
+        self._puts += 1
+        if self._puts % _PURGE_EVERY == 0:
+            self.client.zremrangebyscore(self._index, "-inf", time.time() - ttl_seconds)
+
+    def since(self, created_after: float, limit: int) -> list[bytes]:
+        members = self.client.zrangebyscore(self._index, f"({created_after}", "+inf")[-limit:] if limit > 0 else []
+        if not members:
+            return []
+        keys = [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+        # Expired entries are gone from the keyspace but may linger in the index.
+        return [blob for blob in self.client.mget([self._entry_key(k) for k in keys]) if blob is not None]
+
+    def clear(self) -> None:
+        members = self.client.zrange(self._index, 0, -1)
+        keys = [self._entry_key(m.decode("utf-8") if isinstance(m, bytes) else m) for m in members]
+        self.client.delete(*keys, self._index)
+
+    def count(self) -> int:
+        return int(self.client.zcard(self._index))
+
+    def epoch(self) -> int:
+        return int(self.client.get(self._epoch) or 0)
+
+    def bump_epoch(self) -> int:
+        return int(self.client.incr(self._epoch))
+
+
+def make_backend(name: str | None = None) -> CacheBackend | None:
+    """Build the configured L2 backend; ``None`` for memory-only or when it cannot be opened."""
+    name = (name or semantic_cache_backend()).strip().lower()
+    if name in {"", "memory", "mem", "inmemory"}:
+        return None
+    try:
+        if name == "sqlite":
+            return SqliteCacheBackend(semantic_cache_sqlite_path())
+        if name == "redis":
+            return RedisCacheBackend()
+    except Exception as exc:
+        print(f"[semantic_cache] {name} backend unavailable, using process memory only: {exc}", file=sys.stderr)
+        return None
+    print(f"[semantic_cache] unknown SEMANTIC_CACHE_BACKEND={name!r}, using process memory only", file=sys.stderr)
+    return None
@@ -0,0 +1,54 @@
+"""Single-flight call coalescing: concurrent callers with the same key share one execution."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+
+class SingleFlight:
+    """The first caller for a key runs ``fn``; callers arriving meanwhile wait for its result.
+
+    Nothing is cached: once the leader finishes, the next call starts a new
+    flight. A leader's exception is re-raised in every follower.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._counts = {"leaders": 0, "followers": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``(value, shared)``; ``shared`` is True for followers."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._counts["followers"] += 1
+                leader = False
+            else:
+                future = self._calls[key] = Future()
+                self._counts["leaders"] += 1
+                leader = True
+        if not leader:
+            return future.result(), True
+        try:
+            value = fn()
+        except BaseException as exc:
+            with self._lock:
+                self._calls.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._calls.pop(key, None)
+        future.set_result(value)
+        return value, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {**self._counts, "in_flight": len(self._calls)}
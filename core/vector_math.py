@@ -0,0 +1,44 @@
+"""Small dense-vector helpers shared by the local vector index and the semantic cache."""
+
+from __future__ import annotations
+
+import numpy as np
+
+_ASSIGN_BATCH = 8192
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """float32 copy with unit L2 norm per row (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for each row, computed in batches."""
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), _ASSIGN_BATCH):
+        block = vectors[start : start + _ASSIGN_BATCH]
+        out[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, *, iters: int = 12, seed: int = 0) -> np.ndarray:
+    """Cosine k-means on a sample (≤ 64 points per list) — enough for IVF coarse quantization."""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), n_lists * 64)
+    train = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    centroids = train[rng.choice(len(train), n_lists, replace=False)].copy()
+    for _ in range(iters):
+        assign = assign_to_centroids(train, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_lists)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        sums = np.add.reduceat(train[order], starts[filled], axis=0)
+        centroids[filled] = sums
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = train[rng.choice(len(train), len(empty), replace=False)]
+        centroids = normalize_rows(centroids)
+    return centroids
@@ -0,0 +1,205 @@
+"""BM25 index load benchmark: legacy pickle vs memory-mapped CSR arrays.
+
+Builds synthetic chunk corpora, writes both formats, then measures each load in a
+fresh subprocess (load time, first-query time, RSS split into anon vs file-backed).
+File-backed RSS is page cache that every worker on the host shares; anon RSS is
+the private copy each uvicorn / MCP worker pays for.
+
+  uv run python eval/bench_bm25_index.py                       # 10k / 100k / 1M chunks
+  uv run python eval/bench_bm25_index.py --sizes 10000 --no-legacy
+
+Legacy pickling at 1M chunks needs several GB of RAM; pass --legacy-max to cap it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+from langchain_core.documents import Document
+
+from rag.bm25_index import (
+    BM25SearchResult,
+    LocalBM25Index,
+    load_bm25_index,
+    tokenize,
+    write_bm25_index,
+)
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+DOC_TYPES = ("policy", "contract", "sop", "faq", "kpi_dict")
+QUERIES = ("w12 w345 w7", "w3 w99 w1024 w5", "w42")
+
+
+def _synthetic_docs(n: int, *, vocab: int = 50_000, length: int = 80, seed: int = 7) -> list[Document]:
+    rng = np.random.default_rng(seed)
+    # Zipf-ish term distribution so postings lists look like real text.
+    ids = np.minimum(rng.zipf(1.2, size=(n, length)), vocab) - 1
+    docs = []
+    for i in range(n):
+        docs.append(
+            Document(
+                page_content=" ".join(f"w{t}" for t in ids[i]),
+                metadata={
+                    "chunk_id": f"c{i:08d}",
+                    "doc_type": DOC_TYPES[i % len(DOC_TYPES)],
+                    "source_name": f"doc_{i // 20}.txt",
+                },
+            )
+        )
+    return docs
+
+
+def _write_legacy_pickle(docs: list[Document], path: str) -> None:
+    from rank_bm25 import BM25Okapi
+
+    corpus = [tokenize(d.page_content) for d in docs]
+    legacy = LocalBM25Index.__new__(LocalBM25Index)
+    legacy.__dict__.update({"docs": docs, "corpus": corpus, "bm25": BM25Okapi(corpus)})
+    with open(path, "wb") as f:
+        pickle.dump(legacy, f)
+
+
+def _rss_kb() -> dict[str, int]:
+    out = {"rss_kb": 0, "rss_anon_kb": 0, "rss_file_kb": 0}
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key == "VmRSS":
+                    out["rss_kb"] = int(value.split()[0])
+                elif key == "RssAnon":
+                    out["rss_anon_kb"] = int(value.split()[0])
+                elif key == "RssFile":
+                    out["rss_file_kb"] = int(value.split()[0])
+    except OSError:
+        import resource
+
+        out["rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return out
+
+
+class _LegacyIndex:
+    """Stand-in so the legacy pickle loads exactly as before (no array rebuild)."""
+
+    def search(self, query: str, k: int = 20, doc_types: list[str] | None = None):
+        scores = self.bm25.get_scores(tokenize(query))
+        allowed = set(doc_types or [])
+        candidates = [
+            BM25SearchResult(doc=doc, score=float(score))
+            for doc, score in zip(self.docs, scores)
+            if not allowed or doc.metadata.get("doc_type") in allowed
+        ]
+        return sorted(candidates, key=lambda item: item.score, reverse=True)[:k]
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str):
+        if module == "rag.bm25_index" and name == "LocalBM25Index":
+            return _LegacyIndex
+        return super().find_class(module, name)
+
+
+def _measure(fmt: str, path: str) -> dict:
+    before = _rss_kb()
+    started = time.perf_counter()
+    if fmt == "legacy":
+        with open(path, "rb") as f:
+            index = _LegacyUnpickler(f).load()
+    else:
+        index = load_bm25_index(path)
+    load_ms = (time.perf_counter() - started) * 1000
+    after_load = _rss_kb()
+    started = time.perf_counter()
+    for query in QUERIES:
+        index.search(query, k=30, doc_types=["policy", "sop"])
+    query_ms = (time.perf_counter() - started) * 1000 / len(QUERIES)
+    after_query = _rss_kb()
+    return {
+        "load_ms": round(load_ms, 2),
+        "avg_query_ms": round(query_ms, 2),
+        "rss_delta_after_load_mb": round((after_load["rss_kb"] - before["rss_kb"]) / 1024, 1),
+        "rss_delta_after_query_mb": round((after_query["rss_kb"] - before["rss_kb"]) / 1024, 1),
+        "anon_delta_after_query_mb": round((after_query["rss_anon_kb"] - before["rss_anon_kb"]) / 1024, 1),
+        "file_delta_after_query_mb": round((after_query["rss_file_kb"] - before["rss_file_kb"]) / 1024, 1),
+    }
+
+
+def _measure_in_subprocess(fmt: str, path: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--_measure", fmt, path],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _dir_size_mb(path: str) -> float:
+    if os.path.isfile(path):
+        return round(os.path.getsize(path) / 1024 / 1024, 1)
+    total = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return round(total / 1024 / 1024, 1)
+
+
+def run(sizes: list[int], *, legacy_max: int, no_legacy: bool) -> dict:
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="bm25_bench_") as tmp:
+        for n in sizes:
+            docs = _synthetic_docs(n)
+            row: dict = {"chunks": n}
+
+            mmap_path = os.path.join(tmp, f"bm25_{n}")
+            started = time.perf_counter()
+            write_bm25_index(LocalBM25Index(docs), mmap_path)
+            row["mmap_build_s"] = round(time.perf_counter() - started, 2)
+            row["mmap_size_mb"] = _dir_size_mb(mmap_path)
+            row["mmap"] = _measure_in_subprocess("mmap", mmap_path)
+
+            if not no_legacy and n <= legacy_max:
+                pkl_path = os.path.join(tmp, f"bm25_{n}.pkl")
+                _write_legacy_pickle(docs, pkl_path)
+                row["legacy_size_mb"] = _dir_size_mb(pkl_path)
+                row["legacy"] = _measure_in_subprocess("legacy", pkl_path)
+            rows.append(row)
+            print(json.dumps(row), flush=True)
+    return {"benchmark": "bm25_index_load", "queries": list(QUERIES), "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--legacy-max", type=int, default=1_000_000)
+    parser.add_argument("--no-legacy", action="store_true")
+    parser.add_argument("--_measure", nargs=2, metavar=("FORMAT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._measure:
+        print(json.dumps(_measure(*args._measure)))
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, legacy_max=args.legacy_max, no_legacy=args.no_legacy)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_bm25_index_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
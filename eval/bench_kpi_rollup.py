@@ -0,0 +1,129 @@
+"""KPI template latency on raw event tables vs ``kpi_monthly_rollup`` as event volume grows.
+
+For each scale, copies the demo DB, appends synthetic ``delivery_events`` and
+``quality_events`` spread over the demo suppliers and 36 months, migrates, and
+builds the rollup. It then times the OTD / defect / average-delay templates
+in both variants through the pooled read path. It also times an incremental
+refresh after appending 1% more events.
+
+  uv run python eval/bench_kpi_rollup.py
+  uv run python eval/bench_kpi_rollup.py --scales 10000,1000000 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import tools.kpi_sql_builder as kpi
+from tools.db_migrations import migrate
+from tools.kpi_rollup import refresh_rollups
+from tools.sql_guard import validate_read_only_sql
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+
+_TEMPLATES = {
+    "otd_by_category_2025": lambda rollup: kpi._on_time_rate_by_category("Yarns", "2025", rollup),
+    "otd_by_supplier": lambda rollup: kpi._on_time_rate_by_supplier_id("SUP012", None, rollup),
+    "defect_by_category": lambda rollup: kpi._defect_rate_by_category("Fabrics", None, rollup),
+    "avg_delay_above_5": lambda rollup: kpi._avg_delay_above_threshold(5.0, rollup),
+}
+
+
+def _append_events(path: str, n: int, offset: int) -> None:
+    conn = sqlite3.connect(path)
+    suppliers = conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0]
+    conn.execute(
+        """
+        WITH RECURSIVE seq(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM seq WHERE i < ?)
+        INSERT INTO delivery_events
+            (delivery_id, supplier_id, actual_delivery_date, delivery_delay_days, on_time_flag)
+        SELECT 'BX' || i,
+               printf('SUP%03d', 1 + (i * 7919) % ?),
+               date('2023-01-01', '+' || ((i * 104729) % 1095) || ' days'),
+               (i * 31) % 9,
+               CASE WHEN (i * 31) % 9 = 0 THEN 1 ELSE 0 END
+        FROM seq
+        """,
+        (offset, offset + n - 1, suppliers),
+    )
+    conn.execute(
+        """
+        WITH RECURSIVE seq(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM seq WHERE i < ?)
+        INSERT INTO quality_events (quality_event_id, supplier_id, event_date, defect_rate)
+        SELECT 'BQ' || i,
+               printf('SUP%03d', 1 + (i * 6151) % ?),
+               date('2023-01-01', '+' || ((i * 15485863) % 1095) || ' days'),
+               ((i * 17) % 100) / 1000.0
+        FROM seq
+        """,
+        (offset, offset + n // 5 - 1, suppliers),
+    )
+    conn.commit()
+    conn.close()
+
+
+def _time_ms(pool: ReadOnlyPool, sql: str, params: tuple, repeat: int) -> float:
+    conn = pool.connection()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def run(scales: list[int], *, repeat: int) -> dict:
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = os.path.join(tmp, f"kpi_{scale}.db")
+            shutil.copy(resolve_db_path(), path)
+            _append_events(path, scale, 1)
+            migrate(path)
+            build = refresh_rollups(path, full=True)
+            pool = ReadOnlyPool(path)
+            row: dict = {"delivery_events": scale, "rollup_build_ms": build["latency_ms"]}
+            for name, make in _TEMPLATES.items():
+                for variant, rollup in (("raw", False), ("rollup", True)):
+                    tpl = make(rollup)
+                    row[f"{name}_{variant}_ms"] = _time_ms(pool, validate_read_only_sql(tpl.sql), tpl.params, repeat)
+            _append_events(path, max(1, scale // 100), scale + 1)
+            row["incremental_refresh_1pct_ms"] = refresh_rollups(path)["latency_ms"]
+            conn = sqlite3.connect(path)
+            row["rollup_rows"] = conn.execute("SELECT COUNT(*) FROM kpi_monthly_rollup").fetchone()[0]
+            conn.close()
+            rows.append(row)
+            print(json.dumps(row), flush=True)
+    return {"benchmark": "kpi_rollup", "repeat": repeat, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="10000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    report = run([int(s) for s in args.scales.split(",") if s.strip()], repeat=args.repeat)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_kpi_rollup_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""MCP per-call overhead: stdio session pool vs in-process transport.
+
+Calls the same tools with the same arguments through:
+
+  inprocess   ``app.services.mcp_inprocess.call_tool`` (argument validation,
+              the ``*_impl`` call, error mapping)
+  wire        the same, plus the JSON encode/decode a stdio call pays
+              (``dumps_tool_result`` → ``_parse_tool_payload``)
+  stdio       ``McpSessionPool.call_tool`` over a spawned ``mcp_server.server``;
+              reported as unavailable when the server cannot start here
+
+``overhead_ms`` is the median per-call time minus the bare ``*_impl`` median.
+Pool startup is timed separately (``stdio_start_ms``) and not counted per call.
+
+  uv run python eval/bench_mcp_transport.py
+  uv run python eval/bench_mcp_transport.py --repeat 200 --pool-size 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app.services import mcp_inprocess
+from app.services.mcp_client import McpSessionPool, _parse_tool_payload
+from mcp_server.tools import TOOL_IMPLS, dumps_tool_result
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+CALLS = [
+    ("query_kpi", {"supplier_id": "SUP012", "metric": "supplier_status"}),
+    ("query_kpi", {"sql": "SELECT supplier_id, risk_level FROM suppliers ORDER BY supplier_id"}),
+    ("score_supplier_risk", {"supplier_id": "SUP012"}),
+    ("score_suppliers_risk", {"supplier_ids": "all", "include_events": False}),
+]
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()  # warm caches and lazy imports
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def _wire(name: str, arguments: dict) -> dict:
+    return _parse_tool_payload(dumps_tool_result(mcp_inprocess.call_tool(name, arguments)))
+
+
+def _start_stdio(size: int) -> tuple[McpSessionPool | None, float | None, str | None]:
+    started = time.perf_counter()
+    try:
+        pool = McpSessionPool(size)
+    except Exception as exc:
+        return None, None, f"{type(exc).__name__}: {exc}"
+    return pool, round((time.perf_counter() - started) * 1000, 1), None
+
+
+def run(*, repeat: int, pool_size: int) -> dict:
+    pool, start_ms, stdio_error = _start_stdio(pool_size)
+    rows = []
+    try:
+        for name, arguments in CALLS:
+            impl = TOOL_IMPLS[name]
+            base = _median_ms(lambda: impl(**arguments), repeat)
+            row: dict = {"tool": name, "arguments": arguments, "impl_ms": base}
+            modes = {
+                "inprocess": lambda: mcp_inprocess.call_tool(name, arguments),
+                "wire": lambda: _wire(name, arguments),
+            }
+            if pool is not None:
+                modes["stdio"] = lambda: pool.run(pool.call_tool(name, arguments))
+            for mode, fn in modes.items():
+                ms = _median_ms(fn, repeat)
+                row[f"{mode}_ms"] = ms
+                row[f"{mode}_overhead_ms"] = round(ms - base, 3)
+            rows.append(row)
+            print(json.dumps(row), flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+    return {
+        "benchmark": "mcp_transport",
+        "repeat": repeat,
+        "pool_size": pool_size,
+        "stdio_start_ms": start_ms,
+        "stdio_error": stdio_error,
+        "rows": rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=1)
+    args = parser.parse_args()
+    report = run(repeat=args.repeat, pool_size=args.pool_size)
+    if report["stdio_error"]:
+        print(f"stdio unavailable: {report['stdio_error']}")
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_mcp_transport_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Wide result sets: fetchall + dict rows vs bounded fetchmany + columnar MCP payload.
+
+Copies the demo DB and appends synthetic ``delivery_events`` (as
+``bench_kpi_rollup.py`` does). It then runs a wide join (every
+``delivery_events`` and ``suppliers`` column) with an explicit LIMIT per size,
+through ``run_sql_query_with_meta`` with the result cache disabled:
+
+  unbounded   fetchall, one dict per row, payload JSON with keys on every row,
+              decoded again as the MCP client does
+  bounded     fetchmany under ``SQL_RESULT_MAX_ROWS`` / ``SQL_RESULT_MAX_BYTES``,
+              columnar payload (``dumps_tool_result``) decoded by
+              ``_parse_tool_payload``
+
+For each mode it reports the median end-to-end time, the peak traced memory
+(``tracemalloc``) and the payload size.
+
+  uv run python eval/bench_result_streaming.py
+  uv run python eval/bench_result_streaming.py --sizes 1000,100000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import tools.result_cache as result_cache
+import tools.sql_tools as sql_tools
+from app.services.mcp_client import _parse_tool_payload
+from eval.bench_kpi_rollup import _append_events
+from mcp_server.tools import dumps_tool_result
+from tools.result_cache import QueryResultCache
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+from tools.sql_results import default_limits
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+WIDE_SQL = "SELECT d.*, s.* FROM delivery_events d JOIN suppliers s ON s.supplier_id = d.supplier_id LIMIT {n}"
+
+
+def _unbounded(sql: str) -> tuple[int, int]:
+    result = sql_tools.run_sql_query_with_meta(sql)
+    wire = json.dumps({"rows": result["rows"], "meta": result["meta"]}, ensure_ascii=False, default=str)
+    return len(_parse_tool_payload(wire)["rows"]), len(wire)
+
+
+def _bounded(sql: str) -> tuple[int, int]:
+    result = sql_tools.run_sql_query_with_meta(sql, limits=default_limits())
+    wire = dumps_tool_result({"rows": result["rows"], "meta": result["meta"]})
+    return len(_parse_tool_payload(wire)["rows"]), len(wire)
+
+
+def _measure(fn, sql: str, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows, nbytes = fn(sql)
+        samples.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fn(sql)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(statistics.median(samples), 2), "peak_kb": round(peak / 1024, 1), "rows": rows, "wire_bytes": nbytes}
+
+
+def run(sizes: list[int], *, repeat: int) -> dict:
+    rows = []
+    saved = (sql_tools.get_read_pool, result_cache._CACHE)
+    result_cache._CACHE = QueryResultCache(max_entries=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "streaming.db")
+            shutil.copy(resolve_db_path(), path)
+            _append_events(path, max(sizes), 1)
+            pool = ReadOnlyPool(path)
+            sql_tools.get_read_pool = lambda: pool
+            for n in sizes:
+                sql = WIDE_SQL.format(n=n)
+                row = {"limit": n}
+                for mode, fn in (("unbounded", _unbounded), ("bounded", _bounded)):
+                    for name, value in _measure(fn, sql, repeat).items():
+                        row[f"{mode}_{name}"] = value
+                rows.append(row)
+                print(json.dumps(row), flush=True)
+    finally:
+        sql_tools.get_read_pool, result_cache._CACHE = saved
+    limits = default_limits()
+    return {
+        "benchmark": "result_streaming",
+        "repeat": repeat,
+        "max_rows": limits.max_rows,
+        "max_bytes": limits.max_bytes,
+        "rows": rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    report = run([int(s) for s in args.sizes.split(",") if s.strip()], repeat=args.repeat)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_result_streaming_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Per-request retrieval overhead: index load per call vs the shared index registry.
+
+Vector recall and LLM query expansion are stubbed out so the numbers isolate what
+``get_retriever(...).invoke`` costs around BM25 itself:
+
+  legacy_pickle_per_call  old behaviour — every HybridRetriever unpickles bm25_index.pkl
+  mmap_per_call           memory-mapped index, still opened per call
+  shared_registry         rag.index_registry — loaded once, cheap per-call views
+
+  uv run python eval/bench_retrieval_overhead.py
+  uv run python eval/bench_retrieval_overhead.py --synthetic 100000 --requests 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import rag.hybrid_retriever as hybrid_mod
+from eval.bench_bm25_index import _LegacyUnpickler, _synthetic_docs, _write_legacy_pickle
+from rag.bm25_index import BM25_INDEX_PATH, load_bm25_index, save_bm25_index
+from rag.hybrid_retriever import HybridRetriever
+from rag.index_registry import IndexRegistry, bm25_index_stamp
+from rag.rerank import NoopReranker
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+RAG_EVAL = os.path.join(ROOT, "eval", "datasets", "rag_eval.json")
+DOC_TYPES = ["policy", "contract", "sop", "faq"]
+
+
+class _EmptyVectorStore:
+    def similarity_search_with_score(self, *args, **kwargs):
+        return []
+
+
+def _questions() -> list[str]:
+    with open(RAG_EVAL, encoding="utf-8") as f:
+        return [row["question"] for row in json.load(f)]
+
+
+def _load_legacy(path: str):
+    with open(path, "rb") as f:
+        return _LegacyUnpickler(f).load()
+
+
+def _time_requests(make_index, questions: list[str], requests: int) -> dict:
+    latencies = []
+    for i in range(requests):
+        question = questions[i % len(questions)]
+        started = time.perf_counter()
+        retriever = HybridRetriever(
+            k=5,
+            doc_types=DOC_TYPES,
+            reranker=NoopReranker(),
+            bm25=make_index(),
+            vectorstore=_EmptyVectorStore(),
+        )
+        retriever.invoke(question)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return {
+        "requests": requests,
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+    }
+
+
+def run(synthetic: int, requests: int) -> dict:
+    # Isolate index overhead: no LLM keyword extraction.
+    hybrid_mod.build_keyword_query = lambda question: question
+    questions = _questions()
+    with tempfile.TemporaryDirectory(prefix="retrieval_bench_") as tmp:
+        if synthetic:
+            docs = _synthetic_docs(synthetic)
+            index_path = os.path.join(tmp, "bm25_index")
+            save_bm25_index(docs, index_path)
+            questions = ["w3 w12 w99", "w7 w1024", "w42 w5 w6"]
+        else:
+            index_path = BM25_INDEX_PATH
+            docs = list(load_bm25_index(index_path).docs)
+        pkl_path = os.path.join(tmp, "bm25_index.pkl")
+        _write_legacy_pickle(docs, pkl_path)
+
+        registry = IndexRegistry()
+        results = {
+            "legacy_pickle_per_call": _time_requests(
+                lambda: _load_legacy(pkl_path), questions, requests
+            ),
+            "mmap_per_call": _time_requests(lambda: load_bm25_index(index_path), questions, requests),
+            "shared_registry": _time_requests(
+                lambda: registry.get("bm25", index_path, load_bm25_index, bm25_index_stamp),
+                questions,
+                requests,
+            ),
+        }
+    return {
+        "benchmark": "retrieval_overhead",
+        "corpus_chunks": len(docs),
+        "vector_recall": "stubbed (empty)",
+        "query_expansion": "stubbed (identity)",
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synthetic", type=int, default=0, help="Use an N-chunk synthetic corpus.")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    report = run(args.synthetic, args.requests)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_retrieval_overhead_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
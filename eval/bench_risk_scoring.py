@@ -0,0 +1,147 @@
+"""Portfolio risk scoring: ``score_supplier_risk`` per supplier vs batch ``score_suppliers_risk``.
+
+Copies the demo DB and appends synthetic suppliers (``SUP061`` onwards), each
+with about 8 risk events, 3 quality events and 5 documents. It then scores the
+whole portfolio both ways through the pooled read path with the KPI result
+cache disabled, and checks that every batch entry equals the single-supplier
+result. It also times the scores-only batch (``include_events=False``).
+Synthetic ids run past ``SUP999``, so the benchmark widens the ``SUP###`` id
+check for the run.
+
+  uv run python eval/bench_risk_scoring.py
+  uv run python eval/bench_risk_scoring.py --scales 1000,10000 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import mcp_server.tools as mt
+import tools.result_cache as result_cache
+import tools.sql_tools as sql_tools
+from tools.db_migrations import migrate
+from tools.result_cache import QueryResultCache
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+AS_OF = "2025-12-31"
+
+
+def _append_suppliers(path: str, total: int) -> None:
+    conn = sqlite3.connect(path)
+    first = conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0] + 1
+    if first > total:
+        conn.close()
+        return
+    seq = "WITH RECURSIVE seq(i) AS (SELECT ? UNION ALL SELECT i + 1 FROM seq WHERE i < ?) "
+    bounds = (first, total)
+    conn.execute(
+        seq + "INSERT INTO suppliers (supplier_id, supplier_name_anonymized, risk_level) "
+        "SELECT printf('SUP%03d', i), 'Synthetic ' || i, 'Medium' FROM seq",
+        bounds,
+    )
+    conn.execute(
+        seq + "INSERT INTO risk_events (risk_event_id, supplier_id, risk_type, event_date, risk_score_1_25) "
+        "SELECT 'BR' || i || '_' || k, printf('SUP%03d', i), 'Synthetic',"
+        " date('2023-01-01', '+' || ((i * 104729 + k * 613) % 1095) || ' days'), 1 + (i * 31 + k * 7) % 25 "
+        "FROM seq, (SELECT value AS k FROM json_each('[0,1,2,3,4,5,6,7]')) WHERE (i + k) % 9 <> 0",
+        bounds,
+    )
+    conn.execute(
+        seq + "INSERT INTO quality_events (quality_event_id, supplier_id, event_date, severity, defect_rate) "
+        "SELECT 'BQ' || i || '_' || k, printf('SUP%03d', i),"
+        " date('2023-01-01', '+' || ((i * 15485863 + k * 97) % 1095) || ' days'), 'Minor',"
+        " ((i * 17 + k) % 100) / 1000.0 "
+        "FROM seq, (SELECT value AS k FROM json_each('[0,1,2]'))",
+        bounds,
+    )
+    conn.execute(
+        seq + "INSERT INTO documents (document_id, supplier_id, document_type, expiry_date, document_status) "
+        "SELECT 'BD' || i || '_' || k, printf('SUP%03d', i), 'Certificate',"
+        " date('2025-06-01', '+' || ((i * 7919 + k * 53) % 730) || ' days'),"
+        " CASE WHEN (i + k) % 11 = 0 THEN 'Expired' ELSE 'Valid' END "
+        "FROM seq, (SELECT value AS k FROM json_each('[0,1,2,3,4]'))",
+        bounds,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _median_ms(fn, repeat: int) -> tuple[float, object]:
+    samples, out = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 2), out
+
+
+def run(scales: list[int], *, repeat: int) -> dict:
+    rows = []
+    saved = (sql_tools.get_read_pool, result_cache._CACHE, mt._SUPPLIER_ID_PATTERN)
+    result_cache._CACHE = QueryResultCache(max_entries=0)
+    mt._SUPPLIER_ID_PATTERN = re.compile(r"SUP\d{3,}", re.IGNORECASE)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for scale in scales:
+                path = os.path.join(tmp, f"risk_{scale}.db")
+                shutil.copy(resolve_db_path(), path)
+                migrate(path)
+                _append_suppliers(path, scale)
+                pool = ReadOnlyPool(path)
+                sql_tools.get_read_pool = lambda pool=pool: pool
+
+                batch_ms, batch = _median_ms(lambda: mt.score_suppliers_risk_impl("all", AS_OF), repeat)
+                scores_ms, _ = _median_ms(
+                    lambda: mt.score_suppliers_risk_impl("all", AS_OF, include_events=False), repeat
+                )
+                ids = [r["supplier_id"] for r in batch["results"]]
+                loop_ms, singles = _median_ms(
+                    lambda: [mt.score_supplier_risk_impl(sid, AS_OF) for sid in ids], max(1, repeat // 3)
+                )
+                row = {
+                    "suppliers": len(ids),
+                    "per_supplier_loop_ms": loop_ms,
+                    "batch_ms": batch_ms,
+                    "speedup": round(loop_ms / batch_ms, 1) if batch_ms else None,
+                    "batch_scores_only_ms": scores_ms,
+                    "identical": singles == batch["results"],
+                    "bands": batch["bands"],
+                }
+                rows.append(row)
+                print(json.dumps(row), flush=True)
+    finally:
+        sql_tools.get_read_pool, result_cache._CACHE, mt._SUPPLIER_ID_PATTERN = saved
+    return {"benchmark": "risk_scoring", "as_of_date": AS_OF, "repeat": repeat, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="60,1000,10000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    report = run([int(s) for s in args.scales.split(",") if s.strip()], repeat=args.repeat)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_risk_scoring_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Semantic cache lookup benchmark: vectorized matrix/IVF vs the former per-entry Python cosine loop.
+
+Random unit embeddings stand in for OpenAI vectors, so no API key is needed.
+Each probe is a slightly perturbed cached question, so every lookup is a
+semantic hit. ``python_loop`` reproduces the list scan the cache used before
+the per-language matrix.
+
+  uv run python eval/bench_semantic_cache.py
+  uv run python eval/bench_semantic_cache.py --sizes 1000,20000 --dim 1536
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import core.embedding_cache as embedding_cache
+from core.semantic_cache import SemanticCache
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+
+
+class _TableEmbeddings:
+    def __init__(self, table: dict[str, np.ndarray]):
+        self.table = table
+
+    def embed_query(self, text):
+        return self.table[text]
+
+
+def _python_loop(entries: list[list[float]], query: list[float]) -> int:
+    best, best_score = -1, -1.0
+    for i, vec in enumerate(entries):
+        dot = sum(x * y for x, y in zip(query, vec))
+        na = math.sqrt(sum(x * x for x in query))
+        nb = math.sqrt(sum(y * y for y in vec))
+        score = dot / (na * nb) if na and nb else 0.0
+        if score > best_score:
+            best, best_score = i, score
+    return best
+
+
+def _percentiles(latencies: list[float]) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+    }
+
+
+def run(sizes: list[int], *, dim: int, n_queries: int, loop_max: int) -> dict:
+    os.environ["ENABLE_SEMANTIC_CACHE"] = "true"
+    os.environ["SEMANTIC_CACHE_THRESHOLD"] = "0.5"
+    rng = np.random.default_rng(11)
+    rows = []
+    for n in sizes:
+        os.environ["SEMANTIC_CACHE_MAX_ENTRIES"] = str(n)
+        vectors = rng.normal(size=(n, dim)).astype(np.float32)
+        picks = rng.integers(0, n, n_queries)
+        probes = vectors[picks] + 0.05 * rng.normal(size=(n_queries, dim)).astype(np.float32)
+        table = {f"q{i}": vectors[i] for i in range(n)} | {f"probe {j}": probes[j] for j in range(n_queries)}
+        service = _TableEmbeddings(table)
+        embedding_cache.get_embedding_service = lambda: service  # type: ignore[assignment]
+        row: dict = {"entries": n, "dim": dim}
+        for mode, ann_min in (("matrix", "0"), ("ivf", "1")):
+            os.environ["SEMANTIC_CACHE_ANN_MIN_ENTRIES"] = ann_min
+            cache = SemanticCache()
+            started = time.perf_counter()
+            for i in range(n):
+                cache.put(f"q{i}", "en", {"answer": i})
+            cache.wait_for_ann()
+            row[f"{mode}_fill_s"] = round(time.perf_counter() - started, 2)
+            latencies, correct = [], 0
+            for j in range(n_queries):
+                started = time.perf_counter()
+                hit = cache.get(f"probe {j}", "en")
+                latencies.append((time.perf_counter() - started) * 1000)
+                correct += bool(hit) and hit["answer"] == int(picks[j])
+            row[mode] = {**_percentiles(latencies), "hit_rate": round(correct / n_queries, 4)}
+        if n <= loop_max:
+            as_lists = vectors.tolist()
+            latencies = []
+            for j in range(min(n_queries, 20)):
+                query = probes[j].tolist()
+                started = time.perf_counter()
+                _python_loop(as_lists, query)
+                latencies.append((time.perf_counter() - started) * 1000)
+            row["python_loop"] = _percentiles(latencies)
+        rows.append(row)
+        print(json.dumps(row), flush=True)
+    return {"benchmark": "semantic_cache", "queries": n_queries, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="500,5000,20000")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--loop-max", type=int, default=5000, help="skip the Python-loop baseline above this size")
+    args = parser.parse_args()
+    report = run(
+        [int(s) for s in args.sizes.split(",") if s.strip()],
+        dim=args.dim,
+        n_queries=args.queries,
+        loop_max=args.loop_max,
+    )
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_semantic_cache_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
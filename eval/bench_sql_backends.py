@@ -0,0 +1,132 @@
+"""KPI template latency on the SQLite backend vs DuckDB over a Parquet export.
+
+For each scale, copies the demo DB and appends synthetic ``delivery_events``
+and ``quality_events`` (as ``bench_kpi_rollup.py`` does). It migrates the copy
+and exports it with ``tools.sql_backends.export_parquet``. Then it times every
+KPI template on raw event tables (``rollup=False``; the rollup already makes
+those cheap on SQLite) on both engines. Each engine runs the guard-validated
+SQL: SQLite through the read pool, DuckDB through ``DuckDbBackend.fetch``
+(transpiled). Rows are compared order-insensitively, with a float tolerance.
+Needs the optional ``duckdb`` package.
+
+  uv run python eval/bench_sql_backends.py
+  uv run python eval/bench_sql_backends.py --scales 1000000,5000000 --repeat 5 --threads 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import tools.kpi_sql_builder as kpi
+from eval.bench_kpi_rollup import _append_events
+from tools.db_migrations import migrate
+from tools.sql_backends import DuckDbBackend, export_parquet
+from tools.sql_guard import validate_read_only_sql
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+
+_TEMPLATES = {
+    "otd_by_category_2025": lambda: kpi._on_time_rate_by_category("Yarns", "2025", False),
+    "otd_by_category_all": lambda: kpi._on_time_rate_by_category("Yarns", None, False),
+    "otd_by_supplier": lambda: kpi._on_time_rate_by_supplier_id("SUP012", None, False),
+    "defect_by_category": lambda: kpi._defect_rate_by_category("Fabrics", None, False),
+    "avg_delay_above_5": lambda: kpi._avg_delay_above_threshold(5.0, False),
+    "yarn_otd_defect_2025": lambda: kpi._yarn_otd_and_defect("2025"),
+    "spend_by_kraljic": kpi._spend_by_kraljic,
+    "certificates_expiring_60d": lambda: kpi._certificates_expiring_soon(60),
+    "strategic_vendor_rank": kpi._strategic_vendor_rating_rank,
+    "esg_below_60": lambda: kpi._esg_below_threshold_missing_docs(60),
+    "supplier_snapshot": lambda: kpi._supplier_status_snapshot("SUP012"),
+}
+
+
+def _median_ms(fn, repeat: int) -> tuple[float, object]:
+    samples, out = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 3), out
+
+
+def _same(a: list[tuple], b: list[tuple]) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(sorted(a, key=repr), sorted(b, key=repr)):
+        for u, v in zip(x, y):
+            if isinstance(u, float) or isinstance(v, float):
+                if u is None or v is None or not math.isclose(u, v, rel_tol=1e-6, abs_tol=1e-3):
+                    return False
+            elif u != v:
+                return False
+    return True
+
+
+def run(scales: list[int], *, repeat: int, threads: int) -> dict:
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = os.path.join(tmp, f"backends_{scale}.db")
+            shutil.copy(resolve_db_path(), path)
+            _append_events(path, scale, 1)
+            migrate(path)
+            parquet_dir = os.path.join(tmp, f"parquet_{scale}")
+            export = export_parquet(path, parquet_dir)
+            pool = ReadOnlyPool(path)
+            duck = DuckDbBackend(path, source="parquet", parquet_dir=parquet_dir, threads=threads)
+            conn = pool.connection()
+            for name, make in _TEMPLATES.items():
+                tpl = make()
+                sql = validate_read_only_sql(tpl.sql)
+                sqlite_ms, expected = _median_ms(
+                    lambda: [tuple(r) for r in conn.execute(sql, tpl.params).fetchall()], repeat
+                )
+                duck.fetch(sql, tpl.params)  # warm-up: transpile + Parquet metadata
+                duckdb_ms, (_, actual, _) = _median_ms(lambda: duck.fetch(sql, tpl.params), repeat)
+                row = {
+                    "delivery_events": scale,
+                    "template": name,
+                    "sqlite_ms": sqlite_ms,
+                    "duckdb_ms": duckdb_ms,
+                    "speedup": round(sqlite_ms / duckdb_ms, 2) if duckdb_ms else None,
+                    "rows": len(expected),
+                    "identical": _same(expected, actual),
+                }
+                rows.append(row)
+                print(json.dumps(row), flush=True)
+            rows.append({"delivery_events": scale, "template": "parquet_export", "export_ms": export["latency_ms"]})
+            print(json.dumps(rows[-1]), flush=True)
+    return {"benchmark": "sql_backends", "repeat": repeat, "duckdb_threads": threads, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="1000000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=0, help="DuckDB threads (0 = DuckDB default)")
+    args = parser.parse_args()
+    report = run([int(s) for s in args.scales.split(",") if s.strip()], repeat=args.repeat, threads=args.threads)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_sql_backends_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""SQL guard throughput: validations/second with and without the validated-SQL cache.
+
+The statement mix is every KPI template plus the risk-scoring tool SQL, as
+the Copilot issues them. Modes:
+
+  uncached   full sqlglot parse + authorization on every call (LLM SQL path)
+  lru        application SQL served from the bounded LRU after the first call
+  trusted    statements pinned with ``register_trusted_sql`` at import
+
+  uv run python eval/bench_sql_guard.py
+  uv run python eval/bench_sql_guard.py --seconds 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import mcp_server.tools as mcp_tools
+from tools import sql_guard
+from tools.kpi_sql_builder import build_kpi_sql
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+
+QUESTIONS = [
+    ("Yarn suppliers OTD and defect rate in 2025", {"metric": "on_time_rate"}),
+    ("Suppliers with average delay above 3 days", {"metric": "avg_delay_days"}),
+    ("Spend by Kraljic quadrant", {"metric": "spend"}),
+    ("Certificates expiring in the next 60 days", {"metric": "cert_expiry"}),
+    ("Strategic suppliers vendor rating ranking", {"metric": "vendor_rating"}),
+    ("On-time rate for SUP012 in 2025", {"metric": "on_time_rate", "supplier_hint": "SUP012"}),
+    ("Defect rate for Yarns", {"metric": "defect_rate"}),
+    ("Vendor rating of SUP003", {"metric": "vendor_rating", "supplier_hint": "SUP003"}),
+]
+
+
+def _statements() -> list[str]:
+    sqls = [t.sql for q, parse in QUESTIONS if (t := build_kpi_sql(q, parse)) is not None]
+    sqls += [
+        mcp_tools._RISK_SQL,
+        mcp_tools._QUALITY_SQL,
+        mcp_tools._DOCS_SQL,
+        mcp_tools._EVENTS_SQL,
+        mcp_tools._QUALITY_EVENTS_SQL,
+    ]
+    return list(dict.fromkeys(sqls))
+
+
+def _measure(fn, statements: list[str], seconds: float) -> float:
+    stop = time.perf_counter() + seconds
+    n = 0
+    started = time.perf_counter()
+    while time.perf_counter() < stop:
+        for sql in statements:
+            fn(sql)
+            n += 1
+    return round(n / (time.perf_counter() - started), 1)
+
+
+def run(*, seconds: float) -> dict:
+    statements = _statements()
+    uncached = _measure(lambda s: sql_guard.validate_read_only_sql(s, cache=False), statements, seconds)
+
+    sql_guard.clear_sql_guard_cache(trusted=True)
+    lru = _measure(sql_guard.validate_read_only_sql, statements, seconds)
+
+    for sql in statements:
+        sql_guard.register_trusted_sql(sql)
+    trusted = _measure(sql_guard.validate_read_only_sql, statements, seconds)
+
+    report = {
+        "benchmark": "sql_guard",
+        "statements": len(statements),
+        "seconds": seconds,
+        "uncached_per_s": uncached,
+        "lru_per_s": lru,
+        "trusted_per_s": trusted,
+        "speedup_lru": round(lru / uncached, 1),
+        "speedup_trusted": round(trusted / uncached, 1),
+        "cache": sql_guard.sql_guard_cache_stats(),
+    }
+    print(json.dumps(report), flush=True)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    report = run(seconds=args.seconds)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_sql_guard_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
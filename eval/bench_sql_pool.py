@@ -0,0 +1,144 @@
+"""SQLite read path benchmark: queries/second of connect-per-query vs the pooled read-only connections.
+
+Runs the supplier-assessment query mix (profile, orders, KPI and risk-scoring
+statements) with random supplier ids against ``SQLITE_DB_PATH``. The SQL guard
+is taken out of the loop (statements are validated once up front), so only the
+connection handling differs between modes:
+
+  connect_per_query   the previous ``run_sql_query_with_meta`` behaviour
+  pool                per-thread ``mode=ro`` connection with tuned pragmas
+  pool_immutable      same, opened with ``immutable=1``
+  pool_memory         per-thread readers of a shared in-memory copy
+
+  uv run python eval/bench_sql_pool.py
+  uv run python eval/bench_sql_pool.py --seconds 5 --threads 1,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from tools.sql_guard import validate_read_only_sql
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+
+QUERIES = [
+    (
+        "SELECT s.supplier_id, s.supplier_name_anonymized, vr.rating_class FROM suppliers s "
+        "LEFT JOIN vendor_rating vr ON s.supplier_id = vr.supplier_id "
+        "WHERE s.supplier_id = ? ORDER BY vr.period DESC LIMIT 1",
+        1,
+    ),
+    (
+        "SELECT COUNT(*) AS po_count, ROUND(SUM(order_amount_eur), 2) AS spend "
+        "FROM purchase_orders WHERE supplier_id = ?",
+        1,
+    ),
+    (
+        "SELECT (SELECT ROUND(AVG(on_time_flag) * 100, 2) FROM delivery_events WHERE supplier_id = ?) AS otd, "
+        "(SELECT ROUND(AVG(defect_rate) * 100, 2) FROM quality_events WHERE supplier_id = ?) AS defect",
+        2,
+    ),
+    ("SELECT COUNT(*) AS n FROM risk_events WHERE supplier_id = ?", 1),
+    ("SELECT COUNT(*) AS n FROM documents WHERE supplier_id = ?", 1),
+]
+
+
+def _connect_per_query(db_path: str):
+    def run(sql: str, params: tuple) -> list[dict]:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+        finally:
+            conn.close()
+
+    return run
+
+
+def _pooled(pool: ReadOnlyPool):
+    def run(sql: str, params: tuple) -> list[dict]:
+        cur = pool.connection().cursor()
+        try:
+            return [dict(r) for r in cur.execute(sql, params).fetchall()]
+        finally:
+            cur.close()
+
+    return run
+
+
+def _measure(run, supplier_ids: list[str], *, threads: int, seconds: float) -> float:
+    validated = [(validate_read_only_sql(sql), arity) for sql, arity in QUERIES]
+    stop = time.perf_counter() + seconds
+    counts = [0] * threads
+
+    def worker(slot: int) -> None:
+        rng = random.Random(slot)
+        n = 0
+        while time.perf_counter() < stop:
+            sid = rng.choice(supplier_ids)
+            for sql, arity in validated:
+                run(sql, (sid,) * arity)
+                n += 1
+        counts[slot] = n
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return round(sum(counts) / seconds, 1)
+
+
+def run(thread_counts: list[int], *, seconds: float) -> dict:
+    db_path = resolve_db_path()
+    conn = sqlite3.connect(db_path)
+    supplier_ids = [r[0] for r in conn.execute("SELECT supplier_id FROM suppliers")]
+    conn.close()
+    modes = {
+        "connect_per_query": _connect_per_query(db_path),
+        "pool": _pooled(ReadOnlyPool(db_path)),
+        "pool_immutable": _pooled(ReadOnlyPool(db_path, immutable=True)),
+        "pool_memory": _pooled(ReadOnlyPool(db_path, in_memory=True)),
+    }
+    rows = []
+    for threads in thread_counts:
+        row: dict = {"threads": threads}
+        for name, runner in modes.items():
+            row[f"{name}_qps"] = _measure(runner, supplier_ids, threads=threads, seconds=seconds)
+        row["speedup_pool"] = round(row["pool_qps"] / row["connect_per_query_qps"], 2)
+        row["speedup_memory"] = round(row["pool_memory_qps"] / row["connect_per_query_qps"], 2)
+        rows.append(row)
+        print(json.dumps(row), flush=True)
+    return {"benchmark": "sql_pool", "db": os.path.basename(db_path), "seconds": seconds, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", default="1,4")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    report = run([int(s) for s in args.threads.split(",") if s.strip()], seconds=args.seconds)
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_sql_pool_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
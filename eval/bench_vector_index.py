@@ -0,0 +1,135 @@
+"""Local vector index benchmark: IVF recall@k and latency vs the exact flat scan.
+
+Synthetic clustered embeddings (Gaussian mixture, unit-normalized) stand in for
+OpenAI vectors, so no API key is needed. For each corpus size the flat index is
+the brute-force baseline. IVF is measured at several ``nprobe`` values, with and
+without a doc_type filter. Both indexes are written to disk and memory-mapped
+back, as they would be served.
+
+  uv run python eval/bench_vector_index.py                      # 10k / 100k chunks, dim 384
+  uv run python eval/bench_vector_index.py --sizes 1000000 --dim 256 --queries 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+from langchain_core.documents import Document
+
+from rag.vector_index import LocalVectorIndex, load_vector_index, write_vector_index
+
+RESULT_DIR = os.path.join(ROOT, "eval", "results")
+DOC_TYPES = ("policy", "contract", "sop", "faq", "kpi_dict")
+FILTER = ["policy", "sop"]
+
+
+def _synthetic(n: int, dim: int, *, clusters: int = 256, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, n)
+    vectors = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    docs = [
+        Document(page_content=f"chunk {i}", metadata={"chunk_id": f"c{i:08d}", "doc_type": DOC_TYPES[i % 5]})
+        for i in range(n)
+    ]
+    queries = centers[rng.integers(0, clusters, 1000)] + 0.6 * rng.normal(size=(1000, dim)).astype(np.float32)
+    return vectors, docs, queries
+
+
+def _timed(index: LocalVectorIndex, queries, k: int, doc_types, nprobe=None):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append([doc_id for doc_id, _ in index.search(query, k=k, doc_types=doc_types, nprobe=nprobe)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    stats = {
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+    }
+    return results, stats
+
+
+def _recall(approx: list[list[int]], exact: list[list[int]]) -> float:
+    hits = sum(len(set(a) & set(e)) for a, e in zip(approx, exact))
+    total = sum(len(e) for e in exact)
+    return round(hits / total, 4) if total else 1.0
+
+
+def run(sizes: list[int], *, dim: int, k: int, n_queries: int, nprobes: list[int]) -> dict:
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="vector_bench_") as tmp:
+        for n in sizes:
+            vectors, docs, queries = _synthetic(n, dim)
+            queries = queries[:n_queries]
+            row: dict = {"chunks": n, "dim": dim}
+
+            flat_path = os.path.join(tmp, f"flat_{n}")
+            write_vector_index(LocalVectorIndex.build(vectors, docs, kind="flat"), flat_path)
+            flat = load_vector_index(flat_path)
+            exact, row["flat"] = _timed(flat, queries, k, None)
+            exact_filtered, row["flat_filtered"] = _timed(flat, queries, k, FILTER)
+
+            started = time.perf_counter()
+            ivf_index = LocalVectorIndex.build(vectors, docs, kind="ivf")
+            row["ivf_build_s"] = round(time.perf_counter() - started, 2)
+            ivf_path = os.path.join(tmp, f"ivf_{n}")
+            write_vector_index(ivf_index, ivf_path)
+            ivf = load_vector_index(ivf_path)
+            row["ivf_lists"] = ivf.n_lists
+            row["ivf"] = []
+            for nprobe in nprobes:
+                approx, stats = _timed(ivf, queries, k, None, nprobe)
+                approx_filtered, stats_filtered = _timed(ivf, queries, k, FILTER, nprobe)
+                row["ivf"].append(
+                    {
+                        "nprobe": nprobe,
+                        f"recall@{k}": _recall(approx, exact),
+                        **stats,
+                        f"filtered_recall@{k}": _recall(approx_filtered, exact_filtered),
+                        "filtered_p50_ms": stats_filtered["p50_ms"],
+                    }
+                )
+            rows.append(row)
+            print(json.dumps(row), flush=True)
+    return {"benchmark": "vector_index", "k": k, "queries": n_queries, "filter": FILTER, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--k", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", default="4,8,16,32")
+    args = parser.parse_args()
+    report = run(
+        [int(s) for s in args.sizes.split(",") if s.strip()],
+        dim=args.dim,
+        k=args.k,
+        n_queries=args.queries,
+        nprobes=[int(s) for s in args.nprobe.split(",") if s.strip()],
+    )
+    os.makedirs(RESULT_DIR, exist_ok=True)
+    ts = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    out = os.path.join(RESULT_DIR, f"bench_vector_index_{ts}.json")
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,12 +14,54 @@ from core.prompt_injection import prepare_retrieved_context
 from core.resilience import BM25_ONLY_LIMITATION_EN, BM25_ONLY_LIMITATION_ZH
 from mcp_server.tools import score_supplier_risk_impl
 from rag.retriever import get_retriever
+from tools.sql_guard import register_trusted_sql
 from tools.sql_tools import run_sql_query_with_meta
 
 from .approval import infer_proposed_action
 from .state import SCState
 
 
+# Branch SQL is static: validated once at import and pinned as trusted in the SQL guard.
+_PROFILE_SQL = """
+SELECT s.supplier_id,
+       s.supplier_name_anonymized,
+       s.category_level_2,
+       s.country,
+       s.kraljic_quadrant,
+       s.qualification_status,
+       s.risk_level,
+       s.supply_risk_score,
+       s.single_sourcing_flag,
+       s.next_review_date,
+       vr.rating_class,
+       vr.final_vendor_rating_score,
+       vr.suggested_action
+FROM suppliers s
+LEFT JOIN vendor_rating vr ON s.supplier_id = vr.supplier_id
+WHERE s.supplier_id = ?
+ORDER BY vr.period DESC
+LIMIT 1
+"""
+_ORDERS_SQL = """
+SELECT COUNT(*) AS po_count,
+       ROUND(SUM(order_amount_eur), 2) AS total_spend_eur,
+       MIN(order_date) AS first_order,
+       MAX(order_date) AS last_order
+FROM purchase_orders
+WHERE supplier_id = ?
+"""
+_KPI_SQL = """
+SELECT
+  (SELECT ROUND(AVG(on_time_flag) * 100, 2) FROM delivery_events WHERE supplier_id = ?) AS otd_pct,
+  (SELECT ROUND(AVG(delivery_delay_days), 2) FROM delivery_events WHERE supplier_id = ?) AS avg_delay_days,
+  (SELECT ROUND(AVG(defect_rate) * 100, 2) FROM quality_events WHERE supplier_id = ?) AS avg_defect_pct,
+  (SELECT COUNT(*) FROM quality_events WHERE supplier_id = ?) AS quality_event_count,
+  (SELECT COUNT(*) FROM delivery_events WHERE supplier_id = ?) AS delivery_event_count
+"""
+for _sql in (_PROFILE_SQL, _ORDERS_SQL, _KPI_SQL):
+    register_trusted_sql(_sql)
+
+
 def _zh(state: SCState) -> bool:
     return state.get("response_language", "en") == "zh"
 
@@ -74,30 +116,10 @@ def assessment_profile_branch(state: SCState) -> SCState:
     if state.get("ambiguity_type"):
         return {}
     sid = state.get("supplier_id") or _supplier_id(state)
-    sql = """
-SELECT s.supplier_id,
-       s.supplier_name_anonymized,
-       s.category_level_2,
-       s.country,
-       s.kraljic_quadrant,
-       s.qualification_status,
-       s.risk_level,
-       s.supply_risk_score,
-       s.single_sourcing_flag,
-       s.next_review_date,
-       vr.rating_class,
-       vr.final_vendor_rating_score,
-       vr.suggested_action
-FROM suppliers s
-LEFT JOIN vendor_rating vr ON s.supplier_id = vr.supplier_id
-WHERE s.supplier_id = ?
-ORDER BY vr.period DESC
-LIMIT 1
-"""
-    meta = run_sql_query_with_meta(sql, params=(sid,))
+    meta = run_sql_query_with_meta(_PROFILE_SQL, params=(sid,))
     return {
         "assessment_profile": {
-            "sql": sql.strip(),
+            "sql": _PROFILE_SQL.strip(),
             "rows": meta.get("rows") or [],
             "latency_ms": meta.get("latency_ms"),
         }
@@ -108,18 +130,10 @@ def assessment_orders_branch(state: SCState) -> SCState:
     if state.get("ambiguity_type"):
         return {}
     sid = state.get("supplier_id") or _supplier_id(state)
-    sql = """
-SELECT COUNT(*) AS po_count,
-       ROUND(SUM(order_amount_eur), 2) AS total_spend_eur,
-       MIN(order_date) AS first_order,
-       MAX(order_date) AS last_order
-FROM purchase_orders
-WHERE supplier_id = ?
-"""
-    meta = run_sql_query_with_meta(sql, params=(sid,))
+    meta = run_sql_query_with_meta(_ORDERS_SQL, params=(sid,))
     return {
         "assessment_orders": {
-            "sql": sql.strip(),
+            "sql": _ORDERS_SQL.strip(),
             "rows": meta.get("rows") or [],
             "latency_ms": meta.get("latency_ms"),
         }
@@ -129,19 +143,11 @@ def assessment_kpi_branch(state: SCState) -> SCState:
     if state.get("ambiguity_type"):
         return {}
     sid = state.get("supplier_id") or _supplier_id(state)
-    sql = """
-SELECT
-  (SELECT ROUND(AVG(on_time_flag) * 100, 2) FROM delivery_events WHERE supplier_id = ?) AS otd_pct,
-  (SELECT ROUND(AVG(delivery_delay_days), 2) FROM delivery_events WHERE supplier_id = ?) AS avg_delay_days,
-  (SELECT ROUND(AVG(defect_rate) * 100, 2) FROM quality_events WHERE supplier_id = ?) AS avg_defect_pct,
-  (SELECT COUNT(*) FROM quality_events WHERE supplier_id = ?) AS quality_event_count,
-  (SELECT COUNT(*) FROM delivery_events WHERE supplier_id = ?) AS delivery_event_count
-"""
-    meta = run_sql_query_with_meta(sql, params=(sid, sid, sid, sid, sid))
+    meta = run_sql_query_with_meta(_KPI_SQL, params=(sid, sid, sid, sid, sid))
     # Parallel-safe: only write branch-private keys (no shared sql_*/retrieved_docs).
     return {
         "assessment_kpi": {
-            "sql": sql.strip(),
+            "sql": _KPI_SQL.strip(),
             "rows": meta.get("rows") or [],
             "latency_ms": meta.get("latency_ms"),
         }
@@ -56,6 +56,7 @@ from core.resilience import (
 from app.services.mcp_client import McpToolError, call_tool, format_tools_for_router, list_tools
 from rag.retriever import get_retriever
 from tools.kpi_sql_builder import build_kpi_sql
+from tools.sql_results import default_limits
 from tools.sql_tools import run_sql_query_with_meta
 from .state import SCState
 
@@ -218,6 +219,19 @@ def _params_dict(params: tuple | None) -> dict:
     return {f"p{i}": value for i, value in enumerate(params, start=1)}
 
 
+def _truncation_limitations(meta: dict | None) -> list[str]:
+    """Evidence note when a bounded result set (tools.sql_results) dropped rows."""
+    meta = meta or {}
+    if not meta.get("truncated"):
+        return []
+    total = meta.get("total_rows_estimate")
+    bound = "" if meta.get("total_rows_exact", True) else "at least "
+    return [
+        f"Result truncated to {meta.get('row_count', 0)} of {bound}{total} row(s) by the result size budget; "
+        "narrow the question (supplier, category or period) for the full list."
+    ]
+
+
 # OTIF still requires line-level full-quantity data not modeled in Ratti demo.
 UNSUPPORTED_KPI_PATTERNS = {
     "otif": "OTIF requires per-line full-quantity fulfillment data, which the Ratti demo schema does not include.",
@@ -795,7 +809,7 @@ def kpi_node(state: SCState) -> SCState:
         "Anonymized synthetic Ratti demo dataset for product prototyping — not production supplier performance.",
         f"Demo sample: {sample_size} record(s) returned; treat as illustrative only.",
         "KPI rows executed via MCP tool query_kpi.",
-    ]
+    ] + _truncation_limitations(sql_meta)
     state["evidence"] = sql_evidence(
         query=final_sql or "",
         params=_params_dict(params),
@@ -968,7 +982,9 @@ def hybrid_kpi_branch(state: SCState) -> dict:
 
     if template is not None:
         try:
-            result = run_sql_query_with_meta(template.sql, params=template.params)
+            result = run_sql_query_with_meta(
+                template.sql, params=template.params, cache_label=f"template:{template.template_id}"
+            )
             kpi_rows = result["rows"]
             kpi_sql_text = template.sql
             metric = kpi_parse.get("metric") or "on_time_rate"
@@ -1197,7 +1213,9 @@ def hybrid_node(state: SCState) -> SCState:
     sql_meta_for_state = None
     if template is not None:
         try:
-            result = run_sql_query_with_meta(template.sql, params=template.params)
+            result = run_sql_query_with_meta(
+                template.sql, params=template.params, cache_label=f"template:{template.template_id}"
+            )
             kpi_rows = result["rows"]
             kpi_sql_text = template.sql
             metric = kpi_parse.get("metric") or "on_time_rate"
@@ -1399,7 +1417,9 @@ ORDER BY total_amount_eur DESC
             params = ()
 
     try:
-        result = run_sql_query_with_meta(sql, params=params if isinstance(params, tuple) else None)
+        result = run_sql_query_with_meta(
+            sql, params=params if isinstance(params, tuple) else None, limits=default_limits()
+        )
         impact_rows = result["rows"]
         executed = result["meta"].get("executed_sql", sql.strip())
         state["sql_query"] = executed
@@ -1461,7 +1481,8 @@ LIMIT 10
         limitations=[
             "Anonymized synthetic Ratti demo data; final decisions require buyer/manager approval.",
             f"Demo as-of date for calendar filters: {DEMO_CURRENT_DATE}.",
-        ],
+        ]
+        + _truncation_limitations(state.get("sql_meta")),
     )
     state["citations"] = [{"type": "sql", "sql": state.get("sql_query"), "row_count": len(impact_rows)}]
 
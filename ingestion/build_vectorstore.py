@@ -6,9 +6,11 @@ from pathlib import Path
 # Ensure modules under project root (rag / core) can be imported
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+from core.config import EMBEDDING_MODEL, VECTOR_BACKEND, VECTOR_INDEX_PATH
 from ingestion.chunker_registry import dispatch_chunker
 from rag.bm25_index import save_bm25_index
-from rag.retriever import get_vectorstore, NAMESPACE
+from rag.retriever import _embeddings, get_pinecone_vectorstore, NAMESPACE
+from rag.vector_index import build_vector_index
 
 
 DOCS_DIR = "data/docs"
@@ -46,7 +48,7 @@ def load_and_chunk_docs():
 
 def clear_namespace():
     print(f"Clearing Pinecone namespace='{NAMESPACE}' ...")
-    vs = get_vectorstore()
+    vs = get_pinecone_vectorstore()
     try:
         vs.delete(delete_all=True)
     except TypeError:
@@ -61,9 +63,21 @@ def clear_namespace():
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--reindex", action="store_true", help="Clear namespace before indexing.")
+    parser.add_argument(
+        "--vector-backend",
+        choices=["pinecone", "local"],
+        default=VECTOR_BACKEND if VECTOR_BACKEND in {"pinecone", "local"} else "pinecone",
+        help="Where to write vectors (default: VECTOR_BACKEND).",
+    )
+    parser.add_argument(
+        "--index-kind",
+        choices=["auto", "flat", "ivf"],
+        default="auto",
+        help="Local index type; auto = flat below VECTOR_IVF_MIN_DOCS chunks, IVF above.",
+    )
     args = parser.parse_args()
 
-    if args.reindex:
+    if args.reindex and args.vector_backend == "pinecone":
         clear_namespace()
 
     print("Loading docs...")
@@ -74,9 +88,20 @@ def main():
         print("❌ No valid document chunks found. Please check that data/docs contains valid content.")
         return
 
-    print(f"Indexing into Pinecone namespace='{NAMESPACE}' ...")
-    vs = get_vectorstore()
-    vs.add_documents(chunks)
+    if args.vector_backend == "local":
+        print(f"Writing local vector index to {VECTOR_INDEX_PATH} ...")
+        build_id = build_vector_index(
+            chunks,
+            _embeddings(),
+            VECTOR_INDEX_PATH,
+            kind=args.index_kind,
+            embedding_model=EMBEDDING_MODEL,
+        )
+        print(f" - build_id={build_id}")
+    else:
+        print(f"Indexing into Pinecone namespace='{NAMESPACE}' ...")
+        vs = get_pinecone_vectorstore()
+        vs.add_documents(chunks)
     print("Writing local BM25 index ...")
     save_bm25_index(chunks)
 
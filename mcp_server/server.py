@@ -34,11 +34,13 @@ from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp.exceptions import ToolError
 
 from mcp_server.tools import (
+    TOOL_DESCRIPTIONS,
     ToolValidationError,
     dumps_tool_result,
     query_kpi_impl,
     query_policy_impl,
     score_supplier_risk_impl,
+    score_suppliers_risk_impl,
 )
 
 mcp = FastMCP(
@@ -48,21 +50,13 @@ mcp = FastMCP(
         "Use query_policy for policy/process/document questions; "
         "Use query_kpi for numeric supplier performance metrics; "
         "use score_supplier_risk as the single risk-scoring contract "
-        "(assessment, chat, and MCP all share this implementation)."
+        "(assessment, chat, and MCP all share this implementation); "
+        "use score_suppliers_risk for portfolio views (many suppliers or all)."
     ),
 )
 
 
-@mcp.tool(
-    name="query_policy",
-    description=(
-        "Retrieve supplier-lifecycle policy evidence via hybrid RAG (Pinecone + BM25). "
-        "Use when the user asks what a policy/SOP/contract/FAQ SAYS — e.g. Kraljic monitoring "
-        "rules, ESG formula, pre-qualification vs qualification, audit policy, document "
-        "requirements. Returns retrieved document chunks and a concatenated context string. "
-        "Do NOT use for numeric KPIs (OTD, defect rate, spend) — use query_kpi instead."
-    ),
-)
+@mcp.tool(name="query_policy", description=TOOL_DESCRIPTIONS["query_policy"])
 def query_policy(query: str, k: int = 5) -> str:
     """RAG retrieval over policy/contract/sop/faq corpora."""
     try:
@@ -74,22 +68,7 @@ def query_policy(query: str, k: int = 5) -> str:
     return dumps_tool_result(result)
 
 
-@mcp.tool(
-    name="query_kpi",
-    description=(
-        "Query supplier KPI / performance metrics from the demo SQLite warehouse "
-        "(deterministic SQL templates + read-only allowlisted SQL). "
-        "Use when the user wants numbers: on-time delivery (OTD), defect rate, spend, "
-        "average delay days, ESG score, vendor rating, certificate expiry, or supplier "
-        "status/next step for a SUP### id. "
-        "Arguments: supplier_id (optional SUP###), metric (on_time_rate|defect_rate|"
-        "avg_delay_days|spend|esg_score|vendor_rating|cert_expiry|supplier_status), "
-        "time_range (e.g. 2025, last_3_months). Optional question helps template matching. "
-        "Optional sql: pass a SELECT generated by NL2SQL fallback. "
-        "Invalid params return a standard MCP tool error — do not invent a parallel error schema. "
-        "Do NOT use for pure policy text questions — use query_policy instead."
-    ),
-)
+@mcp.tool(name="query_kpi", description=TOOL_DESCRIPTIONS["query_kpi"])
 def query_kpi(
     supplier_id: str = "",
     metric: str = "",
@@ -113,14 +92,7 @@ def query_kpi(
     return dumps_tool_result(result)
 
 
-@mcp.tool(
-    name="score_supplier_risk",
-    description=(
-        "Score supplier risk 0–100 from risk_events, quality_events, and document expiry. "
-        "Canonical risk contract: assessment, chat, and MCP must reuse this tool so scores stay consistent. "
-        "Returns risk_score, band (low|medium|high), drivers, component breakdown, and event rows."
-    ),
-)
+@mcp.tool(name="score_supplier_risk", description=TOOL_DESCRIPTIONS["score_supplier_risk"])
 def score_supplier_risk(supplier_id: str, as_of_date: str = "") -> str:
     """Weighted supplier risk score from demo SQLite signals."""
     try:
@@ -132,6 +104,26 @@ def score_supplier_risk(supplier_id: str, as_of_date: str = "") -> str:
     return dumps_tool_result(result)
 
 
+@mcp.tool(name="score_suppliers_risk", description=TOOL_DESCRIPTIONS["score_suppliers_risk"])
+def score_suppliers_risk(
+    supplier_ids: list[str] | str = "all",
+    as_of_date: str = "",
+    include_events: bool = True,
+) -> str:
+    """Weighted risk scores for many suppliers from demo SQLite signals."""
+    try:
+        result = score_suppliers_risk_impl(
+            supplier_ids=supplier_ids,
+            as_of_date=as_of_date,
+            include_events=include_events,
+        )
+    except ToolValidationError as exc:
+        raise ToolError(str(exc)) from exc
+    except Exception as exc:
+        raise ToolError(f"score_suppliers_risk failed: {exc}") from exc
+    return dumps_tool_result(result)
+
+
 def main() -> None:
     # Default transport = stdio (client spawns this process).
     mcp.run(transport="stdio")
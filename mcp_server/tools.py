@@ -4,9 +4,14 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any
+import time
+from typing import Any, Callable
+
+import numpy as np
 
 from tools.kpi_sql_builder import build_kpi_sql
+from tools.sql_guard import register_trusted_sql
+from tools.sql_results import default_limits, to_columnar
 from tools.sql_tools import run_sql_query_with_meta
 
 _SUPPLIER_ID_PATTERN = re.compile(r"\b(SUP\d{3})\b", re.IGNORECASE)
@@ -23,6 +28,136 @@ SUPPORTED_METRICS = (
 )
 
 
+# Static risk-scoring SQL: validated once at import and pinned as trusted in the SQL guard.
+_RISK_SQL = """
+SELECT COUNT(*) AS n,
+       COALESCE(AVG(risk_score_1_25), 0) AS avg_score,
+       COALESCE(MAX(risk_score_1_25), 0) AS max_score
+FROM risk_events
+WHERE supplier_id = ?
+"""
+_QUALITY_SQL = """
+SELECT COUNT(*) AS n,
+       COALESCE(AVG(defect_rate), 0) AS avg_defect
+FROM quality_events
+WHERE supplier_id = ?
+"""
+_DOCS_SQL = """
+SELECT COUNT(*) AS expired_or_soon
+FROM documents
+WHERE supplier_id = ?
+  AND (
+    LOWER(COALESCE(document_status, '')) IN ('expired', 'invalid')
+    OR (expiry_date IS NOT NULL AND expiry_date <= date(?, '+30 days'))
+  )
+"""
+_EVENTS_SQL = """
+SELECT risk_event_id,
+       risk_type,
+       risk_score_1_25,
+       recommended_action,
+       human_review_required,
+       event_date
+FROM risk_events
+WHERE supplier_id = ?
+ORDER BY risk_score_1_25 DESC, event_date DESC, risk_event_id
+LIMIT 10
+"""
+_QUALITY_EVENTS_SQL = """
+SELECT quality_event_id, event_date, non_conformity_type, severity, defect_rate
+FROM quality_events
+WHERE supplier_id = ?
+ORDER BY event_date DESC, quality_event_id
+LIMIT 5
+"""
+
+# Batch variants: one grouped statement per component for a JSON array of ids (``json_each``).
+# Each carries an explicit ``LIMIT ?`` so the guard's default row cap never truncates a batch.
+_SUPPLIER_IDS_SQL = """
+SELECT supplier_id
+FROM suppliers
+WHERE supplier_id IS NOT NULL
+ORDER BY supplier_id
+LIMIT ?
+"""
+_BATCH_RISK_SQL = """
+SELECT supplier_id,
+       COUNT(*) AS n,
+       COALESCE(AVG(risk_score_1_25), 0) AS avg_score,
+       COALESCE(MAX(risk_score_1_25), 0) AS max_score
+FROM risk_events
+WHERE supplier_id IN (SELECT value FROM json_each(?))
+GROUP BY supplier_id
+LIMIT ?
+"""
+_BATCH_QUALITY_SQL = """
+SELECT supplier_id,
+       COUNT(*) AS n,
+       COALESCE(AVG(defect_rate), 0) AS avg_defect
+FROM quality_events
+WHERE supplier_id IN (SELECT value FROM json_each(?))
+GROUP BY supplier_id
+LIMIT ?
+"""
+_BATCH_DOCS_SQL = """
+SELECT supplier_id, COUNT(*) AS expired_or_soon
+FROM documents
+WHERE supplier_id IN (SELECT value FROM json_each(?))
+  AND (
+    LOWER(COALESCE(document_status, '')) IN ('expired', 'invalid')
+    OR (expiry_date IS NOT NULL AND expiry_date <= date(?, '+30 days'))
+  )
+GROUP BY supplier_id
+LIMIT ?
+"""
+_BATCH_EVENTS_SQL = """
+SELECT supplier_id,
+       risk_event_id,
+       risk_type,
+       risk_score_1_25,
+       recommended_action,
+       human_review_required,
+       event_date
+FROM (
+  SELECT *,
+         ROW_NUMBER() OVER (
+           PARTITION BY supplier_id
+           ORDER BY risk_score_1_25 DESC, event_date DESC, risk_event_id
+         ) AS rn
+  FROM risk_events
+  WHERE supplier_id IN (SELECT value FROM json_each(?))
+) AS ranked
+WHERE rn <= 10
+ORDER BY supplier_id, rn
+LIMIT ?
+"""
+_BATCH_QUALITY_EVENTS_SQL = """
+SELECT supplier_id, quality_event_id, event_date, non_conformity_type, severity, defect_rate
+FROM (
+  SELECT *,
+         ROW_NUMBER() OVER (
+           PARTITION BY supplier_id
+           ORDER BY event_date DESC, quality_event_id
+         ) AS rn
+  FROM quality_events
+  WHERE supplier_id IN (SELECT value FROM json_each(?))
+) AS ranked
+WHERE rn <= 5
+ORDER BY supplier_id, rn
+LIMIT ?
+"""
+BATCH_RISK_SQL = (
+    _SUPPLIER_IDS_SQL,
+    _BATCH_RISK_SQL,
+    _BATCH_QUALITY_SQL,
+    _BATCH_DOCS_SQL,
+    _BATCH_EVENTS_SQL,
+    _BATCH_QUALITY_EVENTS_SQL,
+)
+for _sql in (_RISK_SQL, _QUALITY_SQL, _DOCS_SQL, _EVENTS_SQL, _QUALITY_EVENTS_SQL, *BATCH_RISK_SQL):
+    register_trusted_sql(_sql)
+
+
 class ToolValidationError(ValueError):
     """Invalid tool arguments — mapped to MCP isError responses by the server."""
 
@@ -87,7 +222,7 @@ def query_kpi_impl(
 
     if sql:
         try:
-            result = run_sql_query_with_meta(sql)
+            result = run_sql_query_with_meta(sql, untrusted=True, limits=default_limits())
         except ValueError as exc:
             raise ToolValidationError(str(exc)) from exc
         except Exception as exc:
@@ -143,7 +278,12 @@ def query_kpi_impl(
         )
 
     try:
-        result = run_sql_query_with_meta(template.sql, params=template.params)
+        result = run_sql_query_with_meta(
+            template.sql,
+            params=template.params,
+            cache_label=f"template:{template.template_id}",
+            limits=default_limits(),
+        )
     except ValueError as exc:
         raise ToolValidationError(str(exc)) from exc
     except Exception as exc:
@@ -166,14 +306,7 @@ def query_kpi_impl(
     }
 
 
-def score_supplier_risk_impl(supplier_id: str = "", as_of_date: str = "") -> dict[str, Any]:
-    """Weighted risk score from risk_events + quality_events + document expiry."""
-    supplier_id = (supplier_id or "").strip().upper()
-    if not _SUPPLIER_ID_PATTERN.fullmatch(supplier_id):
-        raise ToolValidationError(
-            f"Invalid supplier_id '{supplier_id}'. Expected form SUP### (e.g. SUP018)."
-        )
-
+def _resolve_as_of(as_of_date: str) -> str:
     as_of = (as_of_date or "").strip() or None
     # Prefer demo snapshot date when caller omits as_of
     if not as_of:
@@ -183,32 +316,22 @@ def score_supplier_risk_impl(supplier_id: str = "", as_of_date: str = "") -> dic
             as_of = DEMO_CURRENT_DATE
         except Exception:  # noqa: BLE001
             as_of = "2025-12-31"
+    return as_of
 
-    risk_sql = """
-SELECT COUNT(*) AS n,
-       COALESCE(AVG(risk_score_1_25), 0) AS avg_score,
-       COALESCE(MAX(risk_score_1_25), 0) AS max_score
-FROM risk_events
-WHERE supplier_id = ?
-"""
-    quality_sql = """
-SELECT COUNT(*) AS n,
-       COALESCE(AVG(defect_rate), 0) AS avg_defect
-FROM quality_events
-WHERE supplier_id = ?
-"""
-    docs_sql = """
-SELECT COUNT(*) AS expired_or_soon
-FROM documents
-WHERE supplier_id = ?
-  AND (
-    LOWER(COALESCE(document_status, '')) IN ('expired', 'invalid')
-    OR (expiry_date IS NOT NULL AND expiry_date <= date(?, '+30 days'))
-  )
-"""
-    risk = run_sql_query_with_meta(risk_sql, params=(supplier_id,))
-    quality = run_sql_query_with_meta(quality_sql, params=(supplier_id,))
-    docs = run_sql_query_with_meta(docs_sql, params=(supplier_id, as_of))
+
+def score_supplier_risk_impl(supplier_id: str, as_of_date: str = "") -> dict[str, Any]:
+    """Weighted risk score from risk_events + quality_events + document expiry."""
+    supplier_id = (supplier_id or "").strip().upper()
+    if not _SUPPLIER_ID_PATTERN.fullmatch(supplier_id):
+        raise ToolValidationError(
+            f"Invalid supplier_id '{supplier_id}'. Expected form SUP### (e.g. SUP018)."
+        )
+
+    as_of = _resolve_as_of(as_of_date)
+
+    risk = run_sql_query_with_meta(_RISK_SQL, params=(supplier_id,))
+    quality = run_sql_query_with_meta(_QUALITY_SQL, params=(supplier_id,))
+    docs = run_sql_query_with_meta(_DOCS_SQL, params=(supplier_id, as_of))
 
     r = (risk.get("rows") or [{}])[0]
     q = (quality.get("rows") or [{}])[0]
@@ -247,27 +370,8 @@ WHERE supplier_id = ?
     if not drivers:
         drivers.append("baseline")
 
-    events_sql = """
-SELECT risk_event_id,
-       risk_type,
-       risk_score_1_25,
-       recommended_action,
-       human_review_required,
-       event_date
-FROM risk_events
-WHERE supplier_id = ?
-ORDER BY risk_score_1_25 DESC, event_date DESC
-LIMIT 10
-"""
-    quality_events_sql = """
-SELECT quality_event_id, event_date, non_conformity_type, severity, defect_rate
-FROM quality_events
-WHERE supplier_id = ?
-ORDER BY event_date DESC
-LIMIT 5
-"""
-    events = run_sql_query_with_meta(events_sql, params=(supplier_id,))
-    quality_events = run_sql_query_with_meta(quality_events_sql, params=(supplier_id,))
+    events = run_sql_query_with_meta(_EVENTS_SQL, params=(supplier_id,))
+    quality_events = run_sql_query_with_meta(_QUALITY_EVENTS_SQL, params=(supplier_id,))
 
     return {
         "supplier_id": supplier_id,
@@ -294,10 +398,212 @@ LIMIT 5
         },
         "events": events.get("rows") or [],
         "quality_events": quality_events.get("rows") or [],
-        "events_sql": events_sql.strip(),
+        "events_sql": _EVENTS_SQL.strip(),
         "source": "mcp:score_supplier_risk",
     }
 
 
+def _batch_supplier_ids(supplier_ids: list[str] | str | None) -> list[str] | None:
+    """Validated, de-duplicated ids in caller order; ``None`` means every supplier."""
+    if supplier_ids is None:
+        return None
+    if isinstance(supplier_ids, str):
+        if supplier_ids.strip().lower() in ("", "all"):
+            return None
+        supplier_ids = re.split(r"[\s,]+", supplier_ids.strip())
+    cleaned = [str(s or "").strip().upper() for s in supplier_ids]
+    cleaned = [s for s in cleaned if s]
+    if cleaned == ["ALL"]:
+        return None
+    if not cleaned:
+        raise ToolValidationError("supplier_ids must list at least one SUP### id, or be 'all'.")
+    bad = [s for s in cleaned if not _SUPPLIER_ID_PATTERN.fullmatch(s)]
+    if bad:
+        raise ToolValidationError(
+            f"Invalid supplier_id '{bad[0]}'. Expected form SUP### (e.g. SUP018)."
+        )
+    return list(dict.fromkeys(cleaned))
+
+
+def _column(rows_by_id: dict[str, dict[str, Any]], ids: list[str], name: str) -> np.ndarray:
+    return np.fromiter(
+        (float((rows_by_id.get(sid) or {}).get(name) or 0) for sid in ids),
+        dtype=np.float64,
+        count=len(ids),
+    )
+
+
+def _group_rows(rows: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+    grouped: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        grouped.setdefault(row.pop("supplier_id"), []).append(row)
+    return grouped
+
+
+def score_suppliers_risk_impl(
+    supplier_ids: list[str] | str | None = "all",
+    as_of_date: str = "",
+    include_events: bool = True,
+) -> dict[str, Any]:
+    """``score_supplier_risk`` for many suppliers (or ``"all"``) with one grouped query per component.
+
+    Each entry of ``results`` equals ``score_supplier_risk_impl`` for that supplier;
+    components are weighted and banded column-wise with NumPy. ``include_events=False``
+    skips the per-supplier event lists (``events`` / ``quality_events`` come back empty),
+    which is most of the cost for league tables over the whole portfolio.
+    """
+    ids = _batch_supplier_ids(supplier_ids)
+    as_of = _resolve_as_of(as_of_date)
+    started = time.perf_counter()
+    if ids is None:
+        rows = run_sql_query_with_meta(_SUPPLIER_IDS_SQL, params=(-1,))["rows"]  # LIMIT -1: no cap
+        ids = [str(r["supplier_id"]) for r in rows]
+    ids_json = json.dumps(ids)
+    n = len(ids)
+
+    def rows_by_id(sql: str, params: tuple) -> dict[str, dict[str, Any]]:
+        return {r["supplier_id"]: r for r in run_sql_query_with_meta(sql, params=params)["rows"]}
+
+    risk = rows_by_id(_BATCH_RISK_SQL, (ids_json, n))
+    quality = rows_by_id(_BATCH_QUALITY_SQL, (ids_json, n))
+    docs = rows_by_id(_BATCH_DOCS_SQL, (ids_json, as_of, n))
+    events: dict[str, list[dict[str, Any]]] = {}
+    quality_events: dict[str, list[dict[str, Any]]] = {}
+    if include_events:
+        events = _group_rows(run_sql_query_with_meta(_BATCH_EVENTS_SQL, params=(ids_json, n * 10))["rows"])
+        quality_events = _group_rows(
+            run_sql_query_with_meta(_BATCH_QUALITY_EVENTS_SQL, params=(ids_json, n * 5))["rows"]
+        )
+
+    risk_n = _column(risk, ids, "n")
+    risk_avg = _column(risk, ids, "avg_score")
+    risk_max = _column(risk, ids, "max_score")
+    q_n = _column(quality, ids, "n")
+    defect = _column(quality, ids, "avg_defect")
+    expired = _column(docs, ids, "expired_or_soon")
+
+    # Same formula and operation order as score_supplier_risk_impl, so floats match bit for bit
+    risk_component = np.minimum(100.0, (risk_avg / 25.0) * 70.0 + np.minimum(risk_n, 5) * 6.0)
+    quality_component = np.minimum(100.0, defect * 100.0 * 0.7 + np.minimum(q_n, 8) * 4.0)
+    cert_component = np.minimum(100.0, expired * 25.0)
+    raw = 0.45 * risk_component + 0.35 * quality_component + 0.20 * cert_component
+    # Python's round() (correctly rounded) rather than np.round, which can differ on x.x5 ties
+    score = np.array([round(x, 1) for x in raw.tolist()], dtype=np.float64)
+    band = np.where(score >= 70, "high", np.where(score >= 40, "medium", "low"))
+
+    flags = np.stack(
+        [
+            (risk_max >= 15) | (risk_n >= 2),
+            (defect >= 0.05) | (q_n >= 3),
+            expired >= 1,
+        ],
+        axis=1,
+    )
+    names = ("risk_events", "quality_defect_signal", "cert_expiring_or_invalid")
+
+    columns = zip(
+        ids,
+        score.tolist(),
+        band.tolist(),
+        flags.tolist(),
+        risk_n.tolist(),
+        risk_avg.tolist(),
+        risk_max.tolist(),
+        risk_component.tolist(),
+        q_n.tolist(),
+        defect.tolist(),
+        quality_component.tolist(),
+        expired.tolist(),
+        cert_component.tolist(),
+    )
+    results = []
+    for sid, s, b, f, rn, ravg, rmax, rc, qn, dr, qc, ex, cc in columns:
+        drivers = [name for name, on in zip(names, f) if on] or ["baseline"]
+        results.append(
+            {
+                "supplier_id": sid,
+                "as_of_date": as_of,
+                "risk_score": s,
+                "band": b,
+                "drivers": drivers,
+                "components": {
+                    "risk_events": {
+                        "count": int(rn),
+                        "avg_score_1_25": round(ravg, 2),
+                        "max_score_1_25": round(rmax, 2),
+                        "contribution": round(rc, 1),
+                    },
+                    "quality_events": {
+                        "count": int(qn),
+                        "avg_defect_rate": round(dr, 4),
+                        "contribution": round(qc, 1),
+                    },
+                    "documents": {
+                        "expired_or_soon": int(ex),
+                        "contribution": round(cc, 1),
+                    },
+                },
+                "events": events.get(sid, []),
+                "quality_events": quality_events.get(sid, []),
+                "events_sql": _EVENTS_SQL.strip(),
+                "source": "mcp:score_supplier_risk",
+            }
+        )
+
+    return {
+        "as_of_date": as_of,
+        "count": n,
+        "bands": {name: int((band == name).sum()) for name in ("high", "medium", "low")},
+        "results": results,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "source": "mcp:score_suppliers_risk",
+    }
+
+
 def dumps_tool_result(payload: dict[str, Any]) -> str:
-    return json.dumps(payload, ensure_ascii=False, default=str)
+    """JSON for the MCP wire; ``rows`` go columnar (``tools.sql_results.to_columnar``)."""
+    return json.dumps(to_columnar(payload), ensure_ascii=False, default=str)
+
+
+# MCP tool catalog shared by the stdio server (mcp_server.server) and the in-process
+# transport (app.services.mcp_inprocess). Descriptions are the routing signal.
+TOOL_DESCRIPTIONS: dict[str, str] = {
+    "query_policy": (
+        "Retrieve supplier-lifecycle policy evidence via hybrid RAG (Pinecone + BM25). "
+        "Use when the user asks what a policy/SOP/contract/FAQ SAYS — e.g. Kraljic monitoring "
+        "rules, ESG formula, pre-qualification vs qualification, audit policy, document "
+        "requirements. Returns retrieved document chunks and a concatenated context string. "
+        "Do NOT use for numeric KPIs (OTD, defect rate, spend) — use query_kpi instead."
+    ),
+    "query_kpi": (
+        "Query supplier KPI / performance metrics from the demo SQLite warehouse "
+        "(deterministic SQL templates + read-only allowlisted SQL). "
+        "Use when the user wants numbers: on-time delivery (OTD), defect rate, spend, "
+        "average delay days, ESG score, vendor rating, certificate expiry, or supplier "
+        "status/next step for a SUP### id. "
+        "Arguments: supplier_id (optional SUP###), metric (on_time_rate|defect_rate|"
+        "avg_delay_days|spend|esg_score|vendor_rating|cert_expiry|supplier_status), "
+        "time_range (e.g. 2025, last_3_months). Optional question helps template matching. "
+        "Optional sql: pass a SELECT generated by NL2SQL fallback. "
+        "Invalid params return a standard MCP tool error — do not invent a parallel error schema. "
+        "Do NOT use for pure policy text questions — use query_policy instead."
+    ),
+    "score_supplier_risk": (
+        "Score supplier risk 0–100 from risk_events, quality_events, and document expiry. "
+        "Canonical risk contract: assessment, chat, and MCP must reuse this tool so scores stay consistent. "
+        "Returns risk_score, band (low|medium|high), drivers, component breakdown, and event rows."
+    ),
+    "score_suppliers_risk": (
+        "Batch form of score_supplier_risk for league tables and dashboards: scores a list of "
+        "SUP### ids (or 'all') with one grouped query per component. Each entry of results is "
+        "identical to score_supplier_risk for that supplier; also returns per-band counts. "
+        "Set include_events=false for a scores-only league table (event lists left empty)."
+    ),
+}
+
+TOOL_IMPLS: dict[str, Callable[..., dict[str, Any]]] = {
+    "query_policy": query_policy_impl,
+    "query_kpi": query_kpi_impl,
+    "score_supplier_risk": score_supplier_risk_impl,
+    "score_suppliers_risk": score_suppliers_risk_impl,
+}
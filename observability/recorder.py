@@ -3,15 +3,36 @@
 from __future__ import annotations
 
 import inspect
+import itertools
+import threading
 import time
 import uuid
+from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Any
+from typing import Any, Iterator
 
 from observability.store import get_store
 
 _active_trace_id: ContextVar[str | None] = ContextVar("active_trace_id", default=None)
-_step_counter: ContextVar[int] = ContextVar("trace_step_counter", default=0)
+
+
+class _StepCounter:
+    """Step numbers for one trace, shared by every context copied from it.
+
+    Retrieval routes record steps from pool threads running copies of the
+    caller's context, so the counter is a shared object, not a per-context int.
+    """
+
+    def __init__(self) -> None:
+        self._steps = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            return next(self._steps)
+
+
+_step_counter: ContextVar[_StepCounter | None] = ContextVar("trace_step_counter", default=None)
 
 
 def current_trace_id() -> str | None:
@@ -33,7 +54,7 @@ def start_trace(
         agent_config_id=agent_config_id,
     )
     _active_trace_id.set(tid)
-    _step_counter.set(0)
+    _step_counter.set(_StepCounter())
     return tid
 
 
@@ -67,6 +88,20 @@ def finish_trace(
         _active_trace_id.set(None)
 
 
+@contextmanager
+def suspended_trace() -> Iterator[None]:
+    """Record nothing into the active trace inside the block.
+
+    In-process MCP tool calls use it so a trace matches the stdio transport,
+    whose server subprocess has no active trace.
+    """
+    token = _active_trace_id.set(None)
+    try:
+        yield
+    finally:
+        _active_trace_id.reset(token)
+
+
 def record_step(
     tool_called: str,
     *,
@@ -78,8 +113,11 @@ def record_step(
     tid = _active_trace_id.get()
     if not tid:
         return
-    step_num = _step_counter.get() + 1
-    _step_counter.set(step_num)
+    counter = _step_counter.get()
+    if counter is None:
+        counter = _StepCounter()
+        _step_counter.set(counter)
+    step_num = counter.next()
     get_store().add_step(
         trace_id=tid,
         step_num=step_num,
@@ -1,13 +1,63 @@
+"""Local BM25 keyword index backed by flat NumPy arrays.
+
+On-disk layout (one directory, default ``data/bm25_index/``):
+
+  meta.json            format version, BM25 params (k1 / b / epsilon), avgdl, build_id
+  terms.bin            sorted vocabulary, UTF-8, concatenated
+  term_offsets.npy     int64 [n_terms + 1] byte offsets into terms.bin
+  idf.npy              float64 [n_terms] (rank_bm25 ``BM25Okapi`` idf incl. epsilon floor)
+  postings_indptr.npy  int64 [n_terms + 1] CSR row pointers
+  postings_docs.npy    int32 [n_postings] doc ids per term
+  postings_tf.npy      int32 [n_postings] term frequency per (term, doc)
+  doc_len.npy          int32 [n_docs]
+  doc_norm.npy         float64 [n_docs] ``k1 * (1 - b + b * doc_len / avgdl)``
+  doc_type_codes.npy   int16 [n_docs] index into meta["doc_types"] (-1 = none)
+  type_indptr.npy      int64 [n_types + 1] per-doc_type sub-index row pointers
+  type_docs.npy        int32 [n_typed_docs] doc ids grouped by doc_type
+  docs.jsonl           document store, one ``{"page_content", "metadata"}`` per line
+  doc_offsets.npy      int64 [n_docs + 1] byte offsets into docs.jsonl
+
+``load_bm25_index`` memory-maps every file read-only, so loading is O(1) and all
+uvicorn / MCP workers on a host share the same page-cache pages. Documents are
+decoded lazily, only for the hits a search returns.
+
+``search`` scores only the postings of the query terms, filters doc_types with
+a code lookup table, and selects the top k with ``np.partition`` instead of
+sorting the corpus.
+
+Scores are identical to ``rank_bm25.BM25Okapi.get_scores`` on the same corpus.
+The legacy ``data/bm25_index.pkl`` still loads; convert it once with
+``python -m rag.bm25_index convert``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import mmap
 import os
 import pickle
 import re
+import shutil
+import sys
+import uuid
+from bisect import bisect_left
+from collections.abc import Sequence
 from dataclasses import dataclass
+from typing import Any, Callable
 
+import numpy as np
 from langchain_core.documents import Document
-from rank_bm25 import BM25Okapi
 
 
-BM25_INDEX_PATH = os.path.join("data", "bm25_index.pkl")
+BM25_INDEX_PATH = os.path.join("data", "bm25_index")
+LEGACY_BM25_PICKLE_PATH = os.path.join("data", "bm25_index.pkl")
+
+BM25_FORMAT = "bm25-csr"
+BM25_FORMAT_VERSION = 1
+_META_FILE = "meta.json"
 
 
 def tokenize(text: str) -> list[str]:
@@ -20,34 +70,508 @@ class BM25SearchResult:
     score: float
 
 
+class _SortedVocabulary:
+    """Read-only term → id lookup over a sorted, memory-mapped term table."""
+
+    def __init__(self, blob: bytes | mmap.mmap, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, idx: int) -> bytes:
+        return self._blob[int(self._offsets[idx]) : int(self._offsets[idx + 1])]
+
+    def get(self, term: str) -> int | None:
+        # UTF-8 byte order == code point order, so bytes compare like the sorted str list.
+        key = term.encode("utf-8")
+        idx = bisect_left(self, key)
+        if idx < len(self) and self[idx] == key:
+            return idx
+        return None
+
+
+class _MmapDocumentStore(Sequence):
+    """Lazy ``Document`` sequence over docs.jsonl + byte offsets."""
+
+    def __init__(self, blob: bytes | mmap.mmap, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("document index out of range")
+        raw = self._blob[int(self._offsets[idx]) : int(self._offsets[idx + 1])]
+        record = json.loads(raw)
+        return Document(page_content=record["page_content"], metadata=record["metadata"])
+
+
 class LocalBM25Index:
-    def __init__(self, docs: list[Document]):
-        self.docs = docs
-        self.corpus = [tokenize(doc.page_content) for doc in docs]
-        self.bm25 = BM25Okapi(self.corpus) if self.corpus else None
+    """BM25Okapi over CSR postings. Build in memory from docs, or load with ``load_bm25_index``."""
+
+    def __init__(
+        self,
+        docs: list[Document],
+        *,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ):
+        self._build(docs, [tokenize(doc.page_content) for doc in docs], k1=k1, b=b, epsilon=epsilon)
+
+    def _build(
+        self,
+        docs: list[Document],
+        corpus: list[list[str]],
+        *,
+        k1: float,
+        b: float,
+        epsilon: float,
+    ) -> None:
+        self.docs: Sequence[Document] = list(docs)
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.epsilon = float(epsilon)
+        self.build_id: str | None = None
+
+        doc_freqs: list[dict[str, int]] = []
+        df: dict[str, int] = {}
+        for tokens in corpus:
+            freqs: dict[str, int] = {}
+            for token in tokens:
+                freqs[token] = freqs.get(token, 0) + 1
+            doc_freqs.append(freqs)
+            for token in freqs:
+                df[token] = df.get(token, 0) + 1
+
+        terms = sorted(df)
+        self.vocab: dict[str, int] | _SortedVocabulary = {term: i for i, term in enumerate(terms)}
+        self._terms = terms
+
+        n_docs = len(corpus)
+        self.doc_len = np.fromiter((len(t) for t in corpus), dtype=np.int32, count=n_docs)
+        total = int(self.doc_len.sum())
+        self.avgdl = total / n_docs if n_docs else 0.0
+
+        # Same idf (incl. epsilon floor for negative idf) as rank_bm25.BM25Okapi._calc_idf.
+        idf = np.zeros(len(terms), dtype=np.float64)
+        idf_sum = 0.0
+        negative: list[int] = []
+        for tid, term in enumerate(terms):
+            value = math.log(n_docs - df[term] + 0.5) - math.log(df[term] + 0.5)
+            idf[tid] = value
+            idf_sum += value
+            if value < 0:
+                negative.append(tid)
+        if terms:
+            eps = self.epsilon * (idf_sum / len(terms))
+            idf[negative] = eps
+        self.idf = idf
+
+        counts = np.zeros(len(terms) + 1, dtype=np.int64)
+        for freqs in doc_freqs:
+            for token in freqs:
+                counts[self.vocab[token] + 1] += 1
+        indptr = np.cumsum(counts, dtype=np.int64)
+        postings_docs = np.zeros(int(indptr[-1]), dtype=np.int32)
+        postings_tf = np.zeros(int(indptr[-1]), dtype=np.int32)
+        cursor = indptr[:-1].copy()
+        for doc_id, freqs in enumerate(doc_freqs):
+            for token, tf in freqs.items():
+                tid = self.vocab[token]
+                pos = cursor[tid]
+                postings_docs[pos] = doc_id
+                postings_tf[pos] = tf
+                cursor[tid] = pos + 1
+        self.postings_indptr = indptr
+        self.postings_docs = postings_docs
+        self.postings_tf = postings_tf
+        self.doc_norm = self._doc_norm(self.doc_len, self.avgdl, self.k1, self.b)
+
+        doc_type_names = sorted({str(d.metadata.get("doc_type")) for d in docs if d.metadata.get("doc_type")})
+        lookup = {name: i for i, name in enumerate(doc_type_names)}
+        self.doc_type_names = doc_type_names
+        self.doc_type_codes = np.fromiter(
+            (lookup.get(str(d.metadata.get("doc_type")), -1) for d in docs),
+            dtype=np.int16,
+            count=n_docs,
+        )
+        self.type_indptr, self.type_docs = self._type_sub_index(
+            self.doc_type_codes, len(doc_type_names)
+        )
+
+    @staticmethod
+    def _type_sub_index(codes: np.ndarray, n_types: int) -> tuple[np.ndarray, np.ndarray]:
+        """Doc ids grouped by doc_type code (ascending within each group), CSR style."""
+        typed = np.flatnonzero(codes >= 0)
+        order = typed[np.argsort(codes[typed], kind="stable")].astype(np.int32)
+        counts = np.bincount(codes[typed], minlength=n_types) if n_types else np.zeros(0, dtype=np.int64)
+        indptr = np.zeros(n_types + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(counts)
+        return indptr, order
+
+    @staticmethod
+    def _doc_norm(doc_len: np.ndarray, avgdl: float, k1: float, b: float) -> np.ndarray:
+        if not avgdl:
+            return np.full(len(doc_len), k1, dtype=np.float64)
+        return k1 * (1 - b + b * doc_len / avgdl)
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # Legacy pickle: {"docs", "corpus", "bm25": rank_bm25.BM25Okapi}. Rebuild arrays.
+        if "bm25" in state and "postings_indptr" not in state:
+            bm25 = state.get("bm25")
+            self._build(
+                state.get("docs") or [],
+                state.get("corpus") or [],
+                k1=getattr(bm25, "k1", 1.5),
+                b=getattr(bm25, "b", 0.75),
+                epsilon=getattr(bm25, "epsilon", 0.25),
+            )
+            return
+        self.__dict__.update(state)
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _accumulate(self, query_tokens: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Sparse scores for docs in the query terms' postings: (sorted doc ids, scores)."""
+        ids: list[np.ndarray] = []
+        contrib: list[np.ndarray] = []
+        for token in query_tokens:
+            tid = self.vocab.get(token)
+            if tid is None:
+                continue
+            lo, hi = int(self.postings_indptr[tid]), int(self.postings_indptr[tid + 1])
+            if hi <= lo:
+                continue
+            doc_ids = self.postings_docs[lo:hi]
+            tf = self.postings_tf[lo:hi].astype(np.float64)
+            ids.append(doc_ids)
+            contrib.append(self.idf[tid] * (tf * (self.k1 + 1) / (tf + self.doc_norm[doc_ids])))
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        # bincount sums each doc's contributions in query-term order, like get_scores' += loop.
+        doc_ids, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(contrib), minlength=len(doc_ids))
+        return doc_ids.astype(np.int64), scores
+
+    def get_scores(self, query_tokens: list[str]) -> np.ndarray:
+        """Dense BM25 scores for every doc (same values as ``BM25Okapi.get_scores``)."""
+        scores = np.zeros(len(self.doc_len), dtype=np.float64)
+        doc_ids, sparse = self._accumulate(query_tokens)
+        scores[doc_ids] = sparse
+        return scores
+
+    def _doc_type_lut(self, doc_types: list[str] | None) -> np.ndarray | None:
+        """Bool lookup table over doc_type codes (last slot = code -1 / untyped docs)."""
+        key = frozenset(doc_types or ())
+        cache = self.__dict__.setdefault("_lut_cache", {})
+        if key in cache:
+            return cache[key]
+        if not key:
+            lut = np.ones(len(self.doc_type_names) + 1, dtype=bool)
+        else:
+            lut = np.zeros(len(self.doc_type_names) + 1, dtype=bool)
+            for code, name in enumerate(self.doc_type_names):
+                lut[code] = name in key
+            if not lut.any():
+                lut = None
+        cache[key] = lut
+        return lut
+
+    def _first_allowed_ids(self, lut: np.ndarray, limit: int) -> np.ndarray:
+        """Smallest ``limit`` doc ids whose doc_type passes ``lut`` (via the per-type sub-index)."""
+        if lut.all():
+            return np.arange(min(limit, len(self.doc_len)), dtype=np.int64)
+        parts = []
+        for code in np.flatnonzero(lut[:-1]):
+            lo = int(self.type_indptr[code])
+            hi = min(int(self.type_indptr[code + 1]), lo + limit)
+            parts.append(self.type_docs[lo:hi])
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts).astype(np.int64))[:limit]
+
+    @staticmethod
+    def _top_k(doc_ids: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k best (score desc, doc id asc) without sorting everything."""
+        if len(scores) > k:
+            kth = np.partition(-scores, k - 1)[k - 1]
+            above = np.flatnonzero(-scores < kth)
+            tied = np.flatnonzero(-scores == kth)[: k - len(above)]
+            picked = np.concatenate([above, tied])
+        else:
+            picked = np.arange(len(scores))
+        order = np.lexsort((doc_ids[picked], -scores[picked]))
+        return picked[order]
 
     def search(self, query: str, k: int = 20, doc_types: list[str] | None = None) -> list[BM25SearchResult]:
-        if not self.bm25 or not self.docs:
+        """Top-k docs by BM25, restricted to ``doc_types``.
+
+        Only the query terms' postings are scored; doc_type filtering is a table
+        lookup on the matched ids. Ranking equals a stable full sort of every
+        allowed doc by score: when fewer than ``k`` docs match, zero-score docs
+        fill the tail in doc order, as the rank_bm25 implementation did.
+        """
+        if not len(self.docs) or k <= 0:
             return []
-        query_tokens = tokenize(query)
-        scores = self.bm25.get_scores(query_tokens)
-        candidates = []
-        allowed = set(doc_types or [])
-        for doc, score in zip(self.docs, scores):
-            if allowed and doc.metadata.get("doc_type") not in allowed:
-                continue
-            candidates.append(BM25SearchResult(doc=doc, score=float(score)))
-        return sorted(candidates, key=lambda item: item.score, reverse=True)[:k]
+        lut = self._doc_type_lut(doc_types)
+        if lut is None:
+            return []
+        doc_ids, scores = self._accumulate(tokenize(query))
+        keep = lut[self.doc_type_codes[doc_ids]]
+        doc_ids, scores = doc_ids[keep], scores[keep]
 
+        positive = scores > 0
+        best = self._top_k(doc_ids[positive], scores[positive], k)
+        ranked = [(int(i), float(s)) for i, s in zip(doc_ids[positive][best], scores[positive][best])]
+        if len(ranked) < k:
+            need = k - len(ranked)
+            nonzero = doc_ids[scores != 0]
+            fill = self._first_allowed_ids(lut, need + len(nonzero))
+            fill = fill[~np.isin(fill, nonzero)][:need]
+            ranked.extend((int(i), 0.0) for i in fill)
+        if len(ranked) < k:
+            negative = scores < 0
+            worst = self._top_k(doc_ids[negative], scores[negative], k - len(ranked))
+            ranked.extend(
+                (int(i), float(s)) for i, s in zip(doc_ids[negative][worst], scores[negative][worst])
+            )
+        return [BM25SearchResult(doc=self.docs[doc_id], score=score) for doc_id, score in ranked]
 
-def save_bm25_index(docs: list[Document], path: str = BM25_INDEX_PATH) -> None:
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "wb") as f:
-        pickle.dump(LocalBM25Index(docs), f)
 
+def _content_build_id(doc_lines: list[bytes], k1: float, b: float, epsilon: float) -> str:
+    digest = hashlib.sha256(f"{BM25_FORMAT}:{BM25_FORMAT_VERSION}:{k1}:{b}:{epsilon}".encode())
+    for line in doc_lines:
+        digest.update(line)
+    return digest.hexdigest()[:16]
 
-def load_bm25_index(path: str = BM25_INDEX_PATH) -> LocalBM25Index | None:
-    if not os.path.exists(path):
+
+def _write_index_dir(index: LocalBM25Index, path: str) -> str:
+    doc_lines = _doc_lines(index.docs)
+    doc_offsets = _doc_offsets(doc_lines)
+    if index._terms is not None:
+        term_bytes = [term.encode("utf-8") for term in index._terms]
+    else:
+        term_bytes = [bytes(index.vocab[i]) for i in range(len(index.vocab))]
+    term_offsets = np.zeros(len(term_bytes) + 1, dtype=np.int64)
+    if term_bytes:
+        term_offsets[1:] = np.cumsum([len(t) for t in term_bytes])
+
+    build_id = _content_build_id(doc_lines, index.k1, index.b, index.epsilon)
+    with open(os.path.join(path, "docs.jsonl"), "wb") as f:
+        f.writelines(doc_lines)
+    with open(os.path.join(path, "terms.bin"), "wb") as f:
+        f.writelines(term_bytes)
+    arrays = {
+        "term_offsets": term_offsets,
+        "idf": index.idf,
+        "postings_indptr": index.postings_indptr,
+        "postings_docs": index.postings_docs,
+        "postings_tf": index.postings_tf,
+        "doc_len": index.doc_len,
+        "doc_norm": index.doc_norm,
+        "doc_type_codes": index.doc_type_codes,
+        "type_indptr": index.type_indptr,
+        "type_docs": index.type_docs,
+        "doc_offsets": doc_offsets,
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+    meta = {
+        "format": BM25_FORMAT,
+        "format_version": BM25_FORMAT_VERSION,
+        "build_id": build_id,
+        "k1": index.k1,
+        "b": index.b,
+        "epsilon": index.epsilon,
+        "avgdl": index.avgdl,
+        "n_docs": len(index.docs),
+        "n_terms": len(index._terms),
+        "n_postings": int(index.postings_indptr[-1]),
+        "doc_types": index.doc_type_names,
+    }
+    # meta.json last: a directory without it is treated as incomplete.
+    with open(os.path.join(path, _META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return build_id
+
+
+def save_bm25_index(docs: list[Document], path: str = BM25_INDEX_PATH) -> str:
+    """Build and write the array index; returns its content-derived ``build_id``."""
+    return write_bm25_index(LocalBM25Index(docs), path)
+
+
+def write_bm25_index(index: LocalBM25Index, path: str = BM25_INDEX_PATH) -> str:
+    """Write an in-memory index to ``path`` via a temp dir + rename swap."""
+    return _write_dir_atomic(path, lambda staging: _write_index_dir(index, staging))
+
+
+def _write_dir_atomic(path: str, write: Callable[[str], str]) -> str:
+    """Run ``write(staging_dir)`` then rename-swap the staging dir into ``path``."""
+    path = os.path.normpath(path)
+    parent = os.path.dirname(path) or "."
+    os.makedirs(parent, exist_ok=True)
+    staging = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(staging)
+    try:
+        build_id = write(staging)
+        retired = None
+        if os.path.exists(path):
+            retired = f"{path}.old-{uuid.uuid4().hex[:8]}"
+            os.replace(path, retired)
+        os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    if retired:
+        # Readers that already mapped the old files keep their pages until they drop them.
+        shutil.rmtree(retired, ignore_errors=True)
+    return build_id
+
+
+def _doc_lines(docs) -> list[bytes]:
+    """docs.jsonl records, one ``{"page_content", "metadata"}`` line per document."""
+    return [
+        json.dumps(
+            {"page_content": doc.page_content, "metadata": doc.metadata},
+            ensure_ascii=False,
+            default=str,
+        ).encode("utf-8")
+        + b"\n"
+        for doc in docs
+    ]
+
+
+def _doc_offsets(doc_lines: list[bytes]) -> np.ndarray:
+    offsets = np.zeros(len(doc_lines) + 1, dtype=np.int64)
+    if doc_lines:
+        offsets[1:] = np.cumsum([len(line) for line in doc_lines])
+    return offsets
+
+
+def _map_bytes(path: str) -> bytes | mmap.mmap:
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file cannot be mapped
+            return b""
+
+
+def _load_array(path: str, name: str) -> np.ndarray:
+    file_path = os.path.join(path, f"{name}.npy")
+    try:
+        return np.load(file_path, mmap_mode="r")
+    except ValueError:  # zero-length arrays cannot be mapped
+        return np.load(file_path)
+
+
+def read_bm25_meta(path: str = BM25_INDEX_PATH) -> dict[str, Any] | None:
+    meta_path = os.path.join(path, _META_FILE)
+    if not os.path.isfile(meta_path):
         return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_mmap_index(path: str) -> LocalBM25Index:
+    meta = read_bm25_meta(path)
+    if meta is None:
+        raise FileNotFoundError(f"{path} has no {_META_FILE}")
+    if meta.get("format") != BM25_FORMAT or meta.get("format_version") != BM25_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported BM25 index format {meta.get('format')!r} v{meta.get('format_version')!r} at {path}"
+        )
+    index = LocalBM25Index.__new__(LocalBM25Index)
+    index.k1 = float(meta["k1"])
+    index.b = float(meta["b"])
+    index.epsilon = float(meta["epsilon"])
+    index.avgdl = float(meta["avgdl"])
+    index.build_id = meta.get("build_id")
+    index.doc_type_names = list(meta.get("doc_types") or [])
+    index.vocab = _SortedVocabulary(
+        _map_bytes(os.path.join(path, "terms.bin")), _load_array(path, "term_offsets")
+    )
+    index._terms = None  # type: ignore[assignment]  — mmap indexes are read-only
+    index.idf = _load_array(path, "idf")
+    index.postings_indptr = _load_array(path, "postings_indptr")
+    index.postings_docs = _load_array(path, "postings_docs")
+    index.postings_tf = _load_array(path, "postings_tf")
+    index.doc_len = _load_array(path, "doc_len")
+    index.doc_norm = _load_array(path, "doc_norm")
+    index.doc_type_codes = _load_array(path, "doc_type_codes")
+    if os.path.isfile(os.path.join(path, "type_docs.npy")):
+        index.type_indptr = _load_array(path, "type_indptr")
+        index.type_docs = _load_array(path, "type_docs")
+    else:  # written before the per-type sub-index existed
+        index.type_indptr, index.type_docs = LocalBM25Index._type_sub_index(
+            np.asarray(index.doc_type_codes), len(index.doc_type_names)
+        )
+    index.docs = _MmapDocumentStore(
+        _map_bytes(os.path.join(path, "docs.jsonl")), _load_array(path, "doc_offsets")
+    )
+    return index
+
+
+def _load_legacy_pickle(path: str) -> LocalBM25Index:
+    # Trusted, locally built artifact only — never point this at user-supplied files.
     with open(path, "rb") as f:
         return pickle.load(f)
+
+
+def load_bm25_index(path: str = BM25_INDEX_PATH) -> LocalBM25Index | None:
+    """Memory-map the array index at ``path`` (falls back to the legacy pickle)."""
+    if os.path.isdir(path) and os.path.isfile(os.path.join(path, _META_FILE)):
+        return _load_mmap_index(path)
+    if path.endswith(".pkl") and os.path.isfile(path):
+        return _load_legacy_pickle(path)
+    if os.path.normpath(path) == os.path.normpath(BM25_INDEX_PATH) and os.path.isfile(
+        LEGACY_BM25_PICKLE_PATH
+    ):
+        print(
+            f"[bm25] {path} not found; loading legacy {LEGACY_BM25_PICKLE_PATH}. "
+            "Run `python -m rag.bm25_index convert` to switch to the memory-mapped format.",
+            file=sys.stderr,
+        )
+        return _load_legacy_pickle(LEGACY_BM25_PICKLE_PATH)
+    return None
+
+
+def convert_pickle_index(
+    src: str = LEGACY_BM25_PICKLE_PATH,
+    dst: str = BM25_INDEX_PATH,
+) -> str:
+    """Convert a legacy pickled ``LocalBM25Index`` into the array format. Returns build_id."""
+    legacy = _load_legacy_pickle(src)
+    if legacy is None:
+        raise FileNotFoundError(src)
+    return write_bm25_index(legacy, dst)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="BM25 index maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="Convert legacy bm25_index.pkl to the mmap format")
+    convert.add_argument("--src", default=LEGACY_BM25_PICKLE_PATH)
+    convert.add_argument("--dst", default=BM25_INDEX_PATH)
+    info = sub.add_parser("info", help="Print meta.json of an index directory")
+    info.add_argument("--path", default=BM25_INDEX_PATH)
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        build_id = convert_pickle_index(args.src, args.dst)
+        print(f"Converted {args.src} -> {args.dst} (build_id={build_id})")
+    elif args.command == "info":
+        print(json.dumps(read_bm25_meta(args.path), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Scored candidate views for the retrieval funnel.
+
+Recall results are shared ``Document`` objects (index / vectorstore owned).
+Fusion and reranking attach scores to a ``ScoredCandidate`` instead of copying
+the document; only the final top-k are materialized into fresh Documents whose
+metadata is the source metadata followed by the scores, in the order they were set.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from langchain_core.documents import Document
+
+
+class ScoredCandidate:
+    __slots__ = ("doc", "scores")
+
+    def __init__(self, doc: Document, scores: dict[str, Any] | None = None) -> None:
+        self.doc = doc
+        self.scores = scores if scores is not None else {}
+
+    @property
+    def page_content(self) -> str:
+        return self.doc.page_content
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Metadata lookup as seen on the materialized document (scores win)."""
+        if key in self.scores:
+            return self.scores[key]
+        return self.doc.metadata.get(key, default)
+
+    def to_document(self) -> Document:
+        return Document(
+            page_content=self.doc.page_content,
+            metadata={**self.doc.metadata, **self.scores},
+            id=self.doc.id,
+        )
+
+
+def as_candidate(item: Document | ScoredCandidate) -> ScoredCandidate:
+    """Wrap a plain Document (no copy) so rerankers accept either form."""
+    if isinstance(item, ScoredCandidate):
+        return item
+    return ScoredCandidate(item)
@@ -3,25 +3,65 @@
 Funnel (industrial default):
   vector_k / keyword_k (~30)  →  RRF merge  →  Top `rerank_pool` (20)
   → Cross-Encoder fine-rank  →  Top `k` (5) to the generator.
+
+Recall routes run concurrently on a small process-wide thread pool, so a turn
+waits for the slowest route instead of the sum of them. Results are always fused
+in the fixed ``_VECTOR_ROUTES`` + keyword order, so RRF output does not depend on
+which route finished first.
 """
 
 from __future__ import annotations
 
-import copy
+import contextvars
 import re
-from typing import Any
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
 
 from langchain_core.documents import Document
 
-from core.config import ENABLE_HYDE, RERANK_POOL
+from core.config import ENABLE_HYDE, RERANK_POOL, RETRIEVAL_MAX_WORKERS
 from core.resilience import BM25_ONLY_LIMITATION_EN, record_resilience_event
-from rag.bm25_index import load_bm25_index, tokenize
+from rag.bm25_index import tokenize
+from rag.candidates import ScoredCandidate
+from rag.index_registry import get_bm25_index
 from rag.query_expansion import build_hyde_query, build_keyword_query
 
 
 # Reciprocal Rank Fusion constant. Lower => earlier ranks dominate more.
 RRF_K = 60
 
+# Fusion order of the vector routes (the keyword route is fused after them).
+_VECTOR_ROUTES = ("vector", "keyword_rewrite_vector", "hyde_vector")
+
+_ROUTE_POOL: ThreadPoolExecutor | None = None
+_ROUTE_POOL_LOCK = threading.Lock()
+
+
+def _route_pool() -> ThreadPoolExecutor | None:
+    global _ROUTE_POOL
+    if RETRIEVAL_MAX_WORKERS <= 1:
+        return None
+    with _ROUTE_POOL_LOCK:
+        if _ROUTE_POOL is None:
+            _ROUTE_POOL = ThreadPoolExecutor(
+                max_workers=RETRIEVAL_MAX_WORKERS, thread_name_prefix="retrieval"
+            )
+        return _ROUTE_POOL
+
+
+def _submit(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run ``fn`` on the route pool with the caller's contextvars (trace id etc.)."""
+    pool = _route_pool()
+    if pool is not None:
+        return pool.submit(contextvars.copy_context().run, fn, *args)
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:  # noqa: BLE001 — surfaced by future.result()
+        future.set_exception(exc)
+    return future
+
 
 class HybridRetriever:
     def __init__(
@@ -44,7 +84,7 @@ class HybridRetriever:
         self.reranker = reranker
         self._vectorstore = vectorstore
         self._vector_failed = False
-        self.bm25 = bm25 if bm25 is not None else load_bm25_index()
+        self.bm25 = bm25 if bm25 is not None else get_bm25_index()
         self.last_degraded = False
         self.last_degrade_reason: str | None = None
 
@@ -81,81 +121,104 @@ class HybridRetriever:
         self.last_degrade_reason = None
 
         vectorstore = self._get_vectorstore()
-        if vectorstore is not None:
-            try:
-                for route, vector_query, route_k in self._vector_queries(query):
-                    results = self._vector_search(vector_query, route_k)
-                    for rank, (doc, score) in enumerate(results, start=1):
-                        key = self._doc_key(doc)
-                        item = candidates.setdefault(
-                            key,
-                            {
-                                "doc": doc,
-                                "vector_score": 0.0,
-                                "keyword_score": 0.0,
-                                "rrf_score": 0.0,
-                                "routes": [],
-                            },
-                        )
-                        item["vector_score"] = max(
-                            item["vector_score"], self._normalize_vector_score(score)
-                        )
-                        item["rrf_score"] += 1.0 / (RRF_K + rank)
-                        item["routes"].append(route)
-            except Exception as exc:  # noqa: BLE001
-                self._vector_failed = True
-                self._mark_degraded(f"pinecone_search: {exc}")
-                candidates = {}
-        elif not self.last_degraded:
+        if vectorstore is None and not self.last_degraded:
             self._mark_degraded("vectorstore_unavailable")
 
-        if self.bm25:
-            keyword_query = build_keyword_query(query)
-            keyword_results = self.bm25.search(keyword_query, k=self.keyword_k, doc_types=self.doc_types)
-            max_keyword = max([item.score for item in keyword_results], default=1.0) or 1.0
-            for rank, result in enumerate(keyword_results, start=1):
-                key = self._doc_key(result.doc)
+        vector_jobs: dict[str, Future] = {}
+        if vectorstore is not None:
+            vector_jobs["vector"] = _submit(self._vector_search, query, self.vector_k)
+            if ENABLE_HYDE:
+                vector_jobs["hyde_vector"] = _submit(self._hyde_search, query)
+
+        # Keyword expansion + BM25 run on this thread while the vector routes are in flight.
+        keyword_query, keyword_results = query, []
+        if self.bm25 or vectorstore is not None:
+            keyword_query, keyword_results = self._keyword_recall(query)
+        if vectorstore is not None and keyword_query and keyword_query != query:
+            vector_jobs["keyword_rewrite_vector"] = _submit(
+                self._vector_search, keyword_query, max(self.k, 15)
+            )
+
+        vector_results: list[tuple[str, list[tuple[Document, float]]]] = []
+        try:
+            for route in _VECTOR_ROUTES:
+                if route in vector_jobs:
+                    vector_results.append((route, vector_jobs[route].result()))
+        except Exception as exc:  # noqa: BLE001
+            self._vector_failed = True
+            self._mark_degraded(f"pinecone_search: {exc}")
+            vector_results = []
+
+        for route, results in vector_results:
+            for rank, (doc, score) in enumerate(results, start=1):
+                key = self._doc_key(doc)
                 item = candidates.setdefault(
                     key,
                     {
-                        "doc": result.doc,
+                        "doc": doc,
                         "vector_score": 0.0,
                         "keyword_score": 0.0,
                         "rrf_score": 0.0,
                         "routes": [],
                     },
                 )
-                item["keyword_score"] = max(item["keyword_score"], result.score / max_keyword)
+                item["vector_score"] = max(
+                    item["vector_score"], self._normalize_vector_score(score)
+                )
                 item["rrf_score"] += 1.0 / (RRF_K + rank)
-                item["routes"].append("keyword")
+                item["routes"].append(route)
+
+        max_keyword = max([item.score for item in keyword_results], default=1.0) or 1.0
+        for rank, result in enumerate(keyword_results, start=1):
+            key = self._doc_key(result.doc)
+            item = candidates.setdefault(
+                key,
+                {
+                    "doc": result.doc,
+                    "vector_score": 0.0,
+                    "keyword_score": 0.0,
+                    "rrf_score": 0.0,
+                    "routes": [],
+                },
+            )
+            item["keyword_score"] = max(item["keyword_score"], result.score / max_keyword)
+            item["rrf_score"] += 1.0 / (RRF_K + rank)
+            item["routes"].append("keyword")
 
-        fused_docs = []
+        fused: list[ScoredCandidate] = []
         for item in candidates.values():
-            doc = copy.deepcopy(item["doc"])
+            doc = item["doc"]
             metadata_boost = self._metadata_boost(doc, query)
             fused_score = item["rrf_score"] + 0.05 * metadata_boost
-            doc.metadata["vector_score"] = round(item["vector_score"], 4)
-            doc.metadata["keyword_score"] = round(item["keyword_score"], 4)
-            doc.metadata["metadata_boost"] = round(metadata_boost, 4)
-            doc.metadata["rrf_score"] = round(item["rrf_score"], 4)
-            doc.metadata["retrieval_score"] = round(fused_score, 4)
-            doc.metadata["retrieval_routes"] = sorted(set(item["routes"]))
-            fused_docs.append(doc)
-
-        fused_docs.sort(key=lambda doc: doc.metadata.get("retrieval_score", 0.0), reverse=True)
+            fused.append(
+                ScoredCandidate(
+                    doc,
+                    {
+                        "vector_score": round(item["vector_score"], 4),
+                        "keyword_score": round(item["keyword_score"], 4),
+                        "metadata_boost": round(metadata_boost, 4),
+                        "rrf_score": round(item["rrf_score"], 4),
+                        "retrieval_score": round(fused_score, 4),
+                        "retrieval_routes": sorted(set(item["routes"])),
+                    },
+                )
+            )
+
+        fused.sort(key=lambda cand: cand.scores["retrieval_score"], reverse=True)
         pool_size = max(self.rerank_pool, self.k)
-        rerank_input = fused_docs[:pool_size]
+        rerank_input = fused[:pool_size]
 
         # Annotate pre-rerank ranks for observability / interview traces.
-        for idx, doc in enumerate(rerank_input, start=1):
-            doc.metadata["rrf_rank"] = idx
-            doc.metadata["rerank_pool_size"] = pool_size
+        for idx, cand in enumerate(rerank_input, start=1):
+            cand.scores["rrf_rank"] = idx
+            cand.scores["rerank_pool_size"] = pool_size
             if self.last_degraded:
-                doc.metadata["retrieval_degraded"] = True
-                doc.metadata["retrieval_mode"] = "bm25_only"
-                doc.metadata["retrieval_limitation"] = BM25_ONLY_LIMITATION_EN
+                cand.scores["retrieval_degraded"] = True
+                cand.scores["retrieval_mode"] = "bm25_only"
+                cand.scores["retrieval_limitation"] = BM25_ONLY_LIMITATION_EN
 
         if self.reranker:
+            # Rerankers score the views and materialize only their top-k.
             reranked = self.reranker.rerank(query, rerank_input, top_k=self.k)
             for doc in reranked:
                 funnel = (
@@ -173,21 +236,22 @@ class HybridRetriever:
                     doc.metadata["retrieval_limitation"] = BM25_ONLY_LIMITATION_EN
             return reranked
 
-        out = rerank_input[: self.k]
+        out = [cand.to_document() for cand in rerank_input[: self.k]]
         for doc in out:
             doc.metadata["retrieval_funnel"] = (
                 f"bm25_only→top{self.k}" if self.last_degraded else f"dual_recall→RRF_top{self.k}"
             )
         return out
 
-    def _vector_queries(self, query: str) -> list[tuple[str, str, int]]:
-        queries = [("vector", query, self.vector_k)]
+    def _keyword_recall(self, query: str) -> tuple[str, list[Any]]:
+        """Keyword expansion (shared with the rewrite vector route) + BM25 recall."""
         keyword_query = build_keyword_query(query)
-        if keyword_query and keyword_query != query:
-            queries.append(("keyword_rewrite_vector", keyword_query, max(self.k, 15)))
-        if ENABLE_HYDE:
-            queries.append(("hyde_vector", build_hyde_query(query), max(self.k, 15)))
-        return queries
+        if not self.bm25:
+            return keyword_query, []
+        return keyword_query, self.bm25.search(keyword_query, k=self.keyword_k, doc_types=self.doc_types)
+
+    def _hyde_search(self, query: str) -> list[tuple[Document, float]]:
+        return self._vector_search(build_hyde_query(query), max(self.k, 15))
 
     def _vector_search(self, query: str, k: int) -> list[tuple[Document, float]]:
         vectorstore = self._get_vectorstore()
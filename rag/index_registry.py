@@ -0,0 +1,156 @@
+"""Process-wide registry of loaded retrieval indexes.
+
+Each index is loaded once per process and shared by every retriever view
+(``rag.retriever.get_retriever`` builds a cheap ``HybridRetriever`` per call).
+The registry re-stats the index at most every ``INDEX_RELOAD_CHECK_SECONDS``;
+when its version stamp changes (a rebuild swapped the directory in), the new
+index is loaded outside the lock and swapped in atomically. Callers that still
+hold the old object keep using it until they finish — mmap'd pages stay valid.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from core.config import INDEX_RELOAD_CHECK_SECONDS, VECTOR_INDEX_PATH
+from rag.bm25_index import BM25_INDEX_PATH, LEGACY_BM25_PICKLE_PATH, load_bm25_index
+
+
+Stamp = Hashable | None
+
+
+@dataclass
+class _Slot:
+    value: Any
+    stamp: Stamp
+    checked_at: float
+    loads: int = 1
+    reload_errors: int = 0
+
+
+def file_stamp(path: str) -> Stamp:
+    """(inode, mtime_ns, size) — changes on rewrite and on rename-swap."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def bm25_index_stamp(path: str = BM25_INDEX_PATH) -> Stamp:
+    if os.path.isdir(path):
+        return file_stamp(os.path.join(path, "meta.json"))
+    if path.endswith(".pkl"):
+        return file_stamp(path)
+    if os.path.normpath(path) == os.path.normpath(BM25_INDEX_PATH):
+        return file_stamp(LEGACY_BM25_PICKLE_PATH)
+    return None
+
+
+def vector_index_stamp(path: str = VECTOR_INDEX_PATH) -> Stamp:
+    return file_stamp(os.path.join(path, "meta.json"))
+
+
+class IndexRegistry:
+    def __init__(self, check_interval: float | None = None) -> None:
+        self._lock = threading.Lock()
+        self._slots: dict[tuple[str, str], _Slot] = {}
+        self._load_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._check_interval = (
+            INDEX_RELOAD_CHECK_SECONDS if check_interval is None else check_interval
+        )
+
+    def get(
+        self,
+        kind: str,
+        path: str,
+        loader: Callable[[str], Any],
+        stamp: Callable[[str], Stamp],
+    ) -> Any:
+        key = (kind, os.path.normpath(path))
+        now = time.monotonic()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and now - slot.checked_at < self._check_interval:
+                return slot.value
+            # One load lock per index, so concurrent cold loads build it once.
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        current = stamp(path)
+        if slot is not None and current == slot.stamp:
+            slot.checked_at = now
+            return slot.value
+
+        with load_lock:
+            # Another thread may have reloaded while we waited.
+            with self._lock:
+                latest = self._slots.get(key)
+            if latest is not None and latest.stamp == current:
+                return latest.value
+            try:
+                value = loader(path)
+            except Exception as exc:  # noqa: BLE001 — keep serving the last good index
+                if latest is None:
+                    raise
+                latest.reload_errors += 1
+                latest.checked_at = now
+                print(f"[index_registry] reload of {kind}:{path} failed, keeping previous: {exc}", file=sys.stderr)
+                return latest.value
+            if value is None and latest is not None and latest.value is not None:
+                # Caught mid-swap (e.g. write_bm25_index renaming directories): keep the
+                # previous index and its stamp so the next check loads the finished one.
+                latest.checked_at = now
+                return latest.value
+            with self._lock:
+                loads = (latest.loads + 1) if latest is not None else 1
+                self._slots[key] = _Slot(value=value, stamp=current, checked_at=time.monotonic(), loads=loads)
+            return value
+
+    def invalidate(self, kind: str | None = None) -> None:
+        """Force the next ``get`` to re-stat (and reload if changed); ``None`` = all kinds."""
+        with self._lock:
+            for key, slot in self._slots.items():
+                if kind is None or key[0] == kind:
+                    slot.checked_at = float("-inf")
+                    slot.stamp = ("invalidated", time.monotonic_ns())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._slots.clear()
+            self._load_locks.clear()
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "kind": kind,
+                    "path": path,
+                    "loads": slot.loads,
+                    "reload_errors": slot.reload_errors,
+                    "build_id": getattr(slot.value, "build_id", None),
+                }
+                for (kind, path), slot in self._slots.items()
+            ]
+
+
+_REGISTRY = IndexRegistry()
+
+
+def get_index_registry() -> IndexRegistry:
+    return _REGISTRY
+
+
+def get_bm25_index(path: str = BM25_INDEX_PATH):
+    """Shared ``LocalBM25Index`` for this process (``None`` if no index is built)."""
+    return _REGISTRY.get("bm25", path, load_bm25_index, bm25_index_stamp)
+
+
+def get_vector_index(path: str = VECTOR_INDEX_PATH):
+    """Shared ``LocalVectorIndex`` for this process (``None`` if no index is built)."""
+    from rag.vector_index import load_vector_index
+
+    return _REGISTRY.get("vector", path, load_vector_index, vector_index_stamp)
@@ -1,10 +1,27 @@
+"""Query expansion for retrieval: keyword extraction and HyDE.
+
+LLM expansions go through ``ExpansionCache``: each (expansion type, question) is
+computed at most once per request (active trace), shared across requests via a
+bounded LRU/TTL cache, and concurrent callers for the same key wait on a single
+in-flight LLM call. Failed LLM calls fall back per call and are never cached.
+"""
+
+from __future__ import annotations
+
+import copy
 import json
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 
-from core.config import LLM_MODEL
+from core.config import LLM_MODEL, QUERY_EXPANSION_CACHE_SIZE, QUERY_EXPANSION_CACHE_TTL_SECONDS
+from core.llm import get_llm
+from observability.recorder import current_trace_id, record_step
 
 
 KEYWORD_PROMPT = """Extract retrieval keywords from the supply-chain question.
@@ -23,6 +40,138 @@ Question:
 """
 
 
+class ExpansionCache:
+    """Request-scoped memo + bounded cross-request LRU/TTL cache with in-flight dedupe."""
+
+    def __init__(
+        self,
+        max_entries: int = QUERY_EXPANSION_CACHE_SIZE,
+        ttl_seconds: float = QUERY_EXPANSION_CACHE_TTL_SECONDS,
+        max_requests: int = 64,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_requests = max_requests
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, Any]] = OrderedDict()
+        self._requests: OrderedDict[str, dict[tuple[str, str, str], Any]] = OrderedDict()
+        self._inflight: dict[tuple[str, str, str], Future] = {}
+        self._counts = {"request_hits": 0, "shared_hits": 0, "inflight_hits": 0, "misses": 0}
+
+    def get_or_compute(self, kind: str, question: str, compute: Callable[[str], Any]) -> Any:
+        key = (kind, LLM_MODEL, " ".join(question.split()))
+        trace_id = current_trace_id()
+        hit, value, future = self._lookup(key, trace_id)
+        if hit == "miss":
+            value = self._compute(key, trace_id, question, compute, future)
+        elif hit == "inflight":
+            value = future.result()
+            self._remember(key, trace_id, value)
+        if hit != "miss":
+            record_step("query_expansion_cache", tool_latency_ms=0.0, detail={"kind": kind, "hit": hit})
+        return copy.deepcopy(value)
+
+    def _lookup(self, key, trace_id: str | None) -> tuple[str, Any, Future | None]:
+        now = time.monotonic()
+        with self._lock:
+            memo = self._requests.get(trace_id) if trace_id else None
+            if memo is not None and key in memo:
+                self._counts["request_hits"] += 1
+                return "request", memo[key], None
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] > now:
+                self._entries.move_to_end(key)
+                self._counts["shared_hits"] += 1
+                value = cached[1]
+                self._memo_unlocked(key, trace_id, value)
+                return "shared", value, None
+            if cached is not None:
+                del self._entries[key]
+            future = self._inflight.get(key)
+            if future is not None:
+                self._counts["inflight_hits"] += 1
+                return "inflight", None, future
+            future = Future()
+            self._inflight[key] = future
+            self._counts["misses"] += 1
+            return "miss", None, future
+
+    def _compute(self, key, trace_id, question: str, compute, future: Future) -> Any:
+        try:
+            value = compute(question)
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            if self.max_entries > 0:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._memo_unlocked(key, trace_id, value)
+        future.set_result(value)
+        return value
+
+    def _remember(self, key, trace_id: str | None, value: Any) -> None:
+        with self._lock:
+            self._memo_unlocked(key, trace_id, value)
+
+    def _memo_unlocked(self, key, trace_id: str | None, value: Any) -> None:
+        if not trace_id:
+            return
+        memo = self._requests.get(trace_id)
+        if memo is None:
+            memo = self._requests[trace_id] = {}
+            while len(self._requests) > self.max_requests:
+                self._requests.popitem(last=False)
+        else:
+            self._requests.move_to_end(trace_id)
+        memo[key] = value
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                **self._counts,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._requests.clear()
+            for key in self._counts:
+                self._counts[key] = 0
+
+
+_CACHE = ExpansionCache()
+
+
+def get_expansion_cache() -> ExpansionCache:
+    return _CACHE
+
+
+def _llm_keywords(question: str) -> dict:
+    raw = get_llm().invoke(
+        ChatPromptTemplate.from_template(KEYWORD_PROMPT).format(question=question),
+        step_name="query_expansion_keywords",
+    ).content
+    start = raw.find("{")
+    end = raw.rfind("}")
+    return json.loads(raw[start : end + 1])
+
+
+def _llm_hyde(question: str) -> str:
+    return get_llm().invoke(
+        ChatPromptTemplate.from_template(HYDE_PROMPT).format(question=question),
+        step_name="query_expansion_hyde",
+    ).content.strip()
+
+
 def extract_keywords(question: str) -> dict:
     heuristic = {
         "suppliers": re.findall(r"\b(?:Alpha Electronics|Beta Plastics|Gamma Metals|Delta Packaging)\b", question, re.I),
@@ -33,11 +182,7 @@ def extract_keywords(question: str) -> dict:
     if any(heuristic.values()):
         return heuristic
     try:
-        llm = ChatOpenAI(model=LLM_MODEL, temperature=0)
-        raw = llm.invoke(ChatPromptTemplate.from_template(KEYWORD_PROMPT).format(question=question)).content
-        start = raw.find("{")
-        end = raw.rfind("}")
-        return json.loads(raw[start : end + 1])
+        return _CACHE.get_or_compute("keywords", question, _llm_keywords)
     except Exception:
         return heuristic
 
@@ -52,7 +197,6 @@ def build_keyword_query(question: str) -> str:
 
 def build_hyde_query(question: str) -> str:
     try:
-        llm = ChatOpenAI(model=LLM_MODEL, temperature=0)
-        return llm.invoke(ChatPromptTemplate.from_template(HYDE_PROMPT).format(question=question)).content.strip()
+        return _CACHE.get_or_compute("hyde", question, _llm_hyde)
     except Exception:
         return question
@@ -2,44 +2,58 @@
 
 Default path uses a local Cross-Encoder (BAAI/bge-reranker-base) so the
 retrieval stack is industrial-grade: dual-path recall → RRF fusion → CE rerank.
+
+Rerankers accept Documents or ``ScoredCandidate`` views, write rerank scores into
+the views' ``scores`` in place and only materialize the returned top-k as new
+Documents. Input ``Document`` objects are never mutated; the ``scores`` of
+``ScoredCandidate`` views passed in are updated.
 """
 
 from __future__ import annotations
 
-import copy
 import math
 import sys
 import time
-from typing import Protocol
+from typing import Protocol, Sequence
 
 from langchain_core.documents import Document
 
 from core.config import (
-    EMBEDDING_MODEL,
-    OPENAI_API_KEY,
     RERANKER_BACKEND,
     RERANKER_FALLBACK,
     RERANKER_MODEL,
 )
+from rag.candidates import ScoredCandidate, as_candidate
+
+Candidates = Sequence[Document | ScoredCandidate]
 
 
 class Reranker(Protocol):
     name: str
 
-    def rerank(self, query: str, docs: list[Document], top_k: int) -> list[Document]:
+    def rerank(self, query: str, docs: Candidates, top_k: int) -> list[Document]:
         ...
 
 
+def _finish(ranked: list[ScoredCandidate], top_k: int, elapsed_ms: float) -> list[Document]:
+    out = []
+    for idx, cand in enumerate(ranked[:top_k], start=1):
+        cand.scores["rerank_rank"] = idx
+        cand.scores["rerank_latency_ms"] = elapsed_ms
+        out.append(cand.to_document())
+    return out
+
+
 class NoopReranker:
     name = "none"
 
-    def rerank(self, query: str, docs: list[Document], top_k: int) -> list[Document]:
+    def rerank(self, query: str, docs: Candidates, top_k: int) -> list[Document]:
         out = []
-        for doc in docs[:top_k]:
-            copied = copy.deepcopy(doc)
-            copied.metadata["rerank_score"] = copied.metadata.get("retrieval_score", 0.0)
-            copied.metadata["reranker"] = self.name
-            out.append(copied)
+        for item in docs[:top_k]:
+            cand = as_candidate(item)
+            cand.scores["rerank_score"] = cand.get("retrieval_score", 0.0)
+            cand.scores["reranker"] = self.name
+            out.append(cand.to_document())
         return out
 
 
@@ -63,26 +77,23 @@ class CrossEncoderReranker:
         self._model = CrossEncoder(self.model_name)
         return self._model
 
-    def rerank(self, query: str, docs: list[Document], top_k: int) -> list[Document]:
+    def rerank(self, query: str, docs: Candidates, top_k: int) -> list[Document]:
         if not docs:
             return []
         started = time.perf_counter()
         model = self._ensure_model()
         pairs = [(query, doc.page_content) for doc in docs]
         scores = model.predict(pairs)
-        ranked: list[Document] = []
-        for doc, score in zip(docs, scores):
-            copied = copy.deepcopy(doc)
-            copied.metadata["rerank_score"] = float(score)
-            copied.metadata["reranker"] = self.name
-            copied.metadata["reranker_model"] = self.model_name
-            ranked.append(copied)
-        ranked.sort(key=lambda doc: doc.metadata.get("rerank_score", 0.0), reverse=True)
+        ranked: list[ScoredCandidate] = []
+        for item, score in zip(docs, scores):
+            cand = as_candidate(item)
+            cand.scores["rerank_score"] = float(score)
+            cand.scores["reranker"] = self.name
+            cand.scores["reranker_model"] = self.model_name
+            ranked.append(cand)
+        ranked.sort(key=lambda cand: cand.scores["rerank_score"], reverse=True)
         elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
-        for idx, doc in enumerate(ranked[:top_k], start=1):
-            doc.metadata["rerank_rank"] = idx
-            doc.metadata["rerank_latency_ms"] = elapsed_ms
-        return ranked[:top_k]
+        return _finish(ranked, top_k, elapsed_ms)
 
 
 class OpenAIEmbeddingReranker:
@@ -91,29 +102,27 @@ class OpenAIEmbeddingReranker:
     name = "openai"
 
     def __init__(self):
-        from langchain_openai import OpenAIEmbeddings
+        from core.embedding_cache import get_embedding_service
 
-        self.embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL, api_key=OPENAI_API_KEY)
+        # Cached per chunk text, so repeated pool members are not re-embedded per query.
+        self.embeddings = get_embedding_service()
 
-    def rerank(self, query: str, docs: list[Document], top_k: int) -> list[Document]:
+    def rerank(self, query: str, docs: Candidates, top_k: int) -> list[Document]:
         if not docs:
             return []
         started = time.perf_counter()
         vectors = self.embeddings.embed_documents([query] + [doc.page_content for doc in docs])
         query_vec = vectors[0]
         doc_vecs = vectors[1:]
-        ranked: list[Document] = []
-        for doc, vec in zip(docs, doc_vecs):
-            copied = copy.deepcopy(doc)
-            copied.metadata["rerank_score"] = round(_cosine(query_vec, vec), 4)
-            copied.metadata["reranker"] = self.name
-            ranked.append(copied)
-        ranked.sort(key=lambda doc: doc.metadata.get("rerank_score", 0.0), reverse=True)
+        ranked: list[ScoredCandidate] = []
+        for item, vec in zip(docs, doc_vecs):
+            cand = as_candidate(item)
+            cand.scores["rerank_score"] = round(_cosine(query_vec, vec), 4)
+            cand.scores["reranker"] = self.name
+            ranked.append(cand)
+        ranked.sort(key=lambda cand: cand.scores["rerank_score"], reverse=True)
         elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
-        for idx, doc in enumerate(ranked[:top_k], start=1):
-            doc.metadata["rerank_rank"] = idx
-            doc.metadata["rerank_latency_ms"] = elapsed_ms
-        return ranked[:top_k]
+        return _finish(ranked, top_k, elapsed_ms)
 
 
 def _cosine(a: list[float], b: list[float]) -> float:
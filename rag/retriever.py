@@ -1,12 +1,12 @@
 from functools import lru_cache
 
-from langchain_openai import OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 
 from core.config import (
     EMBEDDING_MODEL,
     PINECONE_HOST,
-    require_openai,
+    VECTOR_BACKEND,
+    VECTOR_INDEX_PATH,
     require_pinecone,
 )
 
@@ -27,15 +27,21 @@ def _pinecone_index():
     return pc.Index(index_name)
 
 
-@lru_cache(maxsize=1)
-def _embeddings() -> OpenAIEmbeddings:
-    return OpenAIEmbeddings(
-        model=EMBEDDING_MODEL,
-        api_key=require_openai(),
-    )
+def _embeddings():
+    """Shared cached embeddings (``core.embedding_cache``) for query and ingestion."""
+    from core.embedding_cache import get_embedding_service
+
+    return get_embedding_service()
+
+
+def get_vectorstore():
+    """Vector store for ``VECTOR_BACKEND``: Pinecone, or the local memory-mapped index."""
+    if VECTOR_BACKEND == "local":
+        return get_local_vectorstore()
+    return get_pinecone_vectorstore()
 
 
-def get_vectorstore() -> PineconeVectorStore:
+def get_pinecone_vectorstore() -> PineconeVectorStore:
     return PineconeVectorStore(
         index=_pinecone_index(),
         embedding=_embeddings(),
@@ -43,6 +49,24 @@ def get_vectorstore() -> PineconeVectorStore:
     )
 
 
+def get_local_vectorstore(path: str = VECTOR_INDEX_PATH):
+    from rag.index_registry import get_vector_index
+    from rag.vector_index import LocalVectorStore
+
+    index = get_vector_index(path)
+    if index is None:
+        raise FileNotFoundError(
+            f"Local vector index not found at {path}; "
+            "run `python ingestion/build_vectorstore.py --vector-backend local`."
+        )
+    if index.embedding_model and index.embedding_model != EMBEDDING_MODEL:
+        raise ValueError(
+            f"Local vector index was built with {index.embedding_model!r}, "
+            f"but EMBEDDING_MODEL={EMBEDDING_MODEL!r}; rebuild the index."
+        )
+    return LocalVectorStore(index, _embeddings())
+
+
 def _doc_type_filter(doc_types: list[str] | None) -> dict | None:
     if not doc_types:
         return None
@@ -61,6 +85,11 @@ def get_vector_retriever(k: int = 5, doc_types: list[str] | None = None):
 
 
 def get_retriever(k: int = 5, doc_types: list[str] | None = None):
+    """Per-call retriever view over the process-wide BM25 index and reranker.
+
+    Construction is cheap: the index comes from ``rag.index_registry`` (loaded
+    once, reloaded when the files change) and the reranker is a singleton.
+    """
     from core.config import RERANK_POOL
     from rag.hybrid_retriever import HybridRetriever
     from rag.rerank import get_reranker
@@ -0,0 +1,375 @@
+"""Local vector index: exact flat scan for small corpora, IVF for large ones.
+
+On-disk layout (one directory, default ``data/vector_index/``):
+
+  meta.json            format version, kind (flat / ivf), dim, embedding_model, nprobe, build_id
+  vectors.npy          float32 [n_docs, dim] L2-normalized, stored grouped by IVF list
+  row_docs.npy         int32 [n_docs] doc id of each stored row
+  row_type_codes.npy   int16 [n_docs] doc_type code of each stored row (-1 = none)
+  centroids.npy        float32 [n_lists, dim] IVF list centroids (one row for flat)
+  list_indptr.npy      int64 [n_lists + 1] row range of each IVF list
+  docs.jsonl           document store, one ``{"page_content", "metadata"}`` per line
+  doc_offsets.npy      int64 [n_docs + 1] byte offsets into docs.jsonl
+
+Everything is memory-mapped read-only, like ``rag.bm25_index``. Scores are cosine
+similarities. A flat index is a single list, so the scan is exact. IVF probes the
+``nprobe`` lists whose centroids are closest to the query, and widens the probe
+when a doc_type filter leaves fewer than k hits.
+
+``LocalVectorStore`` puts the index behind the same ``similarity_search_with_score``
+contract and Pinecone-style ``doc_type`` filter that ``HybridRetriever`` uses, plus
+the ``similarity_search`` / ``as_retriever`` reads ``rag.retriever`` relies on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from core.config import VECTOR_INDEX_PATH, VECTOR_IVF_MIN_DOCS, VECTOR_IVF_NPROBE
+from core.vector_math import assign_to_centroids, normalize_rows, spherical_kmeans
+from rag.bm25_index import (
+    _META_FILE,
+    _MmapDocumentStore,
+    _doc_lines,
+    _doc_offsets,
+    _load_array,
+    _map_bytes,
+    _write_dir_atomic,
+)
+
+
+VECTOR_FORMAT = "vector-ivf"
+VECTOR_FORMAT_VERSION = 1
+
+
+class LocalVectorIndex:
+    """Cosine-similarity index. Build with ``LocalVectorIndex.build`` or load with ``load_vector_index``."""
+
+    @classmethod
+    def build(
+        cls,
+        vectors: Any,
+        docs: Sequence[Document],
+        *,
+        kind: str = "auto",
+        n_lists: int | None = None,
+        nprobe: int = VECTOR_IVF_NPROBE,
+        embedding_model: str | None = None,
+        seed: int = 0,
+    ) -> "LocalVectorIndex":
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2:
+            vectors = vectors.reshape(len(docs), -1) if len(docs) else np.zeros((0, 0), np.float32)
+        vectors = normalize_rows(vectors)
+        n_docs, dim = vectors.shape
+        if kind == "auto":
+            kind = "ivf" if n_docs >= VECTOR_IVF_MIN_DOCS else "flat"
+        if kind not in {"flat", "ivf"}:
+            raise ValueError(f"Unknown vector index kind {kind!r}")
+
+        if kind == "ivf" and n_docs:
+            n_lists = min(n_lists or max(1, int(round(4 * math.sqrt(n_docs)))), n_docs)
+            centroids = spherical_kmeans(vectors, n_lists, seed=seed)
+            assign = assign_to_centroids(vectors, centroids)
+        else:
+            n_lists = 1
+            centroids = normalize_rows(vectors.mean(axis=0, keepdims=True)) if n_docs else np.zeros((1, dim), np.float32)
+            assign = np.zeros(n_docs, dtype=np.int64)
+
+        order = np.argsort(assign, kind="stable")
+        doc_type_names = sorted({str(d.metadata.get("doc_type")) for d in docs if d.metadata.get("doc_type")})
+        lookup = {name: i for i, name in enumerate(doc_type_names)}
+        codes = np.fromiter(
+            (lookup.get(str(d.metadata.get("doc_type")), -1) for d in docs), dtype=np.int16, count=n_docs
+        )
+
+        index = cls.__new__(cls)
+        index.kind = kind
+        index.dim = int(dim)
+        index.nprobe = int(nprobe)
+        index.embedding_model = embedding_model
+        index.build_id = None
+        index.docs = list(docs)
+        index.doc_type_names = doc_type_names
+        index.vectors = np.ascontiguousarray(vectors[order])
+        index.row_docs = order.astype(np.int32)
+        index.row_type_codes = codes[order]
+        index.centroids = centroids.astype(np.float32)
+        index.list_indptr = np.zeros(n_lists + 1, dtype=np.int64)
+        index.list_indptr[1:] = np.cumsum(np.bincount(assign, minlength=n_lists))
+        index._lut_cache = {}
+        return index
+
+    def __len__(self) -> int:
+        return len(self.row_docs)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.list_indptr) - 1
+
+    def _doc_type_lut(self, doc_types: list[str] | None) -> np.ndarray | None:
+        """Bool lookup over codes (last slot = code -1). ``None`` = no filter."""
+        if not doc_types:
+            return None
+        key = tuple(sorted(set(doc_types)))
+        lut = self._lut_cache.get(key)
+        if lut is None:
+            lut = np.zeros(len(self.doc_type_names) + 1, dtype=bool)
+            for i, name in enumerate(self.doc_type_names):
+                lut[i] = name in key
+            self._lut_cache[key] = lut
+        return lut
+
+    def _probe_lists(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if nprobe >= self.n_lists:
+            return np.arange(self.n_lists)
+        scores = self.centroids @ query
+        top = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def _scan(self, query: np.ndarray, lists: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(row ids, scores) of every stored row in ``lists`` (contiguous mmap slices)."""
+        if len(lists) == self.n_lists:
+            return np.arange(len(self.row_docs)), self.vectors @ query
+        rows, scores = [], []
+        for lst in lists:
+            start, end = int(self.list_indptr[lst]), int(self.list_indptr[lst + 1])
+            if end > start:
+                rows.append(np.arange(start, end))
+                scores.append(self.vectors[start:end] @ query)
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(rows), np.concatenate(scores)
+
+    def search(
+        self,
+        query_vector: Any,
+        k: int = 4,
+        doc_types: list[str] | None = None,
+        nprobe: int | None = None,
+    ) -> list[tuple[int, float]]:
+        """Top-k ``(doc_id, cosine)`` pairs, best first (ties broken by doc id)."""
+        if k <= 0 or not len(self):
+            return []
+        lut = self._doc_type_lut(doc_types)
+        if lut is not None and not lut[:-1].any():
+            return []
+        query = normalize_rows(np.asarray(query_vector, dtype=np.float32).reshape(-1))
+        probe = self.n_lists if self.kind == "flat" else max(1, nprobe or self.nprobe)
+        while True:
+            rows, scores = self._scan(query, self._probe_lists(query, probe))
+            if lut is not None:
+                keep = lut[self.row_type_codes[rows]]
+                rows, scores = rows[keep], scores[keep]
+            if len(rows) >= k or probe >= self.n_lists:
+                break
+            probe *= 2  # filter / small lists left too few hits — widen the probe
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        doc_ids = self.row_docs[rows]
+        order = np.lexsort((doc_ids, -scores))
+        return [(int(doc_ids[i]), float(scores[i])) for i in order]
+
+    def search_documents(
+        self,
+        query_vector: Any,
+        k: int = 4,
+        doc_types: list[str] | None = None,
+        nprobe: int | None = None,
+    ) -> list[tuple[Document, float]]:
+        return [(self.docs[doc_id], score) for doc_id, score in self.search(query_vector, k, doc_types, nprobe)]
+
+
+def _doc_types_from_filter(metadata_filter: dict | None) -> list[str] | None:
+    """Pinecone-style ``{"doc_type": x}`` / ``{"doc_type": {"$in"|"$eq": ...}}`` → doc_types."""
+    if not metadata_filter:
+        return None
+    unsupported = set(metadata_filter) - {"doc_type"}
+    if unsupported:
+        raise ValueError(f"Local vector index only filters on doc_type, got {sorted(unsupported)}")
+    condition = metadata_filter["doc_type"]
+    if isinstance(condition, dict):
+        if "$in" in condition:
+            return [str(v) for v in condition["$in"]]
+        if "$eq" in condition:
+            return [str(condition["$eq"])]
+        raise ValueError(f"Unsupported doc_type filter {condition!r}")
+    return [str(condition)]
+
+
+class LocalVectorStore:
+    """``similarity_search_with_score`` over a ``LocalVectorIndex`` (drop-in for PineconeVectorStore reads)."""
+
+    def __init__(self, index: LocalVectorIndex, embedding: Any):
+        self.index = index
+        self.embedding = embedding
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,
+        **kwargs: Any,
+    ) -> list[tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(
+            self.embedding.embed_query(query), k=k, filter=filter, **kwargs
+        )
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        filter: dict | None = None,
+        nprobe: int | None = None,
+    ) -> list[tuple[Document, float]]:
+        return self.index.search_documents(embedding, k=k, doc_types=_doc_types_from_filter(filter), nprobe=nprobe)
+
+    def similarity_search(
+        self,
+        query: str,
+        k: int = 4,
+        filter: dict | None = None,
+        **kwargs: Any,
+    ) -> list[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter, **kwargs)]
+
+    def as_retriever(self, search_kwargs: dict | None = None) -> LocalVectorRetriever:
+        return LocalVectorRetriever(store=self, search_kwargs=dict(search_kwargs or {}))
+
+
+class LocalVectorRetriever(BaseRetriever):
+    """``BaseRetriever`` over ``LocalVectorStore.similarity_search`` (what ``as_retriever`` returns)."""
+
+    store: Any
+    search_kwargs: dict = {}
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return self.store.similarity_search(query, **self.search_kwargs)
+
+
+def _content_build_id(doc_lines: list[bytes], vectors: np.ndarray, meta: dict[str, Any]) -> str:
+    digest = hashlib.sha256(
+        json.dumps({k: meta[k] for k in ("format", "format_version", "kind", "embedding_model", "n_lists")}).encode()
+    )
+    for line in doc_lines:
+        digest.update(line)
+    digest.update(np.ascontiguousarray(vectors).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _write_index_dir(index: LocalVectorIndex, path: str) -> str:
+    doc_lines = _doc_lines(index.docs)
+    meta = {
+        "format": VECTOR_FORMAT,
+        "format_version": VECTOR_FORMAT_VERSION,
+        "kind": index.kind,
+        "metric": "cosine",
+        "dim": index.dim,
+        "n_docs": len(index),
+        "n_lists": index.n_lists,
+        "nprobe": index.nprobe,
+        "embedding_model": index.embedding_model,
+        "doc_types": index.doc_type_names,
+    }
+    meta["build_id"] = _content_build_id(doc_lines, index.vectors, meta)
+    with open(os.path.join(path, "docs.jsonl"), "wb") as f:
+        f.writelines(doc_lines)
+    arrays = {
+        "vectors": index.vectors,
+        "row_docs": index.row_docs,
+        "row_type_codes": index.row_type_codes,
+        "centroids": index.centroids,
+        "list_indptr": index.list_indptr,
+        "doc_offsets": _doc_offsets(doc_lines),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+    # meta.json last: a directory without it is treated as incomplete.
+    with open(os.path.join(path, _META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    return meta["build_id"]
+
+
+def write_vector_index(index: LocalVectorIndex, path: str = VECTOR_INDEX_PATH) -> str:
+    """Write an in-memory index to ``path`` via a temp dir + rename swap. Returns build_id."""
+    return _write_dir_atomic(path, lambda staging: _write_index_dir(index, staging))
+
+
+def build_vector_index(
+    docs: Sequence[Document],
+    embeddings: Any,
+    path: str = VECTOR_INDEX_PATH,
+    *,
+    kind: str = "auto",
+    embedding_model: str | None = None,
+    batch_size: int = 256,
+) -> str:
+    """Embed ``docs`` in batches and write the index. Returns build_id."""
+    vectors: list[list[float]] = []
+    for start in range(0, len(docs), batch_size):
+        batch = docs[start : start + batch_size]
+        vectors.extend(embeddings.embed_documents([doc.page_content for doc in batch]))
+    index = LocalVectorIndex.build(vectors, docs, kind=kind, embedding_model=embedding_model)
+    return write_vector_index(index, path)
+
+
+def read_vector_meta(path: str = VECTOR_INDEX_PATH) -> dict[str, Any] | None:
+    meta_path = os.path.join(path, _META_FILE)
+    if not os.path.isfile(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_vector_index(path: str = VECTOR_INDEX_PATH) -> LocalVectorIndex | None:
+    """Memory-map the index at ``path``; ``None`` if it has not been built."""
+    meta = read_vector_meta(path)
+    if meta is None:
+        return None
+    if meta.get("format") != VECTOR_FORMAT or meta.get("format_version") != VECTOR_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported vector index format {meta.get('format')!r} v{meta.get('format_version')!r} at {path}"
+        )
+    index = LocalVectorIndex.__new__(LocalVectorIndex)
+    index.kind = meta["kind"]
+    index.dim = int(meta["dim"])
+    index.nprobe = int(meta.get("nprobe") or VECTOR_IVF_NPROBE)
+    index.embedding_model = meta.get("embedding_model")
+    index.build_id = meta.get("build_id")
+    index.doc_type_names = list(meta.get("doc_types") or [])
+    index.vectors = _load_array(path, "vectors")
+    index.row_docs = _load_array(path, "row_docs")
+    index.row_type_codes = _load_array(path, "row_type_codes")
+    index.centroids = np.asarray(_load_array(path, "centroids"))
+    index.list_indptr = np.asarray(_load_array(path, "list_indptr"))
+    index.docs = _MmapDocumentStore(_map_bytes(os.path.join(path, "docs.jsonl")), _load_array(path, "doc_offsets"))
+    index._lut_cache = {}
+    return index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local vector index maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="Print meta.json of an index directory")
+    info.add_argument("--path", default=VECTOR_INDEX_PATH)
+    args = parser.parse_args()
+    if args.command == "info":
+        print(json.dumps(read_vector_meta(args.path), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
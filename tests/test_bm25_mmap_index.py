@@ -0,0 +1,160 @@
+"""Array-backed BM25 index: rank_bm25 score parity, mmap round-trip, legacy pickle conversion."""
+
+from __future__ import annotations
+
+import os
+import pickle
+
+import numpy as np
+from langchain_core.documents import Document
+from rank_bm25 import BM25Okapi
+
+from rag.bm25_index import (
+    LocalBM25Index,
+    _MmapDocumentStore,
+    convert_pickle_index,
+    load_bm25_index,
+    read_bm25_meta,
+    save_bm25_index,
+    tokenize,
+)
+
+
+def _docs() -> list[Document]:
+    texts = [
+        ("ESG scoring formula details for yarn suppliers", "policy"),
+        ("Warehouse packing SOP and ESG audit checklist", "sop"),
+        ("Delivery delay clause: notify procurement of late PO", "contract"),
+        ("供应商准入需要提交 ESG 文件", "policy"),
+        ("On-time delivery rate definition", "kpi_dict"),
+        ("Delivery delay corrective action SOP", "sop"),
+    ]
+    return [
+        Document(page_content=text, metadata={"chunk_id": f"c{i}", "doc_type": doc_type})
+        for i, (text, doc_type) in enumerate(texts)
+    ]
+
+
+def test_scores_match_rank_bm25():
+    docs = _docs()
+    index = LocalBM25Index(docs)
+    reference = BM25Okapi([tokenize(d.page_content) for d in docs])
+    for query in ["ESG yarn", "delivery delay delay", "供应商 ESG", "unknown"]:
+        tokens = tokenize(query)
+        np.testing.assert_allclose(index.get_scores(tokens), reference.get_scores(tokens))
+
+
+def test_save_and_mmap_load_round_trip(tmp_path):
+    docs = _docs()
+    path = str(tmp_path / "bm25")
+    build_id = save_bm25_index(docs, path)
+
+    loaded = load_bm25_index(path)
+    assert isinstance(loaded.docs, _MmapDocumentStore)
+    assert isinstance(loaded.postings_docs, np.memmap)
+    assert loaded.build_id == build_id == read_bm25_meta(path)["build_id"]
+    assert len(loaded) == len(docs)
+    assert loaded.docs[3].page_content == docs[3].page_content
+    assert loaded.docs[3].metadata == docs[3].metadata
+
+    in_memory = LocalBM25Index(docs).search("ESG delivery", k=10, doc_types=["policy", "sop"])
+    mapped = loaded.search("ESG delivery", k=10, doc_types=["policy", "sop"])
+    assert [r.doc.metadata["chunk_id"] for r in mapped] == [r.doc.metadata["chunk_id"] for r in in_memory]
+    assert [r.score for r in mapped] == [r.score for r in in_memory]
+    assert {r.doc.metadata["doc_type"] for r in mapped} <= {"policy", "sop"}
+
+
+def test_same_corpus_gives_same_build_id(tmp_path):
+    first = save_bm25_index(_docs(), str(tmp_path / "a"))
+    second = save_bm25_index(_docs(), str(tmp_path / "a"))
+    assert first == second
+    assert not [name for name in os.listdir(tmp_path) if ".tmp-" in name or ".old-" in name]
+
+
+def test_empty_index_round_trip(tmp_path):
+    path = str(tmp_path / "empty")
+    save_bm25_index([], path)
+    loaded = load_bm25_index(path)
+    assert len(loaded) == 0
+    assert loaded.search("anything") == []
+
+
+def test_missing_index_returns_none(tmp_path):
+    assert load_bm25_index(str(tmp_path / "nope")) is None
+
+
+def test_legacy_pickle_loads_and_converts(tmp_path):
+    docs = _docs()
+    corpus = [tokenize(d.page_content) for d in docs]
+    legacy = LocalBM25Index.__new__(LocalBM25Index)
+    legacy.__dict__.update({"docs": docs, "corpus": corpus, "bm25": BM25Okapi(corpus)})
+    pkl = str(tmp_path / "bm25_index.pkl")
+    with open(pkl, "wb") as f:
+        pickle.dump(legacy, f)
+
+    restored = load_bm25_index(pkl)
+    assert restored.search("ESG yarn", k=1)[0].doc.metadata["chunk_id"] == "c0"
+
+    out = str(tmp_path / "bm25_index")
+    convert_pickle_index(pkl, out)
+    converted = load_bm25_index(out)
+    assert [r.doc.metadata["chunk_id"] for r in converted.search("delivery delay", k=3)] == [
+        r.doc.metadata["chunk_id"] for r in restored.search("delivery delay", k=3)
+    ]
+
+
+def _full_sort_reference(index: LocalBM25Index, docs, query: str, k: int, doc_types):
+    scores = index.get_scores(tokenize(query))
+    allowed = set(doc_types or [])
+    rows = [
+        (i, float(s))
+        for i, s in enumerate(scores)
+        if not allowed or docs[i].metadata.get("doc_type") in allowed
+    ]
+    return sorted(rows, key=lambda item: item[1], reverse=True)[:k]
+
+
+def test_top_k_search_matches_full_sort():
+    import random
+
+    rng = random.Random(7)
+    words = [f"w{i}" for i in range(30)]
+    docs = [
+        Document(
+            page_content=" ".join(rng.choice(words) for _ in range(rng.randint(0, 10))),
+            metadata={"chunk_id": str(i), "doc_type": rng.choice(["policy", "sop", "faq", None])},
+        )
+        for i in range(80)
+    ]
+    index = LocalBM25Index(docs)
+    for query, k, doc_types in [
+        ("w1 w2 w3", 5, None),
+        ("w1 w2 w3", 30, ["policy", "sop"]),
+        ("w7", 50, ["faq"]),
+        ("w7 w7 w8", 3, ["policy"]),
+        ("nomatch", 4, ["sop"]),
+        ("w4", 100, []),
+    ]:
+        got = [(int(r.doc.metadata["chunk_id"]), r.score) for r in index.search(query, k, doc_types)]
+        expected = _full_sort_reference(index, docs, query, k, doc_types)
+        assert [i for i, _ in got] == [i for i, _ in expected]
+        np.testing.assert_allclose([s for _, s in got], [s for _, s in expected])
+
+
+def test_search_only_materializes_returned_docs(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs(), path)
+    index = load_bm25_index(path)
+    fetched: list[int] = []
+    store = index.docs
+    original = type(store).__getitem__
+
+    class _Counting(type(store)):
+        def __getitem__(self, idx):
+            fetched.append(idx)
+            return original(self, idx)
+
+    store.__class__ = _Counting
+    assert len(index.search("ESG", k=2, doc_types=["policy"])) == 2
+    assert len(fetched) == 2
+    assert index.search("ESG", k=5, doc_types=["unknown_type"]) == []
@@ -0,0 +1,124 @@
+"""Cached answers are stamped with the data-snapshot version and the cache epoch."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import core.data_snapshot as data_snapshot
+import core.semantic_cache as semantic_cache
+from api.routes import admin
+from core import config
+from core.semantic_cache import SemanticCache
+from core.semantic_cache_backends import SqliteCacheBackend
+
+
+@pytest.fixture
+def exact_only(monkeypatch):
+    monkeypatch.setenv("ENABLE_SEMANTIC_CACHE", "true")
+    monkeypatch.setenv("SEMANTIC_CACHE_SYNC_SECONDS", "0")
+    monkeypatch.setattr(SemanticCache, "_get_embedder", lambda self: None)
+
+
+def _db(path, rows: int, user_version: int = 0) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+    conn.execute("DELETE FROM t")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(rows)])
+    conn.execute(f"PRAGMA user_version = {user_version}")
+    conn.commit()
+    conn.close()
+
+
+def test_db_fingerprint_tracks_content_and_user_version(tmp_path, monkeypatch):
+    path = str(tmp_path / "demo.db")
+    assert data_snapshot.db_fingerprint(path) == "missing"
+    _db(path, 3)
+    first = data_snapshot.db_fingerprint(path)
+    assert first.startswith("uv0-")
+    monkeypatch.setattr(data_snapshot.hashlib, "sha256", None)  # memoized while the file is unchanged
+    assert data_snapshot.db_fingerprint(path) == first
+    monkeypatch.undo()
+    _db(path, 4, user_version=7)
+    assert data_snapshot.db_fingerprint(path).startswith("uv7-")
+
+
+def test_db_fingerprint_tracks_wal_commits_without_hashing_the_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "wal.db")
+    _db(path, 3)
+    writer = sqlite3.connect(path)
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("PRAGMA wal_autocheckpoint=0")
+    seen = {data_snapshot.db_fingerprint(path)}
+    reads: list[int] = []
+    real_open = open
+
+    def counting_open(file, mode="r", *args, **kwargs):
+        handle = real_open(file, mode, *args, **kwargs)
+        if "b" in mode:
+            real_read = handle.read
+            handle.read = lambda n=-1: reads.append(n) or real_read(n)
+        return handle
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    for i in range(3):
+        writer.execute("INSERT INTO t VALUES (?)", (100 + i,))
+        writer.commit()
+        seen.add(data_snapshot.db_fingerprint(path))
+    writer.close()
+    assert len(seen) == 4
+    assert reads and max(reads) <= 100  # headers only
+
+
+def test_snapshot_version_changes_with_any_component():
+    base = {"db": "uv0-a", "bm25": "b1", "vectors": "pinecone", "graph": "g1"}
+    assert data_snapshot.snapshot_version(base) == data_snapshot.snapshot_version(dict(base))
+    for key in base:
+        assert data_snapshot.snapshot_version({**base, key: "changed"}) != data_snapshot.snapshot_version(base)
+
+
+def test_stale_entries_are_dropped_lazily(exact_only):
+    cache = SemanticCache()
+    cache.put("OTD for SUP003?", "en", {"answer": "92%"}, version="v1")
+    cache.put("ESG policy?", "en", {"answer": "pillars"}, version="v1")
+    assert cache.get("OTD for SUP003?", "en", version="v1")["answer"] == "92%"
+    assert cache.get("OTD for SUP003?", "en", version="v2") is None
+    stats = cache.stats()
+    assert stats["evictions_stale"] == 2 and stats["size"] == 0
+
+    cache.put("OTD for SUP003?", "en", {"answer": "94%"}, version="v2")
+    assert cache.get("OTD for SUP003?", "en", version="v2")["answer"] == "94%"
+    cache.bump_epoch()
+    assert cache.get("OTD for SUP003?", "en", version="v2") is None
+
+
+def test_epoch_bump_is_shared_through_backend(exact_only, tmp_path):
+    path = str(tmp_path / "semcache.sqlite")
+    worker_a = SemanticCache(backend=SqliteCacheBackend(path))
+    worker_b = SemanticCache(backend=SqliteCacheBackend(path))
+    worker_a.put("OTD?", "en", {"answer": "92%"}, version="v1")
+    assert worker_b.get("OTD?", "en", version="v1")["answer"] == "92%"
+    assert worker_b.get("OTD?", "en", version="v0") is None  # other snapshot never loads from L2
+    worker_a.bump_epoch()
+    assert worker_b.get("OTD?", "en", version="v1") is None
+    assert worker_b.stats()["epoch"] == 1
+
+
+def test_admin_endpoints_require_token_and_bump(exact_only, monkeypatch):
+    monkeypatch.setattr(semantic_cache, "_CACHE", SemanticCache())
+    app = FastAPI()
+    app.include_router(admin.router)
+    client = TestClient(app)
+
+    monkeypatch.setattr(config, "ADMIN_API_TOKEN", None)
+    assert client.post("/api/admin/cache/bump").status_code == 403
+    monkeypatch.setattr(config, "ADMIN_API_TOKEN", "s3cret")
+    assert client.post("/api/admin/cache/bump", headers={"X-Admin-Token": "nope"}).status_code == 401
+
+    before = client.get("/api/admin/cache", headers={"X-Admin-Token": "s3cret"}).json()
+    assert set(before["components"]) == {"db", "bm25", "vectors", "graph"}
+    after = client.post("/api/admin/cache/bump", headers={"X-Admin-Token": "s3cret"}).json()
+    assert after["epoch"] == before["epoch"] + 1
@@ -0,0 +1,112 @@
+"""run_copilot single-flight: concurrent identical questions share one graph run. No LLM required."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+import api.services.copilot as copilot
+import core.semantic_cache as semantic_cache
+import observability.store as trace_store
+from core.semantic_cache import SemanticCache
+from core.singleflight import SingleFlight
+from observability.store import TraceStore
+
+
+class _SlowGraph:
+    def __init__(self, *, ambiguity: str | None = None, fail: bool = False):
+        self.calls = 0
+        self.ambiguity = ambiguity
+        self.fail = fail
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def invoke(self, initial, config):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return {
+            "answer": f"OTD answer for {initial['thread_id']}",
+            "intent": "kpi_query",
+            "confidence": 0.9,
+            "ambiguity_type": self.ambiguity,
+            "citations": [{"source": "kpi"}],
+        }
+
+    def get_state(self, config):
+        raise KeyError("no checkpoint")
+
+
+@pytest.fixture
+def graph(monkeypatch, tmp_path):
+    monkeypatch.setenv("ENABLE_SEMANTIC_CACHE", "true")
+    monkeypatch.setattr(SemanticCache, "_get_embedder", lambda self: None)
+    monkeypatch.setattr(semantic_cache, "_CACHE", SemanticCache())
+    monkeypatch.setattr(trace_store, "_store", TraceStore(db_path=str(tmp_path / "traces.db")))
+    monkeypatch.setattr(copilot, "_COPILOT_FLIGHTS", SingleFlight())
+    fake = _SlowGraph()
+    monkeypatch.setattr(copilot, "get_graph", lambda key: fake)
+    return fake
+
+
+def _burst(questions: list[str], graph: _SlowGraph, **kwargs) -> list:
+    results: list = [None] * len(questions)
+
+    def worker(i: int) -> None:
+        try:
+            results[i] = copilot.run_copilot(questions[i], "en", **kwargs)
+        except Exception as exc:  # noqa: BLE001 - surfaced to the assertions
+            results[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(questions))]
+    for t in threads:
+        t.start()
+    deadline = time.time() + 5
+    while copilot._COPILOT_FLIGHTS.stats()["followers"] + graph.calls < len(questions) and time.time() < deadline:
+        time.sleep(0.01)
+    graph.release.set()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_identical_questions_share_one_run(graph):
+    results = _burst(["What is SUP003 OTD?", "what is sup003   OTD?", "What is SUP003 OTD?"], graph)
+    assert graph.calls == 1
+    assert len({r["thread_id"] for r in results}) == 3
+    assert len({r["trace_id"] for r in results}) == 3
+    assert len({r["answer"] for r in results}) == 1
+    assert sum(bool(r.get("coalesced")) for r in results) == 2
+    follower = next(r for r in results if r.get("coalesced"))
+    steps = trace_store.get_store().list_steps(follower["trace_id"])
+    assert steps[0]["tool_called"] == "copilot_singleflight"
+    # The leader's answer was cached; a later request is a plain cache hit.
+    assert copilot.run_copilot("What is SUP003 OTD?", "en")["cache_hit"] is True
+
+
+def test_ineligible_paths_do_not_coalesce(graph):
+    graph.release.set()
+    copilot.run_copilot("Compare SUP003", "en", supplier_id="SUP003")
+    copilot.run_copilot("Compare SUP003", "en", supplier_id="SUP003")
+    assert graph.calls == 2
+    assert copilot._COPILOT_FLIGHTS.stats()["leaders"] == 0
+
+
+def test_followers_rerun_when_leader_needs_clarification(graph):
+    graph.ambiguity = "missing_entity"
+    results = _burst(["Compare them", "Compare them"], graph)
+    assert graph.calls == 2
+    assert all(r["clarification_required"] for r in results)
+    assert not any(r.get("coalesced") for r in results)
+
+
+def test_leader_failure_propagates_to_followers(graph):
+    graph.fail = True
+    results = _burst(["OTD?", "OTD?"], graph)
+    assert graph.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert copilot._COPILOT_FLIGHTS.in_flight() == 0
@@ -0,0 +1,106 @@
+"""Embedding cache: memory/SQLite tiers, batched upstream calls, shared by the semantic cache."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+import core.embedding_cache as embedding_cache
+from core.embedding_cache import CachedEmbeddings
+from core.semantic_cache import SemanticCache
+
+
+class _FakeEmbeddings:
+    def __init__(self, fail: bool = False):
+        self.calls: list[list[str]] = []
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.calls.append(list(texts))
+        if self.fail:
+            raise ConnectionError("embedding API down")
+        return [[float(len(t)), float(sum(map(ord, t)) % 97), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_memory_tier_and_in_call_dedupe():
+    upstream = _FakeEmbeddings()
+    cache = CachedEmbeddings(upstream, "fake", db_path=None, batch_window_ms=0)
+    first = cache.embed_documents(["a", "bb", "a"])
+    assert upstream.calls == [["a", "bb"]]
+    assert first[0] == first[2] == [1.0, 0.0, 1.0]
+    assert cache.embed_query("bb") == first[1]
+    assert upstream.calls == [["a", "bb"]]
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "emb.sqlite")
+    upstream = _FakeEmbeddings()
+    CachedEmbeddings(upstream, "fake", db_path=path, batch_window_ms=0).embed_documents(["ESG policy", "OTD"])
+    restarted = CachedEmbeddings(upstream, "fake", db_path=path, batch_window_ms=0)
+    assert restarted.embed_documents(["OTD", "ESG policy"]) == _FakeEmbeddings().embed_documents(["OTD", "ESG policy"])
+    assert len(upstream.calls) == 1
+    assert restarted.stats()["disk_hits"] == 2
+    # A different model never reuses another model's vectors.
+    CachedEmbeddings(upstream, "other", db_path=path, batch_window_ms=0).embed_query("OTD")
+    assert len(upstream.calls) == 2
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    upstream = _FakeEmbeddings()
+    cache = CachedEmbeddings(upstream, "fake", db_path=None, batch_window_ms=100)
+    barrier = threading.Barrier(6)
+    results: dict[int, list[float]] = {}
+
+    def worker(i: int) -> None:
+        barrier.wait()
+        results[i] = cache.embed_query(f"question {i % 3}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(upstream.calls) == 1
+    assert sorted(upstream.calls[0]) == ["question 0", "question 1", "question 2"]
+    assert results[0] == results[3]
+
+
+def test_upstream_failure_propagates_and_is_not_cached():
+    upstream = _FakeEmbeddings(fail=True)
+    cache = CachedEmbeddings(upstream, "fake", db_path=None, batch_window_ms=0)
+    with pytest.raises(ConnectionError):
+        cache.embed_query("q")
+    upstream.fail = False
+    assert cache.embed_query("q") == upstream.embed_query("q")
+    assert len(upstream.calls) == 3
+
+
+def test_short_upstream_response_fails_every_waiter_instead_of_hanging():
+    class _Short(_FakeEmbeddings):
+        def embed_documents(self, texts):
+            return super().embed_documents(texts)[:-1]
+
+    cache = CachedEmbeddings(_Short(), "fake", db_path=None, batch_window_ms=0)
+    with pytest.raises(RuntimeError, match="returned 1 vectors for 2 texts"):
+        cache.embed_documents(["a", "bb"])
+    assert not cache._inflight
+
+
+def test_semantic_cache_embeds_question_once_per_miss(monkeypatch):
+    monkeypatch.setenv("ENABLE_SEMANTIC_CACHE", "true")
+    upstream = _FakeEmbeddings()
+    service = CachedEmbeddings(upstream, "fake", db_path=None, batch_window_ms=0)
+    monkeypatch.setattr(embedding_cache, "get_embedding_service", lambda: service)
+    cache = SemanticCache()
+    assert cache.get("How is ESG score calculated?", "en") is None
+    cache.put("How is ESG score calculated?", "en", {"answer": "weighted pillars"})
+    assert len(upstream.calls) == 1
+    hit = cache.get("how is esg score   calculated?", "en")
+    assert hit is not None and hit["cache_mode"] == "exact"
@@ -0,0 +1,141 @@
+"""Concurrent recall routes: wall time ~ slowest route, fusion order unchanged."""
+
+from __future__ import annotations
+
+import contextvars
+import time
+
+from langchain_core.documents import Document
+
+import observability.recorder as recorder
+import rag.hybrid_retriever as hybrid_mod
+from observability.recorder import _active_trace_id
+from rag.bm25_index import LocalBM25Index
+from rag.hybrid_retriever import HybridRetriever
+
+DELAY = 0.2
+
+
+def _docs() -> list[Document]:
+    texts = [
+        ("ESG scoring formula details for yarn suppliers", "policy"),
+        ("Warehouse packing SOP and ESG audit checklist", "sop"),
+        ("Delivery delay clause: notify procurement of late PO", "contract"),
+        ("Delivery delay corrective action SOP", "sop"),
+    ]
+    return [
+        Document(page_content=text, metadata={"chunk_id": f"c{i}", "doc_type": doc_type})
+        for i, (text, doc_type) in enumerate(texts)
+    ]
+
+
+class _SlowStore:
+    """Each query returns the corpus in a query-dependent order after a fixed delay."""
+
+    def __init__(self, docs: list[Document]):
+        self.docs = docs
+        self.trace_ids: list[str | None] = []
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        self.trace_ids.append(_active_trace_id.get())
+        time.sleep(DELAY)
+        shift = len(query) % len(self.docs)
+        ordered = self.docs[shift:] + self.docs[:shift]
+        return [(doc, 0.9 - 0.1 * i) for i, doc in enumerate(ordered[:k])]
+
+
+def _patch_expansion(monkeypatch):
+    monkeypatch.setattr(hybrid_mod, "ENABLE_HYDE", True)
+    monkeypatch.setattr(hybrid_mod, "build_keyword_query", lambda q: "ESG delivery delay")
+    monkeypatch.setattr(hybrid_mod, "build_hyde_query", lambda q: f"hypothetical answer to {q}")
+
+
+def _retrieve(store) -> list[Document]:
+    retriever = HybridRetriever(k=4, reranker=None, bm25=LocalBM25Index(_docs()), vectorstore=store)
+    return retriever.invoke("How is ESG score calculated?")
+
+
+def _fingerprint(docs: list[Document]) -> list[tuple]:
+    return [
+        (d.metadata["chunk_id"], d.metadata["rrf_score"], tuple(d.metadata["retrieval_routes"]))
+        for d in docs
+    ]
+
+
+def test_vector_routes_run_concurrently(monkeypatch):
+    _patch_expansion(monkeypatch)
+    started = time.perf_counter()
+    out = _retrieve(_SlowStore(_docs()))
+    elapsed = time.perf_counter() - started
+    # Three vector routes; the rewrite route starts once keyword expansion is done.
+    assert elapsed < 2.5 * DELAY
+    routes = {route for doc in out for route in doc.metadata["retrieval_routes"]}
+    assert routes == {"vector", "keyword_rewrite_vector", "hyde_vector", "keyword"}
+
+
+def test_concurrent_fusion_matches_sequential(monkeypatch):
+    _patch_expansion(monkeypatch)
+    concurrent = _fingerprint(_retrieve(_SlowStore(_docs())))
+    monkeypatch.setattr(hybrid_mod, "RETRIEVAL_MAX_WORKERS", 1)
+    sequential = _fingerprint(_retrieve(_SlowStore(_docs())))
+    assert concurrent == sequential
+
+
+def test_route_workers_see_caller_trace_context(monkeypatch):
+    _patch_expansion(monkeypatch)
+    store = _SlowStore(_docs())
+    token = _active_trace_id.set("trace-123")
+    try:
+        _retrieve(store)
+    finally:
+        _active_trace_id.reset(token)
+    assert store.trace_ids and set(store.trace_ids) == {"trace-123"}
+
+
+def test_concurrent_routes_record_unique_step_numbers(monkeypatch):
+    steps: list[int] = []
+
+    class _Store:
+        def create_trace(self, trace_id, **kwargs):
+            pass
+
+        def add_step(self, **kwargs):
+            steps.append(kwargs["step_num"])
+
+    def _traced(text):
+        def expand(q):
+            recorder.record_step("llm")
+            time.sleep(DELAY / 4)
+            return text
+
+        return expand
+
+    monkeypatch.setattr(recorder, "get_store", lambda: _Store())
+    monkeypatch.setattr(hybrid_mod, "ENABLE_HYDE", True)
+    monkeypatch.setattr(hybrid_mod, "build_keyword_query", _traced("ESG delivery delay"))
+    monkeypatch.setattr(hybrid_mod, "build_hyde_query", _traced("hypothetical answer"))
+
+    def run():
+        recorder.start_trace("How is ESG score calculated?")
+        recorder.record_step("route")
+        _retrieve(_SlowStore(_docs()))
+        recorder.record_step("answer")
+
+    contextvars.copy_context().run(run)
+    assert sorted(steps) == [1, 2, 3, 4]  # route, keyword rewrite, HyDE, answer
+
+
+def test_one_failed_route_degrades_to_bm25_only(monkeypatch):
+    _patch_expansion(monkeypatch)
+
+    class _HydeDown(_SlowStore):
+        def similarity_search_with_score(self, query, k=4, **kwargs):
+            if query.startswith("hypothetical"):
+                raise ConnectionError("pinecone unreachable")
+            return super().similarity_search_with_score(query, k=k, **kwargs)
+
+    retriever = HybridRetriever(k=2, reranker=None, bm25=LocalBM25Index(_docs()), vectorstore=_HydeDown(_docs()))
+    out = retriever.invoke("How is ESG score calculated?")
+    assert retriever.last_degraded is True
+    assert retriever.last_degrade_reason.startswith("pinecone_search")
+    assert all(d.metadata["retrieval_routes"] == ["keyword"] for d in out)
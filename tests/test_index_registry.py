@@ -0,0 +1,128 @@
+"""Shared index registry: load once, reload on rebuild, keep serving on a bad reload."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from langchain_core.documents import Document
+
+from rag.bm25_index import load_bm25_index, save_bm25_index
+from rag.index_registry import IndexRegistry, bm25_index_stamp
+
+
+def _docs(text: str) -> list[Document]:
+    return [Document(page_content=text, metadata={"chunk_id": "c0", "doc_type": "policy"})]
+
+
+def _get(registry: IndexRegistry, path: str):
+    return registry.get("bm25", path, load_bm25_index, bm25_index_stamp)
+
+
+def test_index_is_loaded_once_and_shared(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs("ESG policy"), path)
+    registry = IndexRegistry(check_interval=0)
+    first = _get(registry, path)
+    assert _get(registry, path) is first
+    assert registry.stats()[0]["loads"] == 1
+
+
+def test_rebuild_is_picked_up(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs("ESG policy"), path)
+    registry = IndexRegistry(check_interval=0)
+    old = _get(registry, path)
+
+    save_bm25_index(_docs("delivery delay clause"), path)
+    new = _get(registry, path)
+    assert new is not old
+    assert new.build_id != old.build_id
+    assert new.search("delivery", k=1)[0].doc.page_content == "delivery delay clause"
+    # Callers still holding the previous index keep working after the swap.
+    assert old.search("ESG", k=1)[0].doc.page_content == "ESG policy"
+
+
+def test_check_interval_throttles_restat(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs("ESG policy"), path)
+    registry = IndexRegistry(check_interval=3600)
+    first = _get(registry, path)
+    save_bm25_index(_docs("delivery delay clause"), path)
+    assert _get(registry, path) is first
+    registry.invalidate("bm25")
+    assert _get(registry, path) is not first
+
+
+def test_failed_reload_keeps_previous_index(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs("ESG policy"), path)
+    registry = IndexRegistry(check_interval=0)
+    good = _get(registry, path)
+
+    def broken_loader(_path):
+        raise ValueError("half-written index")
+
+    registry.invalidate()
+    assert registry.get("bm25", path, broken_loader, bm25_index_stamp) is good
+    assert registry.stats()[0]["reload_errors"] == 1
+
+
+def test_concurrent_cold_loads_build_the_index_once(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs("ESG policy"), path)
+    registry = IndexRegistry(check_interval=0)
+    calls: list[str] = []
+    barrier = threading.Barrier(8)
+
+    def slow_loader(p):
+        calls.append(p)
+        time.sleep(0.05)
+        return load_bm25_index(p)
+
+    def worker(out: list):
+        barrier.wait()
+        out.append(registry.get("bm25", path, slow_loader, bm25_index_stamp))
+
+    results: list = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+
+
+def test_reload_that_finds_no_index_keeps_previous(tmp_path):
+    path = str(tmp_path / "bm25")
+    save_bm25_index(_docs("ESG policy"), path)
+    registry = IndexRegistry(check_interval=0)
+    good = _get(registry, path)
+
+    registry.invalidate()
+    assert registry.get("bm25", path, lambda _p: None, bm25_index_stamp) is good  # directory mid-swap
+    save_bm25_index(_docs("delivery delay clause"), path)
+    fresh = _get(registry, path)
+    assert fresh is not good and fresh.search("delivery", k=1)[0].doc.page_content == "delivery delay clause"
+
+
+def test_missing_index_is_none_until_built(tmp_path):
+    path = str(tmp_path / "bm25")
+    registry = IndexRegistry(check_interval=0)
+    assert _get(registry, path) is None
+    save_bm25_index(_docs("ESG policy"), path)
+    assert _get(registry, path) is not None
+
+
+def test_get_retriever_reuses_process_index(monkeypatch):
+    import rag.rerank as rerank_mod
+    from rag.index_registry import get_bm25_index
+    from rag.retriever import get_retriever
+
+    monkeypatch.setattr(rerank_mod, "_RERANKER_SINGLETON", rerank_mod.NoopReranker())
+    a = get_retriever(k=2, doc_types=["policy"])
+    b = get_retriever(k=5, doc_types=["sop"])
+    assert a.bm25 is b.bm25 is get_bm25_index()
+    assert (a.k, a.doc_types) == (2, ["policy"])
+    assert (b.k, b.doc_types) == (5, ["sop"])
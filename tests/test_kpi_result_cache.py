@@ -0,0 +1,91 @@
+"""KPI result cache: template/AST keys, snapshot invalidation, size limits, cache-hit metadata."""
+
+from __future__ import annotations
+
+import shutil
+import sqlite3
+
+import pytest
+
+import mcp_server.tools as mcp_tools
+import tools.result_cache as result_cache
+import tools.sql_tools as sql_tools
+from tools.result_cache import QueryResultCache
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = QueryResultCache(max_entries=64, max_bytes=1 << 20)
+    monkeypatch.setattr(result_cache, "_CACHE", fresh)
+    return fresh
+
+
+def test_template_result_is_served_from_cache(cache):
+    first = mcp_tools.query_kpi_impl(metric="spend", question="Spend by Kraljic quadrant")
+    second = mcp_tools.query_kpi_impl(metric="spend", question="Spend by Kraljic quadrant")
+    assert first["template_id"] == "spend_by_kraljic"
+    assert first["meta"]["cache_hit"] is False and second["meta"]["cache_hit"] is True
+    assert second["meta"]["source_latency_ms"] == first["meta"]["latency_ms"]
+    assert second["rows"] == first["rows"]
+
+    second["rows"][0]["supplier_count"] = -1  # callers own their copy
+    third = mcp_tools.query_kpi_impl(metric="spend", question="Spend by Kraljic quadrant")
+    assert third["rows"] == first["rows"]
+    assert cache.stats()["hits"] == 2 and cache.stats()["size"] == 1
+
+
+def test_llm_sql_shares_entry_by_normalized_ast(cache):
+    a = mcp_tools.query_kpi_impl(sql="SELECT supplier_id FROM suppliers WHERE risk_level = 'High'")
+    b = mcp_tools.query_kpi_impl(sql="select supplier_id\n  from suppliers /* llm */ where risk_level='High';")
+    assert a["meta"]["cache_hit"] is False and b["meta"]["cache_hit"] is True
+    assert b["rows"] == a["rows"]
+    with pytest.raises(mcp_tools.ToolValidationError):
+        mcp_tools.query_kpi_impl(sql="DELETE FROM suppliers WHERE risk_level = 'High'")
+
+
+def test_params_and_volatile_sql(cache):
+    sql = "SELECT supplier_id FROM suppliers WHERE supplier_id = ?"
+    assert sql_tools.run_sql_query(sql, ("SUP012",)) == [{"supplier_id": "SUP012"}]
+    assert sql_tools.run_sql_query(sql, ("SUP003",)) == [{"supplier_id": "SUP003"}]
+    volatile = "SELECT date('now') AS today FROM suppliers LIMIT 1"
+    sql_tools.run_sql_query(volatile)
+    assert sql_tools.run_sql_query_with_meta(volatile)["meta"]["cache_hit"] is False
+    assert cache.stats()["size"] == 2
+
+
+def test_db_change_invalidates(cache, tmp_path, monkeypatch):
+    path = str(tmp_path / "demo.db")
+    shutil.copy(resolve_db_path(), path)
+    pool = ReadOnlyPool(path)
+    monkeypatch.setattr(sql_tools, "get_read_pool", lambda: pool)
+    sql = "SELECT risk_level FROM suppliers WHERE supplier_id = 'SUP012'"
+    before = sql_tools.run_sql_query_with_meta(sql)["rows"]
+    assert sql_tools.run_sql_query_with_meta(sql)["meta"]["cache_hit"] is True
+
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE suppliers SET risk_level = 'Changed' WHERE supplier_id = 'SUP012'")
+    conn.commit()
+    conn.close()
+    after = sql_tools.run_sql_query_with_meta(sql)
+    assert after["meta"]["cache_hit"] is False
+    assert after["rows"] == [{"risk_level": "Changed"}] != before
+
+
+def test_entry_and_byte_limits():
+    small = QueryResultCache(max_entries=2, max_bytes=400)
+    row = [{"v": "x" * 40}]
+    small.put(("a",), row, 1.0)
+    small.put(("b",), row, 1.0)
+    assert small.get(("a",)) is not None
+    small.put(("c",), row, 1.0)
+    assert small.get(("b",)) is None and small.get(("a",)) is not None  # LRU by entry count
+
+    small.put(("big",), [{"v": "y" * 200}], 1.0)
+    assert small.get(("big",)) is None and small.stats()["oversize"] == 1
+
+    bytes_bound = QueryResultCache(max_entries=100, max_bytes=400)
+    for i in range(10):
+        bytes_bound.put((i,), row, 1.0)
+    stats = bytes_bound.stats()
+    assert stats["bytes"] <= 400 and stats["size"] < 10 and bytes_bound.get((9,)) is not None
@@ -0,0 +1,109 @@
+"""Monthly KPI rollup: incremental refresh matches a rebuild, templates fall back while it is stale."""
+
+from __future__ import annotations
+
+import shutil
+import sqlite3
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import tools.kpi_rollup as kpi_rollup
+import tools.sql_tools as sql_tools
+from api.routes import workbench
+from tools.kpi_sql_builder import build_kpi_sql
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+
+@pytest.fixture
+def demo_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "demo.db")
+    shutil.copy(resolve_db_path("data/ratti_source/ratti_copilot_demo.db"), path)
+    pool = ReadOnlyPool(path)
+    monkeypatch.setattr(kpi_rollup, "get_read_pool", lambda: pool)
+    monkeypatch.setattr(sql_tools, "get_read_pool", lambda: pool)
+    return path
+
+
+def _append_deliveries(path: str, rows: list[tuple]) -> None:
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO delivery_events (delivery_id, supplier_id, actual_delivery_date, delivery_delay_days, on_time_flag)"
+        " VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def _rollup(path: str) -> list[tuple]:
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT * FROM kpi_monthly_rollup ORDER BY supplier_id, month").fetchall()
+    finally:
+        conn.close()
+
+
+def test_incremental_refresh_matches_full_rebuild(demo_db):
+    first = kpi_rollup.refresh_rollups(demo_db)
+    assert first["rows_folded"] == {"delivery_events": 550, "quality_events": 109, "purchase_orders": 550}
+
+    _append_deliveries(demo_db, [("DX1", "SUP012", "2025-12-03", 4, 0), ("DX2", "SUP999", "2026-03-01", 0, 1)])
+    second = kpi_rollup.refresh_rollups(demo_db)
+    assert second["rows_folded"] == {"delivery_events": 2, "quality_events": 0, "purchase_orders": 0}
+    incremental = _rollup(demo_db)
+
+    kpi_rollup.refresh_rollups(demo_db, full=True)
+    assert _rollup(demo_db) == incremental
+
+
+def test_refresh_with_nothing_new_leaves_the_file_untouched(demo_db, monkeypatch):
+    kpi_rollup.refresh_rollups(demo_db)
+    with open(demo_db, "rb") as f:
+        before = f.read()
+
+    class _Later(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2099, 1, 1, tzinfo=tz)
+
+    monkeypatch.setattr(kpi_rollup, "datetime", _Later)
+    idle = kpi_rollup.refresh_rollups(demo_db)
+    assert set(idle["rows_folded"].values()) == {0}
+    with open(demo_db, "rb") as f:
+        assert f.read() == before  # no state rewrite, so caches keyed on the DB stay valid
+
+
+def test_templates_read_rollup_only_while_current(demo_db, monkeypatch):
+    parse = {"metric": "on_time_rate"}
+    assert "delivery_events" in build_kpi_sql("On-time rate for Fabrics suppliers", parse).sql  # not built yet
+
+    kpi_rollup.refresh_rollups(demo_db)
+    template = build_kpi_sql("On-time rate for Fabrics suppliers in 2025", parse)
+    assert "kpi_monthly_rollup" in template.sql and template.params == ("Fabrics", "2025", "2025")
+    via_rollup = sql_tools.run_sql_query(template.sql, template.params)
+
+    _append_deliveries(demo_db, [("DX1", "SUP002", "2025-06-01", 9, 0)])
+    stale = build_kpi_sql("On-time rate for Fabrics suppliers in 2025", parse)
+    assert "delivery_events" in stale.sql
+    raw = {r["supplier_id"]: r for r in sql_tools.run_sql_query(stale.sql, stale.params)}
+    assert raw["SUP002"]["delivery_count"] == 11
+
+    kpi_rollup.refresh_rollups(demo_db)
+    fresh = build_kpi_sql("On-time rate for Fabrics suppliers in 2025", parse)
+    assert {r["supplier_id"]: r for r in sql_tools.run_sql_query(fresh.sql, fresh.params)} == raw
+    assert len(via_rollup) == len(raw)
+
+    monkeypatch.setattr(kpi_rollup, "KPI_USE_ROLLUP", False)
+    assert not kpi_rollup.rollup_ready()
+
+
+def test_workbench_trend_comes_from_rollup():
+    app = FastAPI()
+    app.include_router(workbench.router)
+    detail = TestClient(app).get("/api/workbench/suppliers/SUP021").json()
+    trend = kpi_rollup.supplier_kpi_trend("SUP021")
+    assert trend is not None and detail["kpi_trend"] == trend
+    assert len(trend["months"]) == len(trend["otd"]) == len(trend["defect"]) <= 6
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import pytest
+
+import tools.kpi_rollup as kpi_rollup
+import tools.kpi_sql_builder as kpi_sql_builder
 from core.demo_constants import DEMO_CURRENT_DATE
 from tools.kpi_sql_builder import build_kpi_sql
 from tools.sql_tools import run_sql_query_with_meta
 
 
+@pytest.fixture(autouse=True)
+def raw_event_templates(monkeypatch):
+    """Pin the raw-event templates; the rollup variant is tested on its own below."""
+    monkeypatch.setattr(kpi_rollup, "KPI_USE_ROLLUP", False)
+
+
 def test_defect_rate_year_changes_result():
     q_2025 = "Show the defect rate of yarn suppliers in 2025"
     q_2026 = "Show the defect rate of yarn suppliers in 2026"
@@ -40,3 +50,17 @@ def test_certificates_use_demo_as_of_not_now():
     result = run_sql_query_with_meta(tpl.sql, params=tpl.params)
     assert "executed_sql" in result["meta"]
     assert "now" not in result["meta"]["executed_sql"].lower()
+
+
+def test_year_filter_on_the_monthly_rollup_matches_raw_events(monkeypatch):
+    question = "Show on-time delivery rate of fabric suppliers in 2025"
+    raw = build_kpi_sql(question, {"metric": "on_time_rate"})
+    monkeypatch.setattr(kpi_sql_builder, "rollup_ready", lambda: True)
+    rolled = build_kpi_sql(question, {"metric": "on_time_rate"})
+    assert rolled is not None and rolled.template_id == raw.template_id
+    assert "substr(r.month, 1, 4)" in rolled.sql and "strftime" not in rolled.sql
+    assert "2025" in rolled.params
+    assert (
+        run_sql_query_with_meta(rolled.sql, params=rolled.params)["rows"]
+        == run_sql_query_with_meta(raw.sql, params=raw.params)["rows"]
+    )
@@ -0,0 +1,235 @@
+"""MCP client session pool: least-busy dispatch, health pings, standby failover and restart, shared sync/async helpers.
+
+Sessions are fakes behind the pool's ``connect`` hook; no MCP server subprocess is spawned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import app.services.mcp_client as mcp_client
+from app.services.mcp_client import McpSessionPool, McpToolError
+
+
+class _FakeServer:
+    """Counts connections; each connection gets a numbered fake ClientSession."""
+
+    def __init__(self, *, delay: float = 0.0, startup: float = 0.0):
+        self.delay = delay
+        self.startup = startup
+        self.connects = 0
+        self.broken: set[int] = set()  # connection numbers whose next call fails at transport level
+        self.hang: set[int] = set()
+        self.dead: set[int] = set()  # subprocess gone: pings fail too
+
+    def connect(self):
+        server = self
+
+        @asynccontextmanager
+        async def _connect():
+            server.connects += 1
+            number = server.connects
+            await asyncio.sleep(server.startup)
+            yield _FakeSession(server, number)
+
+        return _connect()
+
+
+class _FakeSession:
+    def __init__(self, server: _FakeServer, number: int):
+        self.server = server
+        self.number = number
+
+    async def send_ping(self):
+        if self.number in self.server.dead:
+            raise BrokenPipeError("server process exited")
+
+    async def list_tools(self):
+        return SimpleNamespace(tools=[SimpleNamespace(name="query_kpi", description="KPI", inputSchema={})])
+
+    async def call_tool(self, name, arguments=None):
+        if self.number in self.server.hang:
+            await asyncio.sleep(60)
+        if self.number in self.server.broken or self.number in self.server.dead:
+            self.server.broken.discard(self.number)
+            raise BrokenPipeError("server process exited")
+        await asyncio.sleep(self.server.delay)
+        if name == "bad":
+            return SimpleNamespace(content=[SimpleNamespace(text="invalid arguments")], isError=True)
+        payload = {"rows": [{"session": self.number, "n": (arguments or {}).get("n")}], "ok": True}
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps(payload))], isError=False)
+
+
+@pytest.fixture
+def make_pool():
+    pools: list[McpSessionPool] = []
+
+    def _make(server: _FakeServer, size: int, **kwargs) -> McpSessionPool:
+        kwargs.setdefault("standby", 0)
+        pool = McpSessionPool(size, connect=server.connect, start_timeout=5, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.close()
+
+
+def _wait_healthy(pool: McpSessionPool, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not all(s["healthy"] for s in pool.stats()):
+        time.sleep(0.01)
+
+
+def test_parallel_calls_spread_over_least_busy_sessions(make_pool):
+    server = _FakeServer(delay=0.2)
+    pool = make_pool(server, 3)
+    results: list[dict] = []
+    lock = threading.Lock()
+
+    def worker(n: int) -> None:
+        out = pool.run(pool.call_tool("query_kpi", {"n": n}))
+        with lock:
+            results.append(out["rows"][0])
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    assert sorted(r["n"] for r in results) == list(range(6))
+    assert elapsed < 0.2 * 6 * 0.6  # one session would need 1.2 s
+    assert [s["calls"] for s in pool.stats()] == [2, 2, 2]
+    assert all(s["inflight"] == 0 and s["healthy"] for s in pool.stats())
+
+
+def test_transport_failure_retries_elsewhere_and_restarts_the_session(make_pool):
+    server = _FakeServer()
+    pool = make_pool(server, 2)
+    server.broken.add(1)
+    out = pool.run(pool.call_tool("query_kpi", {"n": 1}))
+    assert out["rows"][0]["session"] == 2
+
+    _wait_healthy(pool)
+    stats = pool.stats()
+    assert server.connects == 3 and all(s["healthy"] for s in stats)
+    assert stats[0]["failures"] == 1 and "BrokenPipeError" in stats[0]["last_error"]
+
+    with pytest.raises(McpToolError, match="invalid arguments"):
+        pool.run(pool.call_tool("bad"))
+    assert server.connects == 3  # tool errors are results, not session failures
+
+
+def test_hung_session_times_out_and_single_slot_pool_recovers(make_pool):
+    server = _FakeServer()
+    pool = make_pool(server, 1, call_timeout=0.1)
+    server.hang.add(1)
+    started = time.perf_counter()
+    out = pool.run(pool.call_tool("query_kpi", {"n": 7}))
+    assert out["rows"][0] == {"session": 2, "n": 7}
+    assert time.perf_counter() - started < 2
+    assert pool.stats()[0]["failures"] == 1
+    assert pool.supervisor_stats()["restarts"] == 1
+
+
+def test_failed_restarts_are_not_counted(make_pool):
+    server = _FakeServer()
+    pool = make_pool(server, 2, failover_wait=0.2)
+
+    @asynccontextmanager
+    async def refuse():
+        raise OSError("spawn failed")
+        yield  # pragma: no cover
+
+    pool._connect = refuse
+    server.broken.add(1)
+    assert pool.run(pool.call_tool("query_kpi", {"n": 1}))["rows"][0]["session"] == 2
+    time.sleep(0.1)
+    assert pool.supervisor_stats()["restarts"] == 0
+    assert "spawn failed" in pool.stats()[0]["last_error"]
+
+
+def test_sync_and_async_helpers_share_one_pool(make_pool, monkeypatch):
+    server = _FakeServer()
+    pool = make_pool(server, 2)
+    monkeypatch.setattr(mcp_client, "_POOL", pool)
+
+    async def gather():
+        return await asyncio.gather(*(mcp_client.acall_tool("query_kpi", {"n": n}) for n in range(4)))
+
+    assert [r["rows"][0]["n"] for r in asyncio.run(gather())] == [0, 1, 2, 3]
+    assert [t.name for t in mcp_client.list_tools()] == ["query_kpi"]
+    assert mcp_client.call_tool("query_kpi", {"n": 9})["rows"][0]["n"] == 9
+    assert sum(s["calls"] for s in mcp_client.mcp_pool_stats()) == 6
+    assert server.connects == 2
+
+
+def test_pool_fails_when_no_session_starts():
+    @asynccontextmanager
+    async def refuse():
+        raise OSError("spawn failed")
+        yield  # pragma: no cover
+
+    with pytest.raises(RuntimeError, match="failed to start: spawn failed"):
+        McpSessionPool(2, connect=refuse, start_timeout=1)
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not condition():
+        time.sleep(0.01)
+
+
+def test_failed_session_is_swapped_for_the_warm_standby(make_pool):
+    server = _FakeServer(startup=0.3)
+    pool = make_pool(server, 1, standby=1)
+    _wait_for(lambda: pool.supervisor_stats()["standby_ready"] == 1)
+    server.broken.add(1)
+
+    started = time.perf_counter()
+    out = pool.run(pool.call_tool("query_kpi", {"n": 1}))
+    assert out["rows"][0]["session"] == 2
+    assert time.perf_counter() - started < 0.1  # no subprocess startup on the request path
+    assert pool.supervisor_stats()["failovers"] == 1 and pool.stats()[0]["failures"] == 1
+
+    _wait_for(lambda: pool.supervisor_stats()["standby_ready"] == 1)
+    assert server.connects == 3  # the standby was replaced in the background
+
+
+def test_supervisor_pings_and_replaces_a_dead_idle_session(make_pool):
+    server = _FakeServer()
+    pool = make_pool(server, 2, standby=1, health_interval=0.05, ping_timeout=0.5)
+    _wait_for(lambda: pool.supervisor_stats()["standby_ready"] == 1)
+    server.dead.add(1)
+
+    _wait_for(lambda: pool.supervisor_stats()["failovers"] == 1 and pool.stats()[0]["healthy"])
+    stats = pool.stats()
+    assert all(s["healthy"] for s in stats) and "ping failed" in stats[0]["last_error"]
+    out = [pool.run(pool.call_tool("query_kpi", {"n": n}))["rows"][0]["session"] for n in range(4)]
+    assert 1 not in out
+
+
+def test_calls_fail_fast_while_no_session_is_up_and_startup_is_off_the_request_path(make_pool):
+    server = _FakeServer(startup=0.5)
+    started = time.perf_counter()
+    pool = make_pool(server, 1, wait=False, failover_wait=0.1)
+    assert time.perf_counter() - started < 0.1
+
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError, match="No healthy MCP session within 0.1s"):
+        pool.run(pool.call_tool("query_kpi", {"n": 1}))
+    assert time.perf_counter() - started < 0.4
+
+    _wait_healthy(pool)
+    assert pool.run(pool.call_tool("query_kpi", {"n": 2}))["rows"][0] == {"session": 1, "n": 2}
+    assert pool.supervisor_stats()["restarts"] == 0  # the background cold start is not a recovery
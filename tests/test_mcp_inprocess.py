@@ -0,0 +1,85 @@
+"""In-process MCP transport: same arguments, errors, payloads and trace steps as the stdio server."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+
+import pytest
+
+import app.services.mcp_client as mcp_client
+import observability.recorder as recorder
+from app.services import mcp_inprocess
+from app.services.mcp_client import McpToolError, _parse_tool_payload
+from mcp_server.tools import TOOL_IMPLS, dumps_tool_result
+
+
+@pytest.mark.parametrize(
+    ("name", "arguments"),
+    [
+        ("query_kpi", {"supplier_id": "SUP012", "metric": "supplier_status"}),
+        ("query_kpi", {"sql": "SELECT supplier_id, risk_level FROM suppliers LIMIT 3"}),
+        ("score_supplier_risk", {"supplier_id": "sup012", "as_of_date": "2025-10-01"}),
+        ("score_suppliers_risk", {"supplier_ids": ["SUP012", "SUP003"], "include_events": False}),
+    ],
+)
+def test_payload_matches_what_the_stdio_client_decodes(name, arguments, monkeypatch):
+    returned: list[dict] = []
+    impl = TOOL_IMPLS[name]
+
+    @functools.wraps(impl)
+    def capture(**kwargs):
+        returned.append(impl(**kwargs))
+        return returned[-1]
+
+    monkeypatch.setitem(TOOL_IMPLS, name, capture)
+    payload = mcp_inprocess.call_tool(name, arguments)
+    assert payload == _parse_tool_payload(dumps_tool_result(returned[0]))
+
+
+def test_errors_carry_the_server_text(monkeypatch):
+    @functools.wraps(TOOL_IMPLS["query_kpi"])
+    def _boom(**_kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(TOOL_IMPLS, "query_kpi", _boom)
+    with pytest.raises(McpToolError, match=r"^MCP tool '[a-z_]+' error: Error executing tool score_supplier_risk: Invalid supplier_id"):
+        mcp_inprocess.call_tool("score_supplier_risk", {"supplier_id": "ABC"})
+    with pytest.raises(McpToolError, match=r"^MCP tool '[a-z_]+' error: Error executing tool score_supplier_risk: 1 validation error"):
+        mcp_inprocess.call_tool("score_supplier_risk", {})  # missing required argument
+    with pytest.raises(McpToolError, match=r"^MCP tool '[a-z_]+' error: Error executing tool query_kpi: 1 validation error.*\nmetric"):
+        mcp_inprocess.call_tool("query_kpi", {"metric": ["not", "a", "string"]})
+    with pytest.raises(McpToolError, match=r"^MCP tool '[a-z_]+' error: Error executing tool query_kpi: query_kpi failed: boom$"):
+        mcp_inprocess.call_tool("query_kpi", {"sql": "SELECT 1"})
+    with pytest.raises(McpToolError, match=r"Unknown tool: drop_tables$"):
+        mcp_inprocess.call_tool("drop_tables", {})
+
+
+def test_tool_steps_are_not_recorded_into_the_callers_trace(monkeypatch):
+    steps: list[str] = []
+
+    class _Store:
+        def add_step(self, **kwargs):
+            steps.append(kwargs["tool_called"])
+
+    monkeypatch.setattr(recorder, "get_store", lambda: _Store())
+    token = recorder._active_trace_id.set("trace-1")
+    try:
+        mcp_inprocess.call_tool("query_kpi", {"sql": "SELECT supplier_id FROM suppliers LIMIT 2"})
+        assert steps == [] and recorder.current_trace_id() == "trace-1"
+        recorder.record_step("mcp_call")
+    finally:
+        recorder._active_trace_id.reset(token)
+    assert steps == ["mcp_call"]
+
+
+def test_transport_selector_routes_without_a_pool(monkeypatch):
+    monkeypatch.setattr(mcp_client, "MCP_TRANSPORT", "inprocess")
+    monkeypatch.setattr(mcp_client, "get_mcp_pool", lambda: pytest.fail("stdio pool used"))
+
+    tools = {t.name: t for t in mcp_client.list_tools()}
+    assert set(tools) == set(TOOL_IMPLS)
+    assert "supplier_id" in tools["score_supplier_risk"].input_schema["required"]
+    assert mcp_client.call_tool("score_supplier_risk", {"supplier_id": "SUP012"})["supplier_id"] == "SUP012"
+    out = asyncio.run(mcp_client.acall_tool("score_suppliers_risk", {"supplier_ids": "SUP012", "include_events": False}))
+    assert [r["supplier_id"] for r in out["results"]] == ["SUP012"]
@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import shutil
+import sqlite3
+
 import pytest
 
-from mcp_server.tools import ToolValidationError, query_kpi_impl, score_supplier_risk_impl
+import tools.sql_tools as sql_tools
+from mcp_server.tools import (
+    ToolValidationError,
+    query_kpi_impl,
+    score_supplier_risk_impl,
+    score_suppliers_risk_impl,
+)
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
 
 
 def test_query_kpi_rejects_empty_args():
@@ -75,3 +85,34 @@ def test_assessment_risk_branch_reuses_score_supplier_risk():
     assert risk["band"] == scored["band"]
     assert risk["rows"] == scored["events"]
     assert risk["quality_rows"] == scored["quality_events"]
+
+
+def test_score_suppliers_risk_matches_single_contract(tmp_path, monkeypatch):
+    path = str(tmp_path / "demo.db")
+    shutil.copy(resolve_db_path(), path)
+    conn = sqlite3.connect(path)
+    conn.executemany(  # ties on (score, date) must rank the same way in both paths
+        "INSERT INTO risk_events (risk_event_id, supplier_id, risk_type, risk_score_1_25, event_date)"
+        " VALUES (?, 'SUP007', 'Tie', 25, '2025-11-30')",
+        [(f"RX{i}",) for i in range(12)],
+    )
+    conn.commit()
+    conn.close()
+    pool = ReadOnlyPool(path)
+    monkeypatch.setattr(sql_tools, "get_read_pool", lambda: pool)
+
+    batch = score_suppliers_risk_impl("all", as_of_date="2025-10-01")
+    assert batch["count"] == 60 and batch["source"] == "mcp:score_suppliers_risk"
+    assert sum(batch["bands"].values()) == 60
+    for result in batch["results"]:
+        assert result == score_supplier_risk_impl(result["supplier_id"], as_of_date="2025-10-01")
+
+
+def test_score_suppliers_risk_ids_and_validation():
+    batch = score_suppliers_risk_impl("sup012, SUP003 SUP012")
+    assert [r["supplier_id"] for r in batch["results"]] == ["SUP012", "SUP003"]
+    assert score_suppliers_risk_impl(["SUP999"])["results"][0]["drivers"] == ["baseline"]
+    with pytest.raises(ToolValidationError, match="Invalid supplier_id"):
+        score_suppliers_risk_impl(["SUP012", "ABC"])
+    with pytest.raises(ToolValidationError, match="at least one"):
+        score_suppliers_risk_impl([])
@@ -0,0 +1,119 @@
+"""Query expansion memoization: once per request, shared LRU/TTL, single in-flight LLM call."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import rag.query_expansion as qe
+from observability.recorder import _active_trace_id
+
+# No supplier / metric / policy / country terms, so the heuristic finds nothing and the LLM path runs.
+QUESTION = "Which vendors should we worry about next quarter?"
+
+
+class _FakeLLM:
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.calls: list[str] = []
+        self.delay = delay
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt, step_name=None):
+        with self._lock:
+            self.calls.append(step_name)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("openai unreachable")
+        if step_name == "query_expansion_hyde":
+            return SimpleNamespace(content=" Beta Plastics has a high risk score. ")
+        return SimpleNamespace(content='{"suppliers": ["Beta Plastics"], "metrics": ["risk score"]}')
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    llm = _FakeLLM()
+    monkeypatch.setattr(qe, "get_llm", lambda: llm)
+    monkeypatch.setattr(qe, "_CACHE", qe.ExpansionCache(max_entries=8, ttl_seconds=60))
+    steps: list[tuple[str, dict]] = []
+    monkeypatch.setattr(qe, "record_step", lambda name, **kw: steps.append((name, kw.get("detail"))))
+    llm.steps = steps
+    return llm
+
+
+def test_keyword_and_hyde_call_llm_once_each(fake_llm):
+    assert qe.build_keyword_query(QUESTION) == "Beta Plastics risk score"
+    assert qe.build_keyword_query(QUESTION) == "Beta Plastics risk score"
+    assert qe.build_hyde_query(QUESTION) == "Beta Plastics has a high risk score."
+    assert qe.build_hyde_query(QUESTION) == "Beta Plastics has a high risk score."
+    assert fake_llm.calls == ["query_expansion_keywords", "query_expansion_hyde"]
+    assert [detail for _, detail in fake_llm.steps] == [
+        {"kind": "keywords", "hit": "shared"},
+        {"kind": "hyde", "hit": "shared"},
+    ]
+
+
+def test_heuristic_match_skips_llm(fake_llm):
+    assert "OTD" in qe.build_keyword_query("Alpha Electronics OTD trend")
+    assert fake_llm.calls == []
+
+
+def test_request_memo_survives_shared_cache_expiry(fake_llm, monkeypatch):
+    monkeypatch.setattr(qe, "_CACHE", qe.ExpansionCache(max_entries=0, ttl_seconds=0))
+    token = _active_trace_id.set("trace-a")
+    try:
+        qe.build_keyword_query(QUESTION)
+        qe.build_keyword_query(QUESTION)
+    finally:
+        _active_trace_id.reset(token)
+    assert fake_llm.calls == ["query_expansion_keywords"]
+    assert fake_llm.steps[-1][1] == {"kind": "keywords", "hit": "request"}
+
+    # A new request with the shared tier disabled expands again.
+    token = _active_trace_id.set("trace-b")
+    try:
+        qe.build_keyword_query(QUESTION)
+    finally:
+        _active_trace_id.reset(token)
+    assert len(fake_llm.calls) == 2
+
+
+def test_ttl_expiry_and_lru_bound(fake_llm, monkeypatch):
+    cache = qe.ExpansionCache(max_entries=1, ttl_seconds=60)
+    monkeypatch.setattr(qe, "_CACHE", cache)
+    qe.build_hyde_query(QUESTION)
+    qe.build_hyde_query("Another unrelated question?")
+    assert cache.stats()["entries"] == 1
+    qe.build_hyde_query(QUESTION)
+    assert len(fake_llm.calls) == 3
+
+    cache.ttl_seconds = 0
+    cache.clear()
+    qe.build_hyde_query(QUESTION)
+    qe.build_hyde_query(QUESTION)
+    assert len(fake_llm.calls) == 5
+
+
+def test_concurrent_callers_share_one_llm_call(fake_llm):
+    fake_llm.delay = 0.1
+    results: list[str] = []
+    threads = [threading.Thread(target=lambda: results.append(qe.build_hyde_query(QUESTION))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(fake_llm.calls) == 1
+    assert set(results) == {"Beta Plastics has a high risk score."}
+    assert qe.get_expansion_cache().stats()["inflight_hits"] == 4
+
+
+def test_llm_failure_falls_back_and_is_not_cached(fake_llm):
+    fake_llm.fail = True
+    assert qe.build_hyde_query(QUESTION) == QUESTION
+    assert qe.build_keyword_query(QUESTION) == QUESTION
+    fake_llm.fail = False
+    assert qe.build_hyde_query(QUESTION) == "Beta Plastics has a high risk score."
+    assert len(fake_llm.calls) == 3
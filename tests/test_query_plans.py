@@ -0,0 +1,118 @@
+"""Index migration + EXPLAIN QUERY PLAN regression: registered SQL never full-scans a fact table."""
+
+from __future__ import annotations
+
+import re
+import shutil
+import sqlite3
+
+import pytest
+import sqlglot
+from sqlglot import exp
+
+import graph.assessment  # noqa: F401  registers the assessment branch SQL
+import mcp_server.tools  # noqa: F401  registers the risk-scoring SQL
+import tools.kpi_sql_builder as kpi
+from tools.db_migrations import LATEST_VERSION, migrate, schema_version
+from tools.sql_guard import registered_sql
+from tools.sql_pool import resolve_db_path
+
+# Fact tables grow with order volume; dimension tables (one row per supplier) may be scanned.
+LARGE_TABLES = {"purchase_orders", "delivery_events", "quality_events", "risk_events", "documents"}
+
+
+def _build_every_template() -> set[str]:
+    built = [
+        kpi._yarn_otd_and_defect("2025"),
+        kpi._spend_by_kraljic(),
+        kpi._certificates_expiring_soon(60),
+        kpi._strategic_vendor_rating_rank(),
+        kpi._esg_below_threshold_missing_docs(60),
+        kpi._supplier_status_snapshot("SUP012"),
+    ]
+    for rollup in (False, True):  # raw event tables and kpi_monthly_rollup variants
+        built.append(kpi._avg_delay_above_threshold(5.0, rollup))
+        for year in ("2025", None):
+            built += [
+                kpi._on_time_rate_by_category("Yarns", year, rollup),
+                kpi._on_time_rate_by_supplier_id("SUP012", year, rollup),
+                kpi._defect_rate_by_category("Yarns", year, rollup),
+            ]
+    built += [kpi._vendor_rating_snapshot("SUP012", year) for year in ("2025", None)]
+    return {t.template_id for t in built}
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    tree = sqlglot.parse_one(sql, read="sqlite")
+    return {t.alias_or_name.lower(): t.name.lower() for t in tree.find_all(exp.Table)}
+
+
+def _scanned_large_tables(conn: sqlite3.Connection, sql: str) -> list[str]:
+    aliases = _aliases(sql)
+    scans = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", (None,) * sql.count("?")):
+        match = re.match(r"SCAN (\w+)", row[3])
+        if match and aliases.get(match.group(1).lower(), match.group(1).lower()) in LARGE_TABLES:
+            scans.append(row[3])
+    return scans
+
+
+def test_every_template_is_covered():
+    source = open(kpi.__file__, encoding="utf-8").read()
+    assert _build_every_template() == set(re.findall(r'template_id="(\w+)"', source))
+
+
+def test_shipped_db_is_migrated():
+    conn = sqlite3.connect(resolve_db_path())
+    try:
+        assert schema_version(conn) == LATEST_VERSION
+    finally:
+        conn.close()
+
+
+def test_registered_sql_uses_indexes_on_large_tables():
+    _build_every_template()
+    statements = registered_sql()
+    assert len(statements) >= 20
+    conn = sqlite3.connect(resolve_db_path())
+    try:
+        offenders = {sql[:80]: scans for sql in statements if (scans := _scanned_large_tables(conn, sql))}
+    finally:
+        conn.close()
+    assert offenders == {}
+
+
+def test_migration_is_versioned_and_idempotent(tmp_path):
+    path = str(tmp_path / "demo.db")
+    shutil.copy(resolve_db_path("data/ratti_source/ratti_copilot_demo.db"), path)
+    conn = sqlite3.connect(path)
+    before = schema_version(conn)
+    conn.close()
+    assert before == 0
+    assert migrate(path) == ["0001_secondary_indexes", "0002_kpi_monthly_rollup"]
+    assert migrate(path) == []
+
+    conn = sqlite3.connect(path)
+    try:
+        assert schema_version(conn) == LATEST_VERSION
+        sql = "SELECT COUNT(*) FROM quality_events WHERE supplier_id = ?"
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("SUP012",)).fetchall()
+        assert "ix_quality_events_supplier" in plan[0][3]
+    finally:
+        conn.close()
+
+
+def test_failed_migration_rolls_back(tmp_path):
+    path = str(tmp_path / "broken.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE suppliers (supplier_id TEXT)")
+    conn.commit()
+    conn.close()
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(path)  # purchase_orders does not exist
+    conn = sqlite3.connect(path)
+    try:
+        assert schema_version(conn) == 0
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'").fetchone()[0] == 0
+    finally:
+        conn.close()
@@ -0,0 +1,84 @@
+"""Copy-free fusion/rerank: shared recall Documents are never mutated, only top-k materialized."""
+
+from __future__ import annotations
+
+from langchain_core.documents import Document
+
+from rag.bm25_index import LocalBM25Index
+from rag.candidates import ScoredCandidate
+from rag.hybrid_retriever import HybridRetriever
+from rag.rerank import CrossEncoderReranker, NoopReranker
+
+
+def _docs(n: int = 12) -> list[Document]:
+    return [
+        Document(
+            page_content=f"ESG delivery clause {i} " + "padding " * i,
+            metadata={"chunk_id": f"c{i}", "doc_type": "policy", "source_name": f"p{i}.txt"},
+        )
+        for i in range(n)
+    ]
+
+
+class _Store:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def similarity_search_with_score(self, query, k=4, **kwargs):
+        return [(doc, 0.9 - 0.01 * i) for i, doc in enumerate(reversed(self.docs[:k]))]
+
+
+class _FakeCE:
+    def predict(self, pairs):
+        return [float(len(text) % 7) for _, text in pairs]
+
+
+def test_invoke_leaves_shared_documents_untouched():
+    docs = _docs()
+    snapshot = [dict(d.metadata) for d in docs]
+    retriever = HybridRetriever(
+        k=3, reranker=NoopReranker(), bm25=LocalBM25Index(docs), vectorstore=_Store(docs)
+    )
+    out = retriever.invoke("ESG delivery clause")
+    assert [dict(d.metadata) for d in docs] == snapshot
+    assert all(doc is not src for doc in out for src in docs)
+    assert list(out[0].metadata)[:3] == ["chunk_id", "doc_type", "source_name"]
+    assert list(out[0].metadata)[3:] == [
+        "vector_score",
+        "keyword_score",
+        "metadata_boost",
+        "rrf_score",
+        "retrieval_score",
+        "retrieval_routes",
+        "rrf_rank",
+        "rerank_pool_size",
+        "rerank_score",
+        "reranker",
+        "retrieval_funnel",
+    ]
+
+
+def test_only_final_top_k_is_materialized(monkeypatch):
+    made: list[str] = []
+    original = ScoredCandidate.to_document
+
+    def counting(self):
+        made.append(self.doc.metadata["chunk_id"])
+        return original(self)
+
+    monkeypatch.setattr(ScoredCandidate, "to_document", counting)
+    reranker = CrossEncoderReranker(model_name="fake")
+    monkeypatch.setattr(reranker, "_ensure_model", lambda: _FakeCE())
+    docs = _docs()
+    retriever = HybridRetriever(k=3, reranker=reranker, bm25=LocalBM25Index(docs), vectorstore=_Store(docs))
+    out = retriever.invoke("ESG delivery clause")
+    assert len(out) == len(made) == 3
+    assert out[0].metadata["rerank_rank"] == 1
+    assert out[0].metadata["reranker_model"] == "fake"
+
+
+def test_rerankers_accept_plain_documents_without_mutating_them():
+    docs = [Document(page_content="a", metadata={"retrieval_score": 0.8})]
+    out = NoopReranker().rerank("q", docs, top_k=1)
+    assert out[0].metadata == {"retrieval_score": 0.8, "rerank_score": 0.8, "reranker": "none"}
+    assert docs[0].metadata == {"retrieval_score": 0.8}
@@ -0,0 +1,169 @@
+"""Semantic cache L2 backends: compact encoding, SQLite WAL and Redis-protocol sharing across workers."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+import core.embedding_cache as embedding_cache
+from core.semantic_cache import SemanticCache, normalize_question
+from core.semantic_cache_backends import (
+    RedisCacheBackend,
+    SqliteCacheBackend,
+    make_backend,
+    pack_entry,
+    unpack_entry,
+)
+
+
+class _FakeRedis:
+    """In-process stand-in for the subset of Redis commands the backend issues."""
+
+    def __init__(self):
+        self.kv: dict[str, tuple[bytes, float]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    def _live(self, key):
+        item = self.kv.get(key)
+        if item and item[1] < time.time():
+            del self.kv[key]
+            return None
+        return item
+
+    def set(self, key, value, ex=None):
+        self.kv[key] = (bytes(value), time.time() + ex if ex else float("inf"))
+
+    def get(self, key):
+        item = self._live(key)
+        return item[0] if item else None
+
+    def mget(self, keys):
+        return [self.get(k) for k in keys]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.kv.pop(k, None)
+            self.zsets.pop(k, None)
+
+    def zadd(self, name, mapping):
+        self.zsets.setdefault(name, {}).update(mapping)
+
+    def zrangebyscore(self, name, lo, hi):
+        lo_val = float(str(lo).lstrip("("))
+        exclusive = str(lo).startswith("(")
+        hi_val = float(hi)
+        items = sorted(self.zsets.get(name, {}).items(), key=lambda kv: kv[1])
+        return [m.encode() for m, s in items if (s > lo_val if exclusive else s >= lo_val) and s <= hi_val]
+
+    def zremrangebyscore(self, name, lo, hi):
+        zset = self.zsets.get(name, {})
+        for m in [m for m, s in zset.items() if float(lo) <= s <= float(hi)]:
+            del zset[m]
+
+    def zrange(self, name, start, stop):
+        return [m.encode() for m, _ in sorted(self.zsets.get(name, {}).items(), key=lambda kv: kv[1])]
+
+    def zcard(self, name):
+        return len(self.zsets.get(name, {}))
+
+
+class _BrokenRedis(_FakeRedis):
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("redis down")
+
+    def zrangebyscore(self, *args):
+        raise ConnectionError("redis down")
+
+
+class _TableEmbeddings:
+    def __init__(self, table):
+        self.table = {normalize_question(k): v for k, v in table.items()}
+
+    def embed_query(self, text):
+        return list(self.table[text])
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.setenv("ENABLE_SEMANTIC_CACHE", "true")
+    monkeypatch.setenv("SEMANTIC_CACHE_THRESHOLD", "0.9")
+    monkeypatch.setenv("SEMANTIC_CACHE_SYNC_SECONDS", "0")
+    base = np.eye(8)[0]
+    service = _TableEmbeddings(
+        {"How is ESG scored?": base, "ESG scoring method?": base + 0.1 * np.eye(8)[1], "OTD?": np.eye(8)[2]}
+    )
+    monkeypatch.setattr(embedding_cache, "get_embedding_service", lambda: service)
+
+
+def test_pack_entry_is_compact_and_round_trips():
+    emb = np.random.default_rng(0).normal(size=1536).astype(np.float32)
+    emb /= np.linalg.norm(emb)
+    payload = {"answer": "ESG uses weighted pillars. " * 20, "citations": [{"source": "policy.md"}] * 5}
+    blob = pack_entry(
+        exact_key="k", question="q", response_language="en", created_at=1.5, payload=payload, embedding=emb
+    )
+    naive = len(json.dumps({"payload": payload, "embedding": emb.tolist()}))
+    assert len(blob) < naive / 5
+    out = unpack_entry(blob)
+    assert out["payload"] == payload and out["created_at"] == 1.5
+    assert np.allclose(out["embedding"], emb, atol=1e-3)
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "redis"])
+def test_workers_share_entries_and_survive_restart(env, tmp_path, kind):
+    if kind == "sqlite":
+        path = str(tmp_path / "semcache.sqlite")
+        make = lambda: SqliteCacheBackend(path)  # noqa: E731
+    else:
+        server = _FakeRedis()
+        make = lambda: RedisCacheBackend(server)  # noqa: E731
+
+    worker_a = SemanticCache(backend=make())
+    worker_b = SemanticCache(backend=make())
+    assert worker_b.get("How is ESG scored?", "en") is None
+    worker_a.put("How is ESG scored?", "en", {"answer": "pillars", "trace_id": "t-1"})
+
+    exact = worker_b.get("how is esg   scored?", "en")
+    assert exact["answer"] == "pillars" and exact["cache_mode"] == "exact"
+    assert "trace_id" not in exact
+    assert worker_b.stats()["backend_hits"] == 1
+
+    restarted = SemanticCache(backend=make())
+    semantic = restarted.get("ESG scoring method?", "en")
+    assert semantic is not None and semantic["cache_mode"] == "semantic"
+    assert restarted.stats()["size"] == 1
+    assert restarted.get("OTD?", "en") is None
+    assert restarted.stats()["backend_size"] == 1
+
+    restarted.clear()
+    assert SemanticCache(backend=make()).get("How is ESG scored?", "en") is None
+
+
+def test_expired_backend_entries_are_not_loaded(env, tmp_path, monkeypatch):
+    path = str(tmp_path / "semcache.sqlite")
+    SemanticCache(backend=SqliteCacheBackend(path)).put("How is ESG scored?", "en", {"answer": "x"})
+    monkeypatch.setenv("SEMANTIC_CACHE_TTL_SECONDS", "-1")
+    assert SemanticCache(backend=SqliteCacheBackend(path)).get("How is ESG scored?", "en") is None
+
+
+def test_backend_errors_degrade_to_l1(env):
+    cache = SemanticCache(backend=RedisCacheBackend(_BrokenRedis()))
+    cache.put("How is ESG scored?", "en", {"answer": "local"})
+    assert cache.get("How is ESG scored?", "en")["answer"] == "local"
+    assert cache.get("OTD?", "en") is None
+    assert cache.stats()["backend_errors"] >= 3
+
+
+def test_make_backend_selection(tmp_path, monkeypatch):
+    assert make_backend("memory") is None
+    assert make_backend("bogus") is None
+    monkeypatch.setenv("SEMANTIC_CACHE_SQLITE_PATH", str(tmp_path / "c.sqlite"))
+    backend = make_backend("sqlite")
+    assert backend.name == "sqlite"
+    assert backend._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -0,0 +1,102 @@
+"""Semantic cache eviction: TTL heap, LRU/LFU/TinyLFU policies and their stats counters."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from core.cache_policy import CountMinSketch, LFUPolicy, make_policy
+from core.semantic_cache import SemanticCache
+
+
+@pytest.fixture
+def exact_only(monkeypatch):
+    monkeypatch.setenv("ENABLE_SEMANTIC_CACHE", "true")
+    monkeypatch.setenv("SEMANTIC_CACHE_MAX_ENTRIES", "3")
+    monkeypatch.setattr(SemanticCache, "_get_embedder", lambda self: None)
+
+
+def _fill(cache: SemanticCache, *questions: str) -> None:
+    for q in questions:
+        cache.put(q, "en", {"answer": q})
+
+
+def _cached(cache: SemanticCache, *questions: str) -> list[str]:
+    return [q for q in questions if cache.get(q, "en") is not None]
+
+
+def test_lru_evicts_least_recently_used(exact_only):
+    cache = SemanticCache(policy="lru")
+    _fill(cache, "a", "b", "c")
+    cache.get("a", "en")
+    _fill(cache, "d")
+    assert _cached(cache, "a", "b", "c", "d") == ["a", "c", "d"]
+    stats = cache.stats()
+    assert stats["policy"] == "lru"
+    assert stats["evictions_size"] == 1 and stats["admissions"] == 4
+
+
+def test_lfu_evicts_least_hit(exact_only):
+    cache = SemanticCache(policy="lfu")
+    _fill(cache, "a", "b", "c")
+    for _ in range(3):
+        cache.get("a", "en")
+    cache.get("c", "en")
+    _fill(cache, "d", "e")
+    assert _cached(cache, "a", "b", "c", "d", "e") == ["a", "c", "e"]
+
+
+def test_tinylfu_rejects_cold_candidate_over_hot_victim(exact_only):
+    cache = SemanticCache(policy="tinylfu")
+    _fill(cache, "a", "b", "c")
+    for q in ("a", "b", "c"):
+        cache.get(q, "en")
+    _fill(cache, "cold")  # never looked up before
+    assert cache.stats()["admission_rejections"] == 1
+    for _ in range(3):
+        cache.get("warm", "en")  # misses still count towards admission
+    _fill(cache, "warm")
+    assert _cached(cache, "a", "b", "c", "cold", "warm") == ["b", "c", "warm"]
+    assert cache.stats()["evictions_size"] == 1
+
+
+def test_ttl_heap_expires_and_replacement_keeps_one_entry(exact_only, monkeypatch):
+    cache = SemanticCache()
+    _fill(cache, "a", "a", "b")
+    assert cache.stats()["size"] == 2
+    monkeypatch.setenv("SEMANTIC_CACHE_TTL_SECONDS", "-1")
+    assert cache.get("a", "en") is None
+    stats = cache.stats()
+    assert stats["size"] == 0 and stats["evictions_expired"] == 2
+    assert stats["misses"] == 1
+
+
+def test_large_overflow_is_linear(exact_only, monkeypatch):
+    monkeypatch.setenv("SEMANTIC_CACHE_MAX_ENTRIES", "2000")
+    cache = SemanticCache()
+    started = time.perf_counter()
+    _fill(cache, *(f"q{i}" for i in range(20000)))
+    assert time.perf_counter() - started < 5
+    assert cache.stats()["size"] == 2000 and cache.stats()["evictions_size"] == 18000
+
+
+def test_lfu_policy_buckets_and_sketch_aging():
+    lfu = LFUPolicy()
+    for key in ("x", "y", "z"):
+        lfu.on_insert(key)
+    lfu.on_hit("x")
+    lfu.on_hit("y")
+    lfu.on_remove("z")
+    assert lfu.victim() == "x"
+    lfu.on_hit("y")
+    assert lfu.victim() == "x"
+
+    sketch = CountMinSketch(capacity=1)
+    for _ in range(9):
+        sketch.increment("hot")
+    assert sketch.estimate("hot") == 9
+    sketch.increment("other")  # 10th addition triggers halving
+    assert sketch.estimate("hot") == 4
+    with pytest.raises(ValueError):
+        make_policy("arc", 10)
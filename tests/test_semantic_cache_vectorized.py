@@ -0,0 +1,149 @@
+"""Semantic cache: per-language embedding matrix, argmax lookup, IVF path, lock-free math."""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+import core.embedding_cache as embedding_cache
+import core.semantic_cache as semantic_cache
+from core.semantic_cache import SemanticCache, normalize_question
+
+
+class _TableEmbeddings:
+    """Fixed vectors per normalized question; unknown text gets a random vector."""
+
+    def __init__(self, table: dict[str, np.ndarray], dim: int = 8):
+        self.table = {normalize_question(k): np.asarray(v, dtype=np.float32) for k, v in table.items()}
+        self.dim = dim
+        self._rng = np.random.default_rng(0)
+
+    def embed_query(self, text):
+        vec = self.table.get(text)
+        if vec is None:
+            vec = self.table[text] = self._rng.normal(size=self.dim).astype(np.float32)
+        return vec.tolist()
+
+
+def _cache(monkeypatch, table, **env) -> SemanticCache:
+    monkeypatch.setenv("ENABLE_SEMANTIC_CACHE", "true")
+    monkeypatch.setenv("SEMANTIC_CACHE_THRESHOLD", env.pop("threshold", "0.9"))
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    service = _TableEmbeddings(table)
+    monkeypatch.setattr(embedding_cache, "get_embedding_service", lambda: service)
+    return SemanticCache()
+
+
+def test_semantic_hit_picks_most_similar_entry(monkeypatch):
+    base = np.eye(8)[0]
+    cache = _cache(
+        monkeypatch,
+        {
+            "ESG score?": base,
+            "ESG rating?": base + 0.2 * np.eye(8)[1],
+            "OTD trend?": np.eye(8)[3],
+            "How is ESG scored?": base + 0.1 * np.eye(8)[1],
+        },
+    )
+    cache.put("ESG score?", "en", {"answer": "pillars"})
+    cache.put("ESG rating?", "en", {"answer": "rating"})
+    cache.put("OTD trend?", "en", {"answer": "otd"})
+    hit = cache.get("How is ESG scored?", "en")
+    assert hit is not None and hit["cache_mode"] == "semantic"
+    assert hit["answer"] == "rating"
+    assert 0.9 <= hit["cache_similarity"] <= 1.0
+    assert cache.stats()["indexed"] == {"en": 3}
+
+
+def test_language_partition_and_replacement(monkeypatch):
+    cache = _cache(monkeypatch, {"ESG score?": np.eye(8)[0], "ESG 分数?": np.eye(8)[0] * 2})
+    cache.put("ESG score?", "en", {"answer": "en"})
+    assert cache.get("ESG 分数?", "zh") is None
+    cache.put("ESG score?", "en", {"answer": "en v2"})
+    assert cache.stats()["indexed"] == {"en": 1}
+    assert cache.get("ESG 分数?", "en")["answer"] == "en v2"
+
+
+def test_expired_and_evicted_entries_never_match(monkeypatch):
+    cache = _cache(
+        monkeypatch,
+        {"q1": np.eye(8)[0], "q1 again": np.eye(8)[0], "q2": np.eye(8)[1]},
+        SEMANTIC_CACHE_MAX_ENTRIES="1",
+    )
+    cache.put("q1", "en", {"answer": "1"})
+    cache.put("q2", "en", {"answer": "2"})  # evicts q1 and its matrix row
+    assert cache.get("q1 again", "en") is None
+    monkeypatch.setenv("SEMANTIC_CACHE_TTL_SECONDS", "-1")
+    assert cache.get("q2", "en") is None
+    assert cache.stats()["indexed"] == {"en": 0}
+
+
+def test_ann_path_matches_exact_scan(monkeypatch):
+    rng = np.random.default_rng(5)
+    centers = rng.normal(size=(16, 8))
+    questions = {f"q{i}": centers[i % 16] + 0.05 * rng.normal(size=8) for i in range(400)}
+    probes = {f"probe {i}": questions[f"q{i}"] + 0.01 * rng.normal(size=8) for i in range(0, 400, 7)}
+    cache = _cache(
+        monkeypatch,
+        {**questions, **probes},
+        threshold="0.0",
+        SEMANTIC_CACHE_ANN_MIN_ENTRIES="200",
+        SEMANTIC_CACHE_ANN_NPROBE="4",
+        SEMANTIC_CACHE_MAX_ENTRIES="1000",
+    )
+    for q in questions:
+        cache.put(q, "en", {"answer": q})
+    cache.wait_for_ann(timeout=10)
+    assert cache.stats()["ann_languages"] == ["en"]
+
+    unit = {q: v / np.linalg.norm(v) for q, v in questions.items()}
+    agree = 0
+    for probe, vec in probes.items():
+        expected = max(unit, key=lambda q: float(unit[q] @ (vec / np.linalg.norm(vec))))
+        agree += cache.get(probe, "en")["answer"] == expected
+    assert agree / len(probes) >= 0.9
+
+
+def test_lock_is_not_held_during_similarity_math(monkeypatch):
+    cache = _cache(monkeypatch, {"q": np.eye(8)[0], "q?": np.eye(8)[0]})
+    cache.put("q", "en", {"answer": "x"})
+    held: list[bool] = []
+    real_best_row = semantic_cache._best_row
+
+    def spy(*args):
+        acquired = cache._lock.acquire(blocking=False)
+        held.append(not acquired)
+        if acquired:
+            cache._lock.release()
+        return real_best_row(*args)
+
+    monkeypatch.setattr(semantic_cache, "_best_row", spy)
+    worker = threading.Thread(target=lambda: held.append(cache.get("q?", "en") is not None))
+    worker.start()
+    worker.join()
+    assert held == [False, True]
+
+
+def test_ann_is_trained_off_the_request_thread(monkeypatch):
+    questions = {f"q{i}": np.eye(8)[i % 8] + 0.01 * i for i in range(40)}
+    cache = _cache(monkeypatch, questions, SEMANTIC_CACHE_ANN_MIN_ENTRIES="30", SEMANTIC_CACHE_MAX_ENTRIES="100")
+    release = threading.Event()
+    trained_on: list[str] = []
+    real_kmeans = semantic_cache.spherical_kmeans
+
+    def slow_kmeans(*args, **kwargs):
+        trained_on.append(threading.current_thread().name)
+        release.wait(5)
+        return real_kmeans(*args, **kwargs)
+
+    monkeypatch.setattr(semantic_cache, "spherical_kmeans", slow_kmeans)
+    for q in questions:
+        cache.put(q, "en", {"answer": q})  # returns while k-means is blocked
+    assert cache.stats()["ann_languages"] == []
+    assert cache.get("q3", "en")["answer"] == "q3"  # brute force meanwhile
+    release.set()
+    cache.wait_for_ann(timeout=5)
+    assert trained_on == ["semantic-cache-ann-en"]
+    assert cache.stats()["ann_languages"] == ["en"]
@@ -0,0 +1,120 @@
+"""Pluggable SQL execution backends: sqlite -> duckdb transpilation, Parquet-backed DuckDB, fallback."""
+
+from __future__ import annotations
+
+import math
+import shutil
+import sqlite3
+
+import pytest
+
+import tools.kpi_sql_builder as kpi
+import tools.result_cache as result_cache
+import tools.sql_backends as sql_backends
+import tools.sql_tools as sql_tools
+from tools.result_cache import QueryResultCache
+from tools.sql_backends import duckdb_sql, get_sql_backend
+from tools.sql_guard import validate_read_only_sql
+from tools.sql_pool import ReadOnlyPool, resolve_db_path
+
+
+def test_transpile_keeps_guard_limit_and_rewrites_sqlite_idioms():
+    sql = duckdb_sql(
+        validate_read_only_sql(
+            "SELECT supplier_id, supplier_name_anonymized, COUNT(*) AS n FROM documents d"
+            " JOIN suppliers s USING (supplier_id)"
+            " WHERE expiry_date BETWEEN date(?) AND date(?, '+' || ? || ' days')"
+            " AND document_type LIKE '%code%' AND flag = 1 GROUP BY supplier_id",
+            cache=False,
+        ),
+        frozenset({"flag"}),
+    )
+    assert sql.endswith("LIMIT 100")
+    assert "TO_DAYS(CAST(TRY_CAST(? AS DOUBLE) AS BIGINT))" in sql and "AT TIME ZONE" not in sql
+    assert "ILIKE '%code%'" in sql and "flag = '1'" in sql
+    assert "ANY_VALUE(supplier_name_anonymized) AS supplier_name_anonymized" in sql
+    assert "LIMIT NULLIF(GREATEST(?, -1), -1)" in duckdb_sql("SELECT supplier_id FROM suppliers LIMIT ?")
+    with pytest.raises(ValueError, match="Unsupported date modifier"):
+        duckdb_sql("SELECT date(expiry_date, 'start of month') FROM documents LIMIT 1")
+
+
+def test_unknown_or_sqlite_backend_runs_on_sqlite():
+    sql_backends.reset_sql_backends()
+    assert get_sql_backend(resolve_db_path(), "sqlite") is None
+    assert get_sql_backend(resolve_db_path(), "oracle") is None
+    meta = sql_tools.run_sql_query_with_meta("SELECT supplier_id FROM suppliers LIMIT 1")["meta"]
+    assert meta["backend"] == "sqlite"
+
+
+def _close(a: list[dict], b: list[dict]) -> bool:
+    if len(a) != len(b):
+        return False
+    for x, y in zip(sorted(a, key=repr), sorted(b, key=repr)):
+        if x.keys() != y.keys():
+            return False
+        for k, u in x.items():
+            v = y[k]
+            if isinstance(u, float) or isinstance(v, float):
+                if u is None or v is None or not math.isclose(u, v, abs_tol=1e-3):
+                    return False
+            elif u != v:
+                return False
+    return True
+
+
+@pytest.fixture
+def parquet_db(tmp_path, monkeypatch):
+    pytest.importorskip("duckdb")
+    path = str(tmp_path / "demo.db")
+    shutil.copy(resolve_db_path(), path)
+    out = str(tmp_path / "parquet")
+    sql_backends.export_parquet(path, out)
+    pool = ReadOnlyPool(path)
+    monkeypatch.setattr(sql_tools, "get_read_pool", lambda: pool)
+    monkeypatch.setattr(result_cache, "_CACHE", QueryResultCache(max_entries=0))
+    monkeypatch.setattr(sql_backends, "SQL_DUCKDB_SOURCE", "parquet")
+    monkeypatch.setattr(sql_backends, "SQL_DUCKDB_PARQUET_DIR", out)
+    backend = sql_backends.DuckDbBackend(path, source="parquet", parquet_dir=out)
+    sql_backends.reset_sql_backends()
+    yield path, backend
+    sql_backends.reset_sql_backends()
+
+
+def test_duckdb_parquet_matches_sqlite_on_kpi_templates(parquet_db, monkeypatch):
+    path, backend = parquet_db
+    templates = [
+        kpi._spend_by_kraljic(),
+        kpi._certificates_expiring_soon(60),
+        kpi._strategic_vendor_rating_rank(),
+        kpi._esg_below_threshold_missing_docs(60),
+        kpi._supplier_status_snapshot("SUP012"),
+        kpi._yarn_otd_and_defect("2025"),
+        kpi._vendor_rating_snapshot("SUP012", None),
+    ]
+    for rollup in (False, True):
+        templates += [
+            kpi._on_time_rate_by_category("Yarns", "2025", rollup),
+            kpi._on_time_rate_by_supplier_id("SUP012", None, rollup),
+            kpi._defect_rate_by_category("Yarns", None, rollup),
+            kpi._avg_delay_above_threshold(2.0, rollup),
+        ]
+    expected = [sql_tools.run_sql_query(t.sql, t.params) for t in templates]
+    monkeypatch.setattr(sql_tools, "get_sql_backend", lambda _path: backend)
+    for tpl, rows in zip(templates, expected):
+        out = sql_tools.run_sql_query_with_meta(tpl.sql, tpl.params)
+        assert out["meta"]["backend"] == "duckdb"
+        assert _close(rows, out["rows"]), tpl.template_id
+
+
+def test_stale_parquet_export_falls_back_to_sqlite(parquet_db, monkeypatch):
+    path, _ = parquet_db
+    monkeypatch.setattr(sql_backends, "SQL_BACKEND", "duckdb")
+    sql = "SELECT risk_level FROM suppliers WHERE supplier_id = 'SUP012'"
+    assert sql_tools.run_sql_query_with_meta(sql)["meta"]["backend"] == "duckdb"
+
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE suppliers SET risk_level = 'Changed' WHERE supplier_id = 'SUP012'")
+    conn.commit()
+    conn.close()
+    out = sql_tools.run_sql_query_with_meta(sql)
+    assert out["meta"]["backend"] == "sqlite" and out["rows"] == [{"risk_level": "Changed"}]
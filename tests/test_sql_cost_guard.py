@@ -0,0 +1,108 @@
+"""Cost control for LLM-written SQL: plan-based rejection, progress-handler budgets, repair feedback."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import graph.nodes as nodes
+import tools.sql_cost as sql_cost
+from app.services.mcp_client import McpToolError
+from core.prompts import KPI_SQL_PROMPT, KPI_SQL_REPAIR_PROMPT
+from mcp_server.tools import ToolValidationError, query_kpi_impl
+from tools.sql_cost import QueryBudget, QueryCostError, check_query_plan
+from tools.sql_guard import validate_read_only_sql
+from tools.sql_pool import resolve_db_path
+
+CROSS_JOIN = "SELECT COUNT(*) AS n FROM delivery_events a, delivery_events b, purchase_orders c"
+
+
+@pytest.fixture
+def conn():
+    c = sqlite3.connect(resolve_db_path())
+    yield c
+    c.close()
+
+
+def _plan(conn, sql, **limits):
+    return check_query_plan(conn, validate_read_only_sql(sql, cache=False), **limits)
+
+
+def test_plan_check_rejects_large_scans_and_nested_loops(conn):
+    scan = r"full scan of delivery_events \(~550 rows.*\(supplier_id, actual_delivery_date\)"
+    with pytest.raises(QueryCostError, match=scan):
+        _plan(conn, "SELECT AVG(on_time_flag) FROM delivery_events", max_scan_rows=100)
+    assert _plan(conn, "SELECT * FROM delivery_events WHERE supplier_id = 'SUP012'", max_scan_rows=100)["scans"] == {}
+
+    with pytest.raises(QueryCostError, match="nested loops over delivery_events, suppliers visit ~33,000"):
+        _plan(
+            conn,
+            "SELECT s.supplier_id, (SELECT COUNT(*) FROM delivery_events d"
+            " WHERE d.delivery_delay_days > s.single_sourcing_flag) FROM suppliers s",
+            max_nested_rows=10_000,
+        )
+    assert _plan(conn, CROSS_JOIN, max_scan_rows=0, max_nested_rows=0)["estimated_rows"] == 550 * 550 * 550
+
+
+def test_budget_stops_runaway_statement(conn):
+    sql = validate_read_only_sql(CROSS_JOIN, cache=False)
+    with pytest.raises(QueryCostError, match="budget of 1,000,000 SQLite VM steps"):
+        QueryBudget(timeout_ms=0, max_steps=1_000_000).fetchall(conn.cursor(), sql)
+    with pytest.raises(QueryCostError, match="20 ms time budget"):
+        QueryBudget(timeout_ms=20, max_steps=0).fetchall(conn.cursor(), sql)
+    # the handler is removed afterwards: the same connection runs unbounded SQL again
+    assert conn.execute("SELECT COUNT(*) FROM delivery_events a, delivery_events b").fetchone()[0] == 550 * 550
+
+
+def test_only_llm_sql_is_checked(monkeypatch):
+    monkeypatch.setattr(sql_cost, "SQL_PLAN_MAX_SCAN_ROWS", 10)
+    with pytest.raises(ToolValidationError, match="Query cost check: full scan of delivery_events"):
+        query_kpi_impl(sql="SELECT supplier_id, AVG(on_time_flag) FROM delivery_events GROUP BY supplier_id")
+    template = query_kpi_impl(metric="spend", question="Spend by Kraljic quadrant")
+    assert template["sql_source"] == "template" and template["rows"]
+
+
+class _FakeLlm:
+    def __init__(self, replies):
+        self.replies = replies
+        self.prompts: list[str] = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        for marker, reply in self.replies:
+            if marker in prompt:
+                return type("Msg", (), {"content": reply})()
+        return type("Msg", (), {"content": "{}"})()
+
+
+def test_rejection_reason_reaches_repair_prompt(monkeypatch):
+    def call_tool(name, arguments=None):
+        arguments = dict(arguments or {})
+        if not arguments.get("sql"):
+            raise McpToolError(name, "No KPI template matched.")
+        try:
+            return query_kpi_impl(**arguments)
+        except ToolValidationError as exc:
+            raise McpToolError(name, str(exc)) from exc
+
+    repaired = (
+        "SELECT supplier_id, COUNT(*) AS n FROM delivery_events"
+        " WHERE supplier_id = 'SUP012' GROUP BY supplier_id"
+    )
+    llm = _FakeLlm(
+        [
+            (KPI_SQL_REPAIR_PROMPT[:40], repaired),
+            (KPI_SQL_PROMPT[:40], CROSS_JOIN),
+        ]
+    )
+    monkeypatch.setattr(sql_cost, "SQL_PLAN_MAX_NESTED_ROWS", 100_000)
+    monkeypatch.setattr(nodes, "call_tool", call_tool)
+    monkeypatch.setattr(nodes, "get_llm", lambda: llm)
+
+    state = nodes.kpi_node({"question": "How many delivery combinations exist across orders?"})
+    repair_prompts = [p for p in llm.prompts if KPI_SQL_REPAIR_PROMPT[:40] in p]
+    assert len(repair_prompts) == 1
+    assert "Query cost check: nested loops over delivery_events, purchase_orders" in repair_prompts[0]
+    assert state["sql_query"] == repaired
+    assert [r["supplier_id"] for r in state["sql_result"]] == ["SUP012"]
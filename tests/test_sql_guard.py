@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import pytest
 
+import tools.kpi_rollup as kpi_rollup
 from tools.kpi_sql_builder import build_kpi_sql
 from tools.sql_guard import validate_read_only_sql
 from tools.sql_tools import run_sql_query_with_meta
@@ -82,7 +83,8 @@ WHERE s.next_review_date >= date(?, 'start of month')
     assert "row_count" in result["meta"]
 
 
-def test_kpi_templates_still_execute():
+def test_kpi_templates_still_execute(monkeypatch):
+    monkeypatch.setattr(kpi_rollup, "KPI_USE_ROLLUP", False)  # pin the raw-event template
     tpl = build_kpi_sql(
         "Show yarn supplier defect rate in 2025",
         {"metric": "defect_rate"},
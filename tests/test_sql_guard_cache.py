@@ -0,0 +1,94 @@
+"""Validated-SQL cache: trusted templates, bounded LRU keyed by allowlist/limit, LLM SQL never cached."""
+
+from __future__ import annotations
+
+import pytest
+
+import mcp_server.tools as mcp_tools
+import tools.sql_guard as sql_guard
+from tools.kpi_sql_builder import TemplatedSQL, build_kpi_sql
+from tools.sql_guard import register_trusted_sql, sql_guard_cache_stats, validate_read_only_sql
+
+
+@pytest.fixture
+def guard_cache(monkeypatch):
+    cache = sql_guard._ValidatedSQLCache(max_size=2)
+    monkeypatch.setattr(sql_guard, "_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def no_parse(monkeypatch):
+    def fail(*_a, **_k):
+        raise AssertionError("guard re-parsed SQL")
+
+    return lambda: monkeypatch.setattr(sql_guard.sqlglot, "parse", fail)
+
+
+def test_lru_key_includes_allowlist_and_limit(guard_cache, no_parse):
+    sql = "SELECT supplier_id FROM suppliers;"
+    first = validate_read_only_sql(sql)
+    assert validate_read_only_sql(sql) == first
+    assert validate_read_only_sql(sql, limit=5).endswith("LIMIT 5")
+    with pytest.raises(ValueError, match="allowlist"):
+        validate_read_only_sql(sql, allowed_tables={"documents"})
+    validate_read_only_sql(sql, allowed_tables={"suppliers"})
+
+    stats = sql_guard_cache_stats()
+    assert stats["hits"] == 1 and stats["size"] == 2 and stats["evictions"] == 1
+
+    no_parse()
+    assert validate_read_only_sql(sql, limit=5).endswith("LIMIT 5")
+    with pytest.raises(AssertionError):
+        validate_read_only_sql(sql)  # least recently used, evicted
+
+
+def test_rejections_are_not_cached(guard_cache):
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Only SELECT"):
+            validate_read_only_sql("DELETE FROM suppliers")
+    assert sql_guard_cache_stats()["size"] == 0
+
+
+def test_uncached_path_always_reparses(guard_cache, no_parse):
+    sql = "SELECT risk_level FROM suppliers"
+    validate_read_only_sql(sql)
+    no_parse()
+    assert validate_read_only_sql(sql)
+    with pytest.raises(AssertionError):
+        validate_read_only_sql(sql, cache=False)
+    assert sql_guard_cache_stats()["uncached"] == 1
+
+
+def test_trusted_registration_validates_once_and_survives_lru(guard_cache, no_parse):
+    with pytest.raises(ValueError, match="Only SELECT"):
+        register_trusted_sql("DROP TABLE suppliers")
+
+    template = TemplatedSQL("t", "SELECT country FROM suppliers", (), "test")
+    for i in range(5):
+        validate_read_only_sql(f"SELECT supplier_id FROM suppliers WHERE {i} = {i}")
+    no_parse()
+    assert validate_read_only_sql(template.sql).endswith("LIMIT 100")
+    stats = sql_guard_cache_stats()
+    assert stats["trusted"] == 1 and stats["trusted_hits"] == 1
+
+
+def test_kpi_templates_and_tool_sql_are_trusted():
+    template = build_kpi_sql("Spend by Kraljic quadrant", {"metric": "spend"})
+    assert template is not None
+    key = sql_guard._cache_key(template.sql, None, sql_guard.DEFAULT_QUERY_LIMIT)
+    assert sql_guard._CACHE.trusted(key) is not None
+    key = sql_guard._cache_key(mcp_tools._RISK_SQL, None, sql_guard.DEFAULT_QUERY_LIMIT)
+    assert sql_guard._CACHE.trusted(key) is not None
+
+
+def test_llm_sql_through_query_kpi_skips_cache(monkeypatch):
+    calls = []
+    real = sql_guard.validate_read_only_sql
+    monkeypatch.setattr(
+        "tools.sql_tools.validate_read_only_sql",
+        lambda sql, **kw: calls.append(kw) or real(sql, **kw),
+    )
+    out = mcp_tools.query_kpi_impl(sql="SELECT supplier_id FROM suppliers WHERE supplier_id = 'SUP012'")
+    assert out["rows"] == [{"supplier_id": "SUP012"}]
+    assert calls == [{"cache": False}]
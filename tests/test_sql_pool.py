@@ -0,0 +1,72 @@
+"""Read-only SQLite pool: per-thread reuse, read-only enforcement, reload on file change, RAM copy."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import threading
+
+import pytest
+
+import tools.sql_tools as sql_tools
+from tools.sql_pool import ReadOnlyPool, get_read_pool, resolve_db_path
+
+
+def _make_db(path: str, names: list[str]) -> None:
+    tmp = path + ".tmp"
+    conn = sqlite3.connect(tmp)
+    conn.execute("CREATE TABLE suppliers (supplier_id TEXT PRIMARY KEY, supplier_name TEXT)")
+    conn.executemany("INSERT INTO suppliers VALUES (?, ?)", [(f"SUP{i:03d}", n) for i, n in enumerate(names)])
+    conn.commit()
+    conn.close()
+    os.replace(tmp, path)  # swap like a real reload
+
+
+def _names(pool: ReadOnlyPool) -> list[str]:
+    return [r["supplier_name"] for r in pool.connection().execute("SELECT supplier_name FROM suppliers")]
+
+
+@pytest.mark.parametrize("in_memory", [False, True])
+def test_thread_reuse_read_only_and_reload(tmp_path, in_memory):
+    path = str(tmp_path / "demo.db")
+    _make_db(path, ["Acme", "Borealis"])
+    pool = ReadOnlyPool(path, in_memory=in_memory)
+
+    first = pool.connection()
+    assert pool.connection() is first
+    assert _names(pool) == ["Acme", "Borealis"]
+    with pytest.raises(sqlite3.OperationalError):
+        first.execute("DELETE FROM suppliers")
+
+    other: list[sqlite3.Connection] = []
+    t = threading.Thread(target=lambda: other.append(pool.connection()))
+    t.start()
+    t.join()
+    assert other[0] is not first
+
+    _make_db(path, ["Cobalt"])
+    assert _names(pool) == ["Cobalt"]
+    stats = pool.stats()
+    assert stats["reloads"] == 1 and stats["opens"] == 3 and stats["reuses"] >= 2
+
+
+def test_immutable_uri_and_pragmas(tmp_path):
+    path = str(tmp_path / "demo.db")
+    _make_db(path, ["Acme"])
+    conn = ReadOnlyPool(path, immutable=True, mmap_bytes=1 << 20, cache_kb=2048).connection()
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2048
+    assert conn.execute("PRAGMA mmap_size").fetchone()[0] == 1 << 20
+
+
+def test_run_sql_query_uses_shared_pool(tmp_path, monkeypatch):
+    path = str(tmp_path / "demo.db")
+    shutil.copy(resolve_db_path(), path)
+    pool = ReadOnlyPool(path)
+    monkeypatch.setattr(sql_tools, "get_read_pool", lambda: pool)
+    for _ in range(3):
+        rows = sql_tools.run_sql_query("SELECT supplier_id FROM suppliers WHERE supplier_id = ?", ("SUP012",))
+        assert rows == [{"supplier_id": "SUP012"}]
+    assert pool.stats()["opens"] == 1
+    assert get_read_pool() is get_read_pool()
@@ -0,0 +1,71 @@
+"""Bounded result sets: fetchmany streaming, row/byte caps, total-row estimate, columnar MCP payloads."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import mcp_server.tools as mcp_tools
+import tools.result_cache as result_cache
+import tools.sql_results as sql_results
+from app.services.mcp_client import _parse_tool_payload
+from tools.result_cache import QueryResultCache
+from tools.sql_results import RowLimits, collect_rows, from_columnar, to_columnar
+from tools.sql_tools import run_sql_query_with_meta
+
+WIDE = "SELECT * FROM delivery_events d JOIN suppliers s ON s.supplier_id = d.supplier_id LIMIT 400"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = QueryResultCache(max_entries=64, max_bytes=8 << 20)
+    monkeypatch.setattr(result_cache, "_CACHE", fresh)
+    return fresh
+
+
+def test_row_and_byte_caps_report_totals(cache):
+    full = run_sql_query_with_meta(WIDE, cache_label="wide")
+    assert "truncated" not in full["meta"] and len(full["rows"]) == 400
+
+    capped = run_sql_query_with_meta(WIDE, cache_label="wide-capped", limits=RowLimits(max_rows=50))
+    meta = capped["meta"]
+    assert capped["rows"] == full["rows"][:50]
+    assert meta["truncated"] is True and meta["row_count"] == 50
+    assert meta["total_rows_estimate"] == 400 and meta["total_rows_exact"] is True
+
+    by_bytes = run_sql_query_with_meta(WIDE, cache_label="wide-bytes", limits=RowLimits(max_bytes=20_000))
+    assert 0 < by_bytes["meta"]["row_count"] < 400 and by_bytes["meta"]["result_bytes"] <= 20_000
+    assert len(json.dumps([list(r.values()) for r in by_bytes["rows"]])) <= 20_000  # columnar wire size
+    # truncated results are not cached; a full cached result is re-capped on a hit
+    assert cache.stats()["size"] == 1
+    hit = run_sql_query_with_meta(WIDE, cache_label="wide", limits=RowLimits(max_rows=10))
+    assert hit["meta"]["cache_hit"] is True and hit["meta"]["truncated"] is True
+    assert hit["rows"] == full["rows"][:10] and hit["meta"]["total_rows_estimate"] == 400
+
+
+def test_collect_rows_counts_past_the_cap_up_to_a_ceiling():
+    rows = iter([(i, "x" * 10) for i in range(1000)])
+    kept, stats = collect_rows(lambda n: [r for _, r in zip(range(n), rows)], RowLimits(5, 0), batch=64, count_cap=200)
+    assert len(kept) == 5 and stats["truncated"] is True
+    assert stats["total_rows_exact"] is False and 200 <= stats["total_rows_estimate"] < 1000
+    single, stats = collect_rows(lambda n: [(1, "y" * 500)] if n else [], RowLimits(0, 10), batch=1, count_cap=1)
+    assert len(single) == 1  # the first row is always returned, however wide
+
+
+def test_query_kpi_is_bounded_and_columnar_on_the_wire(cache, monkeypatch):
+    monkeypatch.setattr(sql_results, "SQL_RESULT_MAX_ROWS", 3)
+    payload = mcp_tools.query_kpi_impl(sql="SELECT supplier_id, risk_level FROM suppliers ORDER BY supplier_id")
+    assert payload["meta"]["truncated"] is True and payload["meta"]["total_rows_estimate"] == 60
+    assert [r["supplier_id"] for r in payload["rows"]] == ["SUP001", "SUP002", "SUP003"]
+
+    wire = json.loads(mcp_tools.dumps_tool_result(payload))
+    assert wire["row_format"] == "columnar" and wire["columns"] == ["supplier_id", "risk_level"]
+    assert wire["rows"][0] == ["SUP001", payload["rows"][0]["risk_level"]]
+    assert _parse_tool_payload(mcp_tools.dumps_tool_result(payload)) == json.loads(json.dumps(payload))
+
+
+def test_irregular_rows_are_sent_as_is():
+    mixed = {"rows": [{"a": 1}, {"b": 2}], "count": 2}
+    assert to_columnar(mixed) is mixed and to_columnar({"rows": []}) == {"rows": []}
+    assert from_columnar({"documents": [1]}) == {"documents": [1]}
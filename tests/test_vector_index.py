@@ -0,0 +1,148 @@
+"""Local vector index: exact flat scan, IVF recall, doc_type filters, mmap round-trip, retriever wiring."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from rag.bm25_index import LocalBM25Index
+from rag.hybrid_retriever import HybridRetriever
+from rag.vector_index import (
+    LocalVectorIndex,
+    LocalVectorStore,
+    build_vector_index,
+    load_vector_index,
+    read_vector_meta,
+)
+
+DOC_TYPES = ("policy", "sop", "contract", None)
+
+
+def _corpus(n: int, dim: int = 16, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(8, dim))
+    vectors = centers[rng.integers(0, 8, n)] + 0.3 * rng.normal(size=(n, dim))
+    docs = [
+        Document(page_content=f"chunk {i}", metadata={"chunk_id": f"c{i}", "doc_type": DOC_TYPES[i % 4]})
+        for i in range(n)
+    ]
+    return vectors.astype(np.float32), docs
+
+
+def _brute_force(vectors, docs, query, k, doc_types=None):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = unit @ (query / np.linalg.norm(query))
+    ids = [i for i in range(len(docs)) if not doc_types or docs[i].metadata["doc_type"] in doc_types]
+    return sorted(ids, key=lambda i: (-scores[i], i))[:k]
+
+
+class _HashEmbeddings:
+    """Deterministic fake embeddings: the vector table plus a lookup by text."""
+
+    def __init__(self, vectors, docs):
+        self.by_text = {d.page_content: v for d, v in zip(docs, vectors)}
+
+    def embed_documents(self, texts):
+        return [self.by_text[t].tolist() for t in texts]
+
+    def embed_query(self, text):
+        return self.by_text[text].tolist()
+
+
+def test_flat_index_matches_brute_force():
+    vectors, docs = _corpus(300)
+    index = LocalVectorIndex.build(vectors, docs, kind="flat")
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        query = rng.normal(size=vectors.shape[1])
+        for doc_types in (None, ["policy"], ["sop", "contract"]):
+            got = [doc_id for doc_id, _ in index.search(query, k=7, doc_types=doc_types)]
+            assert got == _brute_force(vectors, docs, query, 7, doc_types)
+
+
+def test_ivf_full_probe_is_exact_and_default_probe_has_high_recall():
+    vectors, docs = _corpus(2000)
+    index = LocalVectorIndex.build(vectors, docs, kind="ivf", n_lists=32, nprobe=8)
+    assert index.kind == "ivf" and index.n_lists == 32
+    rng = np.random.default_rng(1)
+    hits = total = 0
+    for _ in range(20):
+        query = vectors[rng.integers(len(vectors))] + 0.1 * rng.normal(size=vectors.shape[1])
+        exact = _brute_force(vectors, docs, query, 10)
+        assert [i for i, _ in index.search(query, k=10, nprobe=32)] == exact
+        approx = {i for i, _ in index.search(query, k=10)}
+        hits += len(approx & set(exact))
+        total += len(exact)
+    assert hits / total >= 0.9
+
+
+def test_filter_widens_probe_until_k_hits():
+    vectors, docs = _corpus(500)
+    index = LocalVectorIndex.build(vectors, docs, kind="ivf", n_lists=50, nprobe=1)
+    out = index.search(vectors[0], k=20, doc_types=["contract"])
+    assert len(out) == 20
+    assert all(docs[i].metadata["doc_type"] == "contract" for i, _ in out)
+    assert index.search(vectors[0], k=5, doc_types=["unknown"]) == []
+
+
+def test_build_write_and_mmap_load(tmp_path):
+    vectors, docs = _corpus(120)
+    path = str(tmp_path / "vec")
+    build_id = build_vector_index(docs, _HashEmbeddings(vectors, docs), path, kind="flat", embedding_model="fake")
+    loaded = load_vector_index(path)
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.build_id == build_id == read_vector_meta(path)["build_id"]
+    assert loaded.embedding_model == "fake"
+    in_memory = LocalVectorIndex.build(vectors, docs, kind="flat")
+    query = vectors[5]
+    assert loaded.search(query, k=5) == in_memory.search(query, k=5)
+    assert load_vector_index(str(tmp_path / "missing")) is None
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "empty")
+    build_vector_index([], _HashEmbeddings([], []), path)
+    assert load_vector_index(path).search([1.0, 0.0], k=3) == []
+
+
+def test_store_applies_pinecone_style_filters():
+    vectors, docs = _corpus(80)
+    store = LocalVectorStore(LocalVectorIndex.build(vectors, docs), _HashEmbeddings(vectors, docs))
+    single = store.similarity_search_with_score("chunk 3", k=5, filter={"doc_type": "policy"})
+    assert {d.metadata["doc_type"] for d, _ in single} == {"policy"}
+    multi = store.similarity_search_with_score("chunk 3", k=5, filter={"doc_type": {"$in": ["sop", "contract"]}})
+    assert {d.metadata["doc_type"] for d, _ in multi} <= {"sop", "contract"}
+    top_doc, top_score = store.similarity_search_with_score("chunk 3", k=1)[0]
+    assert top_doc.metadata["chunk_id"] == "c3" and top_score == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        store.similarity_search_with_score("chunk 3", k=1, filter={"supplier": "x"})
+
+
+def test_hybrid_retriever_runs_on_local_store():
+    vectors, docs = _corpus(40)
+    store = LocalVectorStore(LocalVectorIndex.build(vectors, docs), _HashEmbeddings(vectors, docs))
+    retriever = HybridRetriever(k=3, reranker=None, bm25=LocalBM25Index(docs), vectorstore=store, doc_types=["policy"])
+    out = retriever.invoke("chunk 8")
+    assert not retriever.last_degraded
+    assert out[0].metadata["chunk_id"] == "c8"
+    assert "vector" in out[0].metadata["retrieval_routes"]
+
+
+def test_local_backend_without_index_raises(tmp_path):
+    from rag.retriever import get_local_vectorstore
+
+    with pytest.raises(FileNotFoundError):
+        get_local_vectorstore(str(tmp_path / "none"))
+
+
+def test_vector_retriever_on_local_backend(monkeypatch):
+    import rag.retriever as retriever_module
+
+    vectors, docs = _corpus(40)
+    store = LocalVectorStore(LocalVectorIndex.build(vectors, docs), _HashEmbeddings(vectors, docs))
+    monkeypatch.setattr(retriever_module, "VECTOR_BACKEND", "local")
+    monkeypatch.setattr(retriever_module, "get_local_vectorstore", lambda: store)
+    out = retriever_module.get_vector_retriever(k=3, doc_types=["policy", "sop"]).invoke("chunk 8")
+    assert len(out) == 3 and out[0].metadata["chunk_id"] == "c8"
+    assert {d.metadata["doc_type"] for d in out} <= {"policy", "sop"}
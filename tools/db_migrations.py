@@ -0,0 +1,143 @@
+"""Versioned schema migrations for the Ratti demo warehouse (``SQLITE_DB_PATH``).
+
+``PRAGMA user_version`` records the last applied migration. Each migration is
+a list of idempotent DDL statements applied in one transaction together with
+the version bump, followed by ``ANALYZE`` so the planner has row statistics
+for the new indexes. Version 1 adds the secondary indexes behind the KPI
+templates, the risk-scoring tool and the assessment branches:
+
+  supplier_id   on every fact table, with the date column the queries order by
+  dates         ``documents.expiry_date``, ``suppliers.next_review_date``
+  scores        ``esg_assessments.final_esg_score``
+  composites    ``suppliers(category_level_2, kraljic_quadrant)`` and
+                ``suppliers(kraljic_quadrant, category_level_2)``
+
+Version 2 adds the ``kpi_monthly_rollup`` table filled by ``tools.kpi_rollup``.
+
+The migration changes the DB fingerprint, so cached answers from the old file
+are invalidated (see ``core.data_snapshot``).
+
+  uv run python -m tools.db_migrations            # migrate SQLITE_DB_PATH
+  uv run python -m tools.db_migrations --status
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from typing import NamedTuple
+
+from core.config import SQLITE_DB_PATH
+from tools.sql_pool import resolve_db_path
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    statements: tuple[str, ...]
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "secondary_indexes",
+        (
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_suppliers_supplier_id ON suppliers(supplier_id)",
+            "CREATE INDEX IF NOT EXISTS ix_suppliers_category_kraljic ON suppliers(category_level_2, kraljic_quadrant)",
+            "CREATE INDEX IF NOT EXISTS ix_suppliers_kraljic_category ON suppliers(kraljic_quadrant, category_level_2)",
+            "CREATE INDEX IF NOT EXISTS ix_suppliers_next_review ON suppliers(next_review_date)",
+            "CREATE INDEX IF NOT EXISTS ix_purchase_orders_supplier ON purchase_orders(supplier_id, order_date)",
+            "CREATE INDEX IF NOT EXISTS ix_delivery_events_supplier"
+            " ON delivery_events(supplier_id, actual_delivery_date)",
+            "CREATE INDEX IF NOT EXISTS ix_quality_events_supplier ON quality_events(supplier_id, event_date)",
+            "CREATE INDEX IF NOT EXISTS ix_risk_events_supplier"
+            " ON risk_events(supplier_id, risk_score_1_25, event_date)",
+            "CREATE INDEX IF NOT EXISTS ix_risk_events_event_date ON risk_events(event_date)",
+            "CREATE INDEX IF NOT EXISTS ix_documents_supplier ON documents(supplier_id, expiry_date)",
+            "CREATE INDEX IF NOT EXISTS ix_documents_expiry ON documents(expiry_date)",
+            "CREATE INDEX IF NOT EXISTS ix_esg_assessments_supplier ON esg_assessments(supplier_id, assessment_date)",
+            "CREATE INDEX IF NOT EXISTS ix_esg_assessments_score ON esg_assessments(final_esg_score)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_vendor_rating_supplier_period ON vendor_rating(supplier_id, period)",
+            "CREATE INDEX IF NOT EXISTS ix_vendor_rating_period ON vendor_rating(period)",
+        ),
+    ),
+    Migration(
+        2,
+        "kpi_monthly_rollup",
+        (
+            "CREATE TABLE IF NOT EXISTS kpi_monthly_rollup ("
+            " supplier_id TEXT NOT NULL,"
+            " month TEXT NOT NULL,"
+            " delivery_rows INTEGER NOT NULL DEFAULT 0,"
+            " delivery_count INTEGER NOT NULL DEFAULT 0,"
+            " on_time_sum INTEGER NOT NULL DEFAULT 0,"
+            " on_time_n INTEGER NOT NULL DEFAULT 0,"
+            " delay_days_sum REAL NOT NULL DEFAULT 0,"
+            " delay_days_n INTEGER NOT NULL DEFAULT 0,"
+            " quality_rows INTEGER NOT NULL DEFAULT 0,"
+            " quality_event_count INTEGER NOT NULL DEFAULT 0,"
+            " defect_rate_sum REAL NOT NULL DEFAULT 0,"
+            " defect_rate_n INTEGER NOT NULL DEFAULT 0,"
+            " po_rows INTEGER NOT NULL DEFAULT 0,"
+            " spend_eur REAL NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (supplier_id, month)"
+            ") WITHOUT ROWID",
+            "CREATE INDEX IF NOT EXISTS ix_kpi_monthly_rollup_month ON kpi_monthly_rollup(month)",
+            "CREATE TABLE IF NOT EXISTS kpi_rollup_state ("
+            " source_table TEXT PRIMARY KEY, high_watermark INTEGER NOT NULL, refreshed_at TEXT NOT NULL)",
+        ),
+    ),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(path: str | None = None, *, target: int = LATEST_VERSION) -> list[str]:
+    """Apply pending migrations up to ``target``; returns the names applied (empty when current)."""
+    conn = sqlite3.connect(resolve_db_path(path or SQLITE_DB_PATH), isolation_level=None)
+    applied: list[str] = []
+    try:
+        current = schema_version(conn)
+        for migration in MIGRATIONS:
+            if migration.version <= current or migration.version > target:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for statement in migration.statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(f"{migration.version:04d}_{migration.name}")
+        if applied:
+            conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return applied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=None, help="database path (default SQLITE_DB_PATH)")
+    parser.add_argument("--status", action="store_true", help="print the schema version and exit")
+    args = parser.parse_args()
+    path = resolve_db_path(args.db or SQLITE_DB_PATH)
+    if args.status:
+        conn = sqlite3.connect(path)
+        try:
+            print(f"{path}: user_version={schema_version(conn)} latest={LATEST_VERSION}")
+        finally:
+            conn.close()
+        return
+    applied = migrate(path)
+    print(f"{path}: applied {applied}" if applied else f"{path}: already at version {LATEST_VERSION}")
+
+
+if __name__ == "__main__":
+    main()
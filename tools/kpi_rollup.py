@@ -0,0 +1,206 @@
+"""Per-supplier monthly KPI rollup (``kpi_monthly_rollup``) with incremental refresh.
+
+One row per (supplier_id, month) holds additive sums and counts from
+``delivery_events`` (on-time flag, delay days), ``quality_events`` (defect
+rate) and ``purchase_orders`` (spend). Every ratio can be re-derived exactly
+for any month-aligned window, e.g. on-time rate = SUM(on_time_sum) /
+SUM(on_time_n). Months come from ``actual_delivery_date``, ``event_date`` and
+``order_date``; rows without a date are kept under month ``''``.
+
+``kpi_rollup_state`` keeps a rowid high-watermark per source table. Each
+refresh aggregates only the rows appended since the last run and upserts the
+deltas in one transaction, so its cost follows the new rows rather than the
+table size. Updates or deletes of existing event rows need ``--full``.
+
+KPI templates read the rollup only while it is current, meaning every
+watermark is at the source table's MAX(rowid). The check is redone whenever
+the read pool sees the DB file change. A stale rollup falls back to the raw
+event tables.
+
+  uv run python -m tools.kpi_rollup                 # incremental refresh of SQLITE_DB_PATH
+  uv run python -m tools.kpi_rollup --full
+  uv run python -m tools.kpi_rollup --interval 60   # keep refreshing every 60s
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+from core.config import KPI_USE_ROLLUP, SQLITE_DB_PATH
+from tools.db_migrations import migrate
+from tools.sql_guard import register_trusted_sql
+from tools.sql_pool import get_read_pool, resolve_db_path
+from tools.sql_tools import run_sql_query_with_meta
+
+# source table -> (month expression, rollup columns, aggregate expressions)
+_SOURCES: dict[str, tuple[str, tuple[str, ...], tuple[str, ...]]] = {
+    "delivery_events": (
+        "strftime('%Y-%m', actual_delivery_date)",
+        ("delivery_rows", "delivery_count", "on_time_sum", "on_time_n", "delay_days_sum", "delay_days_n"),
+        (
+            "COUNT(*)",
+            "COUNT(delivery_id)",
+            "COALESCE(SUM(on_time_flag), 0)",
+            "COUNT(on_time_flag)",
+            "COALESCE(SUM(delivery_delay_days), 0)",
+            "COUNT(delivery_delay_days)",
+        ),
+    ),
+    "quality_events": (
+        "strftime('%Y-%m', event_date)",
+        ("quality_rows", "quality_event_count", "defect_rate_sum", "defect_rate_n"),
+        ("COUNT(*)", "COUNT(quality_event_id)", "COALESCE(SUM(defect_rate), 0)", "COUNT(defect_rate)"),
+    ),
+    "purchase_orders": (
+        "strftime('%Y-%m', order_date)",
+        ("po_rows", "spend_eur"),
+        ("COUNT(*)", "COALESCE(SUM(order_amount_eur), 0)"),
+    ),
+}
+
+_TREND_SQL = """
+SELECT month,
+       ROUND(on_time_sum * 1.0 / on_time_n, 4) AS otd,
+       ROUND(CASE WHEN defect_rate_n > 0 THEN defect_rate_sum / defect_rate_n ELSE 0 END, 4) AS defect
+FROM kpi_monthly_rollup
+WHERE supplier_id = ?
+  AND month <> ''
+  AND on_time_n > 0
+ORDER BY month DESC
+LIMIT ?
+"""
+register_trusted_sql(_TREND_SQL)
+
+_READY_LOCK = threading.Lock()
+_READY: dict[tuple[str, int], bool] = {}
+
+
+def _delta_sql(table: str) -> str:
+    month_expr, columns, aggregates = _SOURCES[table]
+    select = ", ".join(f"{agg} AS {col}" for col, agg in zip(columns, aggregates))
+    updates = ", ".join(f"{col} = {col} + excluded.{col}" for col in columns)
+    return (
+        f"INSERT INTO kpi_monthly_rollup (supplier_id, month, {', '.join(columns)}) "
+        f"SELECT supplier_id, COALESCE({month_expr}, '') AS month, {select} "
+        f"FROM {table} WHERE rowid > ? AND rowid <= ? AND supplier_id IS NOT NULL "
+        "GROUP BY 1, 2 "
+        f"ON CONFLICT(supplier_id, month) DO UPDATE SET {updates}"
+    )
+
+
+def refresh_rollups(path: str | None = None, *, full: bool = False) -> dict[str, Any]:
+    """Fold event rows appended since the last refresh into the rollup (everything with ``full``).
+
+    A refresh with nothing to fold writes nothing, so the DB fingerprint (and every cache keyed on it) holds.
+    """
+    db_path = resolve_db_path(path or SQLITE_DB_PATH)
+    migrate(db_path)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    started = time.perf_counter()
+    folded: dict[str, int] = {}
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if full:
+                conn.execute("DELETE FROM kpi_monthly_rollup")
+                conn.execute("DELETE FROM kpi_rollup_state")
+            now = datetime.now(UTC).isoformat(timespec="seconds")
+            changed = full
+            for table in _SOURCES:
+                row = conn.execute(
+                    "SELECT high_watermark FROM kpi_rollup_state WHERE source_table = ?", (table,)
+                ).fetchone()
+                low = int(row[0]) if row else 0
+                high = int(conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0])
+                folded[table] = max(0, high - low)
+                if high <= low and row is not None:
+                    continue  # nothing new: leave the file (and its fingerprint) untouched
+                if high > low:
+                    conn.execute(_delta_sql(table), (low, high))
+                conn.execute(
+                    "INSERT INTO kpi_rollup_state (source_table, high_watermark, refreshed_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(source_table) DO UPDATE SET"
+                    " high_watermark = excluded.high_watermark, refreshed_at = excluded.refreshed_at",
+                    (table, max(high, low), now),
+                )
+                changed = True
+            conn.execute("COMMIT" if changed else "ROLLBACK")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    return {
+        "path": db_path,
+        "full": full,
+        "rows_folded": folded,
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _rollup_current(conn: sqlite3.Connection) -> bool:
+    marks = dict(conn.execute("SELECT source_table, high_watermark FROM kpi_rollup_state").fetchall())
+    for table in _SOURCES:
+        high = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {table}").fetchone()[0]
+        if table not in marks or int(marks[table]) < int(high):
+            return False
+    return True
+
+
+def rollup_ready() -> bool:
+    """True when KPI templates may read ``kpi_monthly_rollup`` instead of the event tables."""
+    if not KPI_USE_ROLLUP:
+        return False
+    pool = get_read_pool()
+    try:
+        conn = pool.connection()
+        key = (pool.path, pool.stats()["generation"])
+        with _READY_LOCK:
+            if key in _READY:
+                return _READY[key]
+        ready = _rollup_current(conn)
+    except sqlite3.Error:
+        return False
+    with _READY_LOCK:
+        _READY.clear()
+        _READY[key] = ready
+    return ready
+
+
+def supplier_kpi_trend(supplier_id: str, months: int = 6) -> dict[str, list] | None:
+    """Last ``months`` months with deliveries as ``{"months", "otd", "defect"}`` (fractions); ``None`` if unavailable."""
+    if not rollup_ready():
+        return None
+    rows = run_sql_query_with_meta(_TREND_SQL, params=(supplier_id, int(months)))["rows"]
+    if not rows:
+        return None
+    rows.reverse()
+    return {
+        "otd": [r["otd"] for r in rows],
+        "defect": [r["defect"] for r in rows],
+        "months": [datetime.strptime(r["month"], "%Y-%m").strftime("%b") for r in rows],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Refresh the per-supplier monthly KPI rollup.")
+    parser.add_argument("--db", default=None, help="database path (default SQLITE_DB_PATH)")
+    parser.add_argument("--full", action="store_true", help="rebuild from scratch")
+    parser.add_argument("--interval", type=float, default=0.0, help="repeat every N seconds (0 = once)")
+    args = parser.parse_args()
+    result = refresh_rollups(args.db, full=args.full)
+    print(result, flush=True)
+    while args.interval > 0:
+        time.sleep(args.interval)
+        result = refresh_rollups(args.db)
+        if any(result["rows_folded"].values()):
+            print(result, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 
+from tools.kpi_rollup import rollup_ready
+from tools.sql_guard import register_trusted_sql
+
 
 _SUPPLIER_ID_PATTERN = re.compile(r"\b(SUP\d{3})\b", re.IGNORECASE)
 _YEAR_PATTERN = re.compile(r"\b(20\d{2})\b")
@@ -18,6 +21,10 @@ class TemplatedSQL:
     params: tuple
     description: str
 
+    def __post_init__(self) -> None:
+        # Template text is static per branch: validated on first build, then served from the trusted set.
+        register_trusted_sql(self.sql)
+
 
 def _detect_supplier_ids(text: str) -> list[str]:
     return list(dict.fromkeys(m.upper() for m in _SUPPLIER_ID_PATTERN.findall(text or "")))
@@ -148,7 +155,29 @@ ORDER BY vr.on_time_delivery_rate_pct DESC
     )
 
 
-def _avg_delay_above_threshold(threshold: float) -> TemplatedSQL:
+def _avg_delay_above_threshold(threshold: float, rollup: Optional[bool] = None) -> TemplatedSQL:
+    if rollup is None:
+        rollup = rollup_ready()
+    if rollup:
+        sql = """
+SELECT s.supplier_id,
+       s.supplier_name_anonymized,
+       s.category_level_2,
+       s.risk_level,
+       ROUND(SUM(r.delay_days_sum) * 1.0 / SUM(r.delay_days_n), 2) AS avg_delay_days,
+       SUM(r.delivery_count) AS delivery_count
+FROM suppliers s
+JOIN kpi_monthly_rollup r ON s.supplier_id = r.supplier_id
+GROUP BY s.supplier_id, s.supplier_name_anonymized, s.category_level_2, s.risk_level
+HAVING SUM(r.delivery_rows) > 0 AND avg_delay_days > ?
+ORDER BY avg_delay_days DESC
+"""
+        return TemplatedSQL(
+            template_id="avg_delay_above_threshold",
+            sql=sql.strip(),
+            params=(threshold,),
+            description=f"Suppliers with average delivery delay above {threshold} days (monthly rollup)",
+        )
     sql = """
 SELECT s.supplier_id,
        s.supplier_name_anonymized,
@@ -285,7 +314,29 @@ GROUP BY s.supplier_id
     )
 
 
-def _on_time_rate_by_category(category: str, year: Optional[str]) -> TemplatedSQL:
+def _on_time_rate_by_category(category: str, year: Optional[str], rollup: Optional[bool] = None) -> TemplatedSQL:
+    if rollup is None:
+        rollup = rollup_ready()
+    if rollup:
+        sql = """
+SELECT s.supplier_id,
+       s.supplier_name_anonymized,
+       ROUND(SUM(r.on_time_sum) * 100.0 / SUM(r.on_time_n), 2) AS on_time_delivery_rate_pct,
+       SUM(r.delivery_count) AS delivery_count
+FROM suppliers s
+JOIN kpi_monthly_rollup r ON s.supplier_id = r.supplier_id
+WHERE s.category_level_2 = ?
+  AND (? IS NULL OR substr(r.month, 1, 4) = ?)
+GROUP BY s.supplier_id, s.supplier_name_anonymized
+HAVING SUM(r.delivery_rows) > 0
+ORDER BY on_time_delivery_rate_pct DESC
+"""
+        return TemplatedSQL(
+            template_id="otd_by_category",
+            sql=sql.strip(),
+            params=(category, year, year),
+            description=f"On-time delivery rate for category {category} (monthly rollup)",
+        )
     if year:
         sql = """
 SELECT s.supplier_id,
@@ -321,7 +372,30 @@ ORDER BY on_time_delivery_rate_pct DESC
     )
 
 
-def _on_time_rate_by_supplier_id(supplier_id: str, year: Optional[str]) -> TemplatedSQL:
+def _on_time_rate_by_supplier_id(
+    supplier_id: str, year: Optional[str], rollup: Optional[bool] = None
+) -> TemplatedSQL:
+    if rollup is None:
+        rollup = rollup_ready()
+    if rollup:
+        sql = """
+SELECT s.supplier_id,
+       s.supplier_name_anonymized,
+       ROUND(SUM(r.on_time_sum) * 100.0 / SUM(r.on_time_n), 2) AS on_time_delivery_rate_pct,
+       SUM(r.delivery_count) AS delivery_count
+FROM suppliers s
+JOIN kpi_monthly_rollup r ON s.supplier_id = r.supplier_id
+WHERE s.supplier_id = ?
+  AND (? IS NULL OR substr(r.month, 1, 4) = ?)
+GROUP BY s.supplier_id, s.supplier_name_anonymized
+HAVING SUM(r.delivery_rows) > 0
+"""
+        return TemplatedSQL(
+            template_id="otd_by_supplier_id",
+            sql=sql.strip(),
+            params=(supplier_id, year, year),
+            description=f"On-time delivery rate for {supplier_id} (monthly rollup)",
+        )
     if year:
         sql = """
 SELECT s.supplier_id,
@@ -355,7 +429,30 @@ GROUP BY s.supplier_id, s.supplier_name_anonymized
     )
 
 
-def _defect_rate_by_category(category: str, year: Optional[str]) -> TemplatedSQL:
+def _defect_rate_by_category(category: str, year: Optional[str], rollup: Optional[bool] = None) -> TemplatedSQL:
+    if rollup is None:
+        rollup = rollup_ready()
+    if rollup:
+        sql = """
+SELECT s.supplier_id,
+       s.supplier_name_anonymized,
+       ROUND(SUM(r.defect_rate_sum) * 100.0 / SUM(r.defect_rate_n), 2) AS quality_defect_rate_pct,
+       SUM(r.quality_event_count) AS quality_event_count
+FROM suppliers s
+JOIN kpi_monthly_rollup r ON s.supplier_id = r.supplier_id
+WHERE s.category_level_2 = ?
+  AND (? IS NULL OR substr(r.month, 1, 4) = ?)
+GROUP BY s.supplier_id, s.supplier_name_anonymized
+HAVING SUM(r.quality_rows) > 0
+ORDER BY quality_defect_rate_pct DESC
+"""
+        suffix = f" in {year}" if year else ""
+        return TemplatedSQL(
+            template_id="defect_rate_by_category",
+            sql=sql.strip(),
+            params=(category, year, year),
+            description=f"Quality defect rate for category {category}{suffix} (monthly rollup)",
+        )
     if year:
         sql = """
 SELECT s.supplier_id,
@@ -0,0 +1,101 @@
+"""Result cache for read-only KPI queries (``tools.sql_tools.run_sql_query_with_meta``).
+
+Entries are keyed by (label, normalized SQL, params, DB snapshot):
+
+  label       ``template:<template_id>`` for KPI templates, ``sql`` otherwise
+  SQL         the guard's validated text; LLM-written SQL is re-rendered from
+              its AST without comments, so layout and keyword-case variants
+              share one entry
+  snapshot    ``core.data_snapshot.db_fingerprint`` of the pooled database,
+              so a rebuilt or migrated warehouse never serves old rows
+
+Size is bounded by entry count (``KPI_RESULT_CACHE_SIZE``) and by the
+approximate JSON size of the cached rows (``KPI_RESULT_CACHE_MAX_BYTES``),
+evicting least recently used first. SQL that depends on the clock or on
+randomness (``'now'``, ``CURRENT_*``, ``random()``) is never cached.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from core.config import KPI_RESULT_CACHE_MAX_BYTES, KPI_RESULT_CACHE_SIZE
+
+_VOLATILE = re.compile(r"'now'|\bcurrent_(?:date|time|timestamp)\b|\brandom(?:blob)?\s*\(", re.IGNORECASE)
+
+
+class CachedResult(NamedTuple):
+    rows: list[dict[str, Any]]
+    latency_ms: float
+    nbytes: int
+
+
+def is_cacheable_sql(sql: str) -> bool:
+    return not _VOLATILE.search(sql)
+
+
+class QueryResultCache:
+    def __init__(self, max_entries: int = KPI_RESULT_CACHE_SIZE, max_bytes: int = KPI_RESULT_CACHE_MAX_BYTES) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple, CachedResult] = OrderedDict()
+        self._bytes = 0
+        self._counts = {"hits": 0, "misses": 0, "evictions": 0, "oversize": 0}
+
+    def get(self, key: tuple) -> CachedResult | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                self._counts["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counts["hits"] += 1
+        return hit
+
+    def put(self, key: tuple, rows: list[dict[str, Any]], latency_ms: float) -> None:
+        if self.max_entries == 0:
+            return
+        nbytes = len(json.dumps(rows, default=str))
+        if nbytes > self.max_bytes // 4:  # one huge result must not flush the whole cache
+            with self._lock:
+                self._counts["oversize"] += 1
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[key] = CachedResult(rows, latency_ms, nbytes)
+            self._bytes += nbytes
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, victim = self._entries.popitem(last=False)
+                self._bytes -= victim.nbytes
+                self._counts["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._counts:
+                self._counts[name] = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self._counts,
+            }
+
+
+_CACHE = QueryResultCache()
+
+
+def get_result_cache() -> QueryResultCache:
+    return _CACHE
@@ -0,0 +1,477 @@
+"""Execution backends for guarded read-only SQL (``tools.sql_tools.run_sql_query_with_meta``).
+
+``SQL_BACKEND`` selects where a statement runs after the SQL guard has
+validated it (table allowlist, injected LIMIT) in the SQLite dialect:
+
+  sqlite   pooled read-only SQLite connections (``tools.sql_pool``), default
+  duckdb   DuckDB (optional ``duckdb`` package), columnar and multi-threaded,
+           over the same tables. ``SQL_DUCKDB_SOURCE`` picks how it reads them:
+             attach    the live SQLite file through DuckDB's ``sqlite`` extension
+             parquet   a Parquet export in ``SQL_DUCKDB_PARQUET_DIR`` written by
+                       ``python -m tools.sql_backends --export``; it is served only
+                       while its manifest matches the SQLite file's fingerprint,
+                       otherwise queries fall back to SQLite
+
+Validated SQL is transpiled with sqlglot (sqlite -> duckdb) and memoized. A few
+SQLite idioms that sqlglot does not map are rewritten first: ``date(x, '+N
+days')`` modifiers, ``julianday``, ``json_each`` values as text, LIKE without
+case, bare columns next to GROUP BY (``ANY_VALUE``), negative LIMIT, TEXT
+columns compared with numbers, and date casts that yield NULL instead of
+failing. Values come back
+SQLite-shaped: dates as ``YYYY-MM-DD`` text and DECIMAL as float. Integer
+division is not emulated (``a / b`` is fractional in DuckDB).
+
+LLM-written SQL keeps the wall-clock budget (``SQL_QUERY_TIMEOUT_MS``, through
+DuckDB's ``interrupt()``). The SQLite plan check and VM step limit
+(``tools.sql_cost``) do not apply here.
+
+  uv run python -m tools.sql_backends --export            # Parquet export of SQLITE_DB_PATH
+  uv run python -m tools.sql_backends --export --db path/to.db --out data/duckdb_parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable
+
+import sqlglot
+from sqlglot import exp
+
+from core.config import (
+    SQL_BACKEND,
+    SQL_DUCKDB_PARQUET_DIR,
+    SQL_DUCKDB_SOURCE,
+    SQL_DUCKDB_THREADS,
+    SQL_GUARD_CACHE_SIZE,
+    SQL_QUERY_TIMEOUT_MS,
+    SQLITE_DB_PATH,
+)
+from core.data_snapshot import db_fingerprint
+from tools.sql_cost import QueryCostError
+from tools.sql_guard import ALLOWED_SQL_TABLES
+from tools.sql_pool import resolve_db_path
+from tools.sql_results import RowLimits, collect_rows
+
+_MANIFEST = "manifest.json"
+_NULL = r"\N"
+_MODIFIER = re.compile(r"^\s*([+-]?\s*\d+(?:\.\d+)?)\s+(day|month|year|hour|minute|second)s?\s*$", re.IGNORECASE)
+# SQLite declared type affinity -> DuckDB column type for the Parquet export
+_AFFINITY = (
+    ("INT", "BIGINT"),
+    ("CHAR", "VARCHAR"),
+    ("CLOB", "VARCHAR"),
+    ("TEXT", "VARCHAR"),
+    ("REAL", "DOUBLE"),
+    ("FLOA", "DOUBLE"),
+    ("DOUB", "DOUBLE"),
+)
+
+
+# ---------- sqlite -> duckdb dialect ----------
+
+
+def _duck(sql: str) -> exp.Expression:
+    return sqlglot.parse_one(sql, read="duckdb")
+
+
+def _sqlite_date(node: exp.Date) -> exp.Expression:
+    """SQLite ``date(x[, modifier])`` (TEXT result) as DuckDB ``strftime`` over a DATE."""
+    base = node.this
+    if isinstance(base, exp.Literal) and base.is_string and base.name.lower() == "now":
+        day = "CURRENT_DATE"
+    else:
+        day = f"TRY_CAST({base.sql(dialect='duckdb')} AS DATE)"
+    modifier = node.args.get("zone")
+    if modifier is None:
+        return _duck(f"STRFTIME({day}, '%Y-%m-%d')")
+    if isinstance(modifier, exp.Literal) and modifier.is_string:
+        match = _MODIFIER.match(modifier.name)
+        if match is None:
+            raise ValueError(f"Unsupported date modifier for duckdb: {modifier.name!r}")
+        amount, unit = match.group(1).replace(" ", ""), match.group(2).upper()
+        return _duck(f"STRFTIME({day} + INTERVAL ({amount}) {unit}, '%Y-%m-%d')")
+    # '+' || ? || ' days' (and '-' / months / years)
+    parts = list(modifier.flatten()) if isinstance(modifier, exp.DPipe) else []
+    if len(parts) == 3 and all(isinstance(p, exp.Literal) for p in (parts[0], parts[2])):
+        sign = "-" if parts[0].name.strip() == "-" else ""
+        unit_match = _MODIFIER.match(f"1 {parts[2].name.strip()}")
+        if unit_match is not None:
+            amount = f"{sign}TRY_CAST({parts[1].sql(dialect='duckdb')} AS DOUBLE)"
+            unit = unit_match.group(2).upper()
+            return _duck(f"STRFTIME({day} + TO_{unit}S(CAST({amount} AS BIGINT)), '%Y-%m-%d')")
+    raise ValueError(f"Unsupported date modifier for duckdb: {modifier.sql(dialect='sqlite')}")
+
+
+def _bare_group_columns(select: exp.Select) -> None:
+    """SQLite returns bare columns of a GROUP BY from an arbitrary row; DuckDB needs ``ANY_VALUE``."""
+    group = select.args.get("group")
+    if group is None:
+        return
+    grouped = set()
+    for key in group.expressions:
+        if isinstance(key, exp.Literal) and key.is_int:
+            grouped.add(("pos", int(key.name) - 1))
+        else:
+            grouped.add(("sql", key.sql(dialect="sqlite")))
+            if isinstance(key, exp.Column) and not key.table:
+                grouped.add(("alias", key.name.lower()))
+    for position, projection in enumerate(select.expressions):
+        inner = projection.this if isinstance(projection, exp.Alias) else projection
+        if (
+            ("pos", position) in grouped
+            or ("sql", inner.sql(dialect="sqlite")) in grouped
+            or ("alias", projection.alias_or_name.lower()) in grouped
+            or inner.find(exp.Column) is None
+            or inner.find(exp.AggFunc, exp.Window, exp.Star) is not None
+        ):
+            continue
+        value = exp.AnyValue(this=inner.copy())
+        projection.replace(exp.alias_(value, projection.alias_or_name, quoted=False))
+
+
+def _rewrite_limit(limit: exp.Limit) -> exp.Limit:
+    """SQLite treats a negative LIMIT as "no limit"; DuckDB rejects it (``LIMIT NULL`` is unbounded)."""
+    value = limit.expression
+    if isinstance(value, exp.Placeholder):
+        limit.set("expression", _duck("SELECT 1 LIMIT NULLIF(GREATEST(?, -1), -1)").args["limit"].expression)
+    elif isinstance(value, exp.Neg) or (isinstance(value, exp.Literal) and value.name.startswith("-")):
+        limit.set("expression", exp.Null())
+    return limit
+
+
+def _text_comparison(node: exp.Binary, text_columns: frozenset[str]) -> exp.Binary:
+    """TEXT column vs number compares as text in SQLite (``flag = 1`` is ``flag = '1'``); DuckDB would cast."""
+    for side, other in (("this", "expression"), ("expression", "this")):
+        column, literal = node.args.get(side), node.args.get(other)
+        if (
+            isinstance(column, exp.Column)
+            and column.name.lower() in text_columns
+            and isinstance(literal, exp.Literal)
+            and not literal.is_string
+        ):
+            node.set(other, exp.Literal.string(literal.name))
+    return node
+
+
+def _rewrite_sqlite(node: exp.Expression, text_columns: frozenset[str] = frozenset()) -> exp.Expression:
+    if isinstance(node, exp.Select):
+        _bare_group_columns(node)
+        return node
+    if isinstance(node, exp.Limit):
+        return _rewrite_limit(node)
+    if text_columns and isinstance(node, (exp.EQ, exp.NEQ, exp.GT, exp.GTE, exp.LT, exp.LTE)):
+        return _text_comparison(node, text_columns)
+    if isinstance(node, exp.Date):
+        return _sqlite_date(node)
+    if isinstance(node, exp.Anonymous) and node.name.lower() == "julianday" and len(node.expressions) == 1:
+        arg = node.expressions[0]
+        value = "NOW()" if isinstance(arg, exp.Literal) and arg.name.lower() == "now" else arg.sql(dialect="duckdb")
+        return _duck(f"(EPOCH(TRY_CAST({value} AS TIMESTAMP)) / 86400.0 + 2440587.5)")
+    if isinstance(node, exp.Table) and isinstance(node.this, exp.Anonymous) and node.this.name.lower() == "json_each":
+        args = ", ".join(a.sql(dialect="duckdb") for a in node.this.expressions)
+        alias = node.alias or "json_each"
+        sub = _duck(f"(SELECT j.key, j.value ->> '$' AS value, j.type FROM JSON_EACH({args}) AS j) AS {alias}")
+        return sub.find(exp.Subquery) or sub
+    if isinstance(node, exp.Like):
+        return exp.ILike(this=node.this, expression=node.expression)
+    return node
+
+
+def _lenient_casts(node: exp.Expression) -> exp.Expression:
+    if isinstance(node, exp.Cast) and not isinstance(node, exp.TryCast):
+        if node.to.this in (exp.DataType.Type.DATE, exp.DataType.Type.TIMESTAMP):
+            return exp.TryCast(this=node.this, to=node.to)
+    return node
+
+
+@lru_cache(maxsize=SQL_GUARD_CACHE_SIZE)
+def duckdb_sql(validated_sql: str, text_columns: frozenset[str] = frozenset()) -> str:
+    """DuckDB text for SQL the guard validated in the SQLite dialect (``ValueError`` if unsupported).
+
+    ``text_columns`` names the backend's VARCHAR columns, compared as text against number literals.
+    """
+    try:
+        tree = sqlglot.parse_one(validated_sql, read="sqlite")
+        tree = tree.transform(lambda node: _rewrite_sqlite(node, text_columns))
+        duck = sqlglot.parse_one(tree.sql(dialect="duckdb"), read="duckdb").transform(_lenient_casts)
+    except sqlglot.errors.SqlglotError as exc:
+        raise ValueError(f"Cannot transpile SQL for duckdb: {exc}") from exc
+    return duck.sql(dialect="duckdb")
+
+
+def _py_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _py_row(row: Iterable[Any]) -> tuple:
+    return tuple(_py_value(v) for v in row)
+
+
+# ---------- Parquet export ----------
+
+
+def _duck_type(declared: str) -> str:
+    upper = (declared or "").upper()
+    for needle, duck_type in _AFFINITY:
+        if needle in upper:
+            return duck_type
+    return "VARCHAR"
+
+
+def _export_columns(conn: sqlite3.Connection, table: str) -> list[tuple[str, str, str]]:
+    """(name, DuckDB type, SELECT expression) per column, typed by declared affinity and stored values.
+
+    SQLite lets a REAL or INTEGER column hold text (e.g. ``''``); such values export as NULL.
+    """
+    columns = []
+    for _, name, declared, *_ in conn.execute(f'PRAGMA table_info("{table}")').fetchall():
+        duck_type = _duck_type(str(declared))
+        quoted = f'"{name}"'
+        if duck_type == "VARCHAR":
+            columns.append((name, duck_type, quoted))
+            continue
+        stored = {r[0] for r in conn.execute(f"SELECT DISTINCT typeof({quoted}) FROM \"{table}\"")}
+        if "real" in stored:
+            duck_type = "DOUBLE"
+        columns.append(
+            (name, duck_type, f"CASE WHEN typeof({quoted}) IN ('integer', 'real') THEN {quoted} END")
+        )
+    return columns
+
+
+def _manifest(out_dir: str) -> dict[str, Any] | None:
+    try:
+        with open(os.path.join(out_dir, _MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def export_parquet(path: str | None = None, out_dir: str | None = None) -> dict[str, Any]:
+    """Write every allowlisted table of the SQLite DB to ``<out_dir>/<table>.parquet`` plus a manifest."""
+    import duckdb  # optional dependency
+
+    db_path = resolve_db_path(path or SQLITE_DB_PATH)
+    out_dir = out_dir or SQL_DUCKDB_PARQUET_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    started = time.perf_counter()
+    source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    duck = duckdb.connect()
+    tables: dict[str, int] = {}
+    try:
+        existing = {r[0] for r in source.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        with tempfile.TemporaryDirectory() as tmp:
+            for table in sorted(ALLOWED_SQL_TABLES & existing):
+                spec = _export_columns(source, table)
+                select = ", ".join(expr for _, _, expr in spec)
+                staged = os.path.join(tmp, f"{table}.csv")
+                rows = 0
+                with open(staged, "w", encoding="utf-8", newline="") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(name for name, _, _ in spec)
+                    for row in source.execute(f'SELECT {select} FROM "{table}"'):
+                        writer.writerow(_NULL if v is None else v for v in row)
+                        rows += 1
+                types = {name: duck_type for name, duck_type, _ in spec}
+                target = os.path.join(out_dir, f"{table}.parquet")
+                duck.execute(
+                    "COPY (SELECT * FROM read_csv(?, header = true, delim = ',', quote = '\"', escape = '\"',"
+                    f" nullstr = ?, columns = {types!r})) TO '{target}' (FORMAT PARQUET)",
+                    [staged, _NULL],
+                )
+                tables[table] = rows
+    finally:
+        duck.close()
+        source.close()
+    manifest = {
+        "source": db_path,
+        "db_fingerprint": db_fingerprint(db_path),
+        "exported_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "tables": tables,
+    }
+    with open(os.path.join(out_dir, _MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return {**manifest, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+
+# ---------- DuckDB backend ----------
+
+
+class DuckDbBackend:
+    """One in-process DuckDB database with views over the SQLite tables; one cursor per thread."""
+
+    name = "duckdb"
+
+    def __init__(
+        self,
+        sqlite_path: str,
+        *,
+        source: str | None = None,
+        parquet_dir: str | None = None,
+        threads: int | None = None,
+    ) -> None:
+        import duckdb  # optional dependency
+
+        source = SQL_DUCKDB_SOURCE if source is None else source
+        parquet_dir = SQL_DUCKDB_PARQUET_DIR if parquet_dir is None else parquet_dir
+        threads = SQL_DUCKDB_THREADS if threads is None else threads
+        if source not in {"attach", "parquet"}:
+            raise ValueError(f"unknown SQL_DUCKDB_SOURCE={source!r} (attach|parquet)")
+        self.sqlite_path = sqlite_path
+        self.source = source
+        self.parquet_dir = parquet_dir
+        self._duckdb = duckdb
+        self._conn = duckdb.connect(":memory:")
+        if threads > 0:
+            self._conn.execute(f"SET threads = {int(threads)}")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if source == "attach":
+            self._conn.execute("INSTALL sqlite")
+            self._conn.execute("LOAD sqlite")
+            self._conn.execute(f"ATTACH '{sqlite_path}' AS src (TYPE SQLITE, READ_ONLY)")
+            present = {
+                r[0]
+                for r in self._conn.execute(
+                    "SELECT table_name FROM duckdb_tables() WHERE database_name = 'src'"
+                ).fetchall()
+            }
+            for table in sorted(ALLOWED_SQL_TABLES & present):
+                self._conn.execute(f'CREATE VIEW "{table}" AS SELECT * FROM src."{table}"')
+        else:
+            self._load_parquet_views()
+        self.text_columns = self._text_columns()
+
+    def _load_parquet_views(self) -> None:
+        for table in sorted(ALLOWED_SQL_TABLES):
+            target = os.path.join(self.parquet_dir, f"{table}.parquet")
+            if os.path.exists(target):
+                self._conn.execute(f"CREATE OR REPLACE VIEW \"{table}\" AS SELECT * FROM read_parquet('{target}')")
+
+    def _text_columns(self) -> frozenset[str]:
+        """Column names that are VARCHAR in every view that has them."""
+        types: dict[str, set[str]] = {}
+        for name, data_type in self._conn.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_schema = 'main'"
+        ).fetchall():
+            types.setdefault(str(name).lower(), set()).add(str(data_type).upper())
+        return frozenset(name for name, seen in types.items() if seen == {"VARCHAR"})
+
+    def current(self) -> bool:
+        """False while a Parquet export is missing or older than the SQLite file (callers use SQLite)."""
+        if self.source != "parquet":
+            return True
+        manifest = _manifest(self.parquet_dir)
+        return bool(manifest) and manifest.get("db_fingerprint") == db_fingerprint(self.sqlite_path)
+
+    def _cursor(self):
+        cur = getattr(self._local, "cursor", None)
+        if cur is None:
+            with self._lock:
+                cur = self._conn.cursor()
+            self._local.cursor = cur
+        return cur
+
+    def fetch(
+        self,
+        validated_sql: str,
+        params: Iterable[Any] | None = None,
+        *,
+        untrusted: bool = False,
+        limits: RowLimits | None = None,
+    ) -> tuple[list[str], list[tuple], dict[str, Any] | None]:
+        """Run guard-validated SQLite SQL on DuckDB.
+
+        Returns column names, SQLite-shaped value tuples and, when ``limits`` bound the
+        result, the ``tools.sql_results`` stats (``None`` otherwise).
+        """
+        sql = duckdb_sql(validated_sql, self.text_columns)
+        cur = self._cursor()
+        timer = None
+        if untrusted and SQL_QUERY_TIMEOUT_MS > 0:
+            timer = threading.Timer(SQL_QUERY_TIMEOUT_MS / 1000, cur.interrupt)
+            timer.daemon = True
+            timer.start()
+        stats = None
+        try:
+            cur.execute(sql, list(params or ()))
+            if limits is not None and limits.bounded:
+                rows, stats = collect_rows(cur.fetchmany, limits, convert=_py_row)
+            else:
+                rows = [_py_row(r) for r in cur.fetchall()]
+        except self._duckdb.InterruptException as exc:
+            raise QueryCostError(
+                f"Query cost check: stopped after it exceeded the {SQL_QUERY_TIMEOUT_MS} ms time budget. "
+                "Filter on supplier_id or dates, or aggregate from kpi_monthly_rollup."
+            ) from exc
+        finally:
+            if timer is not None:
+                timer.cancel()
+        columns = [d[0] for d in cur.description or []]
+        return columns, rows, stats
+
+
+_BACKENDS: dict[tuple[str, str], DuckDbBackend | None] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def get_sql_backend(sqlite_path: str, name: str | None = None) -> DuckDbBackend | None:
+    """Configured non-SQLite backend for ``sqlite_path``; ``None`` means run on SQLite."""
+    name = (name or SQL_BACKEND or "sqlite").strip().lower()
+    if name in {"", "sqlite"}:
+        return None
+    key = (name, sqlite_path)
+    with _BACKENDS_LOCK:
+        if key not in _BACKENDS:
+            backend = None
+            if name == "duckdb":
+                try:
+                    backend = DuckDbBackend(sqlite_path)
+                except Exception as exc:
+                    print(f"[sql_backends] duckdb backend unavailable, using SQLite: {exc}", file=sys.stderr)
+            else:
+                print(f"[sql_backends] unknown SQL_BACKEND={name!r}, using SQLite", file=sys.stderr)
+            _BACKENDS[key] = backend
+        backend = _BACKENDS[key]
+    if backend is not None and not backend.current():
+        return None
+    return backend
+
+
+def reset_sql_backends() -> None:
+    """Test helper: drop cached backends."""
+    with _BACKENDS_LOCK:
+        _BACKENDS.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the SQLite warehouse for the DuckDB backend.")
+    parser.add_argument("--export", action="store_true", help="write Parquet files + manifest")
+    parser.add_argument("--db", default=None, help="database path (default SQLITE_DB_PATH)")
+    parser.add_argument("--out", default=None, help="output directory (default SQL_DUCKDB_PARQUET_DIR)")
+    args = parser.parse_args()
+    if not args.export:
+        parser.error("nothing to do (use --export)")
+    print(json.dumps(export_parquet(args.db, args.out), indent=2), flush=True)
+
+
+if __name__ == "__main__":
+    main()
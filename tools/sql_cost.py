@@ -0,0 +1,220 @@
+"""Cost control for LLM-written SQL (``run_sql_query_with_meta(..., untrusted=True)``).
+
+The guard's injected LIMIT bounds the rows returned, not the work done. A
+cartesian join or a correlated subquery over an event table can still keep a
+worker busy for seconds, and the NL2SQL repair loop may run such a query twice.
+Two checks close that gap:
+
+  plan check   before execution, ``EXPLAIN QUERY PLAN`` is walked and the
+               query is rejected when it fully scans a table larger than
+               ``SQL_PLAN_MAX_SCAN_ROWS``, or when nested loops (joins,
+               correlated subqueries) multiply out above
+               ``SQL_PLAN_MAX_NESTED_ROWS``. Table sizes come from
+               ``MAX(rowid)``, a single B-tree descent.
+  budget       during execution, sqlite3's progress handler stops the
+               statement once it passes ``SQL_QUERY_TIMEOUT_MS`` of wall
+               clock or ``SQL_QUERY_MAX_VM_STEPS`` VM instructions.
+
+Both raise ``QueryCostError`` (a ``ValueError``). Its message names the table
+and its indexed columns, so the NL2SQL repair prompt can fix the query.
+Registered templates and tool SQL skip both checks; ``tests/test_query_plans.py``
+covers their plans.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from typing import Any, Callable, Iterable, TypeVar
+
+import sqlglot
+from sqlglot import exp
+
+from core.config import (
+    SQL_PLAN_MAX_NESTED_ROWS,
+    SQL_PLAN_MAX_SCAN_ROWS,
+    SQL_PROGRESS_INTERVAL,
+    SQL_QUERY_MAX_VM_STEPS,
+    SQL_QUERY_TIMEOUT_MS,
+)
+
+T = TypeVar("T")
+
+_SCAN = re.compile(r"SCAN (\w+)")
+_SEARCH = re.compile(r"SEARCH (\w+)")
+
+
+class QueryCostError(ValueError):
+    """Query rejected by the plan check or stopped by its execution budget."""
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    try:
+        tree = sqlglot.parse_one(sql, read="sqlite")
+    except Exception:  # noqa: BLE001 — the guard already accepted this SQL
+        return {}
+    return {t.alias_or_name.lower(): t.name.lower() for t in tree.find_all(exp.Table)}
+
+
+def _table_rows(conn: sqlite3.Connection, table: str) -> int | None:
+    """Approximate row count (``MAX(rowid)``); ``None`` for CTEs, views and unknown names."""
+    try:
+        row = conn.execute(f'SELECT MAX(rowid) FROM "{table}"').fetchone()
+    except sqlite3.Error:
+        return None
+    return int(row[0] or 0)
+
+
+def _indexed_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    columns: list[str] = []
+    try:
+        for index in conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+            info = conn.execute(f'PRAGMA index_info("{index[1]}")').fetchall()
+            if info:
+                lead = ", ".join(str(c[2]) for c in sorted(info, key=lambda c: c[0])[:2])
+                if lead not in columns:
+                    columns.append(lead)
+    except sqlite3.Error:
+        return []
+    return columns
+
+
+def _scan_hint(conn: sqlite3.Connection, table: str) -> str:
+    indexed = _indexed_columns(conn, table)
+    if not indexed:
+        return f"{table} has no index; add a selective filter or use a smaller table"
+    return f"filter {table} on an indexed column ({'; '.join(f'({c})' for c in indexed)})"
+
+
+def check_query_plan(
+    conn: sqlite3.Connection,
+    sql: str,
+    params: Iterable[Any] | None = None,
+    *,
+    max_scan_rows: int | None = None,
+    max_nested_rows: int | None = None,
+) -> dict[str, Any]:
+    """Raise ``QueryCostError`` if the plan is too expensive; otherwise return the estimate.
+
+    Each SCAN loop counts the table's rows and each SEARCH counts one row per
+    outer row (building an automatic index counts as one scan of its table).
+    Sibling loops under one plan node nest, and correlated subqueries run once
+    per row of their enclosing loops.
+    """
+    max_scan_rows = SQL_PLAN_MAX_SCAN_ROWS if max_scan_rows is None else max_scan_rows
+    max_nested_rows = SQL_PLAN_MAX_NESTED_ROWS if max_nested_rows is None else max_nested_rows
+    aliases = _aliases(sql)
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(params or ())).fetchall()
+    children: dict[int, list[tuple[int, str]]] = {}
+    for node_id, parent, _, detail in plan:
+        children.setdefault(int(parent), []).append((int(node_id), str(detail)))
+
+    sizes: dict[str, int | None] = {}
+    scans: list[tuple[str, int]] = []
+
+    def loop_rows(detail: str) -> int | None:
+        match = _SCAN.match(detail) or _SEARCH.match(detail)
+        if match is None:
+            return None
+        if "VIRTUAL TABLE" in detail:
+            return 1
+        automatic = "AUTOMATIC" in detail  # index built per statement: one full pass over the table
+        if detail.startswith("SEARCH") and not automatic:
+            return 1
+        table = aliases.get(match.group(1).lower(), match.group(1).lower())
+        if table not in sizes:
+            sizes[table] = _table_rows(conn, table)
+        rows = sizes[table]
+        if rows is None:  # subquery / CTE output: its own loops are counted where they run
+            return 1
+        scans.append((table, rows))
+        return 1 if automatic else max(rows, 1)
+
+    def walk(parent: int, outer: int) -> int:
+        loops = outer
+        worst = 0
+        nested: list[tuple[int, str]] = []
+        for node_id, detail in children.get(parent, []):
+            rows = loop_rows(detail)
+            if rows is not None:
+                loops *= rows
+                worst = max(worst, loops)
+            nested.append((node_id, detail))
+        for node_id, detail in nested:
+            if node_id in children:
+                worst = max(worst, walk(node_id, loops if "CORRELATED" in detail else outer))
+        return worst
+
+    estimate = walk(0, 1)
+    if max_scan_rows > 0:
+        for table, rows in scans:
+            if rows > max_scan_rows:
+                raise QueryCostError(
+                    f"Query cost check: full scan of {table} (~{rows:,} rows, limit {max_scan_rows:,}). "
+                    f"{_scan_hint(conn, table).capitalize()}, or aggregate from kpi_monthly_rollup."
+                )
+    if max_nested_rows > 0 and estimate > max_nested_rows:
+        tables = ", ".join(sorted({t for t, _ in scans})) or "subqueries"
+        raise QueryCostError(
+            f"Query cost check: nested loops over {tables} visit ~{estimate:,} rows "
+            f"(limit {max_nested_rows:,}). Avoid cross joins and correlated subqueries; "
+            "join on supplier_id and aggregate with GROUP BY."
+        )
+    return {"estimated_rows": estimate, "scans": dict(scans)}
+
+
+class QueryBudget:
+    """Wall-clock and VM-step limits for one statement, enforced by the progress handler."""
+
+    def __init__(
+        self,
+        timeout_ms: int | None = None,
+        max_steps: int | None = None,
+        interval: int | None = None,
+    ) -> None:
+        self.timeout_ms = max(0, int(SQL_QUERY_TIMEOUT_MS if timeout_ms is None else timeout_ms))
+        self.max_steps = max(0, int(SQL_QUERY_MAX_VM_STEPS if max_steps is None else max_steps))
+        self.interval = max(1, int(SQL_PROGRESS_INTERVAL if interval is None else interval))
+        self.steps = 0
+        self.reason: str | None = None
+
+    def fetchall(self, cur: sqlite3.Cursor, sql: str, params: Iterable[Any] | None = None) -> list:
+        """Execute ``sql`` on ``cur`` and fetch every row; ``QueryCostError`` when a limit is hit."""
+        return self.run(cur, sql, params, lambda c: c.fetchall())
+
+    def run(
+        self,
+        cur: sqlite3.Cursor,
+        sql: str,
+        params: Iterable[Any] | None,
+        consume: Callable[[sqlite3.Cursor], T],
+    ) -> T:
+        """Execute ``sql`` and ``consume(cur)`` (e.g. a ``fetchmany`` loop) under the budget."""
+        if not (self.timeout_ms or self.max_steps):
+            return consume(cur.execute(sql, tuple(params or ())))
+        conn = cur.connection
+        deadline = time.perf_counter() + self.timeout_ms / 1000 if self.timeout_ms else None
+        self.steps = 0
+        self.reason = None
+
+        def on_progress() -> int:
+            self.steps += self.interval
+            if self.max_steps and self.steps > self.max_steps:
+                self.reason = f"exceeded the budget of {self.max_steps:,} SQLite VM steps"
+            elif deadline is not None and time.perf_counter() > deadline:
+                self.reason = f"exceeded the {self.timeout_ms} ms time budget"
+            return 1 if self.reason else 0
+
+        conn.set_progress_handler(on_progress, self.interval)
+        try:
+            return consume(cur.execute(sql, tuple(params or ())))
+        except sqlite3.OperationalError as exc:
+            if self.reason is None:
+                raise
+            raise QueryCostError(
+                f"Query cost check: stopped after it {self.reason}. Filter on supplier_id or dates, "
+                "avoid cross joins and correlated subqueries, or aggregate from kpi_monthly_rollup."
+            ) from exc
+        finally:
+            conn.set_progress_handler(None, 0)
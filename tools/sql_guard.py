@@ -1,16 +1,32 @@
 """Fail-closed SQL guard: parse with sqlglot, allow SELECT/WITH only, table allowlist, LIMIT.
 
 Regex / substring checks are not used for authorization. Unparseable SQL is rejected.
+
+Parsing dominates the cost of a guarded query, so validated statements are
+memoized per (sql, allowlist, limit):
+
+  trusted   static SQL (KPI templates, tool/branch queries) registered once via
+            ``register_trusted_sql``; registration validates immediately and
+            raises, so a broken template fails at import, not mid-request
+  LRU       bounded cache of other application SQL that passed validation
+            (``SQL_GUARD_CACHE_SIZE``); rejections are never cached
+
+LLM-written SQL is validated with ``cache=False`` and always takes the full
+parse path.
 """
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from typing import Iterable
 
 import sqlglot
 from sqlglot import exp
 from sqlglot.errors import ParseError
 
+from core.config import SQL_GUARD_CACHE_SIZE
+
 ALLOWED_SQL_TABLES = frozenset(
     {
         "suppliers",
@@ -22,6 +38,7 @@ ALLOWED_SQL_TABLES = frozenset(
         "risk_events",
         "esg_assessments",
         "vendor_rating",
+        "kpi_monthly_rollup",
     }
 )
 
@@ -121,17 +138,7 @@ def _ensure_limit(expression: exp.Expression, limit: int) -> exp.Expression:
     return limited
 
 
-def validate_read_only_sql(
-    sql: str,
-    *,
-    allowed_tables: Iterable[str] | None = None,
-    limit: int = DEFAULT_QUERY_LIMIT,
-) -> str:
-    """Parse, authorize, and return a single SELECT/WITH with LIMIT applied."""
-    cleaned = (sql or "").strip().rstrip(";")
-    if not cleaned:
-        raise ValueError("SQL is empty.")
-
+def _validate_uncached(cleaned: str, allow: frozenset[str], limit: int) -> str:
     try:
         statements = sqlglot.parse(cleaned, read="sqlite")
     except ParseError as exc:
@@ -147,7 +154,6 @@ def validate_read_only_sql(
 
     _reject_forbidden(tree)
 
-    allow = {t.lower() for t in (allowed_tables or ALLOWED_SQL_TABLES)}
     tables = _table_names(tree)
     invalid = [t for t in tables if t not in allow]
     forbidden = [t for t in tables if t in FORBIDDEN_TABLES]
@@ -160,3 +166,139 @@ def validate_read_only_sql(
 
     tree = _ensure_limit(tree, limit)
     return tree.sql(dialect="sqlite")
+
+
+class _ValidatedSQLCache:
+    """Trusted registry plus a bounded LRU of validated statements."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max(0, int(max_size))
+        self._lock = threading.Lock()
+        self._trusted: dict[tuple, str] = {}
+        self._lru: OrderedDict[tuple, str] = OrderedDict()
+        self._counts = {"trusted_hits": 0, "hits": 0, "misses": 0, "uncached": 0, "evictions": 0}
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            hit = self._trusted.get(key)
+            if hit is not None:
+                self._counts["trusted_hits"] += 1
+                return hit
+            hit = self._lru.get(key)
+            if hit is not None:
+                self._lru.move_to_end(key)
+                self._counts["hits"] += 1
+                return hit
+            self._counts["misses"] += 1
+            return None
+
+    def put(self, key: tuple, validated: str) -> None:
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._lru[key] = validated
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def trusted(self, key: tuple) -> str | None:
+        with self._lock:
+            return self._trusted.get(key)
+
+    def trusted_values(self) -> list[str]:
+        with self._lock:
+            return list(dict.fromkeys(self._trusted.values()))
+
+    def trust(self, key: tuple, validated: str) -> None:
+        with self._lock:
+            self._trusted[key] = validated
+            self._lru.pop(key, None)
+
+    def count_uncached(self) -> None:
+        with self._lock:
+            self._counts["uncached"] += 1
+
+    def clear(self, *, trusted: bool = False) -> None:
+        with self._lock:
+            self._lru.clear()
+            if trusted:
+                self._trusted.clear()
+            for name in self._counts:
+                self._counts[name] = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"trusted": len(self._trusted), "size": len(self._lru), "max_size": self.max_size, **self._counts}
+
+
+_CACHE = _ValidatedSQLCache(SQL_GUARD_CACHE_SIZE)
+
+
+def _cache_key(sql: str, allowed_tables: Iterable[str] | None, limit: int) -> tuple[str, frozenset[str], int]:
+    cleaned = (sql or "").strip().rstrip(";")
+    if not cleaned:
+        raise ValueError("SQL is empty.")
+    allow = frozenset(t.lower() for t in (allowed_tables or ALLOWED_SQL_TABLES))
+    return cleaned, allow, int(limit)
+
+
+def validate_read_only_sql(
+    sql: str,
+    *,
+    allowed_tables: Iterable[str] | None = None,
+    limit: int = DEFAULT_QUERY_LIMIT,
+    cache: bool = True,
+) -> str:
+    """Parse, authorize, and return a single SELECT/WITH with LIMIT applied.
+
+    ``cache=False`` is for untrusted (LLM-written) SQL: no lookup, no insert.
+    """
+    key = _cache_key(sql, allowed_tables, limit)
+    if not cache:
+        _CACHE.count_uncached()
+        return _validate_uncached(*key)
+    hit = _CACHE.get(key)
+    if hit is not None:
+        return hit
+    validated = _validate_uncached(*key)
+    _CACHE.put(key, validated)
+    return validated
+
+
+def normalized_sql(validated_sql: str) -> str:
+    """Canonical AST rendering used as a cache key: layout, keyword case and comments drop out.
+
+    Identifier case is kept because it names the result columns.
+    """
+    tree = sqlglot.parse_one(validated_sql, read="sqlite")
+    return tree.sql(dialect="sqlite", comments=False)
+
+
+def register_trusted_sql(
+    sql: str,
+    *,
+    allowed_tables: Iterable[str] | None = None,
+    limit: int = DEFAULT_QUERY_LIMIT,
+) -> str:
+    """Validate static application SQL once and pin it; raises ``ValueError`` if it is not allowed."""
+    key = _cache_key(sql, allowed_tables, limit)
+    validated = _CACHE.trusted(key)
+    if validated is None:
+        validated = _validate_uncached(*key)
+        _CACHE.trust(key, validated)
+    return validated
+
+
+def registered_sql() -> list[str]:
+    """Validated text of every statement pinned with ``register_trusted_sql``."""
+    return _CACHE.trusted_values()
+
+
+def sql_guard_cache_stats() -> dict[str, int]:
+    return _CACHE.stats()
+
+
+def clear_sql_guard_cache(*, trusted: bool = False) -> None:
+    """Test helper: drop the LRU (and the trusted registry with ``trusted=True``)."""
+    _CACHE.clear(trusted=trusted)
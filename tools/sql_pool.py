@@ -0,0 +1,150 @@
+"""Per-thread read-only SQLite connections for ``tools.sql_tools``.
+
+Each thread keeps one connection per database, opened once with a
+``mode=ro`` URI (``immutable=1`` with ``SQL_DB_IMMUTABLE``) and tuned pragmas:
+``query_only``, ``mmap_size``, ``cache_size`` and ``temp_store``. The statement
+cache therefore survives across queries. With ``SQL_DB_IN_MEMORY`` the database
+is copied once into a shared-cache in-memory DB and every reader attaches to
+that copy.
+
+Before each checkout the source file is re-stat'ed. When it changes (reload,
+rebuild, migration) the pool moves to a new generation: threads reopen their
+connection, and the in-memory copy is rebuilt.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from core.config import SQL_CACHE_KB, SQL_DB_IMMUTABLE, SQL_DB_IN_MEMORY, SQL_MMAP_BYTES, SQLITE_DB_PATH
+
+_MEMORY_IDS = itertools.count()
+
+
+def resolve_db_path(path: str = SQLITE_DB_PATH) -> str:
+    """Absolute DB path; relative paths are taken from the project root."""
+    if os.path.isabs(path):
+        return path
+    base = os.path.dirname(os.path.dirname(__file__))
+    return os.path.join(base, path.replace("/", os.sep))
+
+
+def _file_stamp(path: str) -> tuple:
+    stamps = []
+    for part in (path, path + "-wal"):
+        try:
+            st = os.stat(part)
+        except OSError:
+            stamps.append(None)
+        else:
+            stamps.append((st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+class ReadOnlyPool:
+    def __init__(
+        self,
+        path: str,
+        *,
+        in_memory: bool = SQL_DB_IN_MEMORY,
+        immutable: bool = SQL_DB_IMMUTABLE,
+        mmap_bytes: int = SQL_MMAP_BYTES,
+        cache_kb: int = SQL_CACHE_KB,
+    ) -> None:
+        self.path = path
+        self.in_memory = in_memory
+        self.immutable = immutable
+        self.mmap_bytes = mmap_bytes
+        self.cache_kb = cache_kb
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stamp: tuple | None = None
+        self._generation = 0
+        self._memory_keeper: sqlite3.Connection | None = None
+        self._memory_uri: str | None = None
+        self._counts = {"opens": 0, "reuses": 0, "reloads": 0}
+
+    def _file_uri(self) -> str:
+        uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+        return uri + "&immutable=1" if self.immutable else uri
+
+    def _load_memory_copy(self) -> None:
+        """Copy the file into a fresh shared-cache in-memory DB (caller holds ``_lock``)."""
+        uri = f"file:sql_pool_{os.getpid()}_{next(_MEMORY_IDS)}?mode=memory&cache=shared"
+        keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        source = sqlite3.connect(self._file_uri(), uri=True)
+        try:
+            source.backup(keeper)
+        finally:
+            source.close()
+        old, self._memory_keeper, self._memory_uri = self._memory_keeper, keeper, uri
+        if old is not None:
+            old.close()  # the old copy is freed once its last reader reconnects
+
+    def _current_generation(self) -> int:
+        stamp = _file_stamp(self.path)
+        if stamp == self._stamp:
+            return self._generation
+        with self._lock:
+            if stamp != self._stamp:
+                if self.in_memory:
+                    self._load_memory_copy()
+                if self._stamp is not None:
+                    self._counts["reloads"] += 1
+                self._stamp = stamp
+                self._generation += 1
+            return self._generation
+
+    def _open(self) -> sqlite3.Connection:
+        if self.in_memory:
+            conn = sqlite3.connect(self._memory_uri, uri=True, cached_statements=256)
+        else:
+            conn = sqlite3.connect(self._file_uri(), uri=True, cached_statements=256)
+            conn.execute(f"PRAGMA mmap_size = {int(self.mmap_bytes)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_kb)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA query_only = ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection for the current generation of the database."""
+        generation = self._current_generation()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.generation == generation:
+            self._counts["reuses"] += 1
+            return conn
+        if conn is not None:
+            conn.close()
+        conn = self._open()
+        self._local.conn = conn
+        self._local.generation = generation
+        with self._lock:
+            self._counts["opens"] += 1
+        return conn
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "in_memory": self.in_memory,
+            "immutable": self.immutable,
+            "generation": self._generation,
+            **self._counts,
+        }
+
+
+@lru_cache(maxsize=8)
+def get_read_pool(path: str | None = None) -> ReadOnlyPool:
+    """Process-wide pool for ``path`` (default ``SQLITE_DB_PATH``)."""
+    return ReadOnlyPool(resolve_db_path(path or SQLITE_DB_PATH))
+
+
+def reset_read_pools() -> None:
+    """Test helper: forget pools (open per-thread connections close with their threads)."""
+    get_read_pool.cache_clear()
@@ -0,0 +1,150 @@
+"""Bounded, streamed result sets for read-only SQL and their compact wire form.
+
+``run_sql_query_with_meta(..., limits=RowLimits(max_rows, max_bytes))`` reads the cursor
+with ``fetchmany(SQL_FETCH_BATCH)`` instead of ``fetchall()``. Rows stay plain
+tuples until they are kept. Collection stops at the row cap or once the
+approximate JSON size of the kept rows reaches the byte budget. Beyond that
+point rows are only counted (up to ``SQL_RESULT_COUNT_CAP``), so ``meta`` can
+report the total:
+
+  truncated            True when rows were dropped
+  total_rows_estimate  rows the statement produced (a lower bound when
+                       ``total_rows_exact`` is False)
+  result_bytes         approximate JSON size of the returned rows in the
+                       columnar wire form (values only)
+
+Across the MCP boundary, ``rows`` travel columnar (``columns`` once plus one
+list per row, ``row_format: "columnar"``). ``mcp_server.tools.dumps_tool_result``
+packs them; ``app.services.mcp_client`` unpacks them to dicts, so tool callers
+see the same payload shape as the in-process ``*_impl`` functions.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, NamedTuple
+
+from core.config import SQL_FETCH_BATCH, SQL_RESULT_COUNT_CAP, SQL_RESULT_MAX_BYTES, SQL_RESULT_MAX_ROWS
+
+COLUMNAR = "columnar"
+
+
+class RowLimits(NamedTuple):
+    """Caps for one result set; 0 means unbounded."""
+
+    max_rows: int = 0
+    max_bytes: int = 0
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_rows > 0 or self.max_bytes > 0
+
+
+def default_limits() -> RowLimits:
+    """Limits from the ``SQL_RESULT_MAX_ROWS`` / ``SQL_RESULT_MAX_BYTES`` config (fixed at import)."""
+    return RowLimits(max(0, SQL_RESULT_MAX_ROWS), max(0, SQL_RESULT_MAX_BYTES))
+
+
+def value_bytes(value: Any) -> int:
+    """Approximate JSON size of one value, separator included."""
+    if value is None:
+        return 5
+    if isinstance(value, str):
+        return len(value) + 3
+    if isinstance(value, (bytes, bytearray)):
+        return len(value) * 2 + 3
+    return 9
+
+
+def row_bytes(row: Iterable[Any]) -> int:
+    return 2 + sum(value_bytes(v) for v in row)
+
+
+def _fits(limits: RowLimits, kept: int, nbytes: int, cost: int) -> bool:
+    if limits.max_rows and kept >= limits.max_rows:
+        return False
+    return not (limits.max_bytes and kept and nbytes + cost > limits.max_bytes)  # first row always fits
+
+
+def collect_rows(
+    fetchmany: Callable[[int], list],
+    limits: RowLimits,
+    *,
+    convert: Callable[[Any], tuple] = tuple,
+    batch: int | None = None,
+    count_cap: int | None = None,
+) -> tuple[list[tuple], dict[str, Any]]:
+    """Drain ``fetchmany`` in batches, keeping rows within ``limits``; return (rows, stats)."""
+    size = max(1, int(SQL_FETCH_BATCH if batch is None else batch))
+    count_cap = max(0, int(SQL_RESULT_COUNT_CAP if count_cap is None else count_cap))
+    kept: list[tuple] = []
+    nbytes = 0
+    total = 0
+    truncated = False
+    exhausted = False
+    while True:
+        chunk = fetchmany(size)
+        if not chunk:
+            exhausted = True
+            break
+        total += len(chunk)
+        if truncated:
+            if count_cap and total - len(kept) >= count_cap:
+                break
+            continue
+        for raw in chunk:
+            row = convert(raw)
+            cost = row_bytes(row)
+            if not _fits(limits, len(kept), nbytes, cost):
+                truncated = True
+                break
+            kept.append(row)
+            nbytes += cost
+        if truncated and not count_cap:
+            break
+    stats = {
+        "truncated": truncated,
+        "total_rows_estimate": total,
+        "total_rows_exact": exhausted,
+        "result_bytes": nbytes,
+    }
+    return kept, stats
+
+
+def limit_rows(rows: list[dict[str, Any]], limits: RowLimits) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """Apply ``limits`` to already materialized dict rows (result-cache hits)."""
+    kept: list[dict[str, Any]] = []
+    nbytes = 0
+    for row in rows:
+        cost = row_bytes(row.values())
+        if not _fits(limits, len(kept), nbytes, cost):
+            break
+        kept.append(row)
+        nbytes += cost
+    stats = {
+        "truncated": len(kept) < len(rows),
+        "total_rows_estimate": len(rows),
+        "total_rows_exact": True,
+        "result_bytes": nbytes,
+    }
+    return kept, stats
+
+
+def to_columnar(payload: dict[str, Any]) -> dict[str, Any]:
+    """Payload with ``rows`` (list of dicts sharing one key order) as ``columns`` + row lists."""
+    rows = payload.get("rows")
+    if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+        return payload
+    columns = list(rows[0])
+    if any(list(r) != columns for r in rows):
+        return payload
+    return {**payload, "columns": columns, "rows": [list(r.values()) for r in rows], "row_format": COLUMNAR}
+
+
+def from_columnar(payload: Any) -> Any:
+    """Inverse of ``to_columnar``; other payloads pass through unchanged."""
+    if not isinstance(payload, dict) or payload.get("row_format") != COLUMNAR:
+        return payload
+    out = {k: v for k, v in payload.items() if k not in {"columns", "row_format"}}
+    columns = payload.get("columns") or []
+    out["rows"] = [dict(zip(columns, r)) for r in payload.get("rows") or []]
+    return out
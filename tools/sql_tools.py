@@ -1,13 +1,18 @@
-import os
 import time
 from typing import Any, Dict, List
 
-from core.config import SQLITE_DB_PATH
+from core.data_snapshot import db_fingerprint
+from tools.result_cache import get_result_cache, is_cacheable_sql
+from tools.sql_backends import get_sql_backend
+from tools.sql_cost import QueryBudget, check_query_plan
 from tools.sql_guard import (
     ALLOWED_SQL_TABLES,
     DEFAULT_QUERY_LIMIT,
+    normalized_sql,
     validate_read_only_sql,
 )
+from tools.sql_pool import get_read_pool
+from tools.sql_results import RowLimits, collect_rows, limit_rows
 
 __all__ = [
     "ALLOWED_SQL_TABLES",
@@ -22,44 +27,108 @@ def _validate_read_only_sql(sql: str) -> str:
     return validate_read_only_sql(sql)
 
 
-def run_sql_query_with_meta(sql: str, params: tuple | None = None) -> Dict[str, Any]:
-    """Execute validated read-only SQL and return rows with execution metadata."""
-    validated_sql = validate_read_only_sql(sql)
-    db_path = SQLITE_DB_PATH
-    if not os.path.isabs(db_path):
-        base = os.path.dirname(os.path.dirname(__file__))
-        db_path = os.path.join(base, db_path.replace("/", os.sep))
-    import sqlite3
-
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
-    started = time.perf_counter()
+def _record_sql_step(latency_ms: float, row_count: int, validated_sql: str, cache_hit: bool) -> None:
     try:
-        cur.execute(validated_sql, params or ())
-        rows = cur.fetchall()
-        latency_ms = round((time.perf_counter() - started) * 1000, 2)
-        data = [dict(r) for r in rows]
-        try:
-            from observability.recorder import record_step
-
-            record_step(
-                tool_called="sql_query",
-                tool_latency_ms=latency_ms,
-                detail={"row_count": len(data), "sql_preview": validated_sql[:240]},
-            )
-        except Exception:
-            pass
-        return {
-            "rows": data,
-            "meta": {
+        from observability.recorder import record_step
+
+        detail: dict[str, Any] = {"row_count": row_count, "sql_preview": validated_sql[:240]}
+        if cache_hit:
+            detail["cache_hit"] = True
+        record_step(tool_called="sql_query", tool_latency_ms=latency_ms, detail=detail)
+    except Exception:
+        pass
+
+
+def run_sql_query_with_meta(
+    sql: str,
+    params: tuple | None = None,
+    *,
+    untrusted: bool = False,
+    cache_label: str | None = None,
+    limits: RowLimits | None = None,
+) -> Dict[str, Any]:
+    """Execute validated read-only SQL and return rows with execution metadata.
+
+    Pass ``untrusted=True`` for LLM-written SQL so the guard re-parses it on every call
+    and ``tools.sql_cost`` checks its plan and bounds its run time; both raise
+    ``QueryCostError`` (a ``ValueError``) with a reason the repair prompt can use.
+    Results are served from ``tools.result_cache`` while the database is unchanged;
+    ``meta["cache_hit"]`` says so, and ``meta["source_latency_ms"]`` keeps the original run time.
+    ``cache_label`` (e.g. ``template:<template_id>``) names the entry in the cache key.
+    ``SQL_BACKEND`` picks the engine (``tools.sql_backends``); ``meta["backend"]`` reports it.
+    ``limits`` (``tools.sql_results.RowLimits``) streams the rows with ``fetchmany`` and caps
+    them by count and approximate bytes; ``meta`` then carries ``truncated``,
+    ``total_rows_estimate``, ``total_rows_exact`` and ``result_bytes``.
+    """
+    validated_sql = validate_read_only_sql(sql, cache=not untrusted)
+    pool = get_read_pool()
+    backend = get_sql_backend(pool.path)
+    backend_name = backend.name if backend is not None else "sqlite"
+    limits = limits if limits is not None and limits.bounded else None
+    cache = get_result_cache()
+    key = None
+    if cache.max_entries and is_cacheable_sql(validated_sql):
+        identity = normalized_sql(validated_sql) if untrusted else validated_sql
+        key = (cache_label or "sql", identity, tuple(params or ()), db_fingerprint(pool.path), backend_name)
+        started = time.perf_counter()
+        hit = cache.get(key)
+        if hit is not None:
+            data, stats = limit_rows(hit.rows, limits) if limits is not None else (hit.rows, None)
+            data = [dict(r) for r in data]
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+            _record_sql_step(latency_ms, len(data), validated_sql, True)
+            meta = {
                 "row_count": len(data),
                 "latency_ms": latency_ms,
                 "executed_sql": validated_sql,
-            },
-        }
+                "cache_hit": True,
+                "source_latency_ms": hit.latency_ms,
+                "backend": backend_name,
+            }
+            return {"rows": data, "meta": {**meta, **(stats or {})}}
+
+    started = time.perf_counter()
+    if backend is not None:
+        columns, tuples, stats = backend.fetch(validated_sql, params, untrusted=untrusted, limits=limits)
+    else:
+        columns, tuples, stats = _fetch_sqlite(pool.connection(), validated_sql, params, untrusted, limits)
+    data = [dict(zip(columns, r)) for r in tuples]
+    latency_ms = round((time.perf_counter() - started) * 1000, 2)
+    if key is not None and not (stats and stats["truncated"]):  # only complete results are reusable
+        cache.put(key, [dict(r) for r in data], latency_ms)
+    _record_sql_step(latency_ms, len(data), validated_sql, False)
+    meta = {
+        "row_count": len(data),
+        "latency_ms": latency_ms,
+        "executed_sql": validated_sql,
+        "cache_hit": False,
+        "backend": backend_name,
+    }
+    return {"rows": data, "meta": {**meta, **(stats or {})}}
+
+
+def _fetch_sqlite(
+    conn, validated_sql: str, params: tuple | None, untrusted: bool, limits: RowLimits | None
+) -> tuple[List[str], List[tuple], Dict[str, Any] | None]:
+    if untrusted:
+        check_query_plan(conn, validated_sql, params)
+    cur = conn.cursor()
+    cur.row_factory = None  # plain tuples; dicts are built only for the rows returned
+
+    def consume(c) -> tuple[List[tuple], Dict[str, Any] | None]:
+        if limits is None:
+            return c.fetchall(), None
+        return collect_rows(c.fetchmany, limits)
+
+    try:
+        if untrusted:
+            rows, stats = QueryBudget().run(cur, validated_sql, params, consume)
+        else:
+            rows, stats = consume(cur.execute(validated_sql, params or ()))
+        columns = [d[0] for d in cur.description or []]
+        return columns, rows, stats
     finally:
-        conn.close()
+        cur.close()
 
 
 def run_sql_query(sql: str, params: tuple | None = None) -> List[Dict[str, Any]]: